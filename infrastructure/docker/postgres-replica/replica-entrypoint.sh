@@ -0,0 +1,25 @@
+#!/bin/sh
+# =============================================================================
+# Réplica de lectura (streaming replication) para desarrollo local
+# =============================================================================
+# En el primer arranque clona el primario con pg_basebackup (-R deja
+# standby.signal y primary_conninfo); luego arranca Postgres en hot standby.
+# =============================================================================
+set -e
+
+if [ ! -s "$PGDATA/PG_VERSION" ]; then
+    echo "⏳ Esperando al primario ($PRIMARY_HOST)..."
+    until pg_isready -h "$PRIMARY_HOST" -U "$POSTGRES_USER" -d "$POSTGRES_DB" >/dev/null 2>&1; do
+        sleep 1
+    done
+
+    echo "📦 Clonando el primario con pg_basebackup..."
+    mkdir -p "$PGDATA"
+    chown postgres:postgres "$PGDATA"
+    chmod 700 "$PGDATA"
+    su-exec postgres pg_basebackup \
+        -d "host=$PRIMARY_HOST port=5432 user=$POSTGRES_USER password=$POSTGRES_PASSWORD application_name=$REPLICA_NAME" \
+        -D "$PGDATA" -R -X stream -P
+fi
+
+exec su-exec postgres postgres -c hot_standby=on -c hot_standby_feedback=on
@@ -0,0 +1,111 @@
+"""add geohash to coordinates
+
+Revision ID: 96fcc1690654
+Revises: f0204a22baa6
+Create Date: 2026-01-05 10:00:00.000000
+
+Agrega coordinates.geohash (precisión 12, ~3.7 cm) mantenido por trigger.
+El índice B-tree con COLLATE "C" permite buscar por celda (prefijo) sin PostGIS;
+la imagen postgres:16-alpine no incluye la extensión.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '96fcc1690654'
+down_revision = 'f0204a22baa6'
+branch_labels = None
+depends_on = None
+
+
+GEOHASH_ENCODE_FUNCTION = """
+CREATE OR REPLACE FUNCTION geohash_encode(lat double precision, lon double precision, precision integer DEFAULT 12)
+RETURNS varchar
+LANGUAGE plpgsql IMMUTABLE STRICT PARALLEL SAFE
+AS $$
+DECLARE
+    alphabet constant text := '0123456789bcdefghjkmnpqrstuvwxyz';
+    lat_min double precision := -90;
+    lat_max double precision := 90;
+    lon_min double precision := -180;
+    lon_max double precision := 180;
+    mid double precision;
+    is_lon boolean := true;
+    bit integer := 0;
+    ch integer := 0;
+    result text := '';
+BEGIN
+    WHILE length(result) < precision LOOP
+        IF is_lon THEN
+            mid := (lon_min + lon_max) / 2;
+            IF lon >= mid THEN
+                ch := ch * 2 + 1;
+                lon_min := mid;
+            ELSE
+                ch := ch * 2;
+                lon_max := mid;
+            END IF;
+        ELSE
+            mid := (lat_min + lat_max) / 2;
+            IF lat >= mid THEN
+                ch := ch * 2 + 1;
+                lat_min := mid;
+            ELSE
+                ch := ch * 2;
+                lat_max := mid;
+            END IF;
+        END IF;
+        is_lon := NOT is_lon;
+        bit := bit + 1;
+        IF bit = 5 THEN
+            result := result || substr(alphabet, ch + 1, 1);
+            bit := 0;
+            ch := 0;
+        END IF;
+    END LOOP;
+    RETURN result;
+END;
+$$;
+"""
+
+SET_GEOHASH_TRIGGER_FUNCTION = """
+CREATE OR REPLACE FUNCTION coordinates_set_geohash()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    NEW.geohash := geohash_encode(NEW.latitude::float8, NEW.longitude::float8, 12);
+    RETURN NEW;
+END;
+$$;
+"""
+
+SET_GEOHASH_TRIGGER = """
+CREATE TRIGGER trg_coordinates_geohash
+BEFORE INSERT OR UPDATE OF latitude, longitude ON coordinates
+FOR EACH ROW EXECUTE FUNCTION coordinates_set_geohash();
+"""
+
+
+def upgrade() -> None:
+    op.add_column(
+        'coordinates',
+        sa.Column('geohash', sa.String(length=12, collation='C'), nullable=True),
+    )
+    op.execute(GEOHASH_ENCODE_FUNCTION)
+    op.execute(SET_GEOHASH_TRIGGER_FUNCTION)
+    op.execute(SET_GEOHASH_TRIGGER)
+    op.execute(
+        "UPDATE coordinates SET geohash = geohash_encode(latitude::float8, longitude::float8, 12)"
+    )
+    op.create_index('idx_coordinates_geohash', 'coordinates', ['geohash'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_coordinates_geohash', table_name='coordinates')
+    op.execute("DROP TRIGGER IF EXISTS trg_coordinates_geohash ON coordinates")
+    op.execute("DROP FUNCTION IF EXISTS coordinates_set_geohash()")
+    op.execute("DROP FUNCTION IF EXISTS geohash_encode(double precision, double precision, integer)")
+    op.drop_column('coordinates', 'geohash')
@@ -0,0 +1,157 @@
+"""add phase block aggregates
+
+Revision ID: 3b7e91c4d2a8
+Revises: 96fcc1690654
+Create Date: 2026-01-06 09:00:00.000000
+
+Capa de agregados materializados por fase (tonelaje, metal contenido, minado).
+Se mantiene incrementalmente con triggers por sentencia sobre blocks que usan
+tablas de transición: una carga masiva (COPY + INSERT ... SELECT) aplica un
+solo delta por fase en vez de un UPDATE por fila.
+Mina y yacimiento se obtienen sumando las fases (pocas filas).
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3b7e91c4d2a8'
+down_revision = '96fcc1690654'
+branch_labels = None
+depends_on = None
+
+
+APPLY_DELTA_FUNCTION = """
+CREATE OR REPLACE FUNCTION blocks_apply_aggregate_delta()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    changes text;
+BEGIN
+    changes := CASE TG_OP
+        WHEN 'INSERT' THEN 'SELECT 1 AS sign, * FROM new_blocks'
+        WHEN 'DELETE' THEN 'SELECT -1 AS sign, * FROM old_blocks'
+        ELSE 'SELECT 1 AS sign, * FROM new_blocks UNION ALL SELECT -1 AS sign, * FROM old_blocks'
+    END;
+
+    EXECUTE format($sql$
+        INSERT INTO phase_block_aggregates AS agg (
+            mine_phase_id, block_count, mined_block_count,
+            total_tonnage, mined_tonnage,
+            contained_cu_t, contained_mo_t, mined_cu_t, mined_mo_t
+        )
+        SELECT
+            c.mine_phase_id,
+            SUM(c.sign),
+            SUM(c.sign * c.is_mined::int),
+            SUM(c.sign * COALESCE(c.tonnage, 0)),
+            SUM(c.sign * COALESCE(c.tonnage, 0) * c.is_mined::int),
+            SUM(c.sign * COALESCE(c.tonnage * c.cu_grade_pct / 100, 0)),
+            SUM(c.sign * COALESCE(c.tonnage * c.mo_grade_pct / 100, 0)),
+            SUM(c.sign * COALESCE(c.tonnage * c.cu_grade_pct / 100, 0) * c.is_mined::int),
+            SUM(c.sign * COALESCE(c.tonnage * c.mo_grade_pct / 100, 0) * c.is_mined::int)
+        FROM (%s) c
+        WHERE EXISTS (SELECT 1 FROM mine_phases mp WHERE mp.id = c.mine_phase_id)
+        GROUP BY c.mine_phase_id
+        HAVING SUM(c.sign) <> 0
+            OR SUM(c.sign * c.is_mined::int) <> 0
+            OR SUM(c.sign * COALESCE(c.tonnage, 0)) <> 0
+            OR SUM(c.sign * COALESCE(c.tonnage * c.cu_grade_pct, 0)) <> 0
+            OR SUM(c.sign * COALESCE(c.tonnage * c.mo_grade_pct, 0)) <> 0
+        ON CONFLICT (mine_phase_id) DO UPDATE SET
+            block_count = agg.block_count + EXCLUDED.block_count,
+            mined_block_count = agg.mined_block_count + EXCLUDED.mined_block_count,
+            total_tonnage = agg.total_tonnage + EXCLUDED.total_tonnage,
+            mined_tonnage = agg.mined_tonnage + EXCLUDED.mined_tonnage,
+            contained_cu_t = agg.contained_cu_t + EXCLUDED.contained_cu_t,
+            contained_mo_t = agg.contained_mo_t + EXCLUDED.contained_mo_t,
+            mined_cu_t = agg.mined_cu_t + EXCLUDED.mined_cu_t,
+            mined_mo_t = agg.mined_mo_t + EXCLUDED.mined_mo_t,
+            version = agg.version + 1,
+            updated_at = now()
+    $sql$, changes);
+
+    RETURN NULL;
+END;
+$$;
+"""
+
+REBUILD_FUNCTION = """
+CREATE OR REPLACE FUNCTION rebuild_phase_block_aggregates()
+RETURNS void
+LANGUAGE sql
+AS $$
+    INSERT INTO phase_block_aggregates AS agg (
+        mine_phase_id, block_count, mined_block_count,
+        total_tonnage, mined_tonnage,
+        contained_cu_t, contained_mo_t, mined_cu_t, mined_mo_t
+    )
+    SELECT
+        mp.id,
+        COUNT(b.id),
+        COUNT(b.id) FILTER (WHERE b.is_mined),
+        COALESCE(SUM(b.tonnage), 0),
+        COALESCE(SUM(b.tonnage) FILTER (WHERE b.is_mined), 0),
+        COALESCE(SUM(b.tonnage * b.cu_grade_pct / 100), 0),
+        COALESCE(SUM(b.tonnage * b.mo_grade_pct / 100), 0),
+        COALESCE(SUM(b.tonnage * b.cu_grade_pct / 100) FILTER (WHERE b.is_mined), 0),
+        COALESCE(SUM(b.tonnage * b.mo_grade_pct / 100) FILTER (WHERE b.is_mined), 0)
+    FROM mine_phases mp
+    LEFT JOIN blocks b ON b.mine_phase_id = mp.id
+    GROUP BY mp.id
+    ON CONFLICT (mine_phase_id) DO UPDATE SET
+        block_count = EXCLUDED.block_count,
+        mined_block_count = EXCLUDED.mined_block_count,
+        total_tonnage = EXCLUDED.total_tonnage,
+        mined_tonnage = EXCLUDED.mined_tonnage,
+        contained_cu_t = EXCLUDED.contained_cu_t,
+        contained_mo_t = EXCLUDED.contained_mo_t,
+        mined_cu_t = EXCLUDED.mined_cu_t,
+        mined_mo_t = EXCLUDED.mined_mo_t,
+        version = agg.version + 1,
+        updated_at = now();
+$$;
+"""
+
+TRIGGERS = {
+    'trg_blocks_aggregate_insert': "AFTER INSERT ON blocks REFERENCING NEW TABLE AS new_blocks",
+    'trg_blocks_aggregate_update': "AFTER UPDATE ON blocks REFERENCING OLD TABLE AS old_blocks NEW TABLE AS new_blocks",
+    'trg_blocks_aggregate_delete': "AFTER DELETE ON blocks REFERENCING OLD TABLE AS old_blocks",
+}
+
+
+def upgrade() -> None:
+    op.create_table('phase_block_aggregates',
+    sa.Column('mine_phase_id', sa.UUID(), nullable=False),
+    sa.Column('block_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('mined_block_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('total_tonnage', sa.Numeric(precision=18, scale=2), server_default='0', nullable=False),
+    sa.Column('mined_tonnage', sa.Numeric(precision=18, scale=2), server_default='0', nullable=False),
+    sa.Column('contained_cu_t', sa.Numeric(precision=18, scale=4), server_default='0', nullable=False),
+    sa.Column('contained_mo_t', sa.Numeric(precision=18, scale=4), server_default='0', nullable=False),
+    sa.Column('mined_cu_t', sa.Numeric(precision=18, scale=4), server_default='0', nullable=False),
+    sa.Column('mined_mo_t', sa.Numeric(precision=18, scale=4), server_default='0', nullable=False),
+    sa.Column('version', sa.BigInteger(), server_default='1', nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['mine_phase_id'], ['mine_phases.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('mine_phase_id'),
+    comment='Agregados materializados de bloques por fase (mantenidos por trigger)'
+    )
+    op.execute(APPLY_DELTA_FUNCTION)
+    op.execute(REBUILD_FUNCTION)
+    for name, timing in TRIGGERS.items():
+        op.execute(
+            f"CREATE TRIGGER {name} {timing} "
+            "FOR EACH STATEMENT EXECUTE FUNCTION blocks_apply_aggregate_delta()"
+        )
+    op.execute("SELECT rebuild_phase_block_aggregates()")
+
+
+def downgrade() -> None:
+    for name in TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {name} ON blocks")
+    op.execute("DROP FUNCTION IF EXISTS rebuild_phase_block_aggregates()")
+    op.execute("DROP FUNCTION IF EXISTS blocks_apply_aggregate_delta()")
+    op.drop_table('phase_block_aggregates')
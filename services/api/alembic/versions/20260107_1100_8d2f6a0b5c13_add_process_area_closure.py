@@ -0,0 +1,143 @@
+"""add process area closure
+
+Revision ID: 8d2f6a0b5c13
+Revises: 3b7e91c4d2a8
+Create Date: 2026-01-07 11:00:00.000000
+
+Tabla de clausura (ancestro, descendiente, profundidad) para el árbol de
+process_areas (parent_area_id). Se mantiene con triggers al escribir, así el
+flowsheet completo y los agregados por subárbol se leen sin recursión ni N+1.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8d2f6a0b5c13'
+down_revision = '3b7e91c4d2a8'
+branch_labels = None
+depends_on = None
+
+
+INSERT_FUNCTION = """
+CREATE OR REPLACE FUNCTION process_areas_closure_insert()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    INSERT INTO process_area_closure (ancestor_id, descendant_id, depth)
+    SELECT NEW.id, NEW.id, 0
+    UNION ALL
+    SELECT c.ancestor_id, NEW.id, c.depth + 1
+    FROM process_area_closure c
+    WHERE c.descendant_id = NEW.parent_area_id;
+    RETURN NULL;
+END;
+$$;
+"""
+
+CHECK_CYCLE_FUNCTION = """
+CREATE OR REPLACE FUNCTION process_areas_closure_check_cycle()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF NEW.parent_area_id IS NOT NULL AND EXISTS (
+        SELECT 1 FROM process_area_closure
+        WHERE ancestor_id = NEW.id AND descendant_id = NEW.parent_area_id
+    ) THEN
+        RAISE EXCEPTION 'process area % cannot be moved under its own descendant %', NEW.id, NEW.parent_area_id
+            USING ERRCODE = 'check_violation';
+    END IF;
+    RETURN NEW;
+END;
+$$;
+"""
+
+MOVE_FUNCTION = """
+CREATE OR REPLACE FUNCTION process_areas_closure_move()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    -- Desconectar el subárbol de sus ancestros anteriores
+    DELETE FROM process_area_closure c
+    USING process_area_closure sub
+    WHERE sub.ancestor_id = NEW.id
+      AND c.descendant_id = sub.descendant_id
+      AND c.ancestor_id NOT IN (
+          SELECT descendant_id FROM process_area_closure WHERE ancestor_id = NEW.id
+      );
+
+    -- Conectarlo bajo los ancestros del nuevo padre
+    INSERT INTO process_area_closure (ancestor_id, descendant_id, depth)
+    SELECT p.ancestor_id, sub.descendant_id, p.depth + sub.depth + 1
+    FROM process_area_closure p
+    JOIN process_area_closure sub ON sub.ancestor_id = NEW.id
+    WHERE p.descendant_id = NEW.parent_area_id;
+
+    RETURN NULL;
+END;
+$$;
+"""
+
+TRIGGERS = (
+    "CREATE TRIGGER trg_process_areas_closure_insert "
+    "AFTER INSERT ON process_areas "
+    "FOR EACH ROW EXECUTE FUNCTION process_areas_closure_insert()",
+
+    "CREATE TRIGGER trg_process_areas_closure_check_cycle "
+    "BEFORE UPDATE OF parent_area_id ON process_areas "
+    "FOR EACH ROW WHEN (NEW.parent_area_id IS DISTINCT FROM OLD.parent_area_id) "
+    "EXECUTE FUNCTION process_areas_closure_check_cycle()",
+
+    "CREATE TRIGGER trg_process_areas_closure_move "
+    "AFTER UPDATE OF parent_area_id ON process_areas "
+    "FOR EACH ROW WHEN (NEW.parent_area_id IS DISTINCT FROM OLD.parent_area_id) "
+    "EXECUTE FUNCTION process_areas_closure_move()",
+)
+
+BACKFILL = """
+WITH RECURSIVE tree AS (
+    SELECT id AS ancestor_id, id AS descendant_id, 0 AS depth
+    FROM process_areas
+    UNION ALL
+    SELECT t.ancestor_id, pa.id, t.depth + 1
+    FROM tree t
+    JOIN process_areas pa ON pa.parent_area_id = t.descendant_id
+)
+INSERT INTO process_area_closure (ancestor_id, descendant_id, depth)
+SELECT ancestor_id, descendant_id, depth FROM tree
+"""
+
+
+def upgrade() -> None:
+    op.create_table('process_area_closure',
+    sa.Column('ancestor_id', sa.UUID(), nullable=False),
+    sa.Column('descendant_id', sa.UUID(), nullable=False),
+    sa.Column('depth', sa.Integer(), nullable=False),
+    sa.CheckConstraint('depth >= 0', name='process_area_closure_depth_positive'),
+    sa.ForeignKeyConstraint(['ancestor_id'], ['process_areas.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['descendant_id'], ['process_areas.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('ancestor_id', 'descendant_id'),
+    comment='Tabla de clausura del árbol de áreas de proceso (mantenida por trigger)'
+    )
+    op.create_index('idx_process_area_closure_descendant', 'process_area_closure', ['descendant_id', 'depth'], unique=False)
+    op.execute(INSERT_FUNCTION)
+    op.execute(CHECK_CYCLE_FUNCTION)
+    op.execute(MOVE_FUNCTION)
+    for statement in TRIGGERS:
+        op.execute(statement)
+    op.execute(BACKFILL)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_process_areas_closure_move ON process_areas")
+    op.execute("DROP TRIGGER IF EXISTS trg_process_areas_closure_check_cycle ON process_areas")
+    op.execute("DROP TRIGGER IF EXISTS trg_process_areas_closure_insert ON process_areas")
+    op.execute("DROP FUNCTION IF EXISTS process_areas_closure_move()")
+    op.execute("DROP FUNCTION IF EXISTS process_areas_closure_check_cycle()")
+    op.execute("DROP FUNCTION IF EXISTS process_areas_closure_insert()")
+    op.drop_index('idx_process_area_closure_descendant', table_name='process_area_closure')
+    op.drop_table('process_area_closure')
@@ -0,0 +1,57 @@
+"""add audit logs extra_data index
+
+Revision ID: 7a80e5eca776
+Revises: 8d2f6a0b5c13
+Create Date: 2026-01-08 09:00:00.000000
+
+Índice GIN (jsonb_path_ops) sobre audit_logs.extra_data para filtros por
+contención (extra_data @> '{"setting": "max_upload_size"}') sin recorrer la
+tabla completa. jsonb_path_ops es más chico y rápido que el operator class por
+defecto, y sólo soporta @>, @? y @@, que es lo que genera
+app/queries/audit_logs.build_extra_data_filter.
+
+La clave más consultada (setting, en CONFIG_CHANGE) se materializa además como
+columna generada con índice B-tree parcial. Agregar una columna STORED reescribe
+la tabla: ejecutar en una ventana de mantenimiento si audit_logs es grande.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7a80e5eca776'
+down_revision = '8d2f6a0b5c13'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('audit_logs', sa.Column(
+        'extra_setting',
+        sa.Text(),
+        sa.Computed("extra_data ->> 'setting'", persisted=True),
+        nullable=True,
+        comment="extra_data->>'setting' (columna generada para filtros frecuentes)",
+    ))
+    op.create_index(
+        'idx_audit_logs_extra_data',
+        'audit_logs',
+        ['extra_data'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'extra_data': 'jsonb_path_ops'},
+    )
+    op.create_index(
+        'idx_audit_logs_extra_setting',
+        'audit_logs',
+        ['extra_setting', 'created_at'],
+        unique=False,
+        postgresql_where=sa.text('extra_setting IS NOT NULL'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_audit_logs_extra_setting', table_name='audit_logs')
+    op.drop_index('idx_audit_logs_extra_data', table_name='audit_logs')
+    op.drop_column('audit_logs', 'extra_setting')
@@ -0,0 +1,66 @@
+"""add table versions
+
+Revision ID: e5376226569a
+Revises: 7a80e5eca776
+Create Date: 2026-01-08 10:00:00.000000
+
+Contador de cambios por tabla de datos de referencia (roles, deposits, mines,
+equipment_types, reagents), incrementado por un trigger por sentencia. Los
+ETag de /v1/reference se derivan de estos contadores (una lectura por clave
+primaria), así un 304 se responde sin leer las filas; a diferencia de
+max(updated_at), también cambia con DELETE y TRUNCATE.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5376226569a'
+down_revision = '7a80e5eca776'
+branch_labels = None
+depends_on = None
+
+
+VERSIONED_TABLES = ("roles", "deposits", "mines", "equipment_types", "reagents")
+
+BUMP_FUNCTION = """
+CREATE OR REPLACE FUNCTION bump_table_version()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    INSERT INTO table_versions (table_name, version, updated_at)
+    VALUES (TG_TABLE_NAME, 1, now())
+    ON CONFLICT (table_name) DO UPDATE
+    SET version = table_versions.version + 1,
+        updated_at = now();
+    RETURN NULL;
+END;
+$$;
+"""
+
+
+def upgrade() -> None:
+    op.create_table('table_versions',
+    sa.Column('table_name', sa.String(length=63), nullable=False),
+    sa.Column('version', sa.BigInteger(), server_default='0', nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('table_name'),
+    comment='Contador de cambios por tabla de referencia (mantenido por trigger)'
+    )
+    op.execute(BUMP_FUNCTION)
+    for table in VERSIONED_TABLES:
+        op.execute(f"INSERT INTO table_versions (table_name, version) VALUES ('{table}', 1)")
+        op.execute(
+            f"CREATE TRIGGER trg_{table}_version "
+            f"AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table} "
+            f"FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version()"
+        )
+
+
+def downgrade() -> None:
+    for table in VERSIONED_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_version ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS bump_table_version()")
+    op.drop_table('table_versions')
@@ -0,0 +1,66 @@
+"""notify table versions
+
+Revision ID: 4804ab361f7b
+Revises: e5376226569a
+Create Date: 2026-01-09 09:00:00.000000
+
+bump_table_version() además publica NOTIFY table_versions con el payload
+'<tabla>:<versión>'. La caché de datos de referencia de la API
+(app/services/reference_cache.py) escucha el canal y recarga sólo la tabla
+que cambió. La notificación se entrega al hacer COMMIT (nunca por una
+transacción que termina en rollback).
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '4804ab361f7b'
+down_revision = 'e5376226569a'
+branch_labels = None
+depends_on = None
+
+
+BUMP_FUNCTION_NOTIFY = """
+CREATE OR REPLACE FUNCTION bump_table_version()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    new_version BIGINT;
+BEGIN
+    INSERT INTO table_versions (table_name, version, updated_at)
+    VALUES (TG_TABLE_NAME, 1, now())
+    ON CONFLICT (table_name) DO UPDATE
+    SET version = table_versions.version + 1,
+        updated_at = now()
+    RETURNING version INTO new_version;
+    PERFORM pg_notify('table_versions', TG_TABLE_NAME || ':' || new_version);
+    RETURN NULL;
+END;
+$$;
+"""
+
+BUMP_FUNCTION = """
+CREATE OR REPLACE FUNCTION bump_table_version()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    INSERT INTO table_versions (table_name, version, updated_at)
+    VALUES (TG_TABLE_NAME, 1, now())
+    ON CONFLICT (table_name) DO UPDATE
+    SET version = table_versions.version + 1,
+        updated_at = now();
+    RETURN NULL;
+END;
+$$;
+"""
+
+
+def upgrade() -> None:
+    op.execute(BUMP_FUNCTION_NOTIFY)
+
+
+def downgrade() -> None:
+    op.execute(BUMP_FUNCTION)
@@ -0,0 +1,47 @@
+"""add seed natural key indexes
+
+Revision ID: b3e71c9d2a58
+Revises: 4804ab361f7b
+Create Date: 2026-01-10 09:00:00.000000
+
+Índices únicos sobre las claves naturales que usan los scripts de seed para
+su upsert por lotes (INSERT ... ON CONFLICT (clave) DO UPDATE):
+
+- mine_phases (mine_id, code)
+- mineralogy (deposit_id, mineral_name)
+- process_areas (mine_id, code)
+- coordinates (deposit_id) WHERE point_type = 'CENTROID'
+
+La creación falla si ya hay duplicados (p. ej. de un seed antiguo ejecutado
+dos veces): eliminarlos antes de aplicar la migración.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b3e71c9d2a58'
+down_revision = '4804ab361f7b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('idx_mine_phases_mine_code', 'mine_phases', ['mine_id', 'code'], unique=True)
+    op.create_index('idx_mineralogy_deposit_mineral', 'mineralogy', ['deposit_id', 'mineral_name'], unique=True)
+    op.create_index('idx_process_areas_mine_code', 'process_areas', ['mine_id', 'code'], unique=True)
+    op.create_index(
+        'idx_coordinates_deposit_centroid',
+        'coordinates',
+        ['deposit_id'],
+        unique=True,
+        postgresql_where=sa.text("point_type = 'CENTROID'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_coordinates_deposit_centroid', table_name='coordinates')
+    op.drop_index('idx_process_areas_mine_code', table_name='process_areas')
+    op.drop_index('idx_mineralogy_deposit_mineral', table_name='mineralogy')
+    op.drop_index('idx_mine_phases_mine_code', table_name='mine_phases')
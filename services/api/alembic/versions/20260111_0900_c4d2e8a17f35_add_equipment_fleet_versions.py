@@ -0,0 +1,49 @@
+"""add equipment fleet versions
+
+Revision ID: c4d2e8a17f35
+Revises: b3e71c9d2a58
+Create Date: 2026-01-11 09:00:00.000000
+
+Tableros de estado de la flota (app/services/fleet_status.py):
+
+- equipment pasa a tener contador en table_versions (trigger por sentencia
+  con NOTIFY, ver 4804ab361f7b): el snapshot de la flota se reconstruye sólo
+  cuando cambian equipment, equipment_types o mines
+- idx_equipment_operating_hours: ranking de horas de operación
+  (ORDER BY total_operating_hours DESC LIMIT n) con el mismo predicado
+  deleted_at IS NULL que idx_equipment_status e idx_equipment_code
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4d2e8a17f35'
+down_revision = 'b3e71c9d2a58'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "INSERT INTO table_versions (table_name, version) VALUES ('equipment', 1) "
+        "ON CONFLICT (table_name) DO NOTHING"
+    )
+    op.execute(
+        "CREATE TRIGGER trg_equipment_version "
+        "AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON equipment "
+        "FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version()"
+    )
+    op.create_index(
+        'idx_equipment_operating_hours',
+        'equipment',
+        [sa.text('total_operating_hours DESC')],
+        postgresql_where=sa.text('deleted_at IS NULL'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_equipment_operating_hours', table_name='equipment')
+    op.execute("DROP TRIGGER IF EXISTS trg_equipment_version ON equipment")
+    op.execute("DELETE FROM table_versions WHERE table_name = 'equipment'")
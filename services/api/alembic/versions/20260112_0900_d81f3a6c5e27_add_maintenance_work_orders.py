@@ -0,0 +1,86 @@
+"""add maintenance work orders
+
+Revision ID: d81f3a6c5e27
+Revises: c4d2e8a17f35
+Create Date: 2026-01-12 09:00:00.000000
+
+Scheduler de mantenimiento (app/services/maintenance_scheduler.py):
+
+- maintenance_work_orders: órdenes de trabajo generadas por lotes cuando un
+  equipo cruza su fecha u horas de mantención. El índice único parcial
+  idx_maintenance_work_orders_open_equipment deja a lo más una orden abierta
+  por equipo: la generación es INSERT ... ON CONFLICT DO NOTHING, idempotente
+  entre workers
+- idx_equipment_next_maintenance: la cola de vencimientos se reconstruye
+  recorriendo next_maintenance_date (mismo predicado deleted_at IS NULL que
+  los demás índices parciales de equipment)
+- contador en table_versions (con NOTIFY) para maintenance_work_orders: la
+  cola se reconstruye cuando cambian los equipos o las órdenes
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd81f3a6c5e27'
+down_revision = 'c4d2e8a17f35'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('maintenance_work_orders',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('equipment_id', sa.UUID(), nullable=False),
+    sa.Column('maintenance_type', sa.Enum('PREVENTIVE', 'CORRECTIVE', 'PREDICTIVE', 'EMERGENCY', 'SCHEDULED', name='maintenance_type_enum'), nullable=False),
+    sa.Column('priority', sa.Enum('LOW', 'MEDIUM', 'HIGH', 'CRITICAL', name='work_order_priority_enum'), nullable=False),
+    sa.Column('status', sa.Enum('PENDING', 'SCHEDULED', 'IN_PROGRESS', 'ON_HOLD', 'COMPLETED', 'CANCELLED', name='work_order_status_enum'), server_default='PENDING', nullable=False),
+    sa.Column('due_date', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('trigger_reason', sa.String(length=20), nullable=False),
+    sa.Column('operating_hours_at_creation', sa.Numeric(precision=12, scale=2), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['equipment_id'], ['equipment.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    comment='Órdenes de trabajo de mantenimiento de equipos'
+    )
+    op.create_index(
+        'idx_maintenance_work_orders_open_equipment',
+        'maintenance_work_orders',
+        ['equipment_id'],
+        unique=True,
+        postgresql_where=sa.text("status IN ('PENDING', 'SCHEDULED', 'IN_PROGRESS', 'ON_HOLD')"),
+    )
+    op.create_index('idx_maintenance_work_orders_equipment_id', 'maintenance_work_orders', ['equipment_id'], unique=False)
+    op.create_index('idx_maintenance_work_orders_status_due', 'maintenance_work_orders', ['status', 'due_date'], unique=False)
+    op.create_index(
+        'idx_equipment_next_maintenance',
+        'equipment',
+        ['next_maintenance_date'],
+        unique=False,
+        postgresql_where=sa.text('deleted_at IS NULL'),
+    )
+    op.execute(
+        "INSERT INTO table_versions (table_name, version) VALUES ('maintenance_work_orders', 1) "
+        "ON CONFLICT (table_name) DO NOTHING"
+    )
+    op.execute(
+        "CREATE TRIGGER trg_maintenance_work_orders_version "
+        "AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON maintenance_work_orders "
+        "FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version()"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DELETE FROM table_versions WHERE table_name = 'maintenance_work_orders'")
+    op.drop_index('idx_equipment_next_maintenance', table_name='equipment')
+    op.drop_index('idx_maintenance_work_orders_status_due', table_name='maintenance_work_orders')
+    op.drop_index('idx_maintenance_work_orders_equipment_id', table_name='maintenance_work_orders')
+    op.drop_index('idx_maintenance_work_orders_open_equipment', table_name='maintenance_work_orders')
+    op.drop_table('maintenance_work_orders')
+    op.execute("DROP TYPE IF EXISTS work_order_status_enum")
+    op.execute("DROP TYPE IF EXISTS work_order_priority_enum")
+    op.execute("DROP TYPE IF EXISTS maintenance_type_enum")
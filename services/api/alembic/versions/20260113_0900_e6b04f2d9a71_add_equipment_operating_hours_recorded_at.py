@@ -0,0 +1,70 @@
+"""add equipment operating hours recorded at
+
+Revision ID: e6b04f2d9a71
+Revises: d81f3a6c5e27
+Create Date: 2026-01-13 09:00:00.000000
+
+Agrega equipment.operating_hours_recorded_at: cuándo se registró la última
+lectura de horas (total_operating_hours / hours_since_last_overhaul). Lo
+mantiene el trigger trg_equipment_operating_hours_recorded_at sólo cuando
+cambian las horas; updated_at cambia con cualquier edición y no sirve como
+ancla de la proyección de horas del scheduler de mantenimiento
+(app/services/maintenance_scheduler.py). Los equipos existentes toman su
+updated_at como lectura inicial.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e6b04f2d9a71'
+down_revision = 'd81f3a6c5e27'
+branch_labels = None
+depends_on = None
+
+
+SET_HOURS_RECORDED_AT_FUNCTION = """
+CREATE OR REPLACE FUNCTION equipment_set_operating_hours_recorded_at()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    NEW.operating_hours_recorded_at := now();
+    RETURN NEW;
+END;
+$$;
+"""
+
+SET_HOURS_RECORDED_AT_TRIGGER = """
+CREATE TRIGGER trg_equipment_operating_hours_recorded_at
+BEFORE UPDATE OF total_operating_hours, hours_since_last_overhaul ON equipment
+FOR EACH ROW
+WHEN (
+    NEW.total_operating_hours IS DISTINCT FROM OLD.total_operating_hours
+    OR NEW.hours_since_last_overhaul IS DISTINCT FROM OLD.hours_since_last_overhaul
+)
+EXECUTE FUNCTION equipment_set_operating_hours_recorded_at();
+"""
+
+
+def upgrade() -> None:
+    op.add_column(
+        'equipment',
+        sa.Column('operating_hours_recorded_at', sa.DateTime(timezone=True), nullable=True),
+    )
+    op.execute("UPDATE equipment SET operating_hours_recorded_at = updated_at")
+    op.alter_column(
+        'equipment',
+        'operating_hours_recorded_at',
+        nullable=False,
+        server_default=sa.text('now()'),
+    )
+    op.execute(SET_HOURS_RECORDED_AT_FUNCTION)
+    op.execute(SET_HOURS_RECORDED_AT_TRIGGER)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_equipment_operating_hours_recorded_at ON equipment")
+    op.execute("DROP FUNCTION IF EXISTS equipment_set_operating_hours_recorded_at()")
+    op.drop_column('equipment', 'operating_hours_recorded_at')
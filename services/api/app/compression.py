@@ -0,0 +1,138 @@
+"""
+Response Compression
+
+Middleware ASGI que comprime respuestas con brotli (si está instalado) o gzip
+según Accept-Encoding, a partir de HTTP_COMPRESSION_MIN_SIZE bytes.
+
+- Sólo se comprimen respuestas completas (un solo mensaje http.response.body):
+  los streams (exportaciones) pasan tal cual y deciden su propia codificación
+- No se tocan respuestas que ya traen Content-Encoding (exportaciones .gz)
+- Sólo tipos de texto (JSON, NDJSON, CSV, HTML, ...)
+
+brotli es opcional: pip install brotli (comprime ~15-20% más que gzip en JSON).
+"""
+
+import gzip
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+from app.metrics import HTTP_COMPRESSION_BYTES_TOTAL
+
+try:
+    import brotli
+except ImportError:  # Dependencia opcional
+    brotli = None
+
+
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+)
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Codificación a usar según Accept-Encoding ("br", "gzip" o None)
+
+    Respeta q=0 y el comodín "*"; a igual q prefiere br sobre gzip.
+    """
+    weights: dict[str, float] = {}
+    for item in accept_encoding.lower().split(","):
+        name, _, params = item.strip().partition(";")
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name.strip()] = q
+
+    available = ("br", "gzip") if brotli is not None else ("gzip",)
+    wildcard = weights.get("*", 0.0)
+    best, best_q = None, 0.0
+    for encoding in available:
+        q = weights.get(encoding, wildcard)
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def add_vary_accept_encoding(headers: MutableHeaders) -> None:
+    vary = headers.get("vary", "")
+    if "accept-encoding" not in vary.lower():
+        headers.add_vary_header("Accept-Encoding")
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=settings.HTTP_COMPRESSION_BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=settings.HTTP_COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+class CompressionMiddleware:
+    """Compresión gzip/brotli de respuestas completas (ver docstring del módulo)"""
+
+    def __init__(self, app: ASGIApp, minimum_size: Optional[int] = None):
+        self.app = app
+        self.minimum_size = settings.HTTP_COMPRESSION_MIN_SIZE if minimum_size is None else minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Optional[Message] = None
+        passthrough = False
+
+        async def send_wrapper(message: Message):
+            nonlocal start_message, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                start_message = message  # Se envía con el primer chunk del body
+                return
+            if message["type"] != "http.response.body" or start_message is None:
+                await send(message)
+                return
+
+            headers = MutableHeaders(raw=start_message["headers"])
+            body = message.get("body", b"")
+            if (
+                message.get("more_body", False)
+                or "content-encoding" in headers
+                or start_message["status"] < 200
+                or start_message["status"] in (204, 304)
+                or len(body) < self.minimum_size
+                or not headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES)
+            ):
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+
+            compressed = compress(body, encoding)
+            HTTP_COMPRESSION_BYTES_TOTAL.labels(encoding, "original").inc(len(body))
+            HTTP_COMPRESSION_BYTES_TOTAL.labels(encoding, "compressed").inc(len(compressed))
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+            add_vary_accept_encoding(headers)
+            await send(start_message)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_wrapper)
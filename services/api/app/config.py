@@ -29,6 +29,49 @@ class Settings:
     DB_MIN_POOL_SIZE: int = int(os.getenv("POSTGRES_MIN_POOL_SIZE", "5"))
     DB_MAX_POOL_SIZE: int = int(os.getenv("POSTGRES_MAX_POOL_SIZE", "20"))
     DB_POOL_TIMEOUT: int = int(os.getenv("POSTGRES_POOL_TIMEOUT", "30"))
+    DB_APPLICATION_NAME: str = os.getenv("POSTGRES_APPLICATION_NAME", "mlp-api")
+
+    # Read Replicas: URLs separadas por coma (vacío = todo va al primario)
+    DATABASE_REPLICA_URLS: List[str] = [
+        url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()
+    ]
+    DB_REPLICA_MAX_LAG_SECONDS: float = float(os.getenv("DB_REPLICA_MAX_LAG_SECONDS", "5"))
+    DB_REPLICA_MAX_LAG_BYTES: int = int(os.getenv("DB_REPLICA_MAX_LAG_BYTES", str(16 * 1024 * 1024)))
+    DB_REPLICA_LAG_CHECK_SECONDS: float = float(os.getenv("DB_REPLICA_LAG_CHECK_SECONDS", "2"))
+
+    # Adaptive Pool (app/pool_manager.py)
+    API_WORKERS: int = int(os.getenv("API_WORKERS", "1"))  # Para dimensionar workers × pool
+    DB_POOL_ADAPTIVE: bool = os.getenv("DB_POOL_ADAPTIVE", "true").lower() == "true"
+    DB_POOL_WARM_SIZE: int = int(os.getenv("DB_POOL_WARM_SIZE", os.getenv("POSTGRES_MIN_POOL_SIZE", "5")))
+    DB_POOL_IDLE_LIFETIME_SECONDS: float = float(os.getenv("DB_POOL_IDLE_LIFETIME_SECONDS", "60"))
+    DB_POOL_ADJUST_INTERVAL_SECONDS: float = float(os.getenv("DB_POOL_ADJUST_INTERVAL_SECONDS", "5"))
+    DB_POOL_GROW_WAIT_MS: float = float(os.getenv("DB_POOL_GROW_WAIT_MS", "5"))
+    DB_POOL_SHRINK_WAIT_MS: float = float(os.getenv("DB_POOL_SHRINK_WAIT_MS", "0.5"))
+    DB_POOL_SHRINK_AFTER_INTERVALS: int = int(os.getenv("DB_POOL_SHRINK_AFTER_INTERVALS", "6"))
+    DB_POOL_SERVER_STATS_SECONDS: float = float(os.getenv("DB_POOL_SERVER_STATS_SECONDS", "30"))
+
+    # Caché de prepared statements por conexión (app/prepared_statements.py); 0 = desactivado
+    DB_STATEMENT_CACHE_SIZE: int = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "100"))
+
+    # Perfiles numéricos (app/numeric_profiles.py): analytics castea NUMERIC a float8,
+    # salvo las columnas financieras (esta lista o terminadas en _cost/_price)
+    DB_NUMERIC_ANALYTICS: bool = os.getenv("DB_NUMERIC_ANALYTICS", "true").lower() == "true"
+    DB_FINANCIAL_NUMERIC_COLUMNS: List[str] = [
+        column.strip()
+        for column in os.getenv("DB_FINANCIAL_NUMERIC_COLUMNS", "acquisition_cost,unit_cost").split(",")
+        if column.strip()
+    ]
+
+    # Block Value Service (valorización económica de bloques)
+    BLOCK_VALUE_CACHE_SIZE: int = int(os.getenv("BLOCK_VALUE_CACHE_SIZE", "16"))
+    BLOCK_VALUE_WORKERS: int = int(os.getenv("BLOCK_VALUE_WORKERS", "0")) or (os.cpu_count() or 1)
+    BLOCK_VALUE_PARALLEL_MIN_SCENARIOS: int = int(os.getenv("BLOCK_VALUE_PARALLEL_MIN_SCENARIOS", "4"))
+
+    # Spatial Index (coordinates)
+    SPATIAL_UTM_ZONE: str = os.getenv("SPATIAL_UTM_ZONE", "19S")  # Zona de proyección común
+    SPATIAL_INDEX_REFRESH_SECONDS: float = float(os.getenv("SPATIAL_INDEX_REFRESH_SECONDS", "5"))
+    SPATIAL_INDEX_MAX_AGE_SECONDS: float = float(os.getenv("SPATIAL_INDEX_MAX_AGE_SECONDS", "600"))
+    SPATIAL_INDEX_REBUILD_RATIO: float = float(os.getenv("SPATIAL_INDEX_REBUILD_RATIO", "0.1"))
 
     # CORS
     CORS_ORIGINS: List[str] = [
@@ -43,9 +86,51 @@ class Settings:
     ALGORITHM: str = os.getenv("API_ALGORITHM", "HS256")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("API_ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
 
+    # Streaming Exports (app/services/export.py)
+    EXPORT_BATCH_SIZE: int = int(os.getenv("EXPORT_BATCH_SIZE", "5000"))
+    EXPORT_MAX_CONCURRENT: int = int(os.getenv("EXPORT_MAX_CONCURRENT", "2"))  # Por worker
+
+    # Responses (app/responses.py): validar fast_json() contra el response_model
+    FAST_JSON_VALIDATE: bool = os.getenv("FAST_JSON_VALIDATE", "false").lower() == "true"
+
+    # Reference Data Cache (app/services/reference_cache.py): poll de respaldo a NOTIFY
+    REFERENCE_CACHE_ENABLED: bool = os.getenv("REFERENCE_CACHE_ENABLED", "true").lower() == "true"
+    REFERENCE_CACHE_POLL_SECONDS: float = float(os.getenv("REFERENCE_CACHE_POLL_SECONDS", "30"))
+
+    # Tableros de la flota (app/services/fleet_status.py): snapshot por versión y antigüedad
+    FLEET_SNAPSHOT_MAX_AGE_SECONDS: float = float(os.getenv("FLEET_SNAPSHOT_MAX_AGE_SECONDS", "60"))
+    FLEET_OVERDUE_LIMIT: int = int(os.getenv("FLEET_OVERDUE_LIMIT", "500"))
+    FLEET_LEADERBOARD_SIZE: int = int(os.getenv("FLEET_LEADERBOARD_SIZE", "20"))
+
+    # Scheduler de mantenimiento (app/services/maintenance_scheduler.py)
+    MAINTENANCE_SCHEDULER_ENABLED: bool = os.getenv("MAINTENANCE_SCHEDULER_ENABLED", "false").lower() == "true"
+    MAINTENANCE_SCHEDULER_INTERVAL_SECONDS: float = float(os.getenv("MAINTENANCE_SCHEDULER_INTERVAL_SECONDS", "300"))
+    MAINTENANCE_OVERHAUL_INTERVAL_HOURS: float = float(os.getenv("MAINTENANCE_OVERHAUL_INTERVAL_HOURS", "10000"))
+    MAINTENANCE_DAILY_OPERATING_HOURS: float = float(os.getenv("MAINTENANCE_DAILY_OPERATING_HOURS", "20"))
+    MAINTENANCE_WORK_ORDER_LEAD_HOURS: float = float(os.getenv("MAINTENANCE_WORK_ORDER_LEAD_HOURS", "24"))
+    MAINTENANCE_CRITICAL_OVERDUE_HOURS: float = float(os.getenv("MAINTENANCE_CRITICAL_OVERDUE_HOURS", "72"))
+
+    # HTTP Compression (app/compression.py); brotli sólo si está instalado
+    HTTP_COMPRESSION_ENABLED: bool = os.getenv("HTTP_COMPRESSION_ENABLED", "true").lower() == "true"
+    HTTP_COMPRESSION_MIN_SIZE: int = int(os.getenv("HTTP_COMPRESSION_MIN_SIZE", "1024"))  # Bytes
+    HTTP_COMPRESSION_GZIP_LEVEL: int = int(os.getenv("HTTP_COMPRESSION_GZIP_LEVEL", "6"))
+    HTTP_COMPRESSION_BROTLI_QUALITY: int = int(os.getenv("HTTP_COMPRESSION_BROTLI_QUALITY", "4"))
+
     # Logging
     LOG_LEVEL: str = os.getenv("API_LOG_LEVEL", "INFO")
 
+    # Query Profiling (app/query_profiler.py)
+    SLOW_QUERY_THRESHOLD_MS: float = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "200"))
+    SLOW_QUERY_LOG_SIZE: int = int(os.getenv("SLOW_QUERY_LOG_SIZE", "100"))
+    SLOW_QUERY_EXPLAIN: bool = os.getenv("SLOW_QUERY_EXPLAIN", "true").lower() == "true"
+    SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS: float = float(os.getenv("SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS", "60"))
+
+    # Admin endpoints (/v1/admin/*): habilitados por defecto fuera de producción
+    ADMIN_ENDPOINTS_ENABLED: bool = os.getenv(
+        "ADMIN_ENDPOINTS_ENABLED",
+        "false" if os.getenv("ENVIRONMENT", "development") == "production" else "true",
+    ).lower() == "true"
+
     def get_db_url_asyncpg(self) -> str:
         """
         Get database URL for asyncpg
@@ -2,50 +2,465 @@
 Database Connection Module
 Manages PostgreSQL connection pool using asyncpg
 """
+import asyncio
+import random
+import time
 import asyncpg
-from typing import Optional
+import orjson
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import List, Optional
+from starlette.types import ASGIApp, Receive, Scope, Send
 from app.config import settings
+from app.metrics import (
+    DB_POOL_ACQUIRE_SECONDS,
+    DB_QUERIES_ROUTED_TOTAL,
+    DB_REPLICA_AVAILABLE,
+    DB_REPLICA_LAG_BYTES,
+    DB_REPLICA_LAG_SECONDS,
+    update_pool_stats,
+)
+from app.numeric_profiles import load_numeric_schema, numeric_schema_loaded
+from app.pool_manager import PoolManager, pool_manager
+from app.prepared_statements import statement_cache_size
+from app.query_profiler import record_acquire_wait, slow_query_log
 
-# Global connection pool
-_pool: Optional[asyncpg.Pool] = None
 
+class _InstrumentedAcquire:
+    """
+    Context manager de acquire que pasa por el límite adaptativo,
+    mide la espera y actualiza los gauges del pool
+    """
+
+    __slots__ = ("_pool", "_timeout", "_conn")
+
+    def __init__(self, pool: "InstrumentedPool", timeout: Optional[float]):
+        self._pool = pool
+        self._timeout = timeout
+        self._conn = None
+
+    async def __aenter__(self) -> asyncpg.Connection:
+        pool = self._pool
+        timeout = self._timeout if self._timeout is not None else settings.DB_POOL_TIMEOUT
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(pool.manager.acquire_slot(), timeout)
+            try:
+                self._conn = await pool.pool.acquire(timeout=max(0.0, timeout - (time.perf_counter() - start)))
+            except BaseException:
+                pool.manager.release_slot()
+                raise
+        finally:
+            wait = time.perf_counter() - start
+            DB_POOL_ACQUIRE_SECONDS.observe(wait)
+            record_acquire_wait(wait)
+            pool.manager.record_wait(wait)
+            pool.update_stats()
+        return self._conn
+
+    async def __aexit__(self, *exc):
+        conn, self._conn = self._conn, None
+        await self._pool.release(conn)
 
-async def get_db_pool() -> asyncpg.Pool:
+    def __await__(self):
+        # Permite `conn = await pool.acquire()` (liberar luego con pool.release(conn))
+        return self.__aenter__().__await__()
+
+
+class InstrumentedPool:
     """
-    Get or create database connection pool
-    This function is used as a FastAPI dependency
+    Proxy de asyncpg.Pool con límite adaptativo y métricas de acquire
+    (ver app/pool_manager.py y app/metrics.py)
+
+    Expone la misma interfaz que asyncpg.Pool: acquire() como context manager
+    y los atajos execute/fetch/fetchrow/fetchval pasan por el acquire medido;
+    el resto de los atributos se delega al pool real.
     """
-    global _pool
 
-    if _pool is None:
+    def __init__(self, pool: asyncpg.Pool, manager: PoolManager):
+        self.pool = pool
+        self.manager = manager
+
+    @property
+    def waiters(self) -> int:
+        return self.manager.limiter.waiting
+
+    def update_stats(self) -> None:
+        if not self.manager.publish_metrics:
+            return
+        limiter = self.manager.limiter
+        update_pool_stats(self.pool, limiter.waiting, limiter.in_use, limiter.limit)
+
+    def acquire(self, *, timeout: Optional[float] = None) -> _InstrumentedAcquire:
+        return _InstrumentedAcquire(self, timeout)
+
+    async def release(self, connection: asyncpg.Connection, *, timeout: Optional[float] = None):
+        try:
+            await self.pool.release(connection, timeout=timeout)
+        finally:
+            self.manager.release_slot()
+            self.update_stats()
+
+    async def execute(self, query: str, *args, timeout: Optional[float] = None) -> str:
+        async with self.acquire() as conn:
+            return await conn.execute(query, *args, timeout=timeout)
+
+    async def executemany(self, command: str, args, *, timeout: Optional[float] = None):
+        async with self.acquire() as conn:
+            return await conn.executemany(command, args, timeout=timeout)
+
+    async def fetch(self, query: str, *args, timeout: Optional[float] = None) -> list:
+        async with self.acquire() as conn:
+            return await conn.fetch(query, *args, timeout=timeout)
+
+    async def fetchrow(self, query: str, *args, timeout: Optional[float] = None):
+        async with self.acquire() as conn:
+            return await conn.fetchrow(query, *args, timeout=timeout)
+
+    async def fetchval(self, query: str, *args, column: int = 0, timeout: Optional[float] = None):
+        async with self.acquire() as conn:
+            return await conn.fetchval(query, *args, column=column, timeout=timeout)
+
+    def __getattr__(self, name: str):
+        return getattr(self.pool, name)
+
+
+async def _init_connection(conn: asyncpg.Connection):
+    """Inicializar cada conexión nueva del pool"""
+    # json/jsonb <-> objetos Python con orjson (por defecto asyncpg usa texto)
+    for typename in ("json", "jsonb"):
+        await conn.set_type_codec(
+            typename,
+            schema="pg_catalog",
+            encoder=lambda value: orjson.dumps(value).decode(),
+            decoder=orjson.loads,
+        )
+    # Sentencias lentas -> ring buffer con EXPLAIN (app/query_profiler.py)
+    conn.add_query_logger(slow_query_log.on_query)
+    # Columnas NUMERIC del esquema, una vez por proceso (app/numeric_profiles.py)
+    if not numeric_schema_loaded():
+        await load_numeric_schema(conn)
+
+
+async def _create_pool(dsn: str, manager: PoolManager) -> InstrumentedPool:
+    pool = await asyncpg.create_pool(
+        dsn=dsn,
+        min_size=manager.min_size,
+        max_size=manager.max_size,
+        timeout=settings.DB_POOL_TIMEOUT,
+        command_timeout=60,
+        max_queries=50000,
+        statement_cache_size=statement_cache_size(),
+        max_inactive_connection_lifetime=settings.DB_POOL_IDLE_LIFETIME_SECONDS,
+        server_settings={"application_name": settings.DB_APPLICATION_NAME},
+        init=_init_connection,
+    )
+    await manager.warm(pool, settings.DB_POOL_WARM_SIZE)
+    await manager.refresh_server_stats(pool)
+    manager.start(pool)
+    return InstrumentedPool(pool, manager)
+
+
+# =============================================================================
+# READ REPLICAS
+# =============================================================================
+
+class _RequestRouting:
+    """Estado de enrutamiento de un request (ver ReadYourWritesMiddleware)"""
+
+    __slots__ = ("wrote", "replica")
+
+    def __init__(self):
+        self.wrote = False
+        self.replica: Optional["Replica"] = None
+
+
+_routing: ContextVar[Optional[_RequestRouting]] = ContextVar("db_request_routing", default=None)
+
+
+def _current_routing() -> _RequestRouting:
+    state = _routing.get()
+    if state is None:
+        state = _RequestRouting()
+        _routing.set(state)
+    return state
+
+
+class ReadYourWritesMiddleware:
+    """
+    Middleware ASGI que abre un estado de enrutamiento por request:
+    tras una escritura, las lecturas del mismo request van al primario,
+    y las lecturas anteriores usan siempre la misma réplica (lecturas monótonas)
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = _routing.set(_RequestRouting())
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _routing.reset(token)
+
+
+class Replica:
+    """Pool de una réplica de lectura y su último retraso observado"""
+
+    LAG_SQL = """
+        SELECT
+            pg_is_in_recovery() AS in_recovery,
+            CASE
+                WHEN NOT pg_is_in_recovery() THEN 0
+                WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+                ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+            END::float8 AS lag_seconds,
+            CASE
+                WHEN pg_is_in_recovery() THEN pg_wal_lsn_diff($1::pg_lsn, pg_last_wal_replay_lsn())
+                ELSE 0
+            END::float8 AS lag_bytes
+    """
+
+    def __init__(self, name: str, pool: InstrumentedPool):
+        self.name = name
+        self.pool = pool
+        self.healthy = False
+        self.lag_seconds: Optional[float] = None
+        self.lag_bytes: Optional[float] = None
+        self.error: Optional[str] = None
+        self.checked_at: Optional[datetime] = None
+
+    @property
+    def available(self) -> bool:
+        return (
+            self.healthy
+            and self.lag_seconds is not None
+            and self.lag_seconds <= settings.DB_REPLICA_MAX_LAG_SECONDS
+            and self.lag_bytes <= settings.DB_REPLICA_MAX_LAG_BYTES
+        )
+
+    async def check(self, primary_lsn: Optional[str]) -> None:
+        try:
+            row = await self.pool.pool.fetchrow(self.LAG_SQL, primary_lsn, timeout=2)
+            self.healthy = row["in_recovery"]
+            self.lag_seconds = row["lag_seconds"]
+            self.lag_bytes = max(0.0, row["lag_bytes"] or 0.0)
+            self.error = None if self.healthy else "not in recovery (promoted?)"
+        except Exception as e:
+            self.healthy = False
+            self.error = repr(e)
+        self.checked_at = datetime.now(timezone.utc)
+        if self.lag_seconds is not None:
+            DB_REPLICA_LAG_SECONDS.labels(self.name).set(self.lag_seconds)
+            DB_REPLICA_LAG_BYTES.labels(self.name).set(self.lag_bytes)
+        DB_REPLICA_AVAILABLE.labels(self.name).set(int(self.available))
+
+    def snapshot(self) -> dict:
+        return {
+            "name": self.name,
+            "available": self.available,
+            "healthy": self.healthy,
+            "lag_seconds": self.lag_seconds,
+            "lag_bytes": self.lag_bytes,
+            "error": self.error,
+            "checked_at": self.checked_at.isoformat() if self.checked_at else None,
+            "pool": self.pool.manager.snapshot(self.pool.pool),
+        }
+
+
+class ReplicaSet:
+    """
+    Réplicas de lectura con selección según retraso y carga
+
+    El retraso de cada réplica se mide cada DB_REPLICA_LAG_CHECK_SECONDS
+    (segundos desde la última transacción aplicada y bytes de WAL pendientes
+    respecto del primario). Una réplica recibe lecturas sólo si está dentro de
+    DB_REPLICA_MAX_LAG_SECONDS y DB_REPLICA_MAX_LAG_BYTES; entre las
+    disponibles se elige la de menor uso de su pool.
+    """
+
+    def __init__(self, primary: InstrumentedPool, replicas: List[Replica]):
+        self.primary = primary
+        self.replicas = replicas
+        self._task: Optional[asyncio.Task] = None
+
+    def choose(self) -> Optional[Replica]:
+        candidates = [replica for replica in self.replicas if replica.available]
+        if not candidates:
+            return None
+
+        def load(replica: Replica) -> tuple:
+            limiter = replica.pool.manager.limiter
+            return (limiter.in_use + limiter.waiting) / limiter.limit, random.random()
+
+        return min(candidates, key=load)
+
+    async def check(self) -> None:
+        try:
+            primary_lsn = await self.primary.pool.fetchval("SELECT pg_current_wal_lsn()::text", timeout=2)
+        except Exception:
+            primary_lsn = None
+        await asyncio.gather(*(replica.check(primary_lsn) for replica in self.replicas))
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(settings.DB_REPLICA_LAG_CHECK_SECONDS)
+            await self.check()
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for replica in self.replicas:
+            await replica.pool.manager.stop()
+            await replica.pool.close()
+
+    def snapshot(self) -> List[dict]:
+        return [replica.snapshot() for replica in self.replicas]
+
+
+def route_pool(pool, kind: str):
+    """
+    Pool que debe usar una función de app/queries (llamado por la instrumentación)
+
+    `kind`: 'read', 'primary_read' o 'write'. Sólo se re-enruta el pool primario:
+    lecturas a una réplica disponible (la misma durante todo el request),
+    escrituras y lecturas marcadas al primario. Después de una escritura,
+    el resto del request lee del primario (read-your-writes).
+    """
+    if _replicas is None or pool is not _pool:
+        return pool
+
+    state = _current_routing()
+    if kind != "read":
+        if kind == "write":
+            state.wrote = True
+        DB_QUERIES_ROUTED_TOTAL.labels("primary").inc()
+        return pool
+    if state.wrote:
+        DB_QUERIES_ROUTED_TOTAL.labels("primary_sticky").inc()
+        return pool
+
+    replica = state.replica
+    if replica is None or not replica.available:
+        replica = state.replica = _replicas.choose()
+    if replica is None:
+        DB_QUERIES_ROUTED_TOTAL.labels("primary_fallback").inc()
+        return pool
+    DB_QUERIES_ROUTED_TOTAL.labels("replica").inc()
+    return replica.pool
+
+
+def get_replica_set() -> Optional[ReplicaSet]:
+    """Réplicas configuradas (None si DATABASE_REPLICA_URLS está vacío)"""
+    return _replicas
+
+
+# =============================================================================
+# POOL LIFECYCLE
+# =============================================================================
+
+# Global connection pools
+_pool: Optional[InstrumentedPool] = None
+_replicas: Optional[ReplicaSet] = None
+_pool_lock = asyncio.Lock()
+
+
+async def init_db_pool() -> InstrumentedPool:
+    """
+    Create the connection pools (primary + read replicas) and warm them up
+    Called on application startup, so the first request doesn't pay the connect cost
+    """
+    global _pool, _replicas
+
+    async with _pool_lock:
+        if _pool is not None:
+            return _pool
+
         print("📦 Creating database connection pool...")
         try:
-            _pool = await asyncpg.create_pool(
-                dsn=settings.get_db_url_asyncpg(),
-                min_size=settings.DB_MIN_POOL_SIZE,
-                max_size=settings.DB_MAX_POOL_SIZE,
-                timeout=settings.DB_POOL_TIMEOUT,
-                command_timeout=60,
-                max_queries=50000,
-                max_inactive_connection_lifetime=300,
-            )
-            print(f"✅ Database pool created (min={settings.DB_MIN_POOL_SIZE}, max={settings.DB_MAX_POOL_SIZE})")
+            primary = await _create_pool(settings.get_db_url_asyncpg(), pool_manager)
         except Exception as e:
             print(f"❌ Failed to create database pool: {e}")
             raise
+        slow_query_log.attach(primary.pool)
+        primary.update_stats()
+        print(
+            f"✅ Database pool created (min={settings.DB_MIN_POOL_SIZE}, max={settings.DB_MAX_POOL_SIZE}, "
+            f"limit={pool_manager.limiter.limit}, open={primary.pool.get_size()})"
+        )
+
+        server = pool_manager.server
+        if server:
+            available = server["max_connections"] - server["reserved_connections"]
+            budget = settings.API_WORKERS * settings.DB_MAX_POOL_SIZE
+            if budget > available:
+                print(
+                    f"⚠️  API_WORKERS × POSTGRES_MAX_POOL_SIZE = {budget} supera las "
+                    f"{available} conexiones disponibles en Postgres (max_connections)"
+                )
+
+        replicas = []
+        for index, url in enumerate(settings.DATABASE_REPLICA_URLS):
+            name = f"replica-{index}"
+            try:
+                pool = await _create_pool(
+                    url.replace("postgresql+asyncpg://", "postgresql://"),
+                    PoolManager(name=name),
+                )
+            except Exception as e:
+                # Sin la réplica, sus lecturas van al primario
+                print(f"⚠️  Read replica {name} unavailable: {e}")
+                continue
+            replicas.append(Replica(name, pool))
+            print(f"✅ Read replica pool created ({name})")
+
+        if replicas:
+            _replicas = ReplicaSet(primary, replicas)
+            await _replicas.check()
+            _replicas.start()
+
+        _pool = primary
+        return _pool
+
 
+async def get_db_pool() -> InstrumentedPool:
+    """
+    Get database connection pool (primary)
+    This function is used as a FastAPI dependency.
+    Read-only query functions are routed to replicas by app/queries (see route_pool).
+    The pool is created on startup; created here only if startup couldn't reach the database.
+    """
+    if _pool is None:
+        return await init_db_pool()
     return _pool
 
 
 async def close_db_pool():
     """
-    Close database connection pool
+    Close database connection pools
     Called on application shutdown
     """
-    global _pool
+    global _pool, _replicas
+
+    if _replicas is not None:
+        await _replicas.close()
+        _replicas = None
 
     if _pool is not None:
         print("📦 Closing database connection pool...")
+        await pool_manager.stop()
         await _pool.close()
         _pool = None
         print("✅ Database pool closed")
@@ -117,3 +532,31 @@ async def fetch_val(query: str, *args):
     async with pool.acquire() as conn:
         result = await conn.fetchval(query, *args)
         return result
+
+
+async def gather_queries(*calls):
+    """
+    Run independent app/queries calls concurrently
+
+    Each call acquires its own pool connection, so the latency is that of the
+    slowest one instead of the sum (e.g. a list page and its count). If one
+    fails, the others are cancelled. Inside a unit of work they share its
+    connection and run one after another.
+
+    Example:
+        rows, total = await gather_queries(
+            users.get_all_users(pool, limit, offset),
+            users.count_users(pool),
+        )
+
+    Returns:
+        Results in the same order as the calls
+    """
+    tasks = [asyncio.ensure_future(call) for call in calls]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
@@ -0,0 +1,181 @@
+"""
+Request-Scoped DataLoaders
+
+Agrupa los lookups por id de un request en queries por lote: las llamadas a
+load() hechas en la misma vuelta del event loop (p. ej. al resolver las
+referencias de cada fila de una página con asyncio.gather) se despachan juntas
+a una función get_X_by_ids (`id = ANY($1::uuid[])`, ver
+scripts/generate_code.py) en vez de una query por fila (N+1):
+
+    types = get_loader(equipment_types.get_equipment_types_by_ids, pool)
+    mines = get_loader(mines.get_mines_by_ids, pool, projection="ref")
+    rows = await equipment.get_equipment_page(pool, limit=50)
+    resolved = await asyncio.gather(*(
+        asyncio.gather(types.load(row["equipment_type_id"]), mines.load(row["mine_id"]))
+        for row in rows
+    ))
+    # 1 query de página + 1 de tipos + 1 de minas
+
+Cada request tiene sus propios loaders (DataLoaderMiddleware): el mismo id
+pedido dos veces en el request se resuelve una sola vez, y nada queda
+cacheado entre requests (sin datos obsoletos ni crecimiento de memoria).
+Fuera de un request (scripts, tareas en segundo plano) get_loader retorna un
+loader desechable: agrupa los load() hechos sobre él y no se guarda.
+
+Métricas: lookups por loader (batched / cached) e ids por lote.
+"""
+
+import asyncio
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Generic, Hashable, Iterable, List, Mapping, Optional, TypeVar
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.metrics import DATALOADER_BATCH_KEYS, DATALOADER_LOADS_TOTAL
+
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+# Ids por query: acota el tamaño del array y del resultado de cada lote
+DEFAULT_MAX_BATCH_SIZE = 500
+
+
+class DataLoader(Generic[K, V]):
+    """
+    Coalesce lookups individuales en llamadas por lote a `batch_load`
+
+    `batch_load(keys)` recibe ids distintos y retorna un mapa id -> valor;
+    los ids ausentes del mapa se resuelven como None.
+    """
+
+    def __init__(
+        self,
+        batch_load: Callable[[List[K]], Awaitable[Mapping[K, V]]],
+        name: str = "loader",
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+    ):
+        self.batch_load = batch_load
+        self.name = name
+        self.max_batch_size = max_batch_size
+        self._futures: Dict[K, asyncio.Future] = {}
+        self._pending: List[K] = []
+        self._tasks: set[asyncio.Task] = set()
+        self._batched = DATALOADER_LOADS_TOTAL.labels(name, "batched")
+        self._cached = DATALOADER_LOADS_TOTAL.labels(name, "cached")
+        self._batch_keys = DATALOADER_BATCH_KEYS.labels(name)
+
+    async def load(self, key: K) -> Optional[V]:
+        """Valor de `key` (None si no existe); se resuelve en el próximo lote"""
+        future = self._futures.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._futures[key] = loop.create_future()
+            if not self._pending:
+                # Despachar cuando las tareas listas de esta vuelta hayan pedido sus ids
+                loop.call_soon(self._dispatch)
+            self._pending.append(key)
+            self._batched.inc()
+        else:
+            self._cached.inc()
+        # shield: cancelar a quien espera no cancela el resultado compartido
+        return await asyncio.shield(future)
+
+    async def load_many(self, keys: Iterable[K]) -> List[Optional[V]]:
+        """Valores de `keys` en el mismo orden (un solo lote)"""
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    def prime(self, key: K, value: V) -> None:
+        """Registrar un valor ya conocido (p. ej. recién creado) sin consultarlo"""
+        if key not in self._futures:
+            future = asyncio.get_running_loop().create_future()
+            future.set_result(value)
+            self._futures[key] = future
+
+    def clear(self, key: K) -> None:
+        """Olvidar `key` (p. ej. tras actualizar la fila en el mismo request)"""
+        future = self._futures.get(key)
+        if future is not None and future.done():
+            del self._futures[key]
+
+    def _dispatch(self) -> None:
+        keys, self._pending = self._pending, []
+        for start in range(0, len(keys), self.max_batch_size):
+            task = asyncio.ensure_future(self._load_batch(keys[start:start + self.max_batch_size]))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _load_batch(self, keys: List[K]) -> None:
+        self._batch_keys.observe(len(keys))
+        try:
+            values = await self.batch_load(keys)
+        except asyncio.CancelledError:
+            for key in keys:
+                future = self._futures.pop(key, None)
+                if future is not None:
+                    future.cancel()
+            raise
+        except Exception as e:
+            # Los errores no se cachean: un load() posterior vuelve a consultar
+            for key in keys:
+                future = self._futures.pop(key, None)
+                if future is not None and not future.done():
+                    future.set_exception(e)
+                    future.exception()  # marcado como recuperado aunque nadie espere
+            return
+        for key in keys:
+            future = self._futures.get(key)
+            if future is not None and not future.done():
+                future.set_result(values.get(key))
+
+
+# =============================================================================
+# ALCANCE POR REQUEST
+# =============================================================================
+
+_loaders: ContextVar[Optional[Dict[Any, DataLoader]]] = ContextVar("request_dataloaders", default=None)
+
+
+def get_loader(
+    batch_load: Callable[..., Awaitable[Mapping[Any, Any]]],
+    *args: Any,
+    max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+    **kwargs: Any,
+) -> DataLoader:
+    """
+    DataLoader del request para `batch_load(*args, keys, **kwargs)`
+
+    Típicamente una función get_X_by_ids de app/queries con su pool:
+    get_loader(users.get_users_by_ids, pool). Las llamadas con la misma
+    función y argumentos comparten loader (lotes y caché) dentro del request.
+    Sin request activo el loader no se comparte ni se guarda.
+    """
+    loaders = _loaders.get()
+    key = (batch_load, args, tuple(sorted(kwargs.items())))
+    loader = loaders.get(key) if loaders is not None else None
+    if loader is None:
+        async def load_batch(keys: List[Any]) -> Mapping[Any, Any]:
+            return await batch_load(*args, keys, **kwargs)
+
+        name = getattr(batch_load, "__name__", "loader")
+        loader = DataLoader(load_batch, name=name, max_batch_size=max_batch_size)
+        if loaders is not None:
+            loaders[key] = loader
+    return loader
+
+
+class DataLoaderMiddleware:
+    """Middleware ASGI que abre un conjunto de DataLoaders vacío por request"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = _loaders.set({})
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _loaders.reset(token)
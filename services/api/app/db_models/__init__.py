@@ -45,6 +45,7 @@ from .deposit import Deposit
 from .mine import Mine
 from .mine_phase import MinePhase
 from .block import Block
+from .phase_block_aggregate import PhaseBlockAggregate
 from .coordinate import Coordinate
 from .mineralogy import Mineralogy
 
@@ -54,12 +55,19 @@ from .mineralogy import Mineralogy
 from .equipment_type import EquipmentType
 from .equipment import Equipment
 from .operator import Operator
+from .maintenance_work_order import MaintenanceWorkOrder
 
 # ============================================================================
 # Capa 1: Entidades Maestras - Proceso
 # ============================================================================
 from .reagent import Reagent
 from .process_area import ProcessArea
+from .process_area_closure import ProcessAreaClosure
+
+# ============================================================================
+# Versionado de datos de referencia (ETag / caché)
+# ============================================================================
+from .table_version import TableVersion
 
 # Metadata para Alembic
 metadata = Base.metadata
@@ -92,13 +100,18 @@ __all__ = [
     "Mine",
     "MinePhase",
     "Block",
+    "PhaseBlockAggregate",
     "Coordinate",
     "Mineralogy",
     # Entidades Maestras - Equipos
     "EquipmentType",
     "Equipment",
     "Operator",
+    "MaintenanceWorkOrder",
     # Entidades Maestras - Proceso
     "Reagent",
     "ProcessArea",
+    "ProcessAreaClosure",
+    # Versionado
+    "TableVersion",
 ]
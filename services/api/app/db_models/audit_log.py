@@ -18,6 +18,7 @@ from sqlalchemy import (
     DateTime,
     ForeignKey,
     Index,
+    Computed,
     Enum as SQLEnum,
 )
 from sqlalchemy.dialects.postgresql import UUID, JSONB
@@ -85,6 +86,9 @@ class AuditLog(Base):
     # Datos adicionales en formato JSON
     extra_data = Column(JSONB, nullable=True)
 
+    # Clave frecuente de extra_data materializada (columna generada)
+    extra_setting = Column(Text, Computed("extra_data ->> 'setting'", persisted=True), nullable=True)
+
     # IP del cliente
     ip_address = Column(String(45), nullable=True)  # IPv6 puede ser largo
 
@@ -109,6 +113,20 @@ class AuditLog(Base):
         Index("idx_audit_logs_entity", "entity_type", "entity_id"),
         # Buscar por fecha (para limpieza de logs antiguos)
         Index("idx_audit_logs_created_at", "created_at"),
+        # Filtros por contención sobre extra_data (@>, @?, @@)
+        Index(
+            "idx_audit_logs_extra_data",
+            "extra_data",
+            postgresql_using="gin",
+            postgresql_ops={"extra_data": "jsonb_path_ops"},
+        ),
+        # Filtros por la clave setting (CONFIG_CHANGE)
+        Index(
+            "idx_audit_logs_extra_setting",
+            "extra_setting",
+            "created_at",
+            postgresql_where=Column("extra_setting").isnot(None),
+        ),
         {
             "comment": "Registro de auditoría del sistema"
         }
@@ -12,6 +12,7 @@ from sqlalchemy import (
     ForeignKey,
     Index,
     CheckConstraint,
+    text,
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
@@ -47,6 +48,9 @@ class Coordinate(Base):
     utm_easting = Column(Numeric(12, 3), nullable=True)
     utm_northing = Column(Numeric(13, 3), nullable=True)
 
+    # Geohash (mantenido por trigger trg_coordinates_geohash, precisión 12)
+    geohash = Column(String(12, collation="C"), nullable=True)
+
     # Sistema de Referencia
     coordinate_system = Column(String(50), nullable=False, default="WGS84")
     datum = Column(String(50), nullable=True, default="WGS84")
@@ -70,6 +74,14 @@ class Coordinate(Base):
         Index("idx_coordinates_deposit_id", "deposit_id"),
         Index("idx_coordinates_point_type", "point_type"),
         Index("idx_coordinates_lat_lon", "latitude", "longitude"),
+        Index("idx_coordinates_geohash", "geohash"),
+        # Un solo centroide por yacimiento (clave natural del seed)
+        Index(
+            "idx_coordinates_deposit_centroid",
+            "deposit_id",
+            unique=True,
+            postgresql_where=text("point_type = 'CENTROID'"),
+        ),
         {
             "comment": "Coordenadas geoespaciales de yacimientos y puntos de interés"
         }
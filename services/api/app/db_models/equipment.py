@@ -16,7 +16,7 @@ from sqlalchemy import (
     CheckConstraint,
 )
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 import uuid
 
 from . import Base
@@ -68,6 +68,9 @@ class Equipment(Base):
     # Horas de Operación
     total_operating_hours = Column(Numeric(12, 2), nullable=False, default=0)
     hours_since_last_overhaul = Column(Numeric(12, 2), nullable=True)
+    # Última lectura de horas (trigger trg_equipment_operating_hours_recorded_at:
+    # cambia sólo cuando cambian las horas, no con cualquier edición)
+    operating_hours_recorded_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
 
     # Costo de Adquisición
     acquisition_cost = Column(Numeric(15, 2), nullable=True)
@@ -97,6 +100,16 @@ class Equipment(Base):
         Index("idx_equipment_mine_id", "mine_id"),
         Index("idx_equipment_code", "code", postgresql_where=Column("deleted_at").is_(None)),
         Index("idx_equipment_status", "status", postgresql_where=Column("deleted_at").is_(None)),
+        Index(
+            "idx_equipment_next_maintenance",
+            "next_maintenance_date",
+            postgresql_where=Column("deleted_at").is_(None),
+        ),
+        Index(
+            "idx_equipment_operating_hours",
+            text("total_operating_hours DESC"),
+            postgresql_where=Column("deleted_at").is_(None),
+        ),
         Index("idx_equipment_location", "location_area"),
         {
             "comment": "Equipos físicos de la operación minera con tracking de horas y mantenimiento"
@@ -0,0 +1,89 @@
+"""
+Maintenance Work Order (Orden de Trabajo de Mantenimiento) SQLAlchemy Model (SOLO PARA ALEMBIC)
+
+Orden de trabajo de mantenimiento de un equipo. Las preventivas las genera por
+lotes el scheduler de mantenimiento (app/services/maintenance_scheduler.py)
+cuando un equipo cruza su fecha o sus horas de mantención; a lo más una orden
+abierta por equipo (índice único parcial).
+"""
+from sqlalchemy import (
+    Column,
+    String,
+    Text,
+    DateTime,
+    Numeric,
+    ForeignKey,
+    Enum as SQLEnum,
+    Index,
+    text,
+)
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+import uuid
+
+from . import Base
+from .mining_enums import MaintenanceTypeEnum, WorkOrderPriorityEnum, WorkOrderStatusEnum
+
+
+# Estados en los que la orden sigue abierta (una por equipo)
+OPEN_WORK_ORDER_STATUSES = ("PENDING", "SCHEDULED", "IN_PROGRESS", "ON_HOLD")
+
+
+class MaintenanceWorkOrder(Base):
+    """Modelo SQLAlchemy de MaintenanceWorkOrder (solo para Alembic)"""
+
+    __tablename__ = "maintenance_work_orders"
+
+    # Identificación
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    equipment_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("equipment.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+
+    # Clasificación
+    maintenance_type = Column(
+        SQLEnum(MaintenanceTypeEnum, name="maintenance_type_enum", create_type=True),
+        nullable=False
+    )
+    priority = Column(
+        SQLEnum(WorkOrderPriorityEnum, name="work_order_priority_enum", create_type=True),
+        nullable=False,
+        default=WorkOrderPriorityEnum.MEDIUM
+    )
+    status = Column(
+        SQLEnum(WorkOrderStatusEnum, name="work_order_status_enum", create_type=True),
+        nullable=False,
+        default=WorkOrderStatusEnum.PENDING,
+        server_default="PENDING"
+    )
+
+    # Vencimiento
+    due_date = Column(DateTime(timezone=True), nullable=False)
+    trigger_reason = Column(String(20), nullable=False)  # CALENDAR (fecha) u HOURS (horas de operación)
+    operating_hours_at_creation = Column(Numeric(12, 2), nullable=True)
+
+    # Descripción
+    description = Column(Text, nullable=True)
+
+    # Auditoría
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
+    completed_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index(
+            "idx_maintenance_work_orders_open_equipment",
+            "equipment_id",
+            unique=True,
+            postgresql_where=text(
+                "status IN (" + ", ".join(f"'{status}'" for status in OPEN_WORK_ORDER_STATUSES) + ")"
+            ),
+        ),
+        Index("idx_maintenance_work_orders_equipment_id", "equipment_id"),
+        Index("idx_maintenance_work_orders_status_due", "status", "due_date"),
+        {
+            "comment": "Órdenes de trabajo de mantenimiento de equipos"
+        }
+    )
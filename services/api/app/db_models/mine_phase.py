@@ -85,6 +85,7 @@ class MinePhase(Base):
         Index("idx_mine_phases_mine_id", "mine_id"),
         Index("idx_mine_phases_code", "code"),
         Index("idx_mine_phases_sequence", "mine_id", "sequence_number"),
+        Index("idx_mine_phases_mine_code", "mine_id", "code", unique=True),
         {
             "comment": "Fases de explotación minera con parámetros de diseño"
         }
@@ -73,6 +73,7 @@ class Mineralogy(Base):
         Index("idx_mineralogy_mineral_name", "mineral_name"),
         Index("idx_mineralogy_mineral_class", "mineral_class"),
         Index("idx_mineralogy_is_primary_ore", "is_primary_ore"),
+        Index("idx_mineralogy_deposit_mineral", "deposit_id", "mineral_name", unique=True),
         {
             "comment": "Composición mineralógica de yacimientos con propiedades de flotación"
         }
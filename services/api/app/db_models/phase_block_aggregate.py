@@ -0,0 +1,55 @@
+"""
+PhaseBlockAggregate (Agregados de Bloques por Fase) SQLAlchemy Model (SOLO PARA ALEMBIC)
+
+Capa materializada con tonelaje, metal contenido y avance de minado por fase.
+Se mantiene con triggers por sentencia sobre blocks (ver migración 3b7e91c4d2a8);
+NO escribir directamente desde la aplicación.
+"""
+from sqlalchemy import (
+    Column,
+    Integer,
+    BigInteger,
+    DateTime,
+    Numeric,
+    ForeignKey,
+)
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+
+from . import Base
+
+
+class PhaseBlockAggregate(Base):
+    """Modelo SQLAlchemy de PhaseBlockAggregate (solo para Alembic)"""
+
+    __tablename__ = "phase_block_aggregates"
+
+    mine_phase_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("mine_phases.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+
+    # Conteos
+    block_count = Column(Integer, nullable=False, server_default="0")
+    mined_block_count = Column(Integer, nullable=False, server_default="0")
+
+    # Tonelaje (toneladas)
+    total_tonnage = Column(Numeric(18, 2), nullable=False, server_default="0")
+    mined_tonnage = Column(Numeric(18, 2), nullable=False, server_default="0")
+
+    # Metal contenido (toneladas de metal)
+    contained_cu_t = Column(Numeric(18, 4), nullable=False, server_default="0")
+    contained_mo_t = Column(Numeric(18, 4), nullable=False, server_default="0")
+    mined_cu_t = Column(Numeric(18, 4), nullable=False, server_default="0")
+    mined_mo_t = Column(Numeric(18, 4), nullable=False, server_default="0")
+
+    # Versión (se incrementa en cada delta, usada para ETag)
+    version = Column(BigInteger, nullable=False, server_default="1")
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    __table_args__ = (
+        {
+            "comment": "Agregados materializados de bloques por fase (mantenidos por trigger)"
+        },
+    )
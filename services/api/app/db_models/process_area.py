@@ -96,6 +96,7 @@ class ProcessArea(Base):
         Index("idx_process_areas_area_type", "area_type"),
         Index("idx_process_areas_sequence", "mine_id", "sequence_order"),
         Index("idx_process_areas_parent", "parent_area_id"),
+        Index("idx_process_areas_mine_code", "mine_id", "code", unique=True),
         {
             "comment": "Áreas de proceso de la planta concentradora"
         }
@@ -0,0 +1,46 @@
+"""
+ProcessAreaClosure (Clausura del Árbol de Áreas de Proceso) SQLAlchemy Model (SOLO PARA ALEMBIC)
+
+Una fila por cada par (ancestro, descendiente) del árbol process_areas.parent_area_id,
+incluida la fila (área, área, 0). Se mantiene con triggers sobre process_areas
+(ver migración 8d2f6a0b5c13); NO escribir directamente desde la aplicación.
+"""
+from sqlalchemy import (
+    Column,
+    Integer,
+    ForeignKey,
+    Index,
+    CheckConstraint,
+)
+from sqlalchemy.dialects.postgresql import UUID
+
+from . import Base
+
+
+class ProcessAreaClosure(Base):
+    """Modelo SQLAlchemy de ProcessAreaClosure (solo para Alembic)"""
+
+    __tablename__ = "process_area_closure"
+
+    ancestor_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("process_areas.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    descendant_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("process_areas.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    depth = Column(Integer, nullable=False)  # 0 = la misma área
+
+    __table_args__ = (
+        CheckConstraint(
+            "depth >= 0",
+            name="process_area_closure_depth_positive"
+        ),
+        Index("idx_process_area_closure_descendant", "descendant_id", "depth"),
+        {
+            "comment": "Tabla de clausura del árbol de áreas de proceso (mantenida por trigger)"
+        }
+    )
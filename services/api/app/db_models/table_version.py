@@ -0,0 +1,33 @@
+"""
+TableVersion (Contadores de Versión por Tabla) SQLAlchemy Model (SOLO PARA ALEMBIC)
+
+Una fila por tabla de datos de referencia (roles, deposits, mines,
+equipment_types, reagents). Un trigger por sentencia incrementa `version` en
+cada INSERT/UPDATE/DELETE/TRUNCATE (ver migración e5376226569a); la API deriva
+de ahí los ETag sin leer las filas. NO escribir directamente desde la aplicación.
+"""
+from sqlalchemy import (
+    Column,
+    String,
+    BigInteger,
+    DateTime,
+)
+from sqlalchemy.sql import func
+
+from . import Base
+
+
+class TableVersion(Base):
+    """Modelo SQLAlchemy de TableVersion (solo para Alembic)"""
+
+    __tablename__ = "table_versions"
+
+    table_name = Column(String(63), primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0, server_default="0")
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    __table_args__ = (
+        {
+            "comment": "Contador de cambios por tabla de referencia (mantenido por trigger)"
+        },
+    )
@@ -0,0 +1,145 @@
+"""
+HTTP Cache Helpers
+
+ETag / If-None-Match para respuestas derivadas de versiones en la base de datos.
+El ETag se calcula a partir de contadores de versión baratos de consultar,
+así un 304 se responde sin ejecutar la query principal.
+
+Dos formas de uso:
+- En el endpoint (rollups, flowsheet): make_etag + etag_matches + not_modified
+- Declarativa: @versioned_by("roles") en el endpoint y ConditionalGetMiddleware
+  deriva el ETag de table_versions (versión de la caché de referencia si la
+  tabla está cacheada, app/services/reference_cache.py) y responde 304 sin
+  llegar al endpoint
+"""
+
+import hashlib
+from typing import Any, Callable, Optional, Sequence
+
+from fastapi import Request, Response
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.compression import add_vary_accept_encoding, negotiate_encoding
+from app.database import get_db_pool
+from app.metrics import HTTP_NOT_MODIFIED_TOTAL, matched_route
+from app.queries import reference_data
+from app.services.reference_cache import get_reference_cache
+
+
+def make_etag(*parts: Any) -> str:
+    """Construir un ETag fuerte a partir de las partes de una versión"""
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()
+    return f'"{digest[:20]}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """True si el If-None-Match del request coincide con `etag`"""
+    return _if_none_match(request.headers.get("if-none-match"), etag)
+
+
+def _if_none_match(header: Optional[str], etag: str) -> bool:
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag in candidates
+
+
+def not_modified(etag: str) -> Response:
+    """Respuesta 304 sin cuerpo"""
+    return Response(status_code=304, headers={"ETag": etag})
+
+
+# =============================================================================
+# ETAG POR VERSIÓN DE TABLAS
+# =============================================================================
+
+VERSIONED_TABLES_ATTR = "__versioned_tables__"
+
+
+def versioned_by(*tables: str) -> Callable:
+    """
+    Marcar un endpoint GET cuya respuesta depende sólo de `tables` (y de la URL)
+
+    Aplicar debajo del decorador de la ruta:
+
+        @router.get("/roles")
+        @versioned_by("roles")
+        async def list_roles(...): ...
+    """
+    def decorator(endpoint: Callable) -> Callable:
+        setattr(endpoint, VERSIONED_TABLES_ATTR, tuple(tables))
+        return endpoint
+    return decorator
+
+
+def versioned_tables(scope: Scope) -> Optional[Sequence[str]]:
+    """Tablas declaradas con @versioned_by por la ruta del request (o None)"""
+    route = matched_route(scope)
+    endpoint = getattr(route, "endpoint", None)
+    return getattr(endpoint, VERSIONED_TABLES_ATTR, None)
+
+
+class ConditionalGetMiddleware:
+    """
+    ETag fuerte y 304 para endpoints marcados con @versioned_by
+
+    El ETag combina URL (path + query), codificación negociada (cada
+    representación comprimida tiene su propio ETag) y la versión de cada tabla.
+    Las versiones se leen antes que los datos: si una escritura ocurre entre
+    ambas lecturas, el cliente recibe datos nuevos con el ETag anterior y sólo
+    vuelve a descargarlos en el próximo poll (nunca se queda con datos viejos).
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD"):
+            await self.app(scope, receive, send)
+            return
+
+        tables = versioned_tables(scope)
+        if not tables:
+            await self.app(scope, receive, send)
+            return
+
+        # Con la caché de referencia cargada, la versión es la del snapshot que
+        # servirá el endpoint (sin base de datos); si no, se lee table_versions
+        versions = get_reference_cache().versions(tables)
+        try:
+            if versions is None:
+                versions = await reference_data.get_table_versions(await get_db_pool(), tables)
+        except Exception:
+            # Sin versiones no hay ETag: se responde normalmente
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        etag = make_etag(
+            scope["path"],
+            scope.get("query_string", b"").decode("latin-1"),
+            negotiate_encoding(headers.get("accept-encoding", "")),
+            *(f"{table}:{versions[table]}" for table in tables),
+        )
+        if _if_none_match(headers.get("if-none-match"), etag):
+            HTTP_NOT_MODIFIED_TOTAL.labels(getattr(matched_route(scope), "path", scope["path"])).inc()
+            response = Response(
+                status_code=304,
+                headers={"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"},
+            )
+            await response(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message):
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                response_headers = MutableHeaders(raw=message["headers"])
+                if "etag" not in response_headers:
+                    response_headers["ETag"] = etag
+                    response_headers.setdefault("Cache-Control", "no-cache")
+                    add_vary_accept_encoding(response_headers)
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
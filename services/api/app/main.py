@@ -4,13 +4,22 @@ Cloud-Native Microservices Learning Platform
 """
 from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 import asyncpg
 from datetime import datetime
 import os
 
 from app.config import settings
-from app.database import get_db_pool, close_db_pool
+from app.compression import CompressionMiddleware
+from app.database import ReadYourWritesMiddleware, get_db_pool, init_db_pool, close_db_pool
+from app.dataloader import DataLoaderMiddleware
+from app.http_cache import ConditionalGetMiddleware
+from app.metrics import MetricsMiddleware, mark_process_dead, render_metrics
+from app.responses import ORJSONResponse
+from app.routers import admin, audit_logs, block_values, coordinates, exports, fleet, reference, rollups, process_areas
+from app.services.block_value import shutdown_block_value_service
+from app.services.maintenance_scheduler import get_maintenance_scheduler
+from app.services.reference_cache import get_reference_cache
 
 # =============================================================================
 # APPLICATION INITIALIZATION
@@ -23,12 +32,20 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     root_path=settings.ROOT_PATH,  # Configurable para desarrollo local vs nube
+    default_response_class=ORJSONResponse,  # orjson (app/responses.py)
 )
 
 # =============================================================================
 # MIDDLEWARE
 # =============================================================================
 
+# Compresión gzip/brotli de respuestas completas sobre el umbral
+if settings.HTTP_COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+
+# ETag por versión de tablas y 304 para endpoints @versioned_by (antes de comprimir)
+app.add_middleware(ConditionalGetMiddleware)
+
 # CORS Configuration
 app.add_middleware(
     CORSMiddleware,
@@ -38,6 +55,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Prometheus: latencia por ruta, status y requests en curso
+app.add_middleware(MetricsMiddleware)
+
+# Réplicas de lectura: read-your-writes y réplica fija por request
+app.add_middleware(ReadYourWritesMiddleware)
+
+# DataLoaders por request: lookups por id agrupados en queries por lote
+app.add_middleware(DataLoaderMiddleware)
+
 # =============================================================================
 # STARTUP & SHUTDOWN EVENTS
 # =============================================================================
@@ -48,7 +74,17 @@ async def startup_event():
     print("🚀 Starting FastAPI application...")
     print(f"📊 Environment: {settings.ENVIRONMENT}")
     print(f"🔍 Debug mode: {settings.DEBUG}")
-    # Database pool will be created on first request
+    # Pool creado y calentado antes de recibir tráfico
+    try:
+        await init_db_pool()
+    except Exception:
+        print("⚠️  Database not reachable on startup, pool will be created on first request")
+    # Catálogos en memoria (recarga por NOTIFY)
+    if settings.REFERENCE_CACHE_ENABLED:
+        await get_reference_cache().start()
+    # Órdenes de trabajo de mantenimiento (cola de vencimientos en memoria)
+    if settings.MAINTENANCE_SCHEDULER_ENABLED:
+        await get_maintenance_scheduler().start()
     print("✅ Application started successfully")
 
 
@@ -56,7 +92,11 @@ async def startup_event():
 async def shutdown_event():
     """Cleanup resources on shutdown"""
     print("👋 Shutting down application...")
+    await get_reference_cache().stop()
+    await get_maintenance_scheduler().stop()
     await close_db_pool()
+    shutdown_block_value_service()
+    mark_process_dead()
     print("✅ Application shutdown complete")
 
 # =============================================================================
@@ -126,24 +166,29 @@ async def root():
 # METRICS ENDPOINT (for Prometheus)
 # =============================================================================
 
-@app.get("/metrics", tags=["Monitoring"])
+@app.get("/metrics", tags=["Monitoring"], include_in_schema=False)
 async def metrics():
     """
     Prometheus metrics endpoint
-    TODO: Implement proper prometheus client metrics
+    Agrega todos los workers si PROMETHEUS_MULTIPROC_DIR está definido
     """
-    return {
-        "message": "Metrics endpoint - TODO: implement prometheus_client",
-        "note": "Install prometheus-fastapi-instrumentator for full metrics"
-    }
+    content, media_type = render_metrics()
+    return Response(content=content, media_type=media_type)
 
 # =============================================================================
 # API V1 ROUTES
 # =============================================================================
 
-# TODO: Import and include routers here
-# from app.routers import items
-# app.include_router(items.router, prefix="/v1", tags=["items"])
+app.include_router(block_values.router, prefix="/v1")
+app.include_router(coordinates.router, prefix="/v1")
+app.include_router(rollups.router, prefix="/v1")
+app.include_router(process_areas.router, prefix="/v1")
+app.include_router(admin.router, prefix="/v1")
+app.include_router(exports.router, prefix="/v1")
+app.include_router(audit_logs.router, prefix="/v1")
+app.include_router(reference.router, prefix="/v1")
+app.include_router(fleet.router, prefix="/v1")
+
 
 @app.get("/v1/items", tags=["Items"])
 async def get_items(pool: asyncpg.Pool = Depends(get_db_pool)):
@@ -0,0 +1,441 @@
+"""
+Prometheus Metrics Module
+
+Métricas expuestas en /metrics (scrapeadas por infrastructure/prometheus):
+
+- HTTP: latencia por ruta (histograma), requests por status, requests en curso;
+  respuestas 304 por versión y bytes antes/después de comprimir
+- Pool asyncpg: tamaño, conexiones libres, waiters y latencia de acquire;
+  límite adaptativo, conexiones en uso y max_connections de Postgres
+  (app/pool_manager.py)
+- Exportaciones: filas, bytes y duración
+- Caché de datos de referencia: hits/misses, recargas, versión y antigüedad
+- Unidad de trabajo: acquires evitados, queries por unidad, duración, rollbacks
+- Réplicas de lectura: enrutamiento por destino, retraso y disponibilidad
+- Queries: por función de app/queries, duración total, espera de acquire,
+  ejecución, filas y bytes (estimados); sentencias lentas
+
+Multi-proceso: si PROMETHEUS_MULTIPROC_DIR está definido (uvicorn --workers N),
+cada worker escribe sus valores en ese directorio y /metrics los agrega con
+MultiProcessCollector. El directorio debe vaciarse antes de arrancar los workers
+(ver Dockerfile); si no existe se crea al importar este módulo (p. ej. uvicorn
+--reload en desarrollo, que no pasa por el CMD del Dockerfile).
+"""
+
+import os
+import time
+from typing import Optional
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from starlette.routing import Match
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+MULTIPROCESS = bool(os.getenv("PROMETHEUS_MULTIPROC_DIR"))
+if MULTIPROCESS:
+    os.makedirs(os.environ["PROMETHEUS_MULTIPROC_DIR"], exist_ok=True)
+
+# Buckets en segundos: de 1 ms a 10 s
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+ACQUIRE_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0, 5.0)
+
+
+# =============================================================================
+# HTTP
+# =============================================================================
+
+HTTP_REQUESTS_TOTAL = Counter(
+    "http_requests_total",
+    "Total de requests HTTP",
+    ["method", "route", "status"],
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Latencia de requests HTTP por ruta",
+    ["method", "route"],
+    buckets=LATENCY_BUCKETS,
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "Requests HTTP en curso",
+    multiprocess_mode="livesum",
+)
+HTTP_NOT_MODIFIED_TOTAL = Counter(
+    "http_not_modified_total",
+    "Respuestas 304 por ETag de versión (sin ejecutar el endpoint)",
+    ["route"],
+)
+HTTP_COMPRESSION_BYTES_TOTAL = Counter(
+    "http_compression_bytes_total",
+    "Bytes de respuestas comprimidas, antes y después de comprimir",
+    ["encoding", "stage"],
+)
+
+
+# =============================================================================
+# POOL DE CONEXIONES (asyncpg)
+# =============================================================================
+
+DB_POOL_SIZE = Gauge(
+    "db_pool_size",
+    "Conexiones abiertas en el pool",
+    multiprocess_mode="livesum",
+)
+DB_POOL_IDLE = Gauge(
+    "db_pool_idle",
+    "Conexiones libres en el pool",
+    multiprocess_mode="livesum",
+)
+DB_POOL_MAX_SIZE = Gauge(
+    "db_pool_max_size",
+    "Tamaño máximo configurado del pool",
+    multiprocess_mode="livesum",
+)
+DB_POOL_WAITERS = Gauge(
+    "db_pool_waiters",
+    "Corrutinas esperando una conexión del pool",
+    multiprocess_mode="livesum",
+)
+DB_POOL_ACQUIRE_SECONDS = Histogram(
+    "db_pool_acquire_seconds",
+    "Tiempo de espera para obtener una conexión del pool",
+    buckets=ACQUIRE_BUCKETS,
+)
+DB_POOL_LIMIT = Gauge(
+    "db_pool_limit",
+    "Límite adaptativo de conexiones en uso",
+    multiprocess_mode="livesum",
+)
+DB_POOL_IN_USE = Gauge(
+    "db_pool_in_use",
+    "Conexiones del pool en uso",
+    multiprocess_mode="livesum",
+)
+DB_POOL_ACQUIRE_WAIT_P95 = Gauge(
+    "db_pool_acquire_wait_p95_seconds",
+    "p95 de la espera de acquire (últimas esperas, por worker)",
+    multiprocess_mode="max",
+)
+DB_POOL_RESIZES_TOTAL = Counter(
+    "db_pool_resizes_total",
+    "Ajustes del límite adaptativo del pool",
+    ["direction"],
+)
+PG_MAX_CONNECTIONS = Gauge(
+    "pg_max_connections",
+    "max_connections del servidor Postgres",
+    multiprocess_mode="max",
+)
+PG_CONNECTIONS = Gauge(
+    "pg_connections",
+    "Conexiones de clientes abiertas en el servidor Postgres",
+    multiprocess_mode="max",
+)
+
+
+# =============================================================================
+# UNIDAD DE TRABAJO (app/unit_of_work.py)
+# =============================================================================
+
+DB_UOW_ACQUIRES_SAVED_TOTAL = Counter(
+    "db_uow_acquires_saved_total",
+    "Acquires del pool evitados al compartir la conexión de una unidad de trabajo",
+)
+DB_UOW_QUERIES = Histogram(
+    "db_uow_queries",
+    "Usos de la conexión por unidad de trabajo",
+    buckets=(1, 2, 3, 5, 10, 25, 50, 100),
+)
+DB_UOW_DURATION = Histogram(
+    "db_uow_duration_seconds",
+    "Duración de las unidades de trabajo (conexión retenida)",
+    buckets=LATENCY_BUCKETS,
+)
+DB_UOW_ROLLBACKS_TOTAL = Counter(
+    "db_uow_rollbacks_total",
+    "Unidades de trabajo revertidas por una excepción",
+)
+
+
+# =============================================================================
+# DATALOADERS (app/dataloader.py)
+# =============================================================================
+
+DATALOADER_LOADS_TOTAL = Counter(
+    "dataloader_loads_total",
+    "Lookups por id de los DataLoaders del request (cached: resueltos sin query)",
+    ["loader", "outcome"],
+)
+DATALOADER_BATCH_KEYS = Histogram(
+    "dataloader_batch_keys",
+    "Ids distintos por query en lote de un DataLoader",
+    ["loader"],
+    buckets=(1, 2, 5, 10, 25, 50, 100, 250, 500, 1000),
+)
+
+
+# =============================================================================
+# RÉPLICAS DE LECTURA
+# =============================================================================
+
+DB_QUERIES_ROUTED_TOTAL = Counter(
+    "db_queries_routed_total",
+    "Funciones de app/queries por destino (primary, replica, primary_sticky, primary_fallback)",
+    ["target"],
+)
+DB_REPLICA_LAG_SECONDS = Gauge(
+    "db_replica_lag_seconds",
+    "Retraso de replicación observado por réplica",
+    ["replica"],
+    multiprocess_mode="max",
+)
+DB_REPLICA_LAG_BYTES = Gauge(
+    "db_replica_lag_bytes",
+    "WAL pendiente de aplicar por réplica",
+    ["replica"],
+    multiprocess_mode="max",
+)
+DB_REPLICA_AVAILABLE = Gauge(
+    "db_replica_available",
+    "1 si la réplica recibe lecturas (sana y dentro del retraso máximo)",
+    ["replica"],
+    multiprocess_mode="min",
+)
+
+
+# =============================================================================
+# QUERIES (app/queries)
+# =============================================================================
+
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds",
+    "Duración de las funciones de app/queries (incluye acquire)",
+    ["query"],
+    buckets=LATENCY_BUCKETS,
+)
+DB_QUERY_ERRORS_TOTAL = Counter(
+    "db_query_errors_total",
+    "Errores en funciones de app/queries",
+    ["query"],
+)
+DB_QUERY_ACQUIRE_WAIT = Histogram(
+    "db_query_acquire_wait_seconds",
+    "Espera de acquire del pool por función de app/queries",
+    ["query"],
+    buckets=ACQUIRE_BUCKETS,
+)
+DB_QUERY_EXEC = Histogram(
+    "db_query_exec_seconds",
+    "Duración sin la espera de acquire por función de app/queries",
+    ["query"],
+    buckets=LATENCY_BUCKETS,
+)
+DB_QUERY_ROWS = Histogram(
+    "db_query_rows",
+    "Filas retornadas por función de app/queries",
+    ["query"],
+    buckets=(0, 1, 10, 100, 1000, 10000, 100000, 1000000),
+)
+DB_QUERY_BYTES_TOTAL = Counter(
+    "db_query_bytes_total",
+    "Bytes retornados (estimados) por función de app/queries",
+    ["query"],
+)
+DB_SLOW_QUERIES_TOTAL = Counter(
+    "db_slow_queries_total",
+    "Sentencias que superan SLOW_QUERY_THRESHOLD_MS",
+    ["query"],
+)
+
+
+# =============================================================================
+# EXPORTACIONES (app/services/export.py)
+# =============================================================================
+
+EXPORT_ROWS_TOTAL = Counter(
+    "export_rows_total",
+    "Filas exportadas en streaming",
+    ["export"],
+)
+EXPORT_BYTES_TOTAL = Counter(
+    "export_bytes_total",
+    "Bytes enviados por exportaciones en streaming (después de gzip)",
+    ["export"],
+)
+EXPORT_DURATION = Histogram(
+    "export_duration_seconds",
+    "Duración de las exportaciones en streaming",
+    ["export"],
+    buckets=(0.1, 0.5, 1.0, 5.0, 15.0, 60.0, 300.0, 900.0, 3600.0),
+)
+
+
+# =============================================================================
+# CACHÉ DE DATOS DE REFERENCIA (app/services/reference_cache.py)
+# =============================================================================
+
+REFERENCE_CACHE_LOOKUPS_TOTAL = Counter(
+    "reference_cache_lookups_total",
+    "Búsquedas en la caché de datos de referencia",
+    ["table", "result"],
+)
+REFERENCE_CACHE_REFRESHES_TOTAL = Counter(
+    "reference_cache_refreshes_total",
+    "Recargas de una tabla de la caché por origen (startup, notify, poll)",
+    ["table", "trigger"],
+)
+REFERENCE_CACHE_VERSION = Gauge(
+    "reference_cache_version",
+    "Versión (table_versions) cargada en la caché",
+    ["table"],
+    multiprocess_mode="min",
+)
+REFERENCE_CACHE_STALENESS_SECONDS = Gauge(
+    "reference_cache_staleness_seconds",
+    "Segundos desde la última vez que se confirmó que la tabla cacheada está al día",
+    ["table"],
+    multiprocess_mode="max",
+)
+
+
+# =============================================================================
+# ESTADO DE LA FLOTA (app/services/fleet_status.py)
+# =============================================================================
+
+FLEET_SNAPSHOT_REFRESHES_TOTAL = Counter(
+    "fleet_snapshot_refreshes_total",
+    "Reconstrucciones del snapshot de la flota por motivo (startup, change, expired)",
+    ["reason"],
+)
+FLEET_SNAPSHOT_BUILD_SECONDS = Histogram(
+    "fleet_snapshot_build_seconds",
+    "Duración de la reconstrucción del snapshot de la flota",
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+
+
+# =============================================================================
+# SCHEDULER DE MANTENIMIENTO (app/services/maintenance_scheduler.py)
+# =============================================================================
+
+MAINTENANCE_QUEUE_SIZE = Gauge(
+    "maintenance_queue_size",
+    "Equipos en la cola de vencimientos de mantención (sin orden abierta)",
+    multiprocess_mode="max",
+)
+MAINTENANCE_QUEUE_REBUILDS_TOTAL = Counter(
+    "maintenance_queue_rebuilds_total",
+    "Reconstrucciones de la cola de vencimientos por motivo (startup, change, forced)",
+    ["reason"],
+)
+MAINTENANCE_WORK_ORDERS_CREATED_TOTAL = Counter(
+    "maintenance_work_orders_created_total",
+    "Órdenes de trabajo de mantenimiento creadas por el scheduler",
+    ["priority"],
+)
+
+
+# =============================================================================
+# MIDDLEWARE
+# =============================================================================
+
+UNMATCHED_ROUTE = "unmatched"
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI que mide latencia, status y requests en curso
+
+    La etiqueta `route` es la plantilla de la ruta (/v1/mines/{mine_id}/flowsheet),
+    no la URL concreta, para acotar la cardinalidad.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            route = route_template(scope)
+            HTTP_REQUEST_DURATION.labels(method, route).observe(time.perf_counter() - start)
+            HTTP_REQUESTS_TOTAL.labels(method, route, str(status_code)).inc()
+
+
+def matched_route(scope: Scope):
+    """Ruta que atiende (o atendió) el request, o None"""
+    route = scope.get("route")  # FastAPI la deja en el scope al enrutar
+    if route is not None:
+        return route
+
+    app = scope.get("app")
+    if app is None:
+        return None
+    for route in app.router.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route
+    return None
+
+
+def route_template(scope: Scope) -> str:
+    """Plantilla de la ruta que atendió el request (o UNMATCHED_ROUTE)"""
+    return getattr(matched_route(scope), "path", UNMATCHED_ROUTE)
+
+
+# =============================================================================
+# POOL STATS
+# =============================================================================
+
+def update_pool_stats(pool, waiters: int = 0, in_use: int = 0, limit: Optional[int] = None) -> None:
+    """Actualizar los gauges del pool (llamado en cada acquire/release)"""
+    DB_POOL_SIZE.set(pool.get_size())
+    DB_POOL_IDLE.set(pool.get_idle_size())
+    DB_POOL_MAX_SIZE.set(pool.get_max_size())
+    DB_POOL_WAITERS.set(waiters)
+    DB_POOL_IN_USE.set(in_use)
+    DB_POOL_LIMIT.set(pool.get_max_size() if limit is None else limit)
+
+
+# =============================================================================
+# EXPOSICIÓN
+# =============================================================================
+
+def render_metrics() -> tuple[bytes, str]:
+    """Serializar las métricas en formato de exposición de Prometheus"""
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead(pid: Optional[int] = None) -> None:
+    """Limpiar los gauges `live*` de un worker que termina (sólo multi-proceso)"""
+    if MULTIPROCESS:
+        multiprocess.mark_process_dead(pid or os.getpid())
@@ -35,6 +35,27 @@ from .auth import (
     TokenData,
     RefreshTokenRequest,
 )
+from .block_value import (
+    PriceScenario,
+    BlockValueRequest,
+    BlockValueSummary,
+    BlockValueResponse,
+)
+from .coordinate import (
+    SpatialPoint,
+    SpatialSearchResponse,
+)
+from .rollup import (
+    RollupMetrics,
+    PhaseRollup,
+    MineRollup,
+    DepositRollup,
+    RollupResponse,
+)
+from .flowsheet import (
+    FlowsheetNode,
+    FlowsheetResponse,
+)
 
 __all__ = [
     # User
@@ -61,4 +82,21 @@ __all__ = [
     "RegisterResponse",
     "TokenData",
     "RefreshTokenRequest",
+    # Block Value
+    "PriceScenario",
+    "BlockValueRequest",
+    "BlockValueSummary",
+    "BlockValueResponse",
+    # Coordinate
+    "SpatialPoint",
+    "SpatialSearchResponse",
+    # Roll-up
+    "RollupMetrics",
+    "PhaseRollup",
+    "MineRollup",
+    "DepositRollup",
+    "RollupResponse",
+    # Flowsheet
+    "FlowsheetNode",
+    "FlowsheetResponse",
 ]
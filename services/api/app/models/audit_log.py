@@ -11,6 +11,8 @@ from uuid import UUID
 from pydantic import BaseModel, Field
 from enum import Enum
 
+from app.models.user import UserPublic
+
 
 class AuditActionEnum(str, Enum):
     """Tipos de acciones auditables"""
@@ -73,6 +75,7 @@ class AuditLogPublic(AuditLogBase):
     id: UUID
     user_id: Optional[UUID] = None
     created_at: datetime
+    user: Optional[UserPublic] = None  # Autor del log (sólo con include_user=true)
 
     model_config = {"from_attributes": True}
 
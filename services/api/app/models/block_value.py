@@ -0,0 +1,81 @@
+"""
+Block Value Pydantic Schemas
+
+Schemas para el cálculo del valor económico de bloques por escenario de precios.
+"""
+
+from typing import Optional
+from uuid import UUID
+from pydantic import BaseModel, Field
+
+
+# =============================================================================
+# Scenario Schema (Request)
+# =============================================================================
+
+class PriceScenario(BaseModel):
+    """
+    Escenario de precios y costos.
+
+    Es inmutable (frozen) para poder usarse como clave de cache.
+    Las recuperaciones de Cu/Mo son opcionales: si no se indican se derivan
+    de las áreas de proceso de la mina (target_recovery_pct).
+    """
+    name: str = Field(default="base", max_length=100)
+
+    # Precios
+    cu_price_usd_lb: float = Field(default=4.00, gt=0)
+    mo_price_usd_lb: float = Field(default=20.00, ge=0)
+    au_price_usd_oz: float = Field(default=2000.00, ge=0)
+    ag_price_usd_oz: float = Field(default=24.00, ge=0)
+
+    # Costos
+    cu_selling_cost_usd_lb: float = Field(default=0.35, ge=0)  # Fundición, refinería y transporte
+    mining_cost_usd_t: float = Field(default=2.20, ge=0)
+    processing_cost_usd_t: float = Field(default=7.50, ge=0)  # Sin reactivos
+    include_reagent_cost: bool = True
+
+    # Recuperaciones metalúrgicas (0-1)
+    cu_recovery: Optional[float] = Field(default=None, ge=0, le=1)
+    mo_recovery: Optional[float] = Field(default=None, ge=0, le=1)
+    au_recovery: float = Field(default=0.55, ge=0, le=1)
+    ag_recovery: float = Field(default=0.45, ge=0, le=1)
+
+    model_config = {"frozen": True}
+
+
+class BlockValueRequest(BaseModel):
+    """Schema para evaluar uno o más escenarios sobre una fase"""
+    scenarios: list[PriceScenario] = Field(default_factory=lambda: [PriceScenario()], min_length=1, max_length=100)
+    include_mined: bool = False
+
+
+# =============================================================================
+# Response Schemas
+# =============================================================================
+
+class BlockValueSummary(BaseModel):
+    """Resumen del valor económico de una fase para un escenario"""
+    scenario: PriceScenario
+    cu_recovery: float
+    mo_recovery: float
+    processing_cost_usd_t: float
+    block_count: int
+    ore_block_count: int
+    total_tonnage: float
+    ore_tonnage: float
+    waste_tonnage: float
+    ore_avg_cu_grade_pct: Optional[float] = None
+    recoverable_cu_lb: float
+    breakeven_cu_grade_pct: Optional[float] = None
+    total_value_usd: float
+    ore_value_usd: float
+    cached: bool = False
+
+
+class BlockValueResponse(BaseModel):
+    """Schema de respuesta con los resúmenes por escenario"""
+    phase_id: UUID
+    block_count: int
+    results: list[BlockValueSummary]
+    elapsed_ms: float
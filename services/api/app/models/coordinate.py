@@ -0,0 +1,35 @@
+"""
+Coordinate Pydantic Schemas
+
+Schemas para búsquedas espaciales sobre coordenadas (bbox, radio, k vecinos).
+"""
+
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+from pydantic import BaseModel
+
+
+# =============================================================================
+# Response Schemas
+# =============================================================================
+
+class SpatialPoint(BaseModel):
+    """Punto encontrado por una búsqueda espacial"""
+    id: UUID
+    deposit_id: UUID
+    point_type: str
+    latitude: float
+    longitude: float
+    elevation_masl: Optional[float] = None
+    distance_m: Optional[float] = None  # Distancia planar UTM al centro de búsqueda
+    geohash: Optional[str] = None  # Sólo en búsquedas por celda geohash
+    updated_at: Optional[datetime] = None
+
+
+class SpatialSearchResponse(BaseModel):
+    """Schema de respuesta de una búsqueda espacial"""
+    count: int
+    results: list[SpatialPoint]
+    index_size: int
+    elapsed_ms: float
@@ -0,0 +1,172 @@
+"""
+Fleet Status Pydantic Schemas
+
+Schemas de los tableros de estado de la flota (/v1/fleet): conteos por
+estado, mantenciones vencidas y ranking de horas de operación.
+"""
+
+from datetime import datetime
+from enum import Enum
+from typing import Optional
+from uuid import UUID
+from pydantic import BaseModel
+
+
+class EquipmentCategoryEnum(str, Enum):
+    """Categorías de equipo (equipment_category_enum)"""
+    HAUL_TRUCK = "HAUL_TRUCK"
+    EXCAVATOR = "EXCAVATOR"
+    LOADER = "LOADER"
+    DRILL = "DRILL"
+    CRUSHER = "CRUSHER"
+    MILL = "MILL"
+    FLOTATION_CELL = "FLOTATION_CELL"
+    PUMP = "PUMP"
+    CONVEYOR = "CONVEYOR"
+    CYCLONE = "CYCLONE"
+    THICKENER = "THICKENER"
+    FILTER = "FILTER"
+
+
+# =============================================================================
+# Status Board Schemas
+# =============================================================================
+
+class CategoryStatusCounts(BaseModel):
+    """Equipos de una categoría en una mina, por estado"""
+    category: str
+    equipment_count: int
+    by_status: dict[str, int]
+
+
+class MineStatusCounts(BaseModel):
+    """Equipos de una mina, por estado y por categoría"""
+    mine_id: UUID
+    mine_code: str
+    mine_name: str
+    equipment_count: int
+    by_status: dict[str, int]
+    categories: list[CategoryStatusCounts]
+
+
+class FleetStatusBoard(BaseModel):
+    """Tablero de estado de la flota"""
+    as_of: datetime
+    equipment_count: int
+    by_status: dict[str, int]
+    mines: list[MineStatusCounts]
+
+
+# =============================================================================
+# List Schemas
+# =============================================================================
+
+class OverdueEquipment(BaseModel):
+    """Equipo con la mantención programada vencida"""
+    id: UUID
+    code: str
+    name: str
+    status: str
+    mine_id: UUID
+    mine_code: str
+    category: str
+    last_maintenance_date: Optional[datetime] = None
+    next_maintenance_date: datetime
+    hours_overdue: float
+    total_operating_hours: float
+    hours_since_last_overhaul: Optional[float] = None
+
+
+class OverdueMaintenanceList(BaseModel):
+    """Mantenciones vencidas, la más atrasada primero"""
+    as_of: datetime
+    items: list[OverdueEquipment]
+
+
+class OperatingHoursEntry(BaseModel):
+    """Posición en el ranking de horas de operación"""
+    id: UUID
+    code: str
+    name: str
+    status: str
+    mine_id: UUID
+    mine_code: str
+    category: str
+    total_operating_hours: float
+    hours_since_last_overhaul: Optional[float] = None
+
+
+class OperatingHoursLeaderboard(BaseModel):
+    """Ranking de horas de operación, de mayor a menor"""
+    as_of: datetime
+    items: list[OperatingHoursEntry]
+
+
+# =============================================================================
+# Maintenance Scheduler Schemas
+# =============================================================================
+
+class MaintenanceDueItem(BaseModel):
+    """Próxima mantención de un equipo (por fecha u horas de operación)"""
+    equipment_id: UUID
+    code: str
+    mine_id: UUID
+    status: str
+    due_at: datetime
+    hours_until_due: float  # Negativo si ya venció
+    trigger: str  # CALENDAR | HOURS
+    next_maintenance_date: Optional[datetime] = None
+    total_operating_hours: float
+    hours_since_last_overhaul: Optional[float] = None
+
+
+class MaintenanceDueList(BaseModel):
+    """Mantenciones que vencen dentro de la ventana, la más próxima primero"""
+    as_of: datetime
+    hours: float
+    count: int
+    items: list[MaintenanceDueItem]
+
+
+class WorkOrderCreated(BaseModel):
+    """Orden de trabajo creada por el scheduler"""
+    id: UUID
+    equipment_id: UUID
+    priority: str
+    due_date: datetime
+
+
+class WorkOrderGenerationResult(BaseModel):
+    """Resultado de una generación de órdenes por lote"""
+    lead_hours: float
+    created_count: int
+    items: list[WorkOrderCreated]
+
+
+# =============================================================================
+# Detail Schema
+# =============================================================================
+
+class EquipmentDetail(BaseModel):
+    """Equipo vigente con su tipo, mina y estado de mantención"""
+    id: UUID
+    code: str
+    name: str
+    serial_number: Optional[str] = None
+    asset_tag: Optional[str] = None
+    status: str
+    mine_id: UUID
+    mine_code: str
+    equipment_type_id: UUID
+    equipment_type_code: str
+    category: str
+    location_area: Optional[str] = None
+    installation_date: Optional[datetime] = None
+    last_maintenance_date: Optional[datetime] = None
+    next_maintenance_date: Optional[datetime] = None
+    total_operating_hours: float
+    hours_since_last_overhaul: Optional[float] = None
+    acquisition_cost: Optional[float] = None
+    acquisition_currency: Optional[str] = None
+    is_active: bool
+    updated_at: datetime
@@ -0,0 +1,47 @@
+"""
+Flowsheet Pydantic Schemas
+
+Schemas para el árbol de áreas de proceso (flowsheet de planta) con
+agregados por subárbol.
+"""
+
+from typing import Optional
+from uuid import UUID
+from pydantic import BaseModel
+
+
+# =============================================================================
+# Response Schemas
+# =============================================================================
+
+class FlowsheetNode(BaseModel):
+    """Área de proceso con sus hijas y agregados del subárbol"""
+    id: UUID
+    parent_area_id: Optional[UUID] = None
+    code: str
+    name: str
+    area_type: str
+    sequence_order: int
+    design_capacity: Optional[float] = None
+    capacity_unit: Optional[str] = None
+    target_recovery_pct: Optional[float] = None
+    target_grade_pct: Optional[float] = None
+    circuit_type: Optional[str] = None
+    is_active: bool
+    depth: int
+
+    # Agregados (calculados con la tabla de clausura)
+    cumulative_recovery_pct: Optional[float] = None      # Desde la raíz hasta esta área
+    subtree_area_count: int
+    subtree_design_capacity_tph: Optional[float] = None
+    bottleneck_capacity_tph: Optional[float] = None      # Menor capacidad del subárbol
+    subtree_recovery_pct: Optional[float] = None         # Recuperaciones del subárbol en serie
+
+    children: list["FlowsheetNode"] = []
+
+
+class FlowsheetResponse(BaseModel):
+    """Schema de respuesta del flowsheet de una mina (o de un subárbol)"""
+    mine_id: UUID
+    area_count: int
+    roots: list[FlowsheetNode]
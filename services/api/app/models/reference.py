@@ -0,0 +1,62 @@
+"""
+Reference Data Pydantic Schemas
+
+Schemas de los catálogos de /v1/reference (yacimientos, minas, tipos de
+equipo, reactivos). Los roles usan RolePublic (app/models/role.py).
+"""
+
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+from pydantic import BaseModel
+
+
+class DepositSummary(BaseModel):
+    """Yacimiento (campos de catálogo)"""
+    id: UUID
+    code: str
+    name: str
+    primary_commodity: str
+    secondary_commodity: Optional[str] = None
+    country: str
+    region: Optional[str] = None
+    updated_at: datetime
+
+
+class MineSummary(BaseModel):
+    """Mina (campos de catálogo)"""
+    id: UUID
+    deposit_id: UUID
+    code: str
+    name: str
+    mine_type: str
+    is_active: bool
+    updated_at: datetime
+
+
+class EquipmentTypeSummary(BaseModel):
+    """Tipo de equipo (campos de catálogo)"""
+    id: UUID
+    code: str
+    name: str
+    category: str
+    manufacturer: Optional[str] = None
+    model: Optional[str] = None
+    capacity: Optional[float] = None
+    capacity_unit: Optional[str] = None
+    is_active: bool
+    updated_at: datetime
+
+
+class ReagentSummary(BaseModel):
+    """Reactivo (campos de catálogo)"""
+    id: UUID
+    code: str
+    name: str
+    reagent_type: str
+    chemical_family: Optional[str] = None
+    unit_cost: Optional[float] = None
+    cost_currency: Optional[str] = None
+    cost_unit: Optional[str] = None
+    is_active: bool
+    updated_at: datetime
@@ -0,0 +1,66 @@
+"""
+Roll-up Pydantic Schemas
+
+Schemas para los agregados jerárquicos yacimiento → mina → fase.
+"""
+
+from typing import Optional
+from uuid import UUID
+from pydantic import BaseModel
+
+
+# =============================================================================
+# Metrics Schema
+# =============================================================================
+
+class RollupMetrics(BaseModel):
+    """Tonelaje, metal contenido y avance de minado de un nivel de la jerarquía"""
+    block_count: int = 0
+    mined_block_count: int = 0
+    total_tonnage: float = 0.0
+    mined_tonnage: float = 0.0
+    remaining_tonnage: float = 0.0
+    contained_cu_t: float = 0.0
+    contained_mo_t: float = 0.0
+    remaining_cu_t: float = 0.0
+    remaining_mo_t: float = 0.0
+    avg_cu_grade_pct: Optional[float] = None
+    avg_mo_grade_pct: Optional[float] = None
+    mined_fraction: Optional[float] = None  # Por tonelaje (0-1)
+
+
+# =============================================================================
+# Response Schemas
+# =============================================================================
+
+class PhaseRollup(BaseModel):
+    """Agregados de una fase"""
+    id: UUID
+    code: str
+    name: str
+    sequence_number: int
+    metrics: RollupMetrics
+
+
+class MineRollup(BaseModel):
+    """Agregados de una mina y sus fases"""
+    id: UUID
+    code: str
+    name: str
+    metrics: RollupMetrics
+    phases: list[PhaseRollup]
+
+
+class DepositRollup(BaseModel):
+    """Agregados de un yacimiento y sus minas"""
+    id: UUID
+    code: str
+    name: str
+    metrics: RollupMetrics
+    mines: list[MineRollup]
+
+
+class RollupResponse(BaseModel):
+    """Schema de respuesta del roll-up completo"""
+    deposits: list[DepositRollup]
+    totals: RollupMetrics
@@ -0,0 +1,118 @@
+"""
+Numeric Decode Profiles
+
+asyncpg decodifica NUMERIC a Decimal con su codec binario: exacto, pero lento
+y pesado en memoria para analítica (leyes, tonelajes, horas de operación) que
+termina en numpy o en JSON como float. Cada query elige un perfil para sus
+columnas NUMERIC:
+
+- exact:     se seleccionan tal cual (NUMERIC -> Decimal)
+- analytics: se castean a ::float8 en el SQL (codec binario de float8)
+
+El perfil se aplica en la proyección, no en un codec: el resto de las queries
+sigue usando el codec binario de asyncpg sin costo adicional.
+
+    cols = numeric_projection("analytics", "blocks", ("tonnage", "cu_grade_pct"))
+    query = f"SELECT id, {cols} FROM blocks WHERE mine_phase_id = $1"
+    # -> SELECT id, tonnage::float8 AS tonnage, cu_grade_pct::float8 AS cu_grade_pct ...
+
+La proyección se arma con el esquema real: las columnas NUMERIC de public se
+leen de information_schema al abrir la primera conexión del pool
+(app/database.py::_init_connection). Sólo se castean columnas NUMERIC; las
+financieras (DB_FINANCIAL_NUMERIC_COLUMNS, o terminadas en _cost/_price)
+quedan siempre exact aunque la query pida analytics: un costo nunca pasa por
+float. Mientras el esquema no esté cargado nada se castea (todo exact).
+
+DB_NUMERIC_ANALYTICS=false desactiva los casts (analytics = exact).
+Benchmark: scripts/benchmark_numeric_codec.py.
+"""
+
+from typing import Dict, Literal, Optional, Sequence
+
+import asyncpg
+
+from app.config import settings
+
+
+NumericProfile = Literal["exact", "analytics"]
+
+PROFILES = ("exact", "analytics")
+
+FINANCIAL_SUFFIXES = ("_cost", "_price")
+
+NUMERIC_COLUMNS_QUERY = """
+    SELECT table_name, column_name
+    FROM information_schema.columns
+    WHERE table_schema = 'public'
+      AND data_type = 'numeric'
+"""
+
+
+# tabla -> columnas NUMERIC (None hasta cargar el esquema)
+_numeric_columns: Optional[Dict[str, frozenset]] = None
+_projections: Dict[tuple, str] = {}
+
+
+# =============================================================================
+# ESQUEMA
+# =============================================================================
+
+async def load_numeric_schema(conn: asyncpg.Connection) -> None:
+    """Leer del catálogo las columnas NUMERIC de cada tabla"""
+    global _numeric_columns
+    columns: Dict[str, set] = {}
+    for row in await conn.fetch(NUMERIC_COLUMNS_QUERY):
+        columns.setdefault(row["table_name"], set()).add(row["column_name"])
+    _numeric_columns = {table: frozenset(names) for table, names in columns.items()}
+    _projections.clear()
+
+
+def numeric_schema_loaded() -> bool:
+    return _numeric_columns is not None
+
+
+def is_financial(column: str) -> bool:
+    """Columna que se decodifica siempre a Decimal"""
+    return column in settings.DB_FINANCIAL_NUMERIC_COLUMNS or column.endswith(FINANCIAL_SUFFIXES)
+
+
+def float_columns(table: str) -> frozenset:
+    """Columnas NUMERIC no financieras de `table` (las que analytics castea)"""
+    numeric = (_numeric_columns or {}).get(table, frozenset())
+    return frozenset(column for column in numeric if not is_financial(column))
+
+
+# =============================================================================
+# PROYECCIÓN
+# =============================================================================
+
+def numeric_projection(
+    profile: NumericProfile,
+    table: str,
+    columns: Sequence[str],
+    alias: Optional[str] = None,
+) -> str:
+    """
+    Lista de columnas de `table` para un SELECT según el perfil numérico
+
+    Args:
+        profile: exact o analytics
+        table: Tabla de las columnas (para consultar el esquema)
+        columns: Columnas en el orden del SELECT (cualquier tipo)
+        alias: Alias de la tabla en la query (e, b, ...)
+    """
+    if profile not in PROFILES:
+        raise ValueError(f"Perfil numérico desconocido: {profile}")
+    key = (profile, table, tuple(columns), alias)
+    projection = _projections.get(key)
+    if projection is None:
+        cast = float_columns(table) if profile == "analytics" and settings.DB_NUMERIC_ANALYTICS else frozenset()
+        prefix = f"{alias}." if alias else ""
+        projection = ", ".join(
+            f"{prefix}{column}::float8 AS {column}" if column in cast else f"{prefix}{column}"
+            for column in columns
+        )
+        # Antes de cargar el esquema no se cachea: la próxima llamada ya lo tiene
+        if _numeric_columns is not None:
+            _projections[key] = projection
+    return projection
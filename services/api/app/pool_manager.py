@@ -0,0 +1,314 @@
+"""
+Adaptive Pool Manager
+
+Control del pool asyncpg (por proceso/worker):
+
+- AdaptiveLimiter: límite blando de conexiones en uso, ajustable en caliente.
+  El pool real se crea con max_size=DB_MAX_POOL_SIZE; el límite decide cuántas
+  conexiones se pueden usar a la vez (asyncpg abre conexiones sólo cuando hacen
+  falta y cierra las ociosas tras DB_POOL_IDLE_LIFETIME_SECONDS).
+- PoolManager: percentiles de la espera de acquire, crecimiento/reducción del
+  límite entre DB_MIN_POOL_SIZE y DB_MAX_POOL_SIZE, calentamiento al arrancar
+  y señales de saturación (uso del pool y presupuesto workers × max_size
+  frente a max_connections de Postgres).
+
+Se consulta vía /v1/admin/pool (app/routers/admin.py) y /metrics.
+"""
+
+import asyncio
+import math
+from collections import deque
+from datetime import datetime, timezone
+from typing import Optional
+
+import asyncpg
+import numpy as np
+
+from app.config import settings
+from app.metrics import (
+    DB_POOL_ACQUIRE_WAIT_P95,
+    DB_POOL_RESIZES_TOTAL,
+    PG_CONNECTIONS,
+    PG_MAX_CONNECTIONS,
+)
+
+
+# =============================================================================
+# LÍMITE AJUSTABLE
+# =============================================================================
+
+class AdaptiveLimiter:
+    """Semáforo FIFO cuyo límite puede cambiar mientras hay conexiones en uso"""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.in_use = 0
+        self._waiters: deque = deque()
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self) -> None:
+        if self.in_use < self.limit and not self._waiters:
+            self.in_use += 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # El cupo ya se había asignado: devolverlo
+                self.release()
+            else:
+                self._waiters.remove(future)
+            raise
+
+    def release(self) -> None:
+        self.in_use -= 1
+        self._wake()
+
+    def set_limit(self, limit: int) -> None:
+        """Cambiar el límite; al reducirlo, las conexiones en uso terminan normalmente"""
+        self.limit = limit
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters and self.in_use < self.limit:
+            future = self._waiters.popleft()
+            if not future.done():
+                self.in_use += 1
+                future.set_result(None)
+
+
+# =============================================================================
+# POOL MANAGER
+# =============================================================================
+
+class PoolManager:
+    """
+    Ajuste del límite del pool según la espera de acquire
+
+    Cada DB_POOL_ADJUST_INTERVAL_SECONDS:
+
+    - crece (x1.5) si el p95 de la espera del intervalo supera DB_POOL_GROW_WAIT_MS
+    - se reduce (-25%, nunca por debajo del pico en uso) si durante
+      DB_POOL_SHRINK_AFTER_INTERVALS intervalos seguidos el p95 quedó bajo
+      DB_POOL_SHRINK_WAIT_MS y el pico en uso no llegó a la mitad del límite
+    """
+
+    SERVER_STATS_SQL = """
+        SELECT
+            current_setting('max_connections')::int AS max_connections,
+            current_setting('superuser_reserved_connections')::int AS reserved_connections,
+            COUNT(*) FILTER (WHERE backend_type = 'client backend') AS connections,
+            COUNT(*) FILTER (WHERE application_name = $1) AS app_connections
+        FROM pg_stat_activity
+    """
+
+    def __init__(
+        self,
+        min_size: int = settings.DB_MIN_POOL_SIZE,
+        max_size: int = settings.DB_MAX_POOL_SIZE,
+        grow_wait_ms: float = settings.DB_POOL_GROW_WAIT_MS,
+        shrink_wait_ms: float = settings.DB_POOL_SHRINK_WAIT_MS,
+        shrink_after: int = settings.DB_POOL_SHRINK_AFTER_INTERVALS,
+        interval: float = settings.DB_POOL_ADJUST_INTERVAL_SECONDS,
+        adaptive: bool = settings.DB_POOL_ADAPTIVE,
+        window: int = 1024,
+        name: str = "primary",
+    ):
+        self.name = name
+        # Los gauges globales del pool describen sólo el primario
+        self.publish_metrics = name == "primary"
+        self.min_size = min_size
+        self.max_size = max_size
+        self.grow_wait = grow_wait_ms / 1000
+        self.shrink_wait = shrink_wait_ms / 1000
+        self.shrink_after = shrink_after
+        self.interval = interval
+        self.adaptive = adaptive
+        self.limiter = AdaptiveLimiter(min_size if adaptive else max_size)
+
+        self._waits: deque = deque(maxlen=window)
+        self._interval_waits: list[float] = []
+        self._peak_in_use = 0
+        self._calm_intervals = 0
+        self._task: Optional[asyncio.Task] = None
+        self.resizes: deque = deque(maxlen=50)
+        self.server: dict = {}
+        self.started_at = datetime.now(timezone.utc)
+
+    # -------------------------------------------------------------------------
+    # Acquire / release (llamados por app/database.py)
+    # -------------------------------------------------------------------------
+
+    async def acquire_slot(self) -> None:
+        await self.limiter.acquire()
+        self._peak_in_use = max(self._peak_in_use, self.limiter.in_use)
+
+    def release_slot(self) -> None:
+        self.limiter.release()
+
+    def record_wait(self, seconds: float) -> None:
+        self._waits.append(seconds)
+        self._interval_waits.append(seconds)
+
+    # -------------------------------------------------------------------------
+    # Ajuste
+    # -------------------------------------------------------------------------
+
+    def wait_percentiles(self) -> tuple[float, float, float]:
+        """p50/p95/p99 (segundos) de las últimas esperas de acquire"""
+        if not self._waits:
+            return 0.0, 0.0, 0.0
+        p50, p95, p99 = np.percentile(np.fromiter(self._waits, dtype=np.float64), [50, 95, 99])
+        return float(p50), float(p95), float(p99)
+
+    def adjust(self) -> Optional[str]:
+        """Evaluar el intervalo que termina; retorna 'grow', 'shrink' o None"""
+        waits, self._interval_waits = self._interval_waits, []
+        peak, self._peak_in_use = self._peak_in_use, self.limiter.in_use
+        interval_p95 = float(np.percentile(waits, 95)) if waits else 0.0
+        if self.publish_metrics:
+            DB_POOL_ACQUIRE_WAIT_P95.set(self.wait_percentiles()[1])
+
+        if not self.adaptive:
+            return None
+
+        limit = self.limiter.limit
+        if interval_p95 > self.grow_wait or self.limiter.waiting:
+            self._calm_intervals = 0
+            if limit < self.max_size:
+                return self._resize(min(self.max_size, limit + max(1, math.ceil(limit * 0.5))), "grow", interval_p95, peak)
+            return None
+
+        if interval_p95 <= self.shrink_wait and peak < limit / 2:
+            self._calm_intervals += 1
+        else:
+            self._calm_intervals = 0
+
+        if self._calm_intervals >= self.shrink_after and limit > self.min_size:
+            self._calm_intervals = 0
+            new_limit = max(self.min_size, peak + 1, limit - max(1, math.ceil(limit * 0.25)))
+            if new_limit < limit:
+                return self._resize(new_limit, "shrink", interval_p95, peak)
+        return None
+
+    def _resize(self, new_limit: int, direction: str, interval_p95: float, peak: int) -> str:
+        self.resizes.append({
+            "at": datetime.now(timezone.utc).isoformat(),
+            "direction": direction,
+            "from": self.limiter.limit,
+            "to": new_limit,
+            "interval_wait_p95_ms": interval_p95 * 1000,
+            "peak_in_use": peak,
+        })
+        self.limiter.set_limit(new_limit)
+        if self.publish_metrics:
+            DB_POOL_RESIZES_TOTAL.labels(direction).inc()
+        return direction
+
+    # -------------------------------------------------------------------------
+    # Ciclo de vida
+    # -------------------------------------------------------------------------
+
+    async def warm(self, pool: asyncpg.Pool, size: int) -> int:
+        """Abrir y validar `size` conexiones antes de recibir tráfico"""
+        size = min(size, self.max_size)
+        connections = []
+        try:
+            for result in await asyncio.gather(
+                *(pool.acquire(timeout=settings.DB_POOL_TIMEOUT) for _ in range(size)),
+                return_exceptions=True,
+            ):
+                if isinstance(result, BaseException):
+                    print(f"⚠️  Pool warm-up: {result!r}")
+                else:
+                    connections.append(result)
+            await asyncio.gather(*(conn.execute("SELECT 1") for conn in connections))
+        finally:
+            for conn in connections:
+                await pool.release(conn)
+        return len(connections)
+
+    def start(self, pool: asyncpg.Pool) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run(pool))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self, pool: asyncpg.Pool) -> None:
+        stats_every = max(1, round(settings.DB_POOL_SERVER_STATS_SECONDS / self.interval))
+        tick = 0
+        while True:
+            if tick % stats_every == 0:
+                await self.refresh_server_stats(pool)
+            await asyncio.sleep(self.interval)
+            self.adjust()
+            tick += 1
+
+    async def refresh_server_stats(self, pool: asyncpg.Pool) -> dict:
+        """max_connections y conexiones abiertas en Postgres (pg_stat_activity)"""
+        try:
+            row = await pool.fetchrow(self.SERVER_STATS_SQL, settings.DB_APPLICATION_NAME, timeout=5)
+        except Exception as e:
+            print(f"⚠️  Pool server stats: {e!r}")
+            return self.server
+        self.server = dict(row)
+        if self.publish_metrics:
+            PG_MAX_CONNECTIONS.set(row["max_connections"])
+            PG_CONNECTIONS.set(row["connections"])
+        return self.server
+
+    # -------------------------------------------------------------------------
+    # Saturación
+    # -------------------------------------------------------------------------
+
+    def snapshot(self, pool: Optional[asyncpg.Pool] = None) -> dict:
+        """Estado del pool y señales de saturación de este worker"""
+        p50, p95, p99 = self.wait_percentiles()
+        limiter = self.limiter
+        result = {
+            "name": self.name,
+            "since": self.started_at.isoformat(),
+            "adaptive": self.adaptive,
+            "min_size": self.min_size,
+            "max_size": self.max_size,
+            "limit": limiter.limit,
+            "in_use": limiter.in_use,
+            "waiting": limiter.waiting,
+            "utilization": limiter.in_use / limiter.limit if limiter.limit else 0.0,
+            "open_connections": pool.get_size() if pool is not None else None,
+            "idle_connections": pool.get_idle_size() if pool is not None else None,
+            "acquire_wait_ms": {"p50": p50 * 1000, "p95": p95 * 1000, "p99": p99 * 1000, "samples": len(self._waits)},
+            "recent_resizes": list(reversed(self.resizes)),
+        }
+
+        # Presupuesto: todos los workers con el pool al máximo vs lo que acepta Postgres
+        budget = settings.API_WORKERS * self.max_size
+        server = dict(self.server)
+        if server:
+            available = server["max_connections"] - server["reserved_connections"]
+            server["available_connections"] = available
+            server["usage"] = server["connections"] / available if available else None
+        result["capacity"] = {
+            "workers": settings.API_WORKERS,
+            "pool_budget": budget,
+            "budget_ratio": budget / server["available_connections"] if server.get("available_connections") else None,
+            "server": server or None,
+        }
+        return result
+
+
+# Instancia global (una por proceso)
+pool_manager = PoolManager()
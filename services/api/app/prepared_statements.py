@@ -0,0 +1,46 @@
+"""
+Prepared Statements Registry
+
+Registro de las sentencias SQL fijas de app/queries (las generadas por
+scripts/generate_code.py se registran al importar su módulo):
+
+    GET_BY_ID = register_statement("equipment.get_by_id", \"\"\"SELECT ...\"\"\")
+
+Las sentencias se preparan con el caché de sentencias de asyncpg, no por
+adelantado: la primera ejecución en cada conexión hace Parse y la guarda, las
+siguientes son sólo Bind/Execute (un ida y vuelta). Para que ninguna
+registrada salga del caché LRU por otra, statement_cache_size lo dimensiona
+para contenerlas todas.
+
+Con PgBouncer en modo transacción desactivar el caché con
+DB_STATEMENT_CACHE_SIZE=0.
+"""
+
+from typing import Dict
+
+from app.config import settings
+
+
+_statements: Dict[str, str] = {}
+
+
+def register_statement(name: str, query: str) -> str:
+    """Registrar una sentencia (cuenta para el tamaño del caché); retorna el SQL"""
+    previous = _statements.get(name)
+    if previous is not None and previous != query:
+        raise ValueError(f"Sentencia registrada dos veces con SQL distinto: {name}")
+    _statements[name] = query
+    return query
+
+
+def registered_statements() -> Dict[str, str]:
+    """Nombre -> SQL de las sentencias registradas"""
+    return dict(_statements)
+
+
+def statement_cache_size() -> int:
+    """Tamaño del caché de sentencias por conexión (cabe todo lo registrado; 0 = desactivado)"""
+    if settings.DB_STATEMENT_CACHE_SIZE <= 0:
+        return 0
+    return max(settings.DB_STATEMENT_CACHE_SIZE, 2 * len(_statements))
+
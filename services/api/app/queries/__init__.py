@@ -3,16 +3,46 @@ SQL Queries Package
 
 Este paquete contiene queries SQL puras organizadas por entidad.
 NO usar ORM - todas las queries son SQL puro ejecutado con asyncpg.
+
+Todas las funciones async de los módulos se instrumentan al importar el
+paquete (métricas por query, ver instrumentation.py).
 """
 
 from . import users
 from . import roles
 from . import sessions
 from . import auth
+from . import audit_logs
+from . import blocks
+from . import process_areas
+from . import reagents
+from . import coordinates
+from . import rollups
+from . import reference_data
+from . import equipment_fleet
+from . import maintenance
 
 __all__ = [
     "users",
     "roles",
     "sessions",
     "auth",
+    "audit_logs",
+    "blocks",
+    "process_areas",
+    "reagents",
+    "coordinates",
+    "rollups",
+    "reference_data",
+    "equipment_fleet",
+    "maintenance",
 ]
+
+from .instrumentation import instrument_module
+
+for _module in (
+    users, roles, sessions, auth, audit_logs,
+    blocks, process_areas, reagents, coordinates, rollups, reference_data,
+    equipment_fleet, maintenance,
+):
+    instrument_module(_module)
@@ -5,10 +5,131 @@ Queries SQL puras para operaciones CRUD de audit logs.
 Ejecutar con asyncpg usando los helpers en app/database.py
 """
 
-from typing import Optional
+import copy
+from typing import Any, AsyncIterator, Optional
 from uuid import UUID
 from datetime import datetime
 import asyncpg
+import orjson
+
+
+# ============================================================================
+# FILTROS JSONB (extra_data)
+# ============================================================================
+
+# Claves de extra_data con columna generada (STORED) e índice B-tree propio
+EXTRA_DATA_COLUMNS = {
+    "setting": "extra_setting",
+}
+
+
+def _nest(path: str, value: Any) -> dict:
+    """'a.b' + 1 -> {"a": {"b": 1}}"""
+    keys = path.split(".")
+    document = {keys[-1]: value}
+    for key in reversed(keys[:-1]):
+        document = {key: document}
+    return document
+
+
+def _conflicts(target: dict, source: dict) -> bool:
+    """True si fusionar source en target pisaría un valor distinto (extra.a=1 y extra.a.b=2)"""
+    for key, value in source.items():
+        if key not in target:
+            continue
+        if isinstance(value, dict) and isinstance(target[key], dict):
+            if _conflicts(target[key], value):
+                return True
+        elif target[key] != value:
+            return True
+    return False
+
+
+def _merge(target: dict, source: dict) -> dict:
+    """Fusionar source en target sin compartir (ni mutar) los dicts de source"""
+    for key, value in source.items():
+        if isinstance(value, dict) and isinstance(target.get(key), dict):
+            _merge(target[key], value)
+        else:
+            target[key] = copy.deepcopy(value)
+    return target
+
+
+def _add_containment(documents: list[dict], source: dict) -> None:
+    """Agregar source al primer documento @> compatible, o como documento nuevo"""
+    for document in documents:
+        if not _conflicts(document, source):
+            _merge(document, source)
+            return
+    documents.append(_merge({}, source))
+
+
+def _jsonpath(path: str) -> str:
+    return "$" + "".join(f".{orjson.dumps(key).decode()}" for key in path.split("."))
+
+
+def build_extra_data_filter(
+    filters: Optional[dict[str, list[Any]]] = None,
+    contains: Optional[dict] = None,
+    first_param: int = 1,
+) -> tuple[str, list]:
+    """
+    Condiciones SQL sobre extra_data que usan el índice GIN (jsonb_path_ops)
+
+    Args:
+        filters: Ruta (claves separadas por punto) -> valores aceptados.
+            Un valor: igualdad; varios: cualquiera de ellos; lista vacía: la clave existe
+        contains: Documento JSON que extra_data debe contener (@>)
+        first_param: Número del primer parámetro posicional ($n)
+
+    Returns:
+        (condiciones unidas con AND precedidas de AND, o "" si no hay; argumentos)
+
+    Todas las igualdades de un valor se combinan en una sola contención
+    (extra_data @> '{"setting": "max_upload_size", ...}'), que es la consulta
+    que jsonb_path_ops resuelve con el índice. Varios valores se expresan como
+    OR de contenciones (BitmapOr sobre el mismo índice). Las claves de
+    EXTRA_DATA_COLUMNS con valores texto van a su columna generada (B-tree).
+    La existencia de una clave (@?) es correcta pero jsonb_path_ops no tiene
+    entradas para claves sin valor: conviene combinarla con otro filtro.
+    Si dos filtros chocan en la misma ruta (extra.a=1 y extra.a.b=2, o
+    contains y un filtro con valores distintos) no se fusionan: cada uno va
+    en su propia contención y se combinan con AND.
+    """
+    conditions: list[str] = []
+    args: list = []
+
+    def param(value) -> str:
+        args.append(value)
+        return f"${first_param + len(args) - 1}"
+
+    documents: list[dict] = []
+    if contains:
+        _add_containment(documents, contains)
+    for path, values in (filters or {}).items():
+        column = EXTRA_DATA_COLUMNS.get(path)
+        if column and all(isinstance(value, str) for value in values):
+            if not values:
+                conditions.append(f"{column} IS NOT NULL")
+            elif len(values) == 1:
+                conditions.append(f"{column} = {param(values[0])}")
+            else:
+                conditions.append(f"{column} = ANY({param(list(values))}::text[])")
+        elif not values:
+            conditions.append(f"extra_data @? {param(_jsonpath(path))}::jsonpath")
+        elif len(values) == 1:
+            _add_containment(documents, _nest(path, values[0]))
+        else:
+            alternatives = " OR ".join(
+                f"extra_data @> {param(_nest(path, value))}::jsonb"
+                for value in values
+            )
+            conditions.append(f"({alternatives})")
+
+    conditions[:0] = [f"extra_data @> {param(document)}::jsonb" for document in documents]
+    if not conditions:
+        return "", []
+    return "".join(f"\n          AND {condition}" for condition in conditions), args
 
 
 # ============================================================================
@@ -130,6 +251,126 @@ async def count_audit_logs(
         return result or 0
 
 
+async def get_audit_logs_page(
+    pool: asyncpg.Pool,
+    user_id: Optional[UUID] = None,
+    action: Optional[str] = None,
+    entity_type: Optional[str] = None,
+    entity_id: Optional[UUID] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    limit: int = 100,
+    offset: int = 0
+) -> tuple[list[asyncpg.Record], int]:
+    """
+    Página de audit logs y total con los mismos filtros que get_audit_logs,
+    en una sola ida y vuelta (COUNT(*) OVER()). Cada fila incluye además
+    la columna total_count.
+    """
+    query = """
+        SELECT
+            id,
+            user_id,
+            action,
+            entity_type,
+            entity_id,
+            description,
+            extra_data,
+            ip_address,
+            user_agent,
+            created_at,
+            COUNT(*) OVER() AS total_count
+        FROM audit_logs
+        WHERE ($1::uuid IS NULL OR user_id = $1)
+          AND ($2::text IS NULL OR action = $2)
+          AND ($3::text IS NULL OR entity_type = $3)
+          AND ($4::uuid IS NULL OR entity_id = $4)
+          AND ($5::timestamp IS NULL OR created_at >= $5)
+          AND ($6::timestamp IS NULL OR created_at <= $6)
+        ORDER BY created_at DESC
+        LIMIT $7 OFFSET $8
+    """
+    count_query = """
+        SELECT COUNT(*)
+        FROM audit_logs
+        WHERE ($1::uuid IS NULL OR user_id = $1)
+          AND ($2::text IS NULL OR action = $2)
+          AND ($3::text IS NULL OR entity_type = $3)
+          AND ($4::uuid IS NULL OR entity_id = $4)
+          AND ($5::timestamp IS NULL OR created_at >= $5)
+          AND ($6::timestamp IS NULL OR created_at <= $6)
+    """
+    filters = (user_id, action, entity_type, entity_id, start_date, end_date)
+    async with pool.acquire() as conn:
+        rows = await conn.fetch(query, *filters, limit, offset)
+        if rows:
+            return rows, rows[0]["total_count"]
+        # Página vacía: el total sólo se conoce contando (offset más allá del final)
+        total = await conn.fetchval(count_query, *filters) if offset else 0
+        return rows, total
+
+
+async def search_audit_logs(
+    pool: asyncpg.Pool,
+    extra_data: Optional[dict[str, list[Any]]] = None,
+    extra_data_contains: Optional[dict] = None,
+    user_id: Optional[UUID] = None,
+    action: Optional[str] = None,
+    entity_type: Optional[str] = None,
+    entity_id: Optional[UUID] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    limit: int = 100,
+    offset: int = 0
+) -> tuple[list[asyncpg.Record], int]:
+    """
+    Página de audit logs y total filtrando además por claves de extra_data
+
+    Args:
+        extra_data: Ruta -> valores aceptados (ver build_extra_data_filter)
+        extra_data_contains: Documento que extra_data debe contener
+
+    Ejemplo: todos los CONFIG_CHANGE sobre max_upload_size
+        search_audit_logs(pool, {"setting": ["max_upload_size"]}, action="CONFIG_CHANGE")
+    """
+    extra_sql, extra_args = build_extra_data_filter(extra_data, extra_data_contains, first_param=7)
+    where = f"""
+        WHERE ($1::uuid IS NULL OR user_id = $1)
+          AND ($2::text IS NULL OR action = $2)
+          AND ($3::text IS NULL OR entity_type = $3)
+          AND ($4::uuid IS NULL OR entity_id = $4)
+          AND ($5::timestamp IS NULL OR created_at >= $5)
+          AND ($6::timestamp IS NULL OR created_at <= $6){extra_sql}
+    """
+    limit_param = 7 + len(extra_args)
+    query = f"""
+        SELECT
+            id,
+            user_id,
+            action,
+            entity_type,
+            entity_id,
+            description,
+            extra_data,
+            ip_address,
+            user_agent,
+            created_at,
+            COUNT(*) OVER() AS total_count
+        FROM audit_logs
+        {where}
+        ORDER BY created_at DESC
+        LIMIT ${limit_param} OFFSET ${limit_param + 1}
+    """
+    count_query = f"SELECT COUNT(*) FROM audit_logs {where}"
+    filters = (user_id, action, entity_type, entity_id, start_date, end_date, *extra_args)
+    async with pool.acquire() as conn:
+        rows = await conn.fetch(query, *filters, limit, offset)
+        if rows:
+            return rows, rows[0]["total_count"]
+        total = await conn.fetchval(count_query, *filters) if offset else 0
+        return rows, total
+
+
 async def get_recent_audit_logs_by_user(
     pool: asyncpg.Pool,
     user_id: UUID,
@@ -179,6 +420,56 @@ async def get_audit_logs_by_entity(
         return await conn.fetch(query, entity_type, entity_id, limit)
 
 
+async def stream_audit_logs(
+    pool: asyncpg.Pool,
+    user_id: Optional[UUID] = None,
+    action: Optional[str] = None,
+    entity_type: Optional[str] = None,
+    entity_id: Optional[UUID] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    extra_data: Optional[dict[str, list[Any]]] = None,
+    extra_data_contains: Optional[dict] = None,
+    batch_size: int = 5000
+) -> AsyncIterator[list[asyncpg.Record]]:
+    """
+    Recorrer audit logs filtrados en lotes con un cursor del servidor
+    (memoria constante: sólo un lote a la vez, sin LIMIT/OFFSET)
+
+    Mantiene una conexión y una transacción de sólo lectura (snapshot
+    consistente) mientras se consume el generador.
+    """
+    extra_sql, extra_args = build_extra_data_filter(extra_data, extra_data_contains, first_param=7)
+    query = f"""
+        SELECT
+            id,
+            user_id,
+            action,
+            entity_type,
+            entity_id,
+            description,
+            extra_data,
+            ip_address,
+            user_agent,
+            created_at
+        FROM audit_logs
+        WHERE ($1::uuid IS NULL OR user_id = $1)
+          AND ($2::text IS NULL OR action = $2)
+          AND ($3::text IS NULL OR entity_type = $3)
+          AND ($4::uuid IS NULL OR entity_id = $4)
+          AND ($5::timestamp IS NULL OR created_at >= $5)
+          AND ($6::timestamp IS NULL OR created_at <= $6){extra_sql}
+        ORDER BY created_at
+    """
+    async with pool.acquire() as conn:
+        async with conn.transaction(isolation="repeatable_read", readonly=True):
+            cursor = await conn.cursor(
+                query, user_id, action, entity_type, entity_id, start_date, end_date, *extra_args
+            )
+            while rows := await cursor.fetch(batch_size):
+                yield rows
+
+
 # ============================================================================
 # CREATE QUERIES
 # ============================================================================
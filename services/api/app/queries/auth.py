@@ -8,6 +8,8 @@ from typing import Optional
 from uuid import UUID
 import asyncpg
 
+from app.queries.instrumentation import primary_only
+
 
 async def authenticate_user(
     pool: asyncpg.Pool,
@@ -36,6 +38,7 @@ async def authenticate_user(
         return await conn.fetchrow(query, email)
 
 
+@primary_only
 async def get_user_permissions(
     pool: asyncpg.Pool,
     user_id: UUID
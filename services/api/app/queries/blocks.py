@@ -0,0 +1,68 @@
+"""
+Block SQL Queries
+
+Queries SQL puras para el modelo de bloques (blocks).
+"""
+
+from typing import Optional
+from uuid import UUID
+import asyncpg
+
+from app.numeric_profiles import NumericProfile, numeric_projection
+from app.queries.instrumentation import primary_only
+
+
+GRADE_COLUMNS = ("tonnage", "cu_grade_pct", "mo_grade_pct", "au_grade_gpt", "ag_grade_gpt")
+
+
+# =============================================================================
+# READ QUERIES
+# =============================================================================
+
+@primary_only
+async def get_phase_block_version(
+    pool: asyncpg.Pool,
+    phase_id: UUID
+) -> Optional[asyncpg.Record]:
+    """
+    Obtener la versión de los bloques de una fase.
+    Se usa como clave de cache: cambia al insertar, actualizar o eliminar bloques.
+    """
+    query = """
+        SELECT
+            mp.id AS phase_id,
+            mp.mine_id,
+            COUNT(b.id) AS block_count,
+            MAX(b.updated_at) AS last_updated_at
+        FROM mine_phases mp
+        LEFT JOIN blocks b ON b.mine_phase_id = mp.id
+        WHERE mp.id = $1
+          AND mp.deleted_at IS NULL
+        GROUP BY mp.id, mp.mine_id
+    """
+    async with pool.acquire() as conn:
+        return await conn.fetchrow(query, phase_id)
+
+
+@primary_only
+async def get_phase_block_grades(
+    pool: asyncpg.Pool,
+    phase_id: UUID,
+    include_mined: bool = False,
+    numeric: NumericProfile = "analytics",
+) -> list[asyncpg.Record]:
+    """
+    Obtener tonelaje y leyes de los bloques de una fase (para cálculos vectorizados).
+    Perfil numérico analytics por defecto: las columnas NUMERIC llegan como float.
+    """
+    query = f"""
+        SELECT
+            id,
+            {numeric_projection(numeric, "blocks", GRADE_COLUMNS)}
+        FROM blocks
+        WHERE mine_phase_id = $1
+          AND ($2 OR is_mined = FALSE)
+        ORDER BY block_k, block_j, block_i
+    """
+    async with pool.acquire() as conn:
+        return await conn.fetch(query, phase_id, include_mined)
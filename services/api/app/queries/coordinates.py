@@ -0,0 +1,93 @@
+"""
+Coordinate SQL Queries
+
+Queries SQL puras para coordenadas geoespaciales (coordinates).
+Las búsquedas espaciales (bbox, radio, k vecinos) se resuelven en memoria
+con app/services/spatial_index.py; aquí sólo se cargan los puntos.
+"""
+
+from datetime import datetime
+from typing import Optional
+import asyncpg
+
+from app.queries.instrumentation import primary_only
+
+
+# Columnas que necesita el índice espacial (NUMERIC -> float8)
+_INDEX_COLUMNS = """
+    id,
+    deposit_id,
+    point_type,
+    latitude::float8 AS latitude,
+    longitude::float8 AS longitude,
+    elevation_masl::float8 AS elevation_masl,
+    updated_at
+"""
+
+
+# =============================================================================
+# READ QUERIES
+# =============================================================================
+
+@primary_only
+async def get_coordinate_version(pool: asyncpg.Pool) -> asyncpg.Record:
+    """
+    Obtener la versión de la tabla de coordenadas.
+    COUNT detecta eliminaciones; MAX(updated_at) detecta inserciones y cambios.
+    """
+    query = """
+        SELECT
+            COUNT(*) AS point_count,
+            MAX(updated_at) AS last_updated_at
+        FROM coordinates
+    """
+    async with pool.acquire() as conn:
+        return await conn.fetchrow(query)
+
+
+@primary_only
+async def get_all_coordinates(pool: asyncpg.Pool) -> list[asyncpg.Record]:
+    """Obtener todas las coordenadas (carga completa del índice espacial)"""
+    query = f"""
+        SELECT {_INDEX_COLUMNS}
+        FROM coordinates
+    """
+    async with pool.acquire() as conn:
+        return await conn.fetch(query)
+
+
+@primary_only
+async def get_coordinates_updated_since(
+    pool: asyncpg.Pool,
+    since: datetime,
+) -> list[asyncpg.Record]:
+    """Obtener coordenadas creadas o modificadas después de `since` (refresco incremental)"""
+    query = f"""
+        SELECT {_INDEX_COLUMNS}
+        FROM coordinates
+        WHERE updated_at > $1
+    """
+    async with pool.acquire() as conn:
+        return await conn.fetch(query, since)
+
+
+async def get_coordinates_by_geohash_prefix(
+    pool: asyncpg.Pool,
+    prefix: str,
+    point_type: Optional[str] = None,
+) -> list[asyncpg.Record]:
+    """
+    Obtener coordenadas cuyo geohash comienza con `prefix` (una celda geohash).
+    El prefijo se expresa como rango para que idx_coordinates_geohash (COLLATE "C")
+    se use también con planes genéricos de prepared statements.
+    """
+    query = f"""
+        SELECT {_INDEX_COLUMNS}, geohash
+        FROM coordinates
+        WHERE geohash >= $1
+          AND geohash < $1 || '{{'
+          AND ($2::varchar IS NULL OR point_type = $2)
+        ORDER BY geohash
+    """
+    async with pool.acquire() as conn:
+        return await conn.fetch(query, prefix, point_type)
@@ -0,0 +1,228 @@
+"""
+Equipment Fleet SQL Queries
+
+Queries SQL puras para los tableros de estado de la flota (equipment):
+conteos por estado × categoría × mina, mantenciones vencidas y ranking de
+horas de operación.
+
+Todas filtran `e.deleted_at IS NULL`, el predicado de los índices parciales
+idx_equipment_status, idx_equipment_code e idx_equipment_operating_hours, y
+los estados con `e.status = ANY($n)`: así el planner puede usar esos índices
+en vez de recorrer los equipos dados de baja. Las columnas NUMERIC se
+proyectan según el perfil numérico (app/numeric_profiles.py, analytics por
+defecto: horas como float); los costos quedan siempre Decimal.
+"""
+
+from datetime import datetime
+from typing import Optional, Sequence
+from uuid import UUID
+
+import asyncpg
+
+from app.numeric_profiles import NumericProfile, numeric_projection
+from app.queries.instrumentation import primary_only
+
+
+# Estados que cuentan como flota (DECOMMISSIONED queda fuera de los tableros)
+FLEET_STATUSES = ("OPERATIONAL", "MAINTENANCE", "FAILED", "STANDBY")
+
+HOURS_COLUMNS = ("total_operating_hours", "hours_since_last_overhaul")
+
+
+# =============================================================================
+# CONTEOS
+# =============================================================================
+
+@primary_only
+async def get_fleet_status_counts(
+    pool: asyncpg.Pool,
+    statuses: Sequence[str] = FLEET_STATUSES,
+    mine_id: Optional[UUID] = None,
+) -> list[asyncpg.Record]:
+    """
+    Cantidad de equipos por mina, categoría y estado.
+    Se lee del primario: alimenta el snapshot versionado de la flota.
+    """
+    query = """
+        SELECT
+            e.mine_id,
+            m.code AS mine_code,
+            m.name AS mine_name,
+            et.category,
+            e.status,
+            COUNT(*) AS equipment_count
+        FROM equipment e
+        JOIN equipment_types et ON et.id = e.equipment_type_id
+        JOIN mines m ON m.id = e.mine_id
+        WHERE e.deleted_at IS NULL
+          AND e.status = ANY($1::equipment_status_enum[])
+          AND ($2::uuid IS NULL OR e.mine_id = $2)
+        GROUP BY e.mine_id, m.code, m.name, et.category, e.status
+        ORDER BY m.code, et.category, e.status
+    """
+    async with pool.acquire() as conn:
+        return await conn.fetch(query, list(statuses), mine_id)
+
+
+# =============================================================================
+# MANTENCIONES VENCIDAS
+# =============================================================================
+
+@primary_only
+async def list_overdue_maintenance(
+    pool: asyncpg.Pool,
+    as_of: datetime,
+    mine_id: Optional[UUID] = None,
+    limit: int = 100,
+    numeric: NumericProfile = "analytics",
+) -> list[asyncpg.Record]:
+    """
+    Equipos en flota con la mantención programada vencida a `as_of`,
+    el más atrasado primero
+    """
+    query = f"""
+        SELECT
+            e.id,
+            e.code,
+            e.name,
+            e.status,
+            e.mine_id,
+            m.code AS mine_code,
+            et.category,
+            e.last_maintenance_date,
+            e.next_maintenance_date,
+            (EXTRACT(EPOCH FROM ($1::timestamptz - e.next_maintenance_date)) / 3600)::float8 AS hours_overdue,
+            {numeric_projection(numeric, "equipment", HOURS_COLUMNS, "e")}
+        FROM equipment e
+        JOIN equipment_types et ON et.id = e.equipment_type_id
+        JOIN mines m ON m.id = e.mine_id
+        WHERE e.deleted_at IS NULL
+          AND e.status = ANY($2::equipment_status_enum[])
+          AND e.next_maintenance_date < $1::timestamptz
+          AND ($3::uuid IS NULL OR e.mine_id = $3)
+        ORDER BY e.next_maintenance_date, e.code
+        LIMIT $4
+    """
+    async with pool.acquire() as conn:
+        return await conn.fetch(query, as_of, list(FLEET_STATUSES), mine_id, limit)
+
+
+# =============================================================================
+# HORAS DE OPERACIÓN
+# =============================================================================
+
+@primary_only
+async def list_operating_hours_leaders(
+    pool: asyncpg.Pool,
+    per_category: int = 20,
+    numeric: NumericProfile = "analytics",
+) -> list[asyncpg.Record]:
+    """
+    Los `per_category` equipos con más horas de operación de cada categoría
+    (el ranking global está contenido en la unión de los rankings por categoría)
+    """
+    query = f"""
+        SELECT
+            id, code, name, status, mine_id, mine_code, category,
+            total_operating_hours, hours_since_last_overhaul
+        FROM (
+            SELECT
+                e.id,
+                e.code,
+                e.name,
+                e.status,
+                e.mine_id,
+                m.code AS mine_code,
+                et.category,
+                {numeric_projection(numeric, "equipment", HOURS_COLUMNS, "e")},
+                ROW_NUMBER() OVER (
+                    PARTITION BY et.category
+                    ORDER BY e.total_operating_hours DESC, e.code
+                ) AS category_rank
+            FROM equipment e
+            JOIN equipment_types et ON et.id = e.equipment_type_id
+            JOIN mines m ON m.id = e.mine_id
+            WHERE e.deleted_at IS NULL
+              AND e.status = ANY($1::equipment_status_enum[])
+        ) ranked
+        WHERE category_rank <= $2
+        ORDER BY total_operating_hours DESC, code
+    """
+    async with pool.acquire() as conn:
+        return await conn.fetch(query, list(FLEET_STATUSES), per_category)
+
+
+async def list_operating_hours_leaderboard(
+    pool: asyncpg.Pool,
+    limit: int = 20,
+    category: Optional[str] = None,
+    mine_id: Optional[UUID] = None,
+    numeric: NumericProfile = "analytics",
+) -> list[asyncpg.Record]:
+    """
+    Ranking de horas de operación filtrado por categoría y/o mina
+    (recorre idx_equipment_operating_hours en orden y corta en `limit`)
+    """
+    query = f"""
+        SELECT
+            e.id,
+            e.code,
+            e.name,
+            e.status,
+            e.mine_id,
+            m.code AS mine_code,
+            et.category,
+            {numeric_projection(numeric, "equipment", HOURS_COLUMNS, "e")}
+        FROM equipment e
+        JOIN equipment_types et ON et.id = e.equipment_type_id
+        JOIN mines m ON m.id = e.mine_id
+        WHERE e.deleted_at IS NULL
+          AND e.status = ANY($1::equipment_status_enum[])
+          AND ($2::equipment_category_enum IS NULL OR et.category = $2)
+          AND ($3::uuid IS NULL OR e.mine_id = $3)
+        ORDER BY e.total_operating_hours DESC, e.code
+        LIMIT $4
+    """
+    async with pool.acquire() as conn:
+        return await conn.fetch(query, list(FLEET_STATUSES), category, mine_id, limit)
+
+
+# =============================================================================
+# DETALLE
+# =============================================================================
+
+async def get_equipment_by_code(
+    pool: asyncpg.Pool,
+    code: str,
+    numeric: NumericProfile = "analytics",
+) -> Optional[asyncpg.Record]:
+    """Equipo vigente por código (idx_equipment_code); acquisition_cost siempre Decimal"""
+    query = f"""
+        SELECT
+            e.id,
+            e.code,
+            e.name,
+            e.serial_number,
+            e.asset_tag,
+            e.status,
+            e.mine_id,
+            m.code AS mine_code,
+            e.equipment_type_id,
+            et.code AS equipment_type_code,
+            et.category,
+            e.location_area,
+            e.installation_date,
+            e.last_maintenance_date,
+            e.next_maintenance_date,
+            {numeric_projection(numeric, "equipment", (*HOURS_COLUMNS, "acquisition_cost"), "e")},
+            e.acquisition_currency,
+            e.is_active,
+            e.updated_at
+        FROM equipment e
+        JOIN equipment_types et ON et.id = e.equipment_type_id
+        JOIN mines m ON m.id = e.mine_id
+        WHERE e.code = $1
+          AND e.deleted_at IS NULL
+    """
+    async with pool.acquire() as conn:
+        return await conn.fetchrow(query, code)
@@ -0,0 +1,132 @@
+"""
+Query Instrumentation
+
+Envuelve las funciones async de los módulos de app/queries para medir, por
+query (<módulo>.<función>):
+
+- duración total, espera de acquire del pool y tiempo de ejecución
+- filas retornadas y bytes (estimados)
+- errores
+
+Los valores van a Prometheus (app/metrics.py) y al registro en proceso de
+app/query_profiler.py (/v1/admin/queries). Se aplica una sola vez al importar
+el paquete app.queries (ver __init__.py), así cada query nueva queda
+instrumentada sin tocar su código.
+
+También enruta el pool: dentro de una unidad de trabajo (app/unit_of_work.py)
+todas usan su conexión; si no, las funciones de sólo lectura
+(get_/count_/search_/list_/check_) pueden ir a una réplica (app/database.py,
+route_pool) y el resto, y las marcadas con @primary_only, van al primario.
+"""
+
+import functools
+import inspect
+import time
+from types import ModuleType
+from typing import Callable
+
+from app.database import route_pool
+from app.metrics import (
+    DB_QUERY_ACQUIRE_WAIT,
+    DB_QUERY_BYTES_TOTAL,
+    DB_QUERY_DURATION,
+    DB_QUERY_ERRORS_TOTAL,
+    DB_QUERY_EXEC,
+    DB_QUERY_ROWS,
+)
+from app.query_profiler import end_query_call, query_stats, result_size, start_query_call
+from app.unit_of_work import current_unit_of_work
+
+
+READ_ONLY_PREFIXES = ("get_", "count_", "search_", "list_", "check_")
+
+
+def primary_only(func: Callable) -> Callable:
+    """
+    Marcar una función de lectura que debe leer siempre del primario
+    (p. ej. versiones y datos que alimentan caches, sesiones, permisos)
+    """
+    func.__primary_only__ = True
+    return func
+
+
+def query_kind(func: Callable) -> str:
+    """'read' (enrutable a réplica), 'primary_read' o 'write'"""
+    if not func.__name__.startswith(READ_ONLY_PREFIXES):
+        return "write"
+    return "primary_read" if getattr(func, "__primary_only__", False) else "read"
+
+
+def _route(pool, kind: str):
+    uow = current_unit_of_work()
+    if uow is not None and pool is uow.pool:
+        return uow
+    return route_pool(pool, kind)
+
+
+def _routed_args(args: tuple, kwargs: dict, kind: str) -> tuple[tuple, dict]:
+    """Reemplazar el pool (primer argumento o `pool=`) por el que corresponda"""
+    if args:
+        pool = _route(args[0], kind)
+        if pool is not args[0]:
+            args = (pool, *args[1:])
+    elif "pool" in kwargs:
+        kwargs["pool"] = _route(kwargs["pool"], kind)
+    return args, kwargs
+
+
+def instrument_query(name: str) -> Callable:
+    """Decorador que mide una función de query (ver docstring del módulo)"""
+    def decorator(func: Callable) -> Callable:
+        if getattr(func, "__instrumented__", False):
+            return func
+
+        kind = query_kind(func)
+
+        duration_metric = DB_QUERY_DURATION.labels(name)
+        acquire_metric = DB_QUERY_ACQUIRE_WAIT.labels(name)
+        exec_metric = DB_QUERY_EXEC.labels(name)
+        rows_metric = DB_QUERY_ROWS.labels(name)
+        bytes_metric = DB_QUERY_BYTES_TOTAL.labels(name)
+        errors_metric = DB_QUERY_ERRORS_TOTAL.labels(name)
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            args, kwargs = _routed_args(args, kwargs, kind)
+            call, token = start_query_call(name)
+            start = time.perf_counter()
+            rows = size = 0
+            error = False
+            try:
+                result = await func(*args, **kwargs)
+                rows, size = result_size(result)
+                return result
+            except Exception:
+                error = True
+                errors_metric.inc()
+                raise
+            finally:
+                duration = time.perf_counter() - start
+                end_query_call(token)
+                duration_metric.observe(duration)
+                acquire_metric.observe(call.acquire_wait)
+                exec_metric.observe(duration - call.acquire_wait)
+                rows_metric.observe(rows)
+                bytes_metric.inc(size)
+                query_stats.record(name, duration, call.acquire_wait, rows, size, error)
+
+        wrapper.__instrumented__ = True
+        return wrapper
+    return decorator
+
+
+def instrument_module(module: ModuleType) -> None:
+    """Instrumentar todas las funciones async públicas definidas en `module`"""
+    prefix = module.__name__.rsplit(".", 1)[-1]
+    for attr, func in vars(module).copy().items():
+        if (
+            not attr.startswith("_")
+            and inspect.iscoroutinefunction(func)
+            and func.__module__ == module.__name__
+        ):
+            setattr(module, attr, instrument_query(f"{prefix}.{attr}")(func))
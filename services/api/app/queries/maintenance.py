@@ -0,0 +1,109 @@
+"""
+Maintenance SQL Queries
+
+Queries SQL puras del scheduler de mantenimiento
+(app/services/maintenance_scheduler.py): equipos con mantención pendiente y
+creación por lotes de órdenes de trabajo (maintenance_work_orders).
+"""
+
+from typing import Sequence
+
+import asyncpg
+
+from app.numeric_profiles import NumericProfile, numeric_projection
+from app.queries.equipment_fleet import FLEET_STATUSES, HOURS_COLUMNS
+from app.queries.instrumentation import primary_only
+
+
+# Estados en los que la orden sigue abierta (a lo más una por equipo)
+OPEN_WORK_ORDER_STATUSES = ("PENDING", "SCHEDULED", "IN_PROGRESS", "ON_HOLD")
+
+
+# =============================================================================
+# READ QUERIES
+# =============================================================================
+
+@primary_only
+async def list_maintenance_candidates(
+    pool: asyncpg.Pool,
+    numeric: NumericProfile = "analytics",
+) -> list[asyncpg.Record]:
+    """
+    Equipos en flota con fecha u horas de mantención y sin orden abierta.
+    Recorre idx_equipment_next_maintenance; se lee del primario porque
+    alimenta la cola del scheduler. hours_recorded_at
+    (operating_hours_recorded_at, cambia sólo con las horas) es el ancla de
+    la proyección de horas.
+    """
+    query = f"""
+        SELECT
+            e.id,
+            e.code,
+            e.mine_id,
+            e.status,
+            e.next_maintenance_date,
+            {numeric_projection(numeric, "equipment", HOURS_COLUMNS, "e")},
+            e.operating_hours_recorded_at AS hours_recorded_at
+        FROM equipment e
+        WHERE e.deleted_at IS NULL
+          AND e.status = ANY($1::equipment_status_enum[])
+          AND (e.next_maintenance_date IS NOT NULL OR e.hours_since_last_overhaul IS NOT NULL)
+          AND NOT EXISTS (
+              SELECT 1
+              FROM maintenance_work_orders w
+              WHERE w.equipment_id = e.id
+                AND w.status = ANY($2::work_order_status_enum[])
+          )
+        ORDER BY e.next_maintenance_date NULLS LAST
+    """
+    async with pool.acquire() as conn:
+        return await conn.fetch(query, list(FLEET_STATUSES), list(OPEN_WORK_ORDER_STATUSES))
+
+
+# =============================================================================
+# WRITE QUERIES
+# =============================================================================
+
+async def create_work_orders_bulk(pool: asyncpg.Pool, orders: Sequence[dict]) -> list[asyncpg.Record]:
+    """
+    Crear órdenes de trabajo en una sola sentencia (unnest)
+
+    Los equipos que ya tienen una orden abierta se omiten (índice único
+    parcial idx_maintenance_work_orders_open_equipment): la generación es
+    idempotente aunque varios workers la ejecuten a la vez.
+
+    Args:
+        orders: dicts con id, equipment_id, maintenance_type, priority,
+            due_date, trigger_reason, operating_hours_at_creation, description
+
+    Returns:
+        Órdenes creadas (id, equipment_id, priority, due_date)
+    """
+    if not orders:
+        return []
+    query = """
+        INSERT INTO maintenance_work_orders (
+            id, equipment_id, maintenance_type, priority, due_date,
+            trigger_reason, operating_hours_at_creation, description
+        )
+        SELECT *
+        FROM unnest(
+            $1::uuid[],
+            $2::uuid[],
+            $3::maintenance_type_enum[],
+            $4::work_order_priority_enum[],
+            $5::timestamptz[],
+            $6::text[],
+            $7::numeric[],
+            $8::text[]
+        )
+        ON CONFLICT (equipment_id) WHERE status IN ('PENDING', 'SCHEDULED', 'IN_PROGRESS', 'ON_HOLD')
+        DO NOTHING
+        RETURNING id, equipment_id, priority, due_date
+    """
+    columns = (
+        "id", "equipment_id", "maintenance_type", "priority", "due_date",
+        "trigger_reason", "operating_hours_at_creation", "description",
+    )
+    async with pool.acquire() as conn:
+        return await conn.fetch(query, *([order[column] for order in orders] for column in columns))
@@ -0,0 +1,152 @@
+"""
+Process Area SQL Queries
+
+Queries SQL puras para las áreas de proceso de la planta concentradora.
+"""
+
+from typing import Optional
+from uuid import UUID
+import asyncpg
+
+from app.queries.instrumentation import primary_only
+
+
+# =============================================================================
+# READ QUERIES
+# =============================================================================
+
+async def get_active_process_areas(pool: asyncpg.Pool, mine_id: UUID) -> list[asyncpg.Record]:
+    """Obtener áreas de proceso activas de una mina en orden de flujo"""
+    query = """
+        SELECT
+            id,
+            parent_area_id,
+            code,
+            name,
+            area_type,
+            sequence_order,
+            design_capacity,
+            capacity_unit,
+            target_recovery_pct,
+            target_grade_pct,
+            circuit_type
+        FROM process_areas
+        WHERE mine_id = $1
+          AND is_active = TRUE
+        ORDER BY sequence_order
+    """
+    async with pool.acquire() as conn:
+        return await conn.fetch(query, mine_id)
+
+
+# =============================================================================
+# FLOWSHEET (árbol vía process_area_closure)
+# =============================================================================
+
+# Cada área con su profundidad, recuperación acumulada desde la raíz y
+# agregados de su subárbol, resueltos con la tabla de clausura (sin recursión).
+# Recuperaciones en serie = producto de target_recovery_pct (vía EXP(SUM(LN))).
+_FLOWSHEET_SELECT = """
+    SELECT
+        pa.id,
+        pa.mine_id,
+        pa.parent_area_id,
+        pa.code,
+        pa.name,
+        pa.area_type,
+        pa.sequence_order,
+        pa.design_capacity::float8 AS design_capacity,
+        pa.capacity_unit,
+        pa.target_recovery_pct::float8 AS target_recovery_pct,
+        pa.target_grade_pct::float8 AS target_grade_pct,
+        pa.circuit_type,
+        pa.is_active,
+        anc.depth,
+        anc.cumulative_recovery_pct,
+        sub.subtree_area_count,
+        sub.subtree_design_capacity_tph,
+        sub.bottleneck_capacity_tph,
+        sub.subtree_recovery_pct
+    FROM process_areas pa
+    CROSS JOIN LATERAL (
+        SELECT
+            MAX(c.depth) AS depth,
+            (CASE
+                WHEN BOOL_OR(a.target_recovery_pct = 0) THEN 0
+                ELSE EXP(SUM(LN(a.target_recovery_pct / 100)) FILTER (WHERE a.target_recovery_pct > 0)) * 100
+            END)::float8 AS cumulative_recovery_pct
+        FROM process_area_closure c
+        JOIN process_areas a ON a.id = c.ancestor_id
+        WHERE c.descendant_id = pa.id
+    ) anc
+    CROSS JOIN LATERAL (
+        SELECT
+            COUNT(*) AS subtree_area_count,
+            SUM(d.design_capacity) FILTER (WHERE d.capacity_unit = 'tph')::float8 AS subtree_design_capacity_tph,
+            MIN(d.design_capacity) FILTER (WHERE d.capacity_unit = 'tph')::float8 AS bottleneck_capacity_tph,
+            (CASE
+                WHEN BOOL_OR(d.target_recovery_pct = 0) THEN 0
+                ELSE EXP(SUM(LN(d.target_recovery_pct / 100)) FILTER (WHERE d.target_recovery_pct > 0)) * 100
+            END)::float8 AS subtree_recovery_pct
+        FROM process_area_closure c
+        JOIN process_areas d ON d.id = c.descendant_id
+        WHERE c.ancestor_id = pa.id
+          AND d.is_active = TRUE
+    ) sub
+"""
+
+
+@primary_only
+async def get_flowsheet_version(pool: asyncpg.Pool, mine_id: UUID) -> Optional[asyncpg.Record]:
+    """
+    Obtener la versión de las áreas de proceso de una mina (para ETag).
+    Retorna None si la mina no existe.
+    """
+    query = """
+        SELECT
+            m.id AS mine_id,
+            COUNT(pa.id) AS area_count,
+            MAX(pa.updated_at) AS last_updated_at
+        FROM mines m
+        LEFT JOIN process_areas pa ON pa.mine_id = m.id
+        WHERE m.id = $1
+          AND m.deleted_at IS NULL
+        GROUP BY m.id
+    """
+    async with pool.acquire() as conn:
+        return await conn.fetchrow(query, mine_id)
+
+
+@primary_only
+async def get_mine_flowsheet(
+    pool: asyncpg.Pool,
+    mine_id: UUID,
+    include_inactive: bool = False
+) -> list[asyncpg.Record]:
+    """Obtener todas las áreas de una mina con profundidad y agregados de subárbol"""
+    query = f"""
+        {_FLOWSHEET_SELECT}
+        WHERE pa.mine_id = $1
+          AND ($2 OR pa.is_active = TRUE)
+        ORDER BY anc.depth, pa.sequence_order, pa.code
+    """
+    async with pool.acquire() as conn:
+        return await conn.fetch(query, mine_id, include_inactive)
+
+
+async def get_process_area_subtree(
+    pool: asyncpg.Pool,
+    area_id: UUID,
+    include_inactive: bool = False
+) -> list[asyncpg.Record]:
+    """Obtener un área y todos sus descendientes con agregados de subárbol"""
+    query = f"""
+        {_FLOWSHEET_SELECT}
+        WHERE pa.id IN (
+            SELECT descendant_id FROM process_area_closure WHERE ancestor_id = $1
+        )
+          AND (pa.id = $1 OR $2 OR pa.is_active = TRUE)
+        ORDER BY anc.depth, pa.sequence_order, pa.code
+    """
+    async with pool.acquire() as conn:
+        return await conn.fetch(query, area_id, include_inactive)
@@ -0,0 +1,41 @@
+"""
+Reagent SQL Queries
+
+Queries SQL puras para el catálogo de reactivos.
+"""
+
+import asyncpg
+
+
+# =============================================================================
+# READ QUERIES
+# =============================================================================
+
+async def get_reagent_cost_per_tonne_by_type(pool: asyncpg.Pool) -> list[asyncpg.Record]:
+    """
+    Obtener el costo de reactivos por tonelada tratada, agrupado por tipo.
+
+    Por cada tipo (COLLECTOR, FROTHER, ...) se promedia el costo de los reactivos
+    activos usando la dosificación media recomendada:
+        costo (USD/t) = dosis media (g/t) / 1000 * costo unitario (USD/kg)
+    """
+    query = """
+        SELECT
+            reagent_type,
+            COUNT(*) AS reagent_count,
+            AVG(
+                (recommended_dosage_min + recommended_dosage_max) / 2 / 1000 * unit_cost
+            )::float8 AS cost_usd_per_tonne
+        FROM reagents
+        WHERE is_active = TRUE
+          AND unit_cost IS NOT NULL
+          AND recommended_dosage_min IS NOT NULL
+          AND recommended_dosage_max IS NOT NULL
+          AND COALESCE(dosage_unit, 'g/t') = 'g/t'
+          AND COALESCE(cost_unit, 'kg') = 'kg'
+          AND COALESCE(cost_currency, 'USD') = 'USD'
+        GROUP BY reagent_type
+        ORDER BY reagent_type
+    """
+    async with pool.acquire() as conn:
+        return await conn.fetch(query)
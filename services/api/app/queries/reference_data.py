@@ -0,0 +1,126 @@
+"""
+Reference Data SQL Queries
+
+Catálogos que cambian poco y se consultan seguido (Dash, selects de
+formularios): yacimientos, minas, tipos de equipo y reactivos; y los
+contadores de versión por tabla (table_versions) de los que se derivan los
+ETag. Los roles están en roles.py.
+"""
+
+from typing import Sequence
+
+import asyncpg
+
+from app.queries.instrumentation import primary_only
+
+
+# =============================================================================
+# VERSIONES
+# =============================================================================
+
+@primary_only
+async def get_table_versions(pool: asyncpg.Pool, tables: Sequence[str]) -> dict[str, int]:
+    """
+    Versión actual de cada tabla (0 si no tiene contador)
+
+    Se lee del primario, igual que los catálogos: un ETag con una versión
+    más nueva que los datos de una réplica quedaría en caché en el cliente.
+    """
+    query = """
+        SELECT table_name, version
+        FROM table_versions
+        WHERE table_name = ANY($1::text[])
+    """
+    async with pool.acquire() as conn:
+        rows = await conn.fetch(query, list(tables))
+    versions = {row["table_name"]: row["version"] for row in rows}
+    return {table: versions.get(table, 0) for table in tables}
+
+
+# =============================================================================
+# CATÁLOGOS
+# =============================================================================
+
+@primary_only
+async def list_deposits(pool: asyncpg.Pool) -> list[asyncpg.Record]:
+    """Yacimientos vigentes ordenados por código"""
+    query = """
+        SELECT
+            id,
+            code,
+            name,
+            primary_commodity,
+            secondary_commodity,
+            country,
+            region,
+            updated_at
+        FROM deposits
+        WHERE deleted_at IS NULL
+        ORDER BY code
+    """
+    async with pool.acquire() as conn:
+        return await conn.fetch(query)
+
+
+@primary_only
+async def list_mines(pool: asyncpg.Pool) -> list[asyncpg.Record]:
+    """Minas vigentes ordenadas por código"""
+    query = """
+        SELECT
+            id,
+            deposit_id,
+            code,
+            name,
+            mine_type,
+            is_active,
+            updated_at
+        FROM mines
+        WHERE deleted_at IS NULL
+        ORDER BY code
+    """
+    async with pool.acquire() as conn:
+        return await conn.fetch(query)
+
+
+@primary_only
+async def list_equipment_types(pool: asyncpg.Pool) -> list[asyncpg.Record]:
+    """Tipos de equipo ordenados por categoría y código"""
+    query = """
+        SELECT
+            id,
+            code,
+            name,
+            category,
+            manufacturer,
+            model,
+            capacity,
+            capacity_unit,
+            is_active,
+            updated_at
+        FROM equipment_types
+        ORDER BY category, code
+    """
+    async with pool.acquire() as conn:
+        return await conn.fetch(query)
+
+
+@primary_only
+async def list_reagents(pool: asyncpg.Pool) -> list[asyncpg.Record]:
+    """Reactivos ordenados por tipo y código"""
+    query = """
+        SELECT
+            id,
+            code,
+            name,
+            reagent_type,
+            chemical_family,
+            unit_cost,
+            cost_currency,
+            cost_unit,
+            is_active,
+            updated_at
+        FROM reagents
+        ORDER BY reagent_type, code
+    """
+    async with pool.acquire() as conn:
+        return await conn.fetch(query)
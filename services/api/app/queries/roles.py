@@ -8,7 +8,10 @@ from typing import Optional
 from uuid import UUID
 import asyncpg
 
+from app.queries.instrumentation import primary_only
 
+
+@primary_only
 async def get_all_roles(pool: asyncpg.Pool) -> list[asyncpg.Record]:
     """Obtener todos los roles ordenados por prioridad"""
     query = """
@@ -76,6 +79,7 @@ async def remove_role_from_user(
         return result is not None
 
 
+@primary_only
 async def get_user_roles(pool: asyncpg.Pool, user_id: UUID) -> list[str]:
     """Obtener nombres de roles de un usuario"""
     query = """
@@ -91,6 +95,7 @@ async def get_user_roles(pool: asyncpg.Pool, user_id: UUID) -> list[str]:
         return [row["name"] for row in rows]
 
 
+@primary_only
 async def check_user_has_role(
     pool: asyncpg.Pool,
     user_id: UUID,
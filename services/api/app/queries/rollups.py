@@ -0,0 +1,86 @@
+"""
+Roll-up SQL Queries
+
+Queries SQL puras para los agregados jerárquicos
+yacimiento → mina → fase → bloques (phase_block_aggregates).
+"""
+
+from typing import Optional
+from uuid import UUID
+import asyncpg
+
+from app.queries.instrumentation import primary_only
+
+
+# =============================================================================
+# READ QUERIES
+# =============================================================================
+
+@primary_only
+async def get_rollup_version(pool: asyncpg.Pool) -> asyncpg.Record:
+    """
+    Obtener la versión de los agregados y de la jerarquía.
+    Es barata (sin tocar blocks) y se usa para calcular el ETag antes del roll-up.
+    """
+    query = """
+        SELECT
+            (SELECT COUNT(*) FROM phase_block_aggregates) AS aggregate_count,
+            (SELECT COALESCE(SUM(version), 0) FROM phase_block_aggregates) AS aggregate_version,
+            (SELECT MAX(updated_at) FROM deposits) AS deposits_updated_at,
+            (SELECT MAX(updated_at) FROM mines) AS mines_updated_at,
+            (SELECT MAX(updated_at) FROM mine_phases) AS phases_updated_at,
+            (SELECT COUNT(*) FROM mine_phases) AS phase_count
+    """
+    async with pool.acquire() as conn:
+        return await conn.fetchrow(query)
+
+
+@primary_only
+async def get_phase_aggregates(
+    pool: asyncpg.Pool,
+    deposit_id: Optional[UUID] = None,
+) -> list[asyncpg.Record]:
+    """
+    Obtener los agregados por fase junto con su mina y yacimiento (una sola query).
+    Fases sin bloques aparecen con agregados en 0.
+    """
+    query = """
+        SELECT
+            d.id AS deposit_id,
+            d.code AS deposit_code,
+            d.name AS deposit_name,
+            m.id AS mine_id,
+            m.code AS mine_code,
+            m.name AS mine_name,
+            mp.id AS phase_id,
+            mp.code AS phase_code,
+            mp.name AS phase_name,
+            mp.sequence_number,
+            COALESCE(a.block_count, 0) AS block_count,
+            COALESCE(a.mined_block_count, 0) AS mined_block_count,
+            COALESCE(a.total_tonnage, 0)::float8 AS total_tonnage,
+            COALESCE(a.mined_tonnage, 0)::float8 AS mined_tonnage,
+            COALESCE(a.contained_cu_t, 0)::float8 AS contained_cu_t,
+            COALESCE(a.contained_mo_t, 0)::float8 AS contained_mo_t,
+            COALESCE(a.mined_cu_t, 0)::float8 AS mined_cu_t,
+            COALESCE(a.mined_mo_t, 0)::float8 AS mined_mo_t
+        FROM deposits d
+        LEFT JOIN mines m ON m.deposit_id = d.id AND m.deleted_at IS NULL
+        LEFT JOIN mine_phases mp ON mp.mine_id = m.id AND mp.deleted_at IS NULL
+        LEFT JOIN phase_block_aggregates a ON a.mine_phase_id = mp.id
+        WHERE d.deleted_at IS NULL
+          AND ($1::uuid IS NULL OR d.id = $1)
+        ORDER BY d.code, m.code, mp.sequence_number, mp.code
+    """
+    async with pool.acquire() as conn:
+        return await conn.fetch(query, deposit_id)
+
+
+# =============================================================================
+# MAINTENANCE
+# =============================================================================
+
+async def rebuild_phase_aggregates(pool: asyncpg.Pool) -> None:
+    """Recalcular todos los agregados desde blocks (corrige cualquier deriva)"""
+    async with pool.acquire() as conn:
+        await conn.execute("SELECT rebuild_phase_block_aggregates()")
@@ -9,6 +9,8 @@ from uuid import UUID
 from datetime import datetime
 import asyncpg
 
+from app.queries.instrumentation import primary_only
+
 
 async def create_session(
     pool: asyncpg.Pool,
@@ -44,6 +46,7 @@ async def create_session(
         )
 
 
+@primary_only
 async def get_session_by_token(
     pool: asyncpg.Pool,
     session_token: str
@@ -122,6 +125,7 @@ async def revoke_all_user_sessions(
         return len(results)
 
 
+@primary_only
 async def get_user_active_sessions(
     pool: asyncpg.Pool,
     user_id: UUID
@@ -5,7 +5,7 @@ Queries SQL puras para operaciones CRUD de usuarios.
 Ejecutar con asyncpg usando los helpers en app/database.py
 """
 
-from typing import Optional
+from typing import AsyncIterator, Optional, Sequence
 from uuid import UUID
 from datetime import datetime
 import asyncpg
@@ -87,6 +87,37 @@ async def get_user_by_username(pool: asyncpg.Pool, username: str) -> Optional[as
         return await conn.fetchrow(query, username)
 
 
+async def get_users_by_ids(pool: asyncpg.Pool, user_ids: Sequence[UUID]) -> dict[UUID, asyncpg.Record]:
+    """
+    Obtener varios usuarios (sin password_hash) por ID en una query
+
+    Para resolver usuarios fila a fila (p. ej. autores de audit logs) usar
+    get_loader(users.get_users_by_ids, pool) de app/dataloader.py.
+
+    Returns:
+        Mapa id -> usuario (los ids inexistentes o eliminados no aparecen)
+    """
+    if not user_ids:
+        return {}
+    query = """
+        SELECT
+            id,
+            email,
+            username,
+            first_name,
+            last_name,
+            is_active,
+            is_verified,
+            created_at
+        FROM users
+        WHERE id = ANY($1::uuid[])
+          AND deleted_at IS NULL
+    """
+    async with pool.acquire() as conn:
+        rows = await conn.fetch(query, list(dict.fromkeys(user_ids)))
+    return {row["id"]: row for row in rows}
+
+
 async def get_all_users(
     pool: asyncpg.Pool,
     limit: int = 100,
@@ -127,6 +158,87 @@ async def count_users(pool: asyncpg.Pool, is_active: Optional[bool] = None) -> i
         return await conn.fetchval(query, is_active)
 
 
+async def get_users_page(
+    pool: asyncpg.Pool,
+    limit: int = 100,
+    offset: int = 0,
+    is_active: Optional[bool] = None
+) -> tuple[list[asyncpg.Record], int]:
+    """
+    Página de usuarios y total en una sola ida y vuelta (COUNT(*) OVER())
+    Cada fila incluye además la columna total_count.
+    """
+    query = """
+        SELECT
+            id,
+            email,
+            username,
+            first_name,
+            last_name,
+            is_active,
+            is_verified,
+            created_at,
+            last_login_at,
+            COUNT(*) OVER() AS total_count
+        FROM users
+        WHERE deleted_at IS NULL
+          AND ($3::boolean IS NULL OR is_active = $3)
+        ORDER BY created_at DESC
+        LIMIT $1 OFFSET $2
+    """
+    count_query = """
+        SELECT COUNT(*)
+        FROM users
+        WHERE deleted_at IS NULL
+          AND ($1::boolean IS NULL OR is_active = $1)
+    """
+    async with pool.acquire() as conn:
+        rows = await conn.fetch(query, limit, offset, is_active)
+        if rows:
+            return rows, rows[0]["total_count"]
+        # Página vacía: el total sólo se conoce contando (offset más allá del final)
+        total = await conn.fetchval(count_query, is_active) if offset else 0
+        return rows, total
+
+
+async def stream_users(
+    pool: asyncpg.Pool,
+    is_active: Optional[bool] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    batch_size: int = 5000
+) -> AsyncIterator[list[asyncpg.Record]]:
+    """
+    Recorrer usuarios (sin password_hash) en lotes con un cursor del servidor
+    (memoria constante, snapshot consistente de sólo lectura)
+    """
+    query = """
+        SELECT
+            id,
+            email,
+            username,
+            first_name,
+            last_name,
+            is_active,
+            is_verified,
+            email_verified_at,
+            last_login_at,
+            created_at,
+            updated_at
+        FROM users
+        WHERE deleted_at IS NULL
+          AND ($1::boolean IS NULL OR is_active = $1)
+          AND ($2::timestamptz IS NULL OR created_at >= $2)
+          AND ($3::timestamptz IS NULL OR created_at <= $3)
+        ORDER BY created_at
+    """
+    async with pool.acquire() as conn:
+        async with conn.transaction(isolation="repeatable_read", readonly=True):
+            cursor = await conn.cursor(query, is_active, created_from, created_to)
+            while rows := await cursor.fetch(batch_size):
+                yield rows
+
+
 async def get_user_with_roles(pool: asyncpg.Pool, user_id: UUID) -> Optional[dict]:
     """Obtener usuario con sus roles"""
     user_query = """
@@ -0,0 +1,287 @@
+"""
+Query Profiler
+
+Análisis en vivo de las queries (por proceso/worker):
+
+- QueryCall: medición de una llamada a una función de app/queries
+  (espera de acquire, ejecución, filas, bytes estimados). Viaja en un ContextVar
+  para que el pool (app/database.py) pueda sumarle la espera de acquire.
+- QueryStatsRegistry: acumulados por query + percentiles sobre las últimas N llamadas
+- SlowQueryLog: ring buffer de sentencias lentas con su EXPLAIN (ANALYZE, BUFFERS),
+  alimentado por el query logger de asyncpg (Connection.add_query_logger)
+
+Se consulta vía /v1/admin/queries (app/routers/admin.py).
+"""
+
+import asyncio
+import time
+from collections import deque
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+import asyncpg
+import numpy as np
+
+from app.config import settings
+from app.metrics import DB_SLOW_QUERIES_TOTAL
+
+
+# =============================================================================
+# LLAMADA EN CURSO
+# =============================================================================
+
+class QueryCall:
+    """Medición de una llamada a una función de query"""
+
+    __slots__ = ("name", "acquire_wait", "acquires")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.acquire_wait = 0.0
+        self.acquires = 0
+
+
+_current_call: ContextVar[Optional[QueryCall]] = ContextVar("current_query_call", default=None)
+_explaining: ContextVar[bool] = ContextVar("explaining_slow_query", default=False)
+
+
+def current_query_call() -> Optional[QueryCall]:
+    """Llamada a app/queries en curso en este contexto (o None)"""
+    return _current_call.get()
+
+
+def start_query_call(name: str) -> tuple[QueryCall, Any]:
+    call = QueryCall(name)
+    return call, _current_call.set(call)
+
+
+def end_query_call(token: Any) -> None:
+    _current_call.reset(token)
+
+
+def record_acquire_wait(seconds: float) -> None:
+    """Sumar la espera de acquire a la llamada en curso (llamado por el pool)"""
+    call = _current_call.get()
+    if call is not None:
+        call.acquire_wait += seconds
+        call.acquires += 1
+
+
+# =============================================================================
+# FILAS Y BYTES
+# =============================================================================
+
+PAYLOAD_SAMPLE_ROWS = 50
+
+
+def _value_size(value: Any) -> int:
+    if value is None:
+        return 0
+    if isinstance(value, (str, bytes)):
+        return len(value)
+    if isinstance(value, (list, tuple)):
+        return sum(_value_size(v) for v in value)
+    if isinstance(value, dict):
+        return sum(len(str(k)) + _value_size(v) for k, v in value.items())
+    return 16  # números, UUID, fechas: tamaño fijo aproximado
+
+
+def result_size(result: Any) -> tuple[int, int]:
+    """
+    Filas y bytes estimados del resultado de una función de query
+    Los bytes se estiman sobre una muestra de filas y se extrapolan.
+    """
+    if result is None:
+        return 0, 0
+    if isinstance(result, dict) and result and isinstance(next(iter(result.values())), asyncpg.Record):
+        return result_size(list(result.values()))  # id -> fila de los lookups por lote (get_*_by_ids)
+    if isinstance(result, (asyncpg.Record, dict)):
+        return 1, _value_size(dict(result))
+    if isinstance(result, tuple) and result and isinstance(result[0], list):
+        return result_size(result[0])  # (filas, total) de las queries paginadas
+    if isinstance(result, list):
+        rows = len(result)
+        if not rows:
+            return 0, 0
+        sample = result[:PAYLOAD_SAMPLE_ROWS]
+        sample_bytes = sum(
+            _value_size(dict(row)) if isinstance(row, (asyncpg.Record, dict)) else _value_size(row)
+            for row in sample
+        )
+        return rows, sample_bytes * rows // len(sample)
+    return 1, _value_size(result)
+
+
+# =============================================================================
+# ESTADÍSTICAS POR QUERY
+# =============================================================================
+
+class _QueryStats:
+    __slots__ = ("calls", "errors", "total", "acquire_wait", "rows", "bytes", "max", "recent")
+
+    def __init__(self, window: int):
+        self.calls = 0
+        self.errors = 0
+        self.total = 0.0
+        self.acquire_wait = 0.0
+        self.rows = 0
+        self.bytes = 0
+        self.max = 0.0
+        self.recent: deque = deque(maxlen=window)
+
+
+class QueryStatsRegistry:
+    """Acumulados por query y percentiles sobre las últimas `window` llamadas"""
+
+    def __init__(self, window: int = 512):
+        self._window = window
+        self._stats: dict[str, _QueryStats] = {}
+        self.started_at = datetime.now(timezone.utc)
+
+    def record(self, name: str, duration: float, acquire_wait: float, rows: int, size: int, error: bool) -> None:
+        stats = self._stats.get(name)
+        if stats is None:
+            stats = self._stats[name] = _QueryStats(self._window)
+        stats.calls += 1
+        stats.errors += error
+        stats.total += duration
+        stats.acquire_wait += acquire_wait
+        stats.rows += rows
+        stats.bytes += size
+        stats.max = max(stats.max, duration)
+        stats.recent.append(duration)
+
+    def snapshot(self, order_by: str = "total_ms", limit: Optional[int] = None) -> list[dict]:
+        """Resumen por query ordenado (por defecto, por tiempo total: el hot path)"""
+        rows = []
+        for name, stats in self._stats.items():
+            p50, p95, p99 = (
+                np.percentile(np.fromiter(stats.recent, dtype=np.float64), [50, 95, 99]) * 1000
+                if stats.recent else (0.0, 0.0, 0.0)
+            )
+            rows.append({
+                "query": name,
+                "calls": stats.calls,
+                "errors": stats.errors,
+                "total_ms": stats.total * 1000,
+                "mean_ms": stats.total / stats.calls * 1000,
+                "p50_ms": float(p50),
+                "p95_ms": float(p95),
+                "p99_ms": float(p99),
+                "max_ms": stats.max * 1000,
+                "acquire_wait_ms": stats.acquire_wait * 1000,
+                "exec_ms": (stats.total - stats.acquire_wait) * 1000,
+                "rows": stats.rows,
+                "mean_rows": stats.rows / stats.calls,
+                "bytes": stats.bytes,
+            })
+        rows.sort(key=lambda row: row[order_by], reverse=True)
+        return rows[:limit] if limit else rows
+
+    def reset(self) -> None:
+        self._stats.clear()
+        self.started_at = datetime.now(timezone.utc)
+
+
+# =============================================================================
+# QUERIES LENTAS
+# =============================================================================
+
+class SlowQueryLog:
+    """
+    Ring buffer de sentencias lentas
+
+    Se registra como query logger en cada conexión del pool. Para una sentencia
+    que supera SLOW_QUERY_THRESHOLD_MS se guarda el SQL y, como máximo una vez
+    por query cada SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS, su plan:
+
+    - EXPLAIN (ANALYZE, BUFFERS) dentro de una transacción READ ONLY
+      (vuelve a ejecutar la sentencia; las escrituras fallan y no se aplican)
+    - si no es de sólo lectura, EXPLAIN sin ANALYZE
+    """
+
+    EXPLAIN_TIMEOUT_MS = 5000
+
+    def __init__(
+        self,
+        threshold_ms: float = settings.SLOW_QUERY_THRESHOLD_MS,
+        size: int = settings.SLOW_QUERY_LOG_SIZE,
+        explain: bool = settings.SLOW_QUERY_EXPLAIN,
+        explain_interval: float = settings.SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS,
+    ):
+        self.threshold = threshold_ms / 1000
+        self.explain = explain
+        self.explain_interval = explain_interval
+        self.entries: deque = deque(maxlen=size)
+        self._last_explained: dict[str, float] = {}
+        self._explain_task: Optional[asyncio.Task] = None
+        self._pool: Optional[asyncpg.Pool] = None
+
+    def attach(self, pool: asyncpg.Pool) -> None:
+        """Pool (asyncpg real) desde el que se obtienen conexiones para EXPLAIN"""
+        self._pool = pool
+
+    def on_query(self, record) -> None:
+        """Callback de Connection.add_query_logger (LoggedQuery)"""
+        if record.elapsed < self.threshold or _explaining.get():
+            return
+
+        call = _current_call.get()
+        name = call.name if call is not None else "unnamed"
+        DB_SLOW_QUERIES_TOTAL.labels(name).inc()
+
+        entry = {
+            "query": name,
+            "sql": record.query.strip(),
+            "elapsed_ms": record.elapsed * 1000,
+            "error": repr(record.exception) if record.exception else None,
+            "captured_at": datetime.now(timezone.utc).isoformat(),
+            "plan": None,
+            "plan_analyzed": False,
+        }
+        self.entries.append(entry)
+
+        now = time.monotonic()
+        if (
+            self.explain
+            and self._pool is not None
+            and record.exception is None
+            and (self._explain_task is None or self._explain_task.done())
+            and now - self._last_explained.get(name, float("-inf")) >= self.explain_interval
+        ):
+            self._last_explained[name] = now
+            self._explain_task = asyncio.get_running_loop().create_task(
+                self._explain(entry, record.query, record.args)
+            )
+
+    async def _explain(self, entry: dict, query: str, args: tuple) -> None:
+        _explaining.set(True)
+        try:
+            async with self._pool.acquire(timeout=1) as conn:
+                try:
+                    entry["plan"] = await self._run_explain(conn, "ANALYZE, BUFFERS, FORMAT TEXT", query, args)
+                    entry["plan_analyzed"] = True
+                except asyncpg.ReadOnlySQLTransactionError:
+                    entry["plan"] = await self._run_explain(conn, "FORMAT TEXT", query, args)
+        except Exception as e:
+            entry["plan"] = f"EXPLAIN no disponible: {e!r}"
+
+    async def _run_explain(self, conn: asyncpg.Connection, options: str, query: str, args: tuple) -> str:
+        async with conn.transaction(readonly=True):
+            await conn.execute(f"SET LOCAL statement_timeout = {self.EXPLAIN_TIMEOUT_MS}")
+            rows = await conn.fetch(f"EXPLAIN ({options}) {query}", *args)
+        return "\n".join(row[0] for row in rows)
+
+    def snapshot(self) -> list[dict]:
+        """Entradas del buffer, la más reciente primero"""
+        return list(reversed(self.entries))
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self._last_explained.clear()
+
+
+# Instancias globales (una por proceso)
+query_stats = QueryStatsRegistry()
+slow_query_log = SlowQueryLog()
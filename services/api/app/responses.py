@@ -0,0 +1,155 @@
+"""
+Fast JSON Responses
+
+Serialización con orjson de los resultados de app/queries:
+
+- asyncpg.Record se convierte a objeto JSON sin pasar por dict intermedios de Pydantic
+- UUID, datetime/date/time: nativos en orjson
+- Decimal (NUMERIC) -> número; INET/CIDR (ipaddress) -> string
+- datetime UTC con sufijo Z (OPT_UTC_Z), igual que Pydantic
+
+ORJSONResponse es la clase de respuesta por defecto de la app. fast_json()
+devuelve la respuesta directamente, así FastAPI no vuelve a validar con el
+response_model (la salida de la base de datos es confiable); con
+FAST_JSON_VALIDATE=true se valida igual contra el modelo (útil en desarrollo).
+
+Con model, fast_json() arma cada objeto con los campos del modelo, en su
+orden: los campos que la query no selecciona salen con su default (null) y
+las columnas que el modelo no declara no salen; los campos float reciben
+float (Decimal/int). El body queda byte a byte igual al del camino con
+response_model (verificado en scripts/benchmark_serialization.py).
+"""
+
+import ipaddress
+import types
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Optional, Union, get_args, get_origin
+
+import asyncpg
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, TypeAdapter
+
+from app.config import settings
+
+
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_UTC_Z
+
+_IP_TYPES = (
+    ipaddress.IPv4Address, ipaddress.IPv6Address,
+    ipaddress.IPv4Interface, ipaddress.IPv6Interface,
+    ipaddress.IPv4Network, ipaddress.IPv6Network,
+)
+
+
+def orjson_default(obj: Any) -> Any:
+    """Tipos que orjson no serializa por sí solo"""
+    if isinstance(obj, asyncpg.Record):
+        return dict(obj.items())
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, _IP_TYPES):
+        return str(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=orjson_default, option=ORJSON_OPTIONS)
+
+
+class ORJSONResponse(JSONResponse):
+    """JSONResponse serializada con orjson (acepta asyncpg.Record, Decimal, INET)"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+@lru_cache(maxsize=128)
+def _adapter(model: Any) -> TypeAdapter:
+    return TypeAdapter(model)
+
+
+# =============================================================================
+# FORMA DEL MODELO
+# =============================================================================
+
+# Plan de armado de una anotación (None = el valor sale tal cual):
+#   ("float",)                                 float(valor)
+#   ("list", plan)                             cada elemento con plan
+#   ("model", ((campo, default, plan), ...))   objeto con los campos del modelo
+_FLOAT = ("float",)
+_MISSING = object()
+
+
+@lru_cache(maxsize=256)
+def _plan(annotation: Any) -> Optional[tuple]:
+    if annotation is float:
+        return _FLOAT
+    origin = get_origin(annotation)
+    if origin in (Union, types.UnionType):
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        return _plan(args[0]) if len(args) == 1 else None
+    if origin is list:
+        (item,) = get_args(annotation) or (Any,)
+        item_plan = _plan(item)
+        return ("list", item_plan) if item_plan is not None else None
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return (
+            "model",
+            tuple(
+                (
+                    name,
+                    _MISSING if field.is_required() else field.get_default(call_default_factory=True),
+                    _plan(field.annotation),
+                )
+                for name, field in annotation.model_fields.items()
+            ),
+        )
+    return None
+
+
+def _shape(value: Any, plan: Optional[tuple]) -> Any:
+    """Armar value (Record, dict, lista) según el plan del modelo"""
+    if plan is None or value is None:
+        return value
+    kind = plan[0]
+    if kind == "float":
+        return float(value) if isinstance(value, (int, Decimal)) and not isinstance(value, bool) else value
+    if kind == "list":
+        return [_shape(item, plan[1]) for item in value]
+    if not isinstance(value, (dict, asyncpg.Record)):
+        return value
+    shaped = {}
+    for name, default, field_plan in plan[1]:
+        field_value = value.get(name, default)
+        if field_value is not _MISSING:
+            shaped[name] = _shape(field_value, field_plan)
+    return shaped
+
+
+def fast_json(
+    content: Any,
+    *,
+    model: Optional[Any] = None,
+    status_code: int = 200,
+    headers: Optional[dict] = None,
+) -> ORJSONResponse:
+    """
+    Respuesta JSON directa para salida confiable de la base de datos
+
+    Args:
+        content: dict/list con asyncpg.Record, UUID, Decimal, datetime, ...
+        model: response_model del endpoint: da la forma de la salida (campos y
+            orden); sólo se valida si FAST_JSON_VALIDATE=true
+        status_code: Status HTTP
+        headers: Headers adicionales (ETag, Cache-Control, ...)
+    """
+    if model is not None:
+        content = _shape(content, _plan(model))
+        if settings.FAST_JSON_VALIDATE:
+            # Convertir con orjson para validar lo mismo que recibirá el cliente
+            _adapter(model).validate_json(dumps(content))
+    return ORJSONResponse(content, status_code=status_code, headers=headers)
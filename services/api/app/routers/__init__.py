@@ -0,0 +1,26 @@
+"""
+API Routers Package
+
+Endpoints organizados por recurso. Cada módulo expone un `router`
+que se registra en app/main.py con el prefijo /v1.
+"""
+
+from . import block_values
+from . import coordinates
+from . import rollups
+from . import process_areas
+from . import admin
+from . import exports
+from . import audit_logs
+from . import reference
+
+__all__ = [
+    "block_values",
+    "coordinates",
+    "rollups",
+    "process_areas",
+    "admin",
+    "exports",
+    "audit_logs",
+    "reference",
+]
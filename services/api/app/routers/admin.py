@@ -0,0 +1,104 @@
+"""
+Admin Endpoints
+
+Análisis en vivo de queries (por worker): estadísticas por función de
+app/queries, ring buffer de sentencias lentas con su EXPLAIN y estado del
+pool adaptativo con sus señales de saturación, caché de referencia y cola
+del scheduler de mantenimiento.
+Deshabilitados en producción salvo ADMIN_ENDPOINTS_ENABLED=true.
+"""
+
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app.config import settings
+from app.database import get_db_pool, get_replica_set
+from app.pool_manager import pool_manager
+from app.query_profiler import query_stats, slow_query_log
+from app.services.maintenance_scheduler import get_maintenance_scheduler
+from app.services.reference_cache import get_reference_cache
+
+
+def require_admin_endpoints():
+    """Dependency: 404 si los endpoints de administración están deshabilitados"""
+    if not settings.ADMIN_ENDPOINTS_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+
+
+router = APIRouter(
+    prefix="/admin",
+    tags=["Admin"],
+    dependencies=[Depends(require_admin_endpoints)],
+)
+
+
+@router.get("/queries")
+async def get_query_stats(
+    order_by: Literal["total_ms", "p95_ms", "calls", "acquire_wait_ms", "rows", "bytes"] = Query("total_ms"),
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+):
+    """Estadísticas por query (hot path primero) desde el arranque o el último reset"""
+    return {
+        "since": query_stats.started_at.isoformat(),
+        "slow_query_threshold_ms": slow_query_log.threshold * 1000,
+        "queries": query_stats.snapshot(order_by=order_by, limit=limit),
+    }
+
+
+@router.delete("/queries", status_code=204)
+async def reset_query_stats():
+    """Reiniciar las estadísticas por query"""
+    query_stats.reset()
+
+
+@router.get("/queries/slow")
+async def get_slow_queries(limit: int = Query(50, ge=1, le=1000)):
+    """Sentencias lentas recientes con su plan (EXPLAIN ANALYZE, BUFFERS)"""
+    entries = slow_query_log.snapshot()
+    return {
+        "count": len(entries),
+        "threshold_ms": slow_query_log.threshold * 1000,
+        "entries": entries[:limit],
+    }
+
+
+@router.delete("/queries/slow", status_code=204)
+async def clear_slow_queries():
+    """Vaciar el buffer de sentencias lentas"""
+    slow_query_log.clear()
+
+
+@router.get("/pool")
+async def get_pool_status(refresh: bool = Query(False, description="Volver a consultar pg_stat_activity y el retraso de las réplicas")):
+    """
+    Estado del pool de este worker: límite adaptativo, uso, percentiles de espera
+    de acquire, presupuesto API_WORKERS × max_size frente a max_connections
+    y retraso/disponibilidad de las réplicas de lectura
+    """
+    pool = await get_db_pool()
+    replicas = get_replica_set()
+    if refresh:
+        await pool_manager.refresh_server_stats(pool.pool)
+        if replicas is not None:
+            await replicas.check()
+    status = pool_manager.snapshot(pool.pool)
+    status["replicas"] = replicas.snapshot() if replicas is not None else []
+    return status
+
+
+@router.get("/reference-cache")
+async def get_reference_cache_status(refresh: bool = Query(False, description="Comparar versiones con la base de datos y recargar las tablas que cambiaron")):
+    """Versión, filas y antigüedad de cada tabla en la caché de referencia de este worker"""
+    cache = get_reference_cache()
+    reloaded = await cache.refresh(await get_db_pool(), trigger="admin") if refresh else []
+    return {**cache.stats(), "reloaded": reloaded}
+
+
+@router.get("/maintenance-scheduler")
+async def get_maintenance_scheduler_status(rebuild: bool = Query(False, description="Reconstruir la cola desde la base de datos")):
+    """Tamaño, versión y próximo vencimiento de la cola de mantención de este worker"""
+    scheduler = get_maintenance_scheduler()
+    if rebuild:
+        await scheduler.refresh(await get_db_pool(), force=True)
+    return scheduler.stats()
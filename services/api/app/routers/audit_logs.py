@@ -0,0 +1,124 @@
+"""
+Audit Log Endpoints
+
+Consulta de audit logs con filtros por columnas y por claves de extra_data
+(JSONB, índice GIN jsonb_path_ops):
+
+    GET /v1/audit-logs?action=CONFIG_CHANGE&extra=setting=max_upload_size
+    GET /v1/audit-logs?extra=status=failed&extra=status=timeout   (cualquiera)
+    GET /v1/audit-logs?extra=request.retry                        (la clave existe)
+    GET /v1/audit-logs?extra_contains={"changes":{"field":"email"}}
+
+Con include_user=true cada log trae su autor, resuelto con el DataLoader del
+request (app/dataloader.py): una query por página para todos los autores, no
+una por log.
+"""
+
+from datetime import datetime
+from typing import Any, Optional
+from uuid import UUID
+
+import asyncpg
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app.database import get_db_pool
+from app.dataloader import get_loader
+from app.models.audit_log import AuditActionEnum, AuditLogListResponse, AuditLogPublic
+from app.queries import audit_logs, users
+from app.responses import fast_json
+
+router = APIRouter(prefix="/audit-logs", tags=["Audit Logs"])
+
+
+def extra_data_filters(
+    extra: list[str] = Query(
+        [],
+        description="Filtro ruta=valor sobre extra_data (ruta con puntos, valor JSON o texto); "
+                    "repetido sobre la misma ruta = cualquiera de los valores; sólo ruta = la clave existe",
+    ),
+    extra_contains: Optional[str] = Query(None, description="Objeto JSON que extra_data debe contener"),
+) -> tuple[dict[str, list[Any]], Optional[dict]]:
+    """Dependency: parsear los filtros de extra_data de la query string"""
+    filters: dict[str, list[Any]] = {}
+    for item in extra:
+        path, sep, raw = item.partition("=")
+        if not path or any(not key for key in path.split(".")):
+            raise HTTPException(status_code=422, detail=f"Filtro extra_data inválido: {item!r}")
+        values = filters.setdefault(path, [])
+        if not sep:
+            continue
+        try:
+            values.append(orjson.loads(raw))
+        except orjson.JSONDecodeError:
+            values.append(raw)
+
+    contains = None
+    if extra_contains:
+        try:
+            contains = orjson.loads(extra_contains)
+        except orjson.JSONDecodeError:
+            contains = None
+        if not isinstance(contains, dict):
+            raise HTTPException(status_code=422, detail="extra_contains debe ser un objeto JSON")
+    return filters, contains
+
+
+async def _with_users(pool: asyncpg.Pool, rows) -> list[dict]:
+    """Agregar el autor (`user`) a cada log; los ids de toda la página van en un lote"""
+    loader = get_loader(users.get_users_by_ids, pool)
+    user_ids = [row["user_id"] for row in rows if row["user_id"] is not None]
+    authors = dict(zip(user_ids, await loader.load_many(user_ids)))
+    return [{**dict(row.items()), "user": authors.get(row["user_id"])} for row in rows]
+
+
+@router.get("", response_model=AuditLogListResponse)
+async def list_audit_logs(
+    user_id: Optional[UUID] = Query(None),
+    action: Optional[AuditActionEnum] = Query(None),
+    entity_type: Optional[str] = Query(None, max_length=100),
+    entity_id: Optional[UUID] = Query(None),
+    start_date: Optional[datetime] = Query(None),
+    end_date: Optional[datetime] = Query(None),
+    limit: int = Query(100, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+    include_user: bool = Query(False, description="Incluir el usuario autor de cada log"),
+    extra: tuple[dict[str, list[Any]], Optional[dict]] = Depends(extra_data_filters),
+    pool: asyncpg.Pool = Depends(get_db_pool),
+):
+    """Listar audit logs (más recientes primero) con filtros opcionales"""
+    filters, contains = extra
+    rows, total = await audit_logs.search_audit_logs(
+        pool,
+        extra_data=filters,
+        extra_data_contains=contains,
+        user_id=user_id,
+        action=action.value if action else None,
+        entity_type=entity_type,
+        entity_id=entity_id,
+        start_date=start_date,
+        end_date=end_date,
+        limit=limit,
+        offset=offset,
+    )
+    if include_user:
+        rows = await _with_users(pool, rows)
+    return fast_json(
+        {"logs": rows, "total": total, "limit": limit, "offset": offset},
+        model=AuditLogListResponse,
+    )
+
+
+@router.get("/{log_id}", response_model=AuditLogPublic)
+async def get_audit_log(
+    log_id: UUID,
+    include_user: bool = Query(False, description="Incluir el usuario autor del log"),
+    pool: asyncpg.Pool = Depends(get_db_pool),
+):
+    """Obtener un audit log por ID"""
+    row = await audit_logs.get_audit_log_by_id(pool, log_id)
+    if row is None:
+        raise HTTPException(status_code=404, detail="Audit log no encontrado")
+    if include_user:
+        (row,) = await _with_users(pool, [row])
+    return fast_json(row, model=AuditLogPublic)
@@ -0,0 +1,46 @@
+"""
+Block Value Endpoints
+
+Valorización económica de bloques por escenario de precios/costos.
+"""
+
+import time
+from uuid import UUID
+
+import asyncpg
+from fastapi import APIRouter, Depends, HTTPException
+
+from app.database import get_db_pool
+from app.models.block_value import BlockValueRequest, BlockValueResponse
+from app.services.block_value import BlockValueService, get_block_value_service
+
+router = APIRouter()
+
+
+@router.post(
+    "/mine-phases/{phase_id}/block-values",
+    response_model=BlockValueResponse,
+    tags=["Block Values"],
+)
+async def evaluate_block_values(
+    phase_id: UUID,
+    request: BlockValueRequest,
+    pool: asyncpg.Pool = Depends(get_db_pool),
+    service: BlockValueService = Depends(get_block_value_service),
+):
+    """
+    Evaluar el valor económico de los bloques de una fase
+    para uno o más escenarios de precios (hasta 100 por request)
+    """
+    start = time.perf_counter()
+    try:
+        results = await service.evaluate(pool, phase_id, request.scenarios, request.include_mined)
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    return {
+        "phase_id": phase_id,
+        "block_count": results[0]["block_count"] if results else 0,
+        "results": results,
+        "elapsed_ms": (time.perf_counter() - start) * 1000,
+    }
@@ -0,0 +1,102 @@
+"""
+Coordinate Endpoints
+
+Búsquedas espaciales sobre coordenadas: k vecinos, radio, bounding box
+y celdas geohash.
+"""
+
+import time
+from typing import Optional
+
+import asyncpg
+from fastapi import APIRouter, Depends, HTTPException, Query, Path
+
+from app.database import get_db_pool
+from app.models.coordinate import SpatialSearchResponse
+from app.queries import coordinates
+from app.responses import ORJSONResponse, fast_json
+from app.services.spatial_index import SpatialIndexService, get_spatial_index_service
+
+router = APIRouter(prefix="/coordinates", tags=["Coordinates"])
+
+
+def _response(results: list, index_size: int, start: float) -> ORJSONResponse:
+    # Resultados confiables (índice / base de datos): sin re-validar con Pydantic
+    return fast_json(
+        {
+            "count": len(results),
+            "results": results,
+            "index_size": index_size,
+            "elapsed_ms": (time.perf_counter() - start) * 1000,
+        },
+        model=SpatialSearchResponse,
+    )
+
+
+@router.get("/nearest", response_model=SpatialSearchResponse)
+async def get_nearest_coordinates(
+    latitude: float = Query(..., ge=-90, le=90),
+    longitude: float = Query(..., ge=-180, le=180),
+    k: int = Query(5, ge=1, le=1000),
+    point_type: Optional[str] = Query(None, max_length=50),
+    pool: asyncpg.Pool = Depends(get_db_pool),
+    service: SpatialIndexService = Depends(get_spatial_index_service),
+):
+    """Obtener los k puntos más cercanos a una ubicación"""
+    start = time.perf_counter()
+    index = await service.get_index(pool)
+    results = index.nearest(latitude, longitude, k=k, point_type=point_type)
+    return _response(results, len(index), start)
+
+
+@router.get("/within-radius", response_model=SpatialSearchResponse)
+async def get_coordinates_within_radius(
+    latitude: float = Query(..., ge=-90, le=90),
+    longitude: float = Query(..., ge=-180, le=180),
+    radius_m: float = Query(..., gt=0, le=500_000),
+    point_type: Optional[str] = Query(None, max_length=50),
+    limit: int = Query(1000, ge=1, le=10000),
+    pool: asyncpg.Pool = Depends(get_db_pool),
+    service: SpatialIndexService = Depends(get_spatial_index_service),
+):
+    """Obtener los puntos a menos de `radius_m` metros, ordenados por distancia"""
+    start = time.perf_counter()
+    index = await service.get_index(pool)
+    results = index.within_radius(latitude, longitude, radius_m, point_type=point_type, limit=limit)
+    return _response(results, len(index), start)
+
+
+@router.get("/within-bbox", response_model=SpatialSearchResponse)
+async def get_coordinates_within_bbox(
+    min_latitude: float = Query(..., ge=-90, le=90),
+    min_longitude: float = Query(..., ge=-180, le=180),
+    max_latitude: float = Query(..., ge=-90, le=90),
+    max_longitude: float = Query(..., ge=-180, le=180),
+    point_type: Optional[str] = Query(None, max_length=50),
+    limit: int = Query(1000, ge=1, le=10000),
+    pool: asyncpg.Pool = Depends(get_db_pool),
+    service: SpatialIndexService = Depends(get_spatial_index_service),
+):
+    """Obtener los puntos dentro de un rectángulo latitud/longitud"""
+    if min_latitude > max_latitude or min_longitude > max_longitude:
+        raise HTTPException(status_code=400, detail="El mínimo del bounding box no puede superar al máximo")
+
+    start = time.perf_counter()
+    index = await service.get_index(pool)
+    results = index.within_bbox(
+        min_latitude, min_longitude, max_latitude, max_longitude,
+        point_type=point_type, limit=limit,
+    )
+    return _response(results, len(index), start)
+
+
+@router.get("/geohash/{prefix}", response_model=SpatialSearchResponse)
+async def get_coordinates_by_geohash(
+    prefix: str = Path(..., min_length=1, max_length=12, pattern="^[0123456789bcdefghjkmnpqrstuvwxyz]+$"),
+    point_type: Optional[str] = Query(None, max_length=50),
+    pool: asyncpg.Pool = Depends(get_db_pool),
+):
+    """Obtener los puntos de una celda geohash (consulta directa a la base de datos)"""
+    start = time.perf_counter()
+    rows = await coordinates.get_coordinates_by_geohash_prefix(pool, prefix, point_type)
+    return _response(rows, len(rows), start)
@@ -0,0 +1,140 @@
+"""
+Export Endpoints
+
+Exportación en streaming de audit logs y usuarios (NDJSON o CSV, gzip
+opcional) con cursores del servidor: memoria constante sin importar el
+número de filas. Las lecturas van a una réplica si hay alguna disponible.
+"""
+
+from datetime import datetime
+from typing import Any, Optional
+from uuid import UUID
+
+import asyncpg
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+from app.config import settings
+from app.database import get_db_pool, route_pool
+from app.queries import audit_logs, users
+from app.routers.audit_logs import extra_data_filters
+from app.services.export import (
+    MEDIA_TYPES,
+    ExportFormat,
+    export_stream,
+    release_export_slot,
+    try_acquire_export_slot,
+)
+
+router = APIRouter(prefix="/exports", tags=["Exports"])
+
+
+AUDIT_LOG_COLUMNS = (
+    "id", "user_id", "action", "entity_type", "entity_id", "description",
+    "extra_data", "ip_address", "user_agent", "created_at",
+)
+USER_COLUMNS = (
+    "id", "email", "username", "first_name", "last_name", "is_active", "is_verified",
+    "email_verified_at", "last_login_at", "created_at", "updated_at",
+)
+
+
+def _wants_gzip(request: Request, gzip: Optional[bool]) -> bool:
+    if gzip is not None:
+        return gzip
+    return "gzip" in request.headers.get("accept-encoding", "").lower()
+
+
+class _ExportResponse(StreamingResponse):
+    """
+    StreamingResponse que libera el cupo de exportación al terminar la respuesta,
+    aunque el cuerpo nunca se haya empezado a iterar (cliente desconectado antes
+    del primer chunk, error al enviar los headers)
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            release_export_slot()
+
+
+def _reserve_slot() -> None:
+    if not try_acquire_export_slot():
+        raise HTTPException(
+            status_code=429,
+            detail=f"Hay {settings.EXPORT_MAX_CONCURRENT} exportaciones en curso, reintentar más tarde",
+            headers={"Retry-After": "30"},
+        )
+
+
+def _streaming_response(name: str, batches, export_format: ExportFormat, columns, compress: bool) -> StreamingResponse:
+    filename = f"{name}-{datetime.utcnow():%Y%m%dT%H%M%SZ}.{export_format}"
+    headers = {
+        "Content-Disposition": f'attachment; filename="{filename}"',
+        "Cache-Control": "no-store",
+        "X-Accel-Buffering": "no",  # Sin buffer en proxies (nginx/traefik)
+    }
+    if compress:
+        headers["Content-Encoding"] = "gzip"
+        headers["Vary"] = "Accept-Encoding"
+    # El cupo se toma justo antes de crear la respuesta, que es la que lo libera
+    _reserve_slot()
+    return _ExportResponse(
+        export_stream(name, batches, export_format, columns, compress),
+        media_type=MEDIA_TYPES[export_format],
+        headers=headers,
+    )
+
+
+@router.get("/audit-logs")
+async def export_audit_logs(
+    request: Request,
+    format: ExportFormat = Query("ndjson"),
+    gzip: Optional[bool] = Query(None, description="Comprimir (por defecto según Accept-Encoding)"),
+    user_id: Optional[UUID] = Query(None),
+    action: Optional[str] = Query(None, max_length=50),
+    entity_type: Optional[str] = Query(None, max_length=100),
+    entity_id: Optional[UUID] = Query(None),
+    start_date: Optional[datetime] = Query(None),
+    end_date: Optional[datetime] = Query(None),
+    extra: tuple[dict[str, list[Any]], Optional[dict]] = Depends(extra_data_filters),
+    pool: asyncpg.Pool = Depends(get_db_pool),
+):
+    """Exportar audit logs filtrados (también por extra_data), ordenados por fecha de creación"""
+    filters, contains = extra
+    batches = audit_logs.stream_audit_logs(
+        route_pool(pool, "read"),
+        user_id=user_id,
+        action=action,
+        entity_type=entity_type,
+        entity_id=entity_id,
+        start_date=start_date,
+        end_date=end_date,
+        extra_data=filters,
+        extra_data_contains=contains,
+        batch_size=settings.EXPORT_BATCH_SIZE,
+    )
+    return _streaming_response("audit-logs", batches, format, AUDIT_LOG_COLUMNS, _wants_gzip(request, gzip))
+
+
+@router.get("/users")
+async def export_users(
+    request: Request,
+    format: ExportFormat = Query("ndjson"),
+    gzip: Optional[bool] = Query(None, description="Comprimir (por defecto según Accept-Encoding)"),
+    is_active: Optional[bool] = Query(None),
+    created_from: Optional[datetime] = Query(None),
+    created_to: Optional[datetime] = Query(None),
+    pool: asyncpg.Pool = Depends(get_db_pool),
+):
+    """Exportar usuarios (sin credenciales), ordenados por fecha de creación"""
+    batches = users.stream_users(
+        route_pool(pool, "read"),
+        is_active=is_active,
+        created_from=created_from,
+        created_to=created_to,
+        batch_size=settings.EXPORT_BATCH_SIZE,
+    )
+    return _streaming_response("users", batches, format, USER_COLUMNS, _wants_gzip(request, gzip))
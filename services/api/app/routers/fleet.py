@@ -0,0 +1,140 @@
+"""
+Fleet Status Endpoints
+
+Tableros de estado de la flota para Dash: conteos por estado × categoría ×
+mina, mantenciones vencidas y ranking de horas de operación. Se sirven desde
+el snapshot de app/services/fleet_status.py (se reconstruye al cambiar la
+flota o al expirar); el ETag es el del snapshot, así un poll sin cambios
+responde 304.
+
+Vencimientos próximos y generación de órdenes de trabajo: cola del scheduler
+de mantenimiento (app/services/maintenance_scheduler.py).
+"""
+
+import time
+from datetime import datetime, timezone
+from typing import Optional
+from uuid import UUID
+
+import asyncpg
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+
+from app.config import settings
+from app.database import get_db_pool
+from app.http_cache import etag_matches, make_etag, not_modified
+from app.models.fleet import (
+    EquipmentCategoryEnum,
+    EquipmentDetail,
+    FleetStatusBoard,
+    MaintenanceDueList,
+    OperatingHoursLeaderboard,
+    OverdueMaintenanceList,
+    WorkOrderGenerationResult,
+)
+from app.numeric_profiles import NumericProfile
+from app.queries import equipment_fleet
+from app.responses import fast_json
+from app.services.fleet_status import FleetSnapshot, FleetStatusService, get_fleet_status_service, status_board
+from app.services.maintenance_scheduler import MaintenanceScheduler, get_maintenance_scheduler
+
+router = APIRouter(prefix="/fleet", tags=["Fleet Status"])
+
+
+def _snapshot_response(request: Request, snapshot: FleetSnapshot, payload: dict, model):
+    etag = make_etag("fleet", request.url.path, request.url.query, *snapshot.version, snapshot.as_of.isoformat())
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response = fast_json(payload, model=model)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
+
+@router.get("/status", response_model=FleetStatusBoard)
+async def get_fleet_status(
+    request: Request,
+    mine_id: Optional[UUID] = Query(None),
+    pool: asyncpg.Pool = Depends(get_db_pool),
+    service: FleetStatusService = Depends(get_fleet_status_service),
+):
+    """Equipos por mina, categoría y estado (sin los dados de baja)"""
+    snapshot = await service.snapshot(pool)
+    payload = {"as_of": snapshot.as_of, **status_board(snapshot.counts, mine_id)}
+    return _snapshot_response(request, snapshot, payload, FleetStatusBoard)
+
+
+@router.get("/maintenance/overdue", response_model=OverdueMaintenanceList)
+async def list_overdue_maintenance(
+    request: Request,
+    mine_id: Optional[UUID] = Query(None),
+    limit: int = Query(100, ge=1, le=settings.FLEET_OVERDUE_LIMIT),
+    pool: asyncpg.Pool = Depends(get_db_pool),
+    service: FleetStatusService = Depends(get_fleet_status_service),
+):
+    """Equipos con la mantención programada vencida, el más atrasado primero"""
+    snapshot, rows = await service.overdue(pool, limit, mine_id)
+    payload = {"as_of": snapshot.as_of, "items": rows}
+    return _snapshot_response(request, snapshot, payload, OverdueMaintenanceList)
+
+
+@router.get("/operating-hours/leaderboard", response_model=OperatingHoursLeaderboard)
+async def get_operating_hours_leaderboard(
+    request: Request,
+    category: Optional[EquipmentCategoryEnum] = Query(None),
+    mine_id: Optional[UUID] = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    pool: asyncpg.Pool = Depends(get_db_pool),
+    service: FleetStatusService = Depends(get_fleet_status_service),
+):
+    """Equipos con más horas de operación (global, por categoría o por mina)"""
+    snapshot, rows = await service.leaderboard(pool, limit, category.value if category else None, mine_id)
+    payload = {"as_of": snapshot.as_of, "items": rows}
+    return _snapshot_response(request, snapshot, payload, OperatingHoursLeaderboard)
+
+
+@router.get("/maintenance/due", response_model=MaintenanceDueList)
+async def list_maintenance_due(
+    hours: float = Query(48, ge=0, le=24 * 365, description="Ventana en horas desde ahora"),
+    limit: int = Query(500, ge=1, le=5000),
+    pool: asyncpg.Pool = Depends(get_db_pool),
+    scheduler: MaintenanceScheduler = Depends(get_maintenance_scheduler),
+):
+    """Equipos sin orden abierta cuya mantención vence en las próximas `hours` horas (o ya venció)"""
+    await scheduler.refresh(pool)
+    now = time.time()
+    count = scheduler.queue.count_due_within(hours, now)
+    items = [
+        {
+            **entry._asdict(),
+            "due_at": datetime.fromtimestamp(entry.due_at, tz=timezone.utc),
+            "hours_until_due": (entry.due_at - now) / 3600,
+        }
+        for entry in scheduler.queue.due_within(hours, now, limit)
+    ]
+    payload = {"as_of": datetime.fromtimestamp(now, tz=timezone.utc), "hours": hours, "count": count, "items": items}
+    return fast_json(payload, model=MaintenanceDueList)
+
+
+@router.post("/maintenance/work-orders", response_model=WorkOrderGenerationResult, status_code=201)
+async def generate_work_orders(
+    lead_hours: float = Query(settings.MAINTENANCE_WORK_ORDER_LEAD_HOURS, ge=0, le=24 * 90),
+    pool: asyncpg.Pool = Depends(get_db_pool),
+    scheduler: MaintenanceScheduler = Depends(get_maintenance_scheduler),
+):
+    """Crear (por lote) las órdenes de trabajo de todo lo que vence dentro de `lead_hours`"""
+    created = await scheduler.generate_work_orders(pool, lead_hours)
+    payload = {"lead_hours": lead_hours, "created_count": len(created), "items": created}
+    return fast_json(payload, model=WorkOrderGenerationResult, status_code=201)
+
+
+@router.get("/equipment/{code}", response_model=EquipmentDetail)
+async def get_equipment(
+    code: str,
+    numeric: NumericProfile = Query("analytics", description="exact: horas como NUMERIC exacto"),
+    pool: asyncpg.Pool = Depends(get_db_pool),
+):
+    """Equipo vigente por código (acquisition_cost siempre exacto)"""
+    row = await equipment_fleet.get_equipment_by_code(pool, code, numeric=numeric)
+    if row is None:
+        raise HTTPException(status_code=404, detail="Equipo no encontrado")
+    return fast_json(row, model=EquipmentDetail)
@@ -0,0 +1,64 @@
+"""
+Process Area Endpoints
+
+Flowsheet de planta (árbol de áreas de proceso) con agregados por subárbol,
+resuelto en una query vía process_area_closure.
+"""
+
+from uuid import UUID
+
+import asyncpg
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+
+from app.database import get_db_pool
+from app.http_cache import etag_matches, make_etag, not_modified
+from app.models.flowsheet import FlowsheetResponse
+from app.queries import process_areas
+from app.services.flowsheet import build_flowsheet_tree
+
+router = APIRouter(tags=["Process Areas"])
+
+
+@router.get("/mines/{mine_id}/flowsheet", response_model=FlowsheetResponse)
+async def get_mine_flowsheet(
+    mine_id: UUID,
+    request: Request,
+    response: Response,
+    include_inactive: bool = Query(False),
+    pool: asyncpg.Pool = Depends(get_db_pool),
+):
+    """Obtener el flowsheet completo de una mina como árbol"""
+    version = await process_areas.get_flowsheet_version(pool, mine_id)
+    if version is None:
+        raise HTTPException(status_code=404, detail=f"Mina no encontrada: {mine_id}")
+
+    etag = make_etag("flowsheet", mine_id, include_inactive, version["area_count"], version["last_updated_at"])
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    rows = await process_areas.get_mine_flowsheet(pool, mine_id, include_inactive)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+    return {
+        "mine_id": mine_id,
+        "area_count": len(rows),
+        "roots": build_flowsheet_tree(rows),
+    }
+
+
+@router.get("/process-areas/{area_id}/subtree", response_model=FlowsheetResponse)
+async def get_process_area_subtree(
+    area_id: UUID,
+    include_inactive: bool = Query(False),
+    pool: asyncpg.Pool = Depends(get_db_pool),
+):
+    """Obtener un área de proceso y todo su subárbol"""
+    rows = await process_areas.get_process_area_subtree(pool, area_id, include_inactive)
+    if not rows:
+        raise HTTPException(status_code=404, detail=f"Área de proceso no encontrada: {area_id}")
+
+    return {
+        "mine_id": rows[0]["mine_id"],
+        "area_count": len(rows),
+        "roots": build_flowsheet_tree(rows),
+    }
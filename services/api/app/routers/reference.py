@@ -0,0 +1,87 @@
+"""
+Reference Data Endpoints
+
+Catálogos consultados por polling desde Dash (roles, yacimientos, minas, tipos
+de equipo, reactivos). Cada endpoint declara las tablas de las que depende con
+@versioned_by: ConditionalGetMiddleware agrega el ETag y responde 304 sin
+ejecutar el endpoint mientras esas tablas no cambien.
+
+Las filas salen de la caché de referencia (sin base de datos); si todavía no
+está cargada o está deshabilitada, de la query correspondiente.
+"""
+
+from typing import Awaitable, Callable
+
+import asyncpg
+from fastapi import APIRouter, Depends
+
+from app.database import get_db_pool
+from app.http_cache import versioned_by
+from app.models.reference import DepositSummary, EquipmentTypeSummary, MineSummary, ReagentSummary
+from app.models.role import RolePublic
+from app.queries import reference_data, roles
+from app.responses import fast_json
+from app.services.reference_cache import ReferenceDataCache, get_reference_cache
+
+router = APIRouter(prefix="/reference", tags=["Reference Data"])
+
+
+async def _rows(
+    cache: ReferenceDataCache,
+    table: str,
+    loader: Callable[[asyncpg.Pool], Awaitable[list]],
+    pool: asyncpg.Pool,
+):
+    rows = cache.rows(table)
+    return rows if rows is not None else await loader(pool)
+
+
+@router.get("/roles", response_model=list[RolePublic])
+@versioned_by("roles")
+async def list_roles(
+    pool: asyncpg.Pool = Depends(get_db_pool),
+    cache: ReferenceDataCache = Depends(get_reference_cache),
+):
+    """Roles ordenados por prioridad"""
+    return fast_json(await _rows(cache, "roles", roles.get_all_roles, pool), model=list[RolePublic])
+
+
+@router.get("/deposits", response_model=list[DepositSummary])
+@versioned_by("deposits")
+async def list_deposits(
+    pool: asyncpg.Pool = Depends(get_db_pool),
+    cache: ReferenceDataCache = Depends(get_reference_cache),
+):
+    """Yacimientos vigentes"""
+    return fast_json(await _rows(cache, "deposits", reference_data.list_deposits, pool), model=list[DepositSummary])
+
+
+@router.get("/mines", response_model=list[MineSummary])
+@versioned_by("mines")
+async def list_mines(
+    pool: asyncpg.Pool = Depends(get_db_pool),
+    cache: ReferenceDataCache = Depends(get_reference_cache),
+):
+    """Minas vigentes"""
+    return fast_json(await _rows(cache, "mines", reference_data.list_mines, pool), model=list[MineSummary])
+
+
+@router.get("/equipment-types", response_model=list[EquipmentTypeSummary])
+@versioned_by("equipment_types")
+async def list_equipment_types(
+    pool: asyncpg.Pool = Depends(get_db_pool),
+    cache: ReferenceDataCache = Depends(get_reference_cache),
+):
+    """Tipos de equipo"""
+    rows = await _rows(cache, "equipment_types", reference_data.list_equipment_types, pool)
+    return fast_json(rows, model=list[EquipmentTypeSummary])
+
+
+@router.get("/reagents", response_model=list[ReagentSummary])
+@versioned_by("reagents")
+async def list_reagents(
+    pool: asyncpg.Pool = Depends(get_db_pool),
+    cache: ReferenceDataCache = Depends(get_reference_cache),
+):
+    """Reactivos"""
+    return fast_json(await _rows(cache, "reagents", reference_data.list_reagents, pool), model=list[ReagentSummary])
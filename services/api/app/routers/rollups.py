@@ -0,0 +1,45 @@
+"""
+Roll-up Endpoints
+
+Agregados jerárquicos yacimiento → mina → fase (tonelaje, metal contenido,
+avance de minado) con soporte de ETag / If-None-Match.
+"""
+
+from typing import Optional
+from uuid import UUID
+
+import asyncpg
+from fastapi import APIRouter, Depends, Query, Request, Response
+
+from app.database import get_db_pool
+from app.http_cache import etag_matches, make_etag, not_modified
+from app.models.rollup import RollupResponse
+from app.queries import rollups
+from app.services.rollup import RollupService, get_rollup_service
+
+router = APIRouter(prefix="/rollups", tags=["Roll-ups"])
+
+
+@router.get("", response_model=RollupResponse)
+async def get_rollup(
+    request: Request,
+    response: Response,
+    deposit_id: Optional[UUID] = Query(None),
+    pool: asyncpg.Pool = Depends(get_db_pool),
+    service: RollupService = Depends(get_rollup_service),
+):
+    """
+    Obtener los agregados por yacimiento, mina y fase
+
+    Responde 304 si el If-None-Match coincide con la versión actual
+    (sin ejecutar la query de agregados).
+    """
+    version = await rollups.get_rollup_version(pool)
+    etag = make_etag("rollup", deposit_id, *version.values())
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    payload = await service.get_rollup(pool, etag, deposit_id)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+    return payload
@@ -0,0 +1,21 @@
+"""
+Services Package
+
+Lógica de negocio que combina queries SQL con cálculo en Python
+(vectorizado con numpy). Los routers delegan aquí; las queries
+viven en app/queries.
+"""
+
+from . import block_value
+from . import spatial_index
+from . import rollup
+from . import flowsheet
+from . import export
+
+__all__ = [
+    "block_value",
+    "spatial_index",
+    "rollup",
+    "flowsheet",
+    "export",
+]
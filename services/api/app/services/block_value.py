@@ -0,0 +1,467 @@
+"""
+Block Value Service
+
+Cálculo del valor económico de bloques (estilo optimización de pit):
+
+    ingreso  = Σ metal recuperable × (precio - costo de venta)
+    valor    = max(ingreso - costo proceso, 0) - costo mina
+
+- Vectorizado con numpy sobre todos los bloques de una fase
+- Cache LRU de resultados por (fase, versión de bloques, parámetros del escenario)
+- Múltiples escenarios en paralelo con un ProcessPoolExecutor; los arrays de la
+  fase se comparten con los workers vía shared memory (sin serializar millones de filas)
+"""
+
+import asyncio
+import multiprocessing
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from typing import NamedTuple, Optional
+from uuid import UUID
+
+import asyncpg
+import numpy as np
+
+from app.config import settings
+from app.models.block_value import PriceScenario
+from app.queries import blocks, process_areas, reagents
+
+
+LB_PER_TONNE = 2204.62
+GRAMS_PER_TROY_OUNCE = 31.1035
+
+# Recuperación por defecto si la mina no tiene áreas de flotación configuradas
+DEFAULT_CU_RECOVERY = 0.85
+DEFAULT_MO_RECOVERY = 0.50
+
+# Filas del array compartido (orden fijo)
+INPUT_FIELDS = ("tonnage", "cu_grade_pct", "mo_grade_pct", "au_grade_gpt", "ag_grade_gpt")
+
+
+class ScenarioParameters(NamedTuple):
+    """Parámetros resueltos de un escenario (sólo floats, baratos de serializar)"""
+    cu_net_price_usd_lb: float
+    mo_price_usd_lb: float
+    au_price_usd_oz: float
+    ag_price_usd_oz: float
+    cu_recovery: float
+    mo_recovery: float
+    au_recovery: float
+    ag_recovery: float
+    mining_cost_usd_t: float
+    processing_cost_usd_t: float
+
+
+# =============================================================================
+# KERNEL VECTORIZADO
+# =============================================================================
+
+def compute_block_values(data: np.ndarray, params: ScenarioParameters) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Calcular el valor de cada bloque
+
+    Args:
+        data: Array (len(INPUT_FIELDS), n_bloques) float64, NaN = sin dato
+        params: Parámetros resueltos del escenario
+
+    Returns:
+        (valor USD por bloque, máscara de bloques que se procesan como mineral)
+    """
+    tonnage, cu, mo, au, ag = np.nan_to_num(data)
+
+    revenue_per_tonne = (
+        cu / 100 * LB_PER_TONNE * params.cu_recovery * params.cu_net_price_usd_lb
+        + mo / 100 * LB_PER_TONNE * params.mo_recovery * params.mo_price_usd_lb
+        + au / GRAMS_PER_TROY_OUNCE * params.au_recovery * params.au_price_usd_oz
+        + ag / GRAMS_PER_TROY_OUNCE * params.ag_recovery * params.ag_price_usd_oz
+    )
+    margin_per_tonne = revenue_per_tonne - params.processing_cost_usd_t
+    is_ore = margin_per_tonne > 0
+
+    value = tonnage * (np.where(is_ore, margin_per_tonne, 0.0) - params.mining_cost_usd_t)
+    return value, is_ore
+
+
+def summarize_block_values(
+    data: np.ndarray,
+    value: np.ndarray,
+    is_ore: np.ndarray,
+    params: ScenarioParameters,
+) -> dict:
+    """Resumir los valores de bloque de un escenario"""
+    tonnage = np.nan_to_num(data[0])
+    cu = np.nan_to_num(data[1])
+
+    ore_tonnage = float(tonnage[is_ore].sum())
+    total_tonnage = float(tonnage.sum())
+    ore_cu_tonnes = float((tonnage[is_ore] * cu[is_ore]).sum())
+
+    cu_value_per_pct = LB_PER_TONNE / 100 * params.cu_recovery * params.cu_net_price_usd_lb
+
+    return {
+        "cu_recovery": params.cu_recovery,
+        "mo_recovery": params.mo_recovery,
+        "processing_cost_usd_t": params.processing_cost_usd_t,
+        "block_count": int(len(value)),
+        "ore_block_count": int(is_ore.sum()),
+        "total_tonnage": total_tonnage,
+        "ore_tonnage": ore_tonnage,
+        "waste_tonnage": total_tonnage - ore_tonnage,
+        "ore_avg_cu_grade_pct": ore_cu_tonnes / ore_tonnage if ore_tonnage > 0 else None,
+        "recoverable_cu_lb": ore_cu_tonnes / 100 * LB_PER_TONNE * params.cu_recovery,
+        "breakeven_cu_grade_pct": (
+            params.processing_cost_usd_t / cu_value_per_pct if cu_value_per_pct > 0 else None
+        ),
+        "total_value_usd": float(value.sum()),
+        "ore_value_usd": float(value[is_ore].sum()),
+    }
+
+
+def _evaluate_batch(
+    input_name: str,
+    output_name: str,
+    n_blocks: int,
+    n_scenarios: int,
+    offset: int,
+    batch: list[ScenarioParameters],
+) -> list[dict]:
+    """Worker: evaluar un lote de escenarios sobre los arrays en shared memory"""
+    # Los segmentos pertenecen al proceso padre (él hace unlink); los workers
+    # spawn comparten su resource tracker, por lo que sólo se adjuntan
+    input_shm = SharedMemory(name=input_name)
+    output_shm = SharedMemory(name=output_name)
+
+    try:
+        data = np.ndarray((len(INPUT_FIELDS), n_blocks), dtype=np.float64, buffer=input_shm.buf)
+        values = np.ndarray((n_scenarios, n_blocks), dtype=np.float32, buffer=output_shm.buf)
+
+        summaries = []
+        for idx, params in enumerate(batch):
+            value, is_ore = compute_block_values(data, params)
+            values[offset + idx] = value
+            summaries.append(summarize_block_values(data, value, is_ore, params))
+
+        del data, values
+        return summaries
+    finally:
+        input_shm.close()
+        output_shm.close()
+
+
+# =============================================================================
+# SERVICIO
+# =============================================================================
+
+class BlockValueResult(NamedTuple):
+    """Resultado cacheado de un escenario"""
+    summary: dict
+    values: np.ndarray  # float32, mismo orden que block_ids
+
+
+class PhaseBlocks(NamedTuple):
+    """Arrays de una fase cargados desde la base de datos"""
+    version: tuple
+    mine_id: UUID
+    block_ids: list
+    data: np.ndarray
+
+
+class BlockValueService:
+    """
+    Servicio de valorización económica de bloques
+
+    Uso:
+        service = get_block_value_service()
+        results = await service.evaluate(pool, phase_id, [PriceScenario(), ...])
+    """
+
+    def __init__(
+        self,
+        cache_size: int = settings.BLOCK_VALUE_CACHE_SIZE,
+        max_workers: Optional[int] = settings.BLOCK_VALUE_WORKERS,
+        parallel_min_scenarios: int = settings.BLOCK_VALUE_PARALLEL_MIN_SCENARIOS,
+    ):
+        self._cache: OrderedDict = OrderedDict()
+        self._cache_size = cache_size
+        self._phases: OrderedDict = OrderedDict()
+        self._max_workers = max_workers or os.cpu_count() or 1
+        self._parallel_min_scenarios = parallel_min_scenarios
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self.hits = 0
+        self.misses = 0
+
+    # -------------------------------------------------------------------------
+    # Carga de datos
+    # -------------------------------------------------------------------------
+
+    async def _load_phase(self, pool: asyncpg.Pool, phase_id: UUID, include_mined: bool) -> PhaseBlocks:
+        """Cargar (o reutilizar) los arrays de una fase según su versión"""
+        version_row = await blocks.get_phase_block_version(pool, phase_id)
+        if version_row is None:
+            raise LookupError(f"Fase no encontrada: {phase_id}")
+
+        version = (version_row["block_count"], version_row["last_updated_at"], include_mined)
+        key = (phase_id, include_mined)
+        cached = self._phases.get(key)
+        if cached is not None and cached.version == version:
+            self._phases.move_to_end(key)
+            return cached
+
+        rows = await blocks.get_phase_block_grades(pool, phase_id, include_mined)
+        data = np.array(
+            [[row[field] for field in INPUT_FIELDS] for row in rows],
+            dtype=np.float64,
+        ).T.reshape(len(INPUT_FIELDS), len(rows))
+
+        phase = PhaseBlocks(
+            version=version,
+            mine_id=version_row["mine_id"],
+            block_ids=[row["id"] for row in rows],
+            data=np.ascontiguousarray(data),
+        )
+        self._phases[key] = phase
+        while len(self._phases) > 4:
+            self._phases.popitem(last=False)
+        return phase
+
+    async def _resolve_parameters(
+        self,
+        pool: asyncpg.Pool,
+        mine_id: UUID,
+        scenarios: list[PriceScenario],
+    ) -> list[ScenarioParameters]:
+        """Combinar escenarios con recuperaciones (áreas de proceso) y costo de reactivos"""
+        areas = await process_areas.get_active_process_areas(pool, mine_id)
+        cu_recovery, mo_recovery = flotation_recoveries(areas)
+
+        reagent_rows = await reagents.get_reagent_cost_per_tonne_by_type(pool)
+        reagent_cost = sum(row["cost_usd_per_tonne"] or 0.0 for row in reagent_rows)
+
+        return [
+            ScenarioParameters(
+                cu_net_price_usd_lb=scenario.cu_price_usd_lb - scenario.cu_selling_cost_usd_lb,
+                mo_price_usd_lb=scenario.mo_price_usd_lb,
+                au_price_usd_oz=scenario.au_price_usd_oz,
+                ag_price_usd_oz=scenario.ag_price_usd_oz,
+                cu_recovery=scenario.cu_recovery if scenario.cu_recovery is not None else cu_recovery,
+                mo_recovery=scenario.mo_recovery if scenario.mo_recovery is not None else mo_recovery,
+                au_recovery=scenario.au_recovery,
+                ag_recovery=scenario.ag_recovery,
+                mining_cost_usd_t=scenario.mining_cost_usd_t,
+                processing_cost_usd_t=(
+                    scenario.processing_cost_usd_t
+                    + (reagent_cost if scenario.include_reagent_cost else 0.0)
+                ),
+            )
+            for scenario in scenarios
+        ]
+
+    # -------------------------------------------------------------------------
+    # Evaluación
+    # -------------------------------------------------------------------------
+
+    async def _evaluate_results(
+        self,
+        pool: asyncpg.Pool,
+        phase_id: UUID,
+        scenarios: list[PriceScenario],
+        include_mined: bool,
+    ) -> tuple[PhaseBlocks, list[tuple[BlockValueResult, bool]]]:
+        """Obtener resultados (desde cache o calculados) y si venían del cache"""
+        phase = await self._load_phase(pool, phase_id, include_mined)
+        parameters = await self._resolve_parameters(pool, phase.mine_id, scenarios)
+
+        keys = [(phase_id, phase.version, params) for params in parameters]
+        pending = {}
+        for key in keys:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.hits += 1
+            elif key not in pending:
+                pending[key] = key[2]
+                self.misses += 1
+
+        computed = {}
+        if pending:
+            results = await self._compute(phase.data, list(pending.values()))
+            computed = dict(zip(pending, results))
+            self._cache.update(computed)
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+
+        return phase, [
+            (computed[key], False) if key in computed else (self._cache[key], True)
+            for key in keys
+        ]
+
+    async def evaluate(
+        self,
+        pool: asyncpg.Pool,
+        phase_id: UUID,
+        scenarios: list[PriceScenario],
+        include_mined: bool = False,
+    ) -> list[dict]:
+        """
+        Evaluar escenarios sobre una fase
+
+        Returns:
+            Lista de resúmenes (mismo orden que scenarios) con flag 'cached'
+        """
+        _, results = await self._evaluate_results(pool, phase_id, scenarios, include_mined)
+        return [
+            {"scenario": scenario, **result.summary, "cached": cached}
+            for scenario, (result, cached) in zip(scenarios, results)
+        ]
+
+    async def get_block_values(
+        self,
+        pool: asyncpg.Pool,
+        phase_id: UUID,
+        scenario: PriceScenario,
+        include_mined: bool = False,
+    ) -> list[tuple[UUID, float]]:
+        """Obtener el valor por bloque (id, USD) de un escenario"""
+        phase, results = await self._evaluate_results(pool, phase_id, [scenario], include_mined)
+        result, _ = results[0]
+        return list(zip(phase.block_ids, result.values.tolist()))
+
+    async def _compute(self, data: np.ndarray, parameters: list[ScenarioParameters]) -> list[BlockValueResult]:
+        """Calcular escenarios en línea (pocos) o en paralelo por procesos (muchos)"""
+        if len(parameters) < self._parallel_min_scenarios or data.shape[1] == 0:
+            return await asyncio.to_thread(self._compute_inline, data, parameters)
+        return await self._compute_parallel(data, parameters)
+
+    @staticmethod
+    def _compute_inline(data: np.ndarray, parameters: list[ScenarioParameters]) -> list[BlockValueResult]:
+        results = []
+        for params in parameters:
+            value, is_ore = compute_block_values(data, params)
+            results.append(BlockValueResult(
+                summary=summarize_block_values(data, value, is_ore, params),
+                values=value.astype(np.float32),
+            ))
+        return results
+
+    async def _compute_parallel(self, data: np.ndarray, parameters: list[ScenarioParameters]) -> list[BlockValueResult]:
+        if self._executor is None:
+            # spawn: no heredar el event loop ni los threads del proceso uvicorn
+            self._executor = ProcessPoolExecutor(
+                max_workers=self._max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+
+        n_blocks = data.shape[1]
+        n_scenarios = len(parameters)
+        input_shm = SharedMemory(create=True, size=data.nbytes)
+        output_shm = SharedMemory(create=True, size=n_scenarios * n_blocks * np.dtype(np.float32).itemsize)
+
+        try:
+            shared_input = np.ndarray(data.shape, dtype=np.float64, buffer=input_shm.buf)
+            shared_input[:] = data
+            del shared_input
+
+            # Un lote por worker: los arrays se leen una vez por proceso
+            batch_size = -(-n_scenarios // self._max_workers)
+            loop = asyncio.get_running_loop()
+            futures = [
+                loop.run_in_executor(
+                    self._executor,
+                    _evaluate_batch,
+                    input_shm.name,
+                    output_shm.name,
+                    n_blocks,
+                    n_scenarios,
+                    offset,
+                    parameters[offset:offset + batch_size],
+                )
+                for offset in range(0, n_scenarios, batch_size)
+            ]
+            summaries = [summary for batch in await asyncio.gather(*futures) for summary in batch]
+
+            output = np.ndarray((n_scenarios, n_blocks), dtype=np.float32, buffer=output_shm.buf)
+            results = [
+                BlockValueResult(summary=summary, values=output[idx].copy())
+                for idx, summary in enumerate(summaries)
+            ]
+            del output
+            return results
+        finally:
+            input_shm.close()
+            input_shm.unlink()
+            output_shm.close()
+            output_shm.unlink()
+
+    def clear_cache(self):
+        """Vaciar caches de resultados y de fases"""
+        self._cache.clear()
+        self._phases.clear()
+
+    def shutdown(self):
+        """Detener el pool de procesos"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+def flotation_recoveries(areas: list) -> tuple[float, float]:
+    """
+    Derivar recuperaciones globales de Cu y Mo desde las áreas de proceso
+
+    - Rougher + Scavenger (sobre las colas del rougher): r + (1 - r) * s
+    - Cada etapa de limpieza multiplica la recuperación
+    - Mo = recuperación del circuito colectivo × flotación selectiva de Mo
+    """
+    rougher = scavenger = None
+    cleaners = 1.0
+    selective_mo = None
+
+    for area in areas:
+        recovery = area["target_recovery_pct"]
+        if recovery is None:
+            continue
+        recovery = float(recovery) / 100
+        area_type = area["area_type"]
+
+        if area_type == "ROUGHER":
+            rougher = recovery
+        elif area_type == "SCAVENGER":
+            scavenger = recovery
+        elif area_type == "CLEANER":
+            cleaners *= recovery
+        elif area_type == "SELECTIVE" and area["circuit_type"] == "SELECTIVE_MO":
+            selective_mo = recovery
+
+    if rougher is None:
+        return DEFAULT_CU_RECOVERY, DEFAULT_MO_RECOVERY
+
+    collective = rougher + (1 - rougher) * (scavenger or 0.0)
+    cu_recovery = collective * cleaners
+    mo_recovery = cu_recovery * selective_mo if selective_mo is not None else DEFAULT_MO_RECOVERY
+    return cu_recovery, mo_recovery
+
+
+# Instancia global del servicio (una por proceso)
+_service: Optional[BlockValueService] = None
+
+
+def get_block_value_service() -> BlockValueService:
+    """
+    Obtener la instancia del servicio
+    Se usa como dependency de FastAPI
+    """
+    global _service
+
+    if _service is None:
+        _service = BlockValueService()
+    return _service
+
+
+def shutdown_block_value_service():
+    """Liberar el pool de procesos (llamado en shutdown)"""
+    global _service
+
+    if _service is not None:
+        _service.shutdown()
+        _service = None
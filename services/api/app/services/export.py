@@ -0,0 +1,131 @@
+"""
+Export Service
+
+Exportación masiva en streaming (audit logs, usuarios) para cumplimiento:
+
+- Las filas llegan en lotes desde un cursor del servidor (app/queries, stream_*)
+- Cada lote se codifica a NDJSON (orjson) o CSV y se envía como chunk HTTP
+- gzip opcional al vuelo (zlib en modo gzip, sin buffer del archivo completo)
+
+La memoria usada es la de un lote, independiente del total de filas.
+Las exportaciones concurrentes por worker se limitan con EXPORT_MAX_CONCURRENT
+porque cada una retiene una conexión del pool mientras dura.
+"""
+
+import csv
+import io
+import time
+import zlib
+from typing import AsyncIterator, Literal, Sequence
+
+import asyncpg
+import orjson
+
+from app.config import settings
+from app.metrics import EXPORT_BYTES_TOTAL, EXPORT_DURATION, EXPORT_ROWS_TOTAL
+from app.responses import orjson_default
+
+
+ExportFormat = Literal["ndjson", "csv"]
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+# =============================================================================
+# CODIFICACIÓN
+# =============================================================================
+
+def encode_ndjson(rows: Sequence[asyncpg.Record]) -> bytes:
+    """Un objeto JSON por línea"""
+    return b"".join(
+        orjson.dumps(dict(row.items()), default=orjson_default, option=orjson.OPT_APPEND_NEWLINE)
+        for row in rows
+    )
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, (dict, list)):
+        return orjson.dumps(value).decode()
+    return value
+
+
+def encode_csv(rows: Sequence[asyncpg.Record], columns: Sequence[str], header: bool = False) -> bytes:
+    """Filas CSV (RFC 4180); JSON anidado (extra_data) como texto JSON"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\r\n")
+    if header:
+        writer.writerow(columns)
+    writer.writerows([_csv_value(row[column]) for column in columns] for row in rows)
+    return buffer.getvalue().encode("utf-8")
+
+
+async def gzip_stream(chunks: AsyncIterator[bytes], level: int = 6) -> AsyncIterator[bytes]:
+    """Comprimir un stream de chunks en formato gzip sin acumularlo"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits=31: cabecera gzip
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+# =============================================================================
+# STREAM
+# =============================================================================
+
+_active_exports = 0
+
+
+def try_acquire_export_slot() -> bool:
+    """Reservar un cupo de exportación (False si ya hay EXPORT_MAX_CONCURRENT en curso)"""
+    global _active_exports
+    if _active_exports >= settings.EXPORT_MAX_CONCURRENT:
+        return False
+    _active_exports += 1
+    return True
+
+
+def release_export_slot() -> None:
+    global _active_exports
+    _active_exports -= 1
+
+
+async def export_stream(
+    name: str,
+    batches: AsyncIterator[Sequence[asyncpg.Record]],
+    export_format: ExportFormat,
+    columns: Sequence[str],
+    compress: bool = False,
+) -> AsyncIterator[bytes]:
+    """
+    Chunks de la exportación `name` en el formato pedido (gzip si compress)
+    Cierra el cursor al terminar o si el cliente se desconecta; el cupo de
+    exportación lo libera la respuesta (app/routers/exports.py).
+    """
+    async def encoded() -> AsyncIterator[bytes]:
+        first = True
+        async for rows in batches:
+            EXPORT_ROWS_TOTAL.labels(name).inc(len(rows))
+            if export_format == "csv":
+                yield encode_csv(rows, columns, header=first)
+            else:
+                yield encode_ndjson(rows)
+            first = False
+        if first and export_format == "csv":
+            yield encode_csv([], columns, header=True)
+
+    start = time.perf_counter()
+    stream = gzip_stream(encoded()) if compress else encoded()
+    try:
+        async for chunk in stream:
+            EXPORT_BYTES_TOTAL.labels(name).inc(len(chunk))
+            yield chunk
+    finally:
+        await stream.aclose()
+        await batches.aclose()
+        EXPORT_DURATION.labels(name).observe(time.perf_counter() - start)
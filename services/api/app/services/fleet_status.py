@@ -0,0 +1,225 @@
+"""
+Fleet Status Service
+
+Snapshot por proceso de los tableros de estado de la flota (equipment), que
+Dash consulta por polling:
+
+- conteos por mina × categoría × estado
+- mantenciones vencidas (las FLEET_OVERDUE_LIMIT más atrasadas)
+- ranking de horas de operación (top FLEET_LEADERBOARD_SIZE por categoría)
+
+Se arma con tres queries de app/queries/equipment_fleet.py y se reconstruye
+sólo cuando:
+
+- cambia la versión (table_versions) de equipment, equipment_types o mines;
+  se compara en cada request (una lectura por clave primaria)
+- pasan FLEET_SNAPSHOT_MAX_AGE_SECONDS: una mantención vence con el paso del
+  tiempo sin que cambie ninguna fila
+
+Los requests concurrentes que encuentran el snapshot desactualizado esperan
+una única reconstrucción.
+"""
+
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import NamedTuple, Optional
+from uuid import UUID
+
+import asyncpg
+
+from app.config import settings
+from app.database import gather_queries
+from app.metrics import FLEET_SNAPSHOT_BUILD_SECONDS, FLEET_SNAPSHOT_REFRESHES_TOTAL
+from app.queries import equipment_fleet, reference_data
+from app.queries.equipment_fleet import FLEET_STATUSES
+
+
+FLEET_TABLES = ("equipment", "equipment_types", "mines")
+
+
+class FleetSnapshot(NamedTuple):
+    """Tableros de la flota en una versión de FLEET_TABLES"""
+    version: tuple
+    as_of: datetime
+    counts: tuple
+    overdue: tuple
+    overdue_truncated: bool
+    leaders: tuple
+    built_at: float
+
+
+# =============================================================================
+# TABLEROS
+# =============================================================================
+
+def _empty_statuses() -> dict:
+    return {status: 0 for status in FLEET_STATUSES}
+
+
+def status_board(rows, mine_id: Optional[UUID] = None) -> dict:
+    """
+    Armar el tablero mina → categoría con el conteo por estado
+
+    Args:
+        rows: Filas de equipment_fleet.get_fleet_status_counts (ordenadas por mina y categoría)
+        mine_id: Sólo esta mina
+    """
+    mines: dict = {}
+    totals = _empty_statuses()
+
+    for row in rows:
+        if mine_id is not None and row["mine_id"] != mine_id:
+            continue
+        mine = mines.get(row["mine_id"])
+        if mine is None:
+            mine = mines[row["mine_id"]] = {
+                "mine_id": row["mine_id"],
+                "mine_code": row["mine_code"],
+                "mine_name": row["mine_name"],
+                "by_status": _empty_statuses(),
+                "categories": {},
+            }
+        category = mine["categories"].get(row["category"])
+        if category is None:
+            category = mine["categories"][row["category"]] = {
+                "category": row["category"],
+                "by_status": _empty_statuses(),
+            }
+        count = row["equipment_count"]
+        category["by_status"][row["status"]] += count
+        mine["by_status"][row["status"]] += count
+        totals[row["status"]] += count
+
+    return {
+        "equipment_count": sum(totals.values()),
+        "by_status": totals,
+        "mines": [
+            {
+                **{key: mine[key] for key in ("mine_id", "mine_code", "mine_name", "by_status")},
+                "equipment_count": sum(mine["by_status"].values()),
+                "categories": [
+                    {**category, "equipment_count": sum(category["by_status"].values())}
+                    for category in mine["categories"].values()
+                ],
+            }
+            for mine in mines.values()
+        ],
+    }
+
+
+# =============================================================================
+# SERVICIO
+# =============================================================================
+
+class FleetStatusService:
+    """
+    Snapshot de la flota refrescado por versión y antigüedad
+
+    Uso:
+        service = get_fleet_status_service()
+        snapshot = await service.snapshot(pool)
+        board = status_board(snapshot.counts)
+    """
+
+    def __init__(
+        self,
+        max_age: float = settings.FLEET_SNAPSHOT_MAX_AGE_SECONDS,
+        overdue_limit: int = settings.FLEET_OVERDUE_LIMIT,
+        leaderboard_size: int = settings.FLEET_LEADERBOARD_SIZE,
+    ):
+        self.max_age = max_age
+        self.overdue_limit = overdue_limit
+        self.leaderboard_size = leaderboard_size
+        self._snapshot: Optional[FleetSnapshot] = None
+        self._lock = asyncio.Lock()
+
+    def _stale_reason(self, version: tuple) -> Optional[str]:
+        current = self._snapshot
+        if current is None:
+            return "startup"
+        if current.version != version:
+            return "change"
+        if time.monotonic() - current.built_at >= self.max_age:
+            return "expired"
+        return None
+
+    async def snapshot(self, pool: asyncpg.Pool) -> FleetSnapshot:
+        """Snapshot vigente (se reconstruye si cambió la flota o expiró)"""
+        versions = await reference_data.get_table_versions(pool, FLEET_TABLES)
+        version = tuple(versions[table] for table in FLEET_TABLES)
+        if self._stale_reason(version) is None:
+            return self._snapshot
+
+        async with self._lock:
+            # Otro request pudo reconstruirlo mientras se esperaba el lock
+            reason = self._stale_reason(version)
+            if reason is not None:
+                self._snapshot = await self._build(pool, version)
+                FLEET_SNAPSHOT_REFRESHES_TOTAL.labels(reason).inc()
+            return self._snapshot
+
+    async def _build(self, pool: asyncpg.Pool, version: tuple) -> FleetSnapshot:
+        start = time.perf_counter()
+        as_of = datetime.now(timezone.utc)
+        counts, overdue, leaders = await gather_queries(
+            equipment_fleet.get_fleet_status_counts(pool),
+            equipment_fleet.list_overdue_maintenance(pool, as_of, limit=self.overdue_limit + 1),
+            equipment_fleet.list_operating_hours_leaders(pool, per_category=self.leaderboard_size),
+        )
+        FLEET_SNAPSHOT_BUILD_SECONDS.observe(time.perf_counter() - start)
+        return FleetSnapshot(
+            version=version,
+            as_of=as_of,
+            counts=tuple(counts),
+            overdue=tuple(overdue[:self.overdue_limit]),
+            overdue_truncated=len(overdue) > self.overdue_limit,
+            leaders=tuple(leaders),
+            built_at=time.monotonic(),
+        )
+
+    async def overdue(self, pool: asyncpg.Pool, limit: int, mine_id: Optional[UUID] = None) -> tuple[FleetSnapshot, list]:
+        """
+        Mantenciones vencidas (más atrasadas primero) desde el snapshot
+        Si el snapshot quedó truncado y se filtra por mina, se consulta la mina.
+        """
+        snapshot = await self.snapshot(pool)
+        if mine_id is not None and snapshot.overdue_truncated:
+            rows = await equipment_fleet.list_overdue_maintenance(pool, snapshot.as_of, mine_id, limit)
+            return snapshot, rows
+        rows = [row for row in snapshot.overdue if mine_id is None or row["mine_id"] == mine_id]
+        return snapshot, rows[:limit]
+
+    async def leaderboard(
+        self,
+        pool: asyncpg.Pool,
+        limit: int,
+        category: Optional[str] = None,
+        mine_id: Optional[UUID] = None,
+    ) -> tuple[FleetSnapshot, list]:
+        """
+        Ranking de horas de operación (global o por categoría) desde el snapshot
+        Por mina, o más allá del tamaño cacheado, se consulta directamente.
+        """
+        snapshot = await self.snapshot(pool)
+        if mine_id is not None or limit > self.leaderboard_size:
+            rows = await equipment_fleet.list_operating_hours_leaderboard(pool, limit, category, mine_id)
+            return snapshot, rows
+        rows = [row for row in snapshot.leaders if category is None or row["category"] == category]
+        return snapshot, rows[:limit]
+
+
+# Instancia global del servicio (una por proceso)
+_service: Optional[FleetStatusService] = None
+
+
+def get_fleet_status_service() -> FleetStatusService:
+    """
+    Obtener la instancia del servicio
+    Se usa como dependency de FastAPI
+    """
+    global _service
+
+    if _service is None:
+        _service = FleetStatusService()
+    return _service
@@ -0,0 +1,31 @@
+"""
+Flowsheet Service
+
+Arma el árbol de áreas de proceso a partir de las filas planas que entrega
+la tabla de clausura (una query, ordenadas por profundidad). No hay recursión
+en SQL ni una query por nivel.
+"""
+
+from typing import Iterable
+
+
+def build_flowsheet_tree(rows: Iterable) -> list[dict]:
+    """
+    Convertir filas (ordenadas por profundidad) en una lista de raíces con `children`
+
+    Un área cuyo padre no está en las filas (inactivo o fuera del subárbol
+    consultado) se trata como raíz.
+    """
+    nodes: dict = {}
+    roots: list[dict] = []
+
+    for row in rows:
+        node = {**dict(row), "children": []}
+        nodes[node["id"]] = node
+        parent = nodes.get(node["parent_area_id"])
+        if parent is not None:
+            parent["children"].append(node)
+        else:
+            roots.append(node)
+
+    return roots
@@ -0,0 +1,400 @@
+"""
+Maintenance Scheduler
+
+Cola en memoria (por proceso) de las mantenciones pendientes de la flota y
+generación por lotes de órdenes de trabajo:
+
+- Cada equipo vence en el primero de dos umbrales: su next_maintenance_date
+  (CALENDAR) o el momento en que sus horas desde el último overhaul llegan a
+  MAINTENANCE_OVERHAUL_INTERVAL_HOURS, proyectado con
+  MAINTENANCE_DAILY_OPERATING_HOURS de uso diario desde la lectura de horas
+  (equipment.operating_hours_recorded_at, que sólo cambia con las horas), no
+  desde la reconstrucción de la cola (HOURS)
+- MaintenanceQueue mantiene los vencimientos ordenados (arrays paralelos con
+  bisect): el próximo en O(1) y "qué vence en las próximas N horas" en
+  O(log n) (más k para listar los k resultados)
+- La cola se reconstruye recorriendo idx_equipment_next_maintenance cuando
+  cambia la versión (table_versions) de equipment o de maintenance_work_orders
+- generate_work_orders crea en una sola sentencia las órdenes de todo lo que
+  vence dentro de MAINTENANCE_WORK_ORDER_LEAD_HOURS, con su audit log, en una
+  unidad de trabajo (app/unit_of_work.py): versiones, candidatos, inserción y
+  audit log usan una sola conexión del pool y se confirman juntos. Los equipos
+  con orden abierta salen de la cola. Es idempotente entre workers (a lo más una orden
+  abierta por equipo) y se ejecuta bajo demanda vía
+  /v1/fleet/maintenance/work-orders
+- Con MAINTENANCE_SCHEDULER_ENABLED corre además cada
+  MAINTENANCE_SCHEDULER_INTERVAL_SECONDS, sólo en el worker líder: el que
+  tiene el advisory lock de sesión LEADER_LOCK_NAME en una conexión dedicada.
+  Si ese worker muere, la conexión se cierra y otro toma el lock en su
+  próximo ciclo
+"""
+
+import asyncio
+import time
+import uuid
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timezone
+from typing import Iterable, NamedTuple, Optional
+from uuid import UUID
+
+import asyncpg
+
+from app.config import settings
+from app.database import get_db_pool
+from app.metrics import (
+    MAINTENANCE_QUEUE_REBUILDS_TOTAL,
+    MAINTENANCE_QUEUE_SIZE,
+    MAINTENANCE_WORK_ORDERS_CREATED_TOTAL,
+)
+from app.queries import audit_logs, maintenance, reference_data
+from app.unit_of_work import unit_of_work
+
+
+SCHEDULER_TABLES = ("equipment", "maintenance_work_orders")
+
+SECONDS_PER_HOUR = 3600.0
+
+# Advisory lock (pg_try_advisory_lock(hashtext(...))) del worker que ejecuta el ciclo periódico
+LEADER_LOCK_NAME = "maintenance_scheduler"
+
+
+class MaintenanceDue(NamedTuple):
+    """Próxima mantención de un equipo"""
+    equipment_id: UUID
+    code: str
+    mine_id: UUID
+    status: str
+    due_at: float  # epoch (segundos)
+    trigger: str  # CALENDAR | HOURS
+    next_maintenance_date: Optional[datetime]
+    total_operating_hours: float
+    hours_since_last_overhaul: Optional[float]
+
+
+def due_entry(
+    row,
+    now: float,
+    overhaul_interval_hours: float = settings.MAINTENANCE_OVERHAUL_INTERVAL_HOURS,
+    daily_operating_hours: float = settings.MAINTENANCE_DAILY_OPERATING_HOURS,
+) -> Optional[MaintenanceDue]:
+    """
+    Vencimiento de un equipo: el primero entre la fecha programada y la
+    proyección de horas hasta el overhaul (None si no tiene ninguno)
+
+    La proyección parte de hours_recorded_at (cuándo se registraron las horas
+    en la base de datos): así es estable entre reconstrucciones de la cola.
+    `now` sólo se usa si la fila no trae ese timestamp.
+    """
+    thresholds = []
+    if row["next_maintenance_date"] is not None:
+        thresholds.append((row["next_maintenance_date"].timestamp(), "CALENDAR"))
+    hours = row["hours_since_last_overhaul"]
+    if hours is not None and overhaul_interval_hours > 0 and daily_operating_hours > 0:
+        recorded_at = row["hours_recorded_at"]
+        anchor = now if recorded_at is None else recorded_at.timestamp()
+        remaining = overhaul_interval_hours - float(hours)
+        thresholds.append((anchor + remaining / daily_operating_hours * 24 * SECONDS_PER_HOUR, "HOURS"))
+    if not thresholds:
+        return None
+
+    due_at, trigger = min(thresholds)
+    return MaintenanceDue(
+        equipment_id=row["id"],
+        code=row["code"],
+        mine_id=row["mine_id"],
+        status=row["status"],
+        due_at=due_at,
+        trigger=trigger,
+        next_maintenance_date=row["next_maintenance_date"],
+        total_operating_hours=float(row["total_operating_hours"]),
+        hours_since_last_overhaul=None if hours is None else float(hours),
+    )
+
+
+# =============================================================================
+# COLA ORDENADA
+# =============================================================================
+
+class MaintenanceQueue:
+    """
+    Vencimientos ordenados por due_at
+
+    Arrays paralelos (_due, _ids) ordenados más un índice id -> entrada:
+    - peek: O(1)
+    - count_due_within / due_within: O(log n) (+ k al listar)
+    - upsert / remove: O(log n) de búsqueda más el desplazamiento del array
+      (memmove en C, despreciable para el tamaño de una flota)
+    """
+
+    def __init__(self, entries: Iterable[MaintenanceDue] = ()):
+        self.rebuild(entries)
+
+    def rebuild(self, entries: Iterable[MaintenanceDue]) -> None:
+        ordered = sorted(entries, key=lambda entry: entry.due_at)
+        self._due = [entry.due_at for entry in ordered]
+        self._ids = [entry.equipment_id for entry in ordered]
+        self._entries = {entry.equipment_id: entry for entry in ordered}
+
+    def __len__(self) -> int:
+        return len(self._due)
+
+    def peek(self) -> Optional[MaintenanceDue]:
+        """Próximo vencimiento"""
+        return self._entries[self._ids[0]] if self._ids else None
+
+    def get(self, equipment_id: UUID) -> Optional[MaintenanceDue]:
+        return self._entries.get(equipment_id)
+
+    def upsert(self, entry: MaintenanceDue) -> None:
+        self.remove(entry.equipment_id)
+        index = bisect_right(self._due, entry.due_at)
+        self._due.insert(index, entry.due_at)
+        self._ids.insert(index, entry.equipment_id)
+        self._entries[entry.equipment_id] = entry
+
+    def remove(self, equipment_id: UUID) -> Optional[MaintenanceDue]:
+        entry = self._entries.pop(equipment_id, None)
+        if entry is None:
+            return None
+        index = bisect_left(self._due, entry.due_at)
+        while self._ids[index] != equipment_id:  # empates en due_at
+            index += 1
+        del self._due[index]
+        del self._ids[index]
+        return entry
+
+    def count_due_within(self, hours: float, now: Optional[float] = None) -> int:
+        """Cuántos vencen (o ya vencieron) antes de now + hours"""
+        now = time.time() if now is None else now
+        return bisect_right(self._due, now + hours * SECONDS_PER_HOUR)
+
+    def due_within(self, hours: float, now: Optional[float] = None, limit: Optional[int] = None) -> list[MaintenanceDue]:
+        """Los que vencen (o ya vencieron) antes de now + hours, el más próximo primero"""
+        end = self.count_due_within(hours, now)
+        if limit is not None:
+            end = min(end, limit)
+        return [self._entries[equipment_id] for equipment_id in self._ids[:end]]
+
+
+# =============================================================================
+# ÓRDENES DE TRABAJO
+# =============================================================================
+
+def work_order_priority(entry: MaintenanceDue, now: float) -> str:
+    """CRITICAL (equipo con falla o muy atrasado), HIGH (vencida), MEDIUM (< 24 h) o LOW"""
+    overdue_hours = (now - entry.due_at) / SECONDS_PER_HOUR
+    if entry.status == "FAILED" or overdue_hours >= settings.MAINTENANCE_CRITICAL_OVERDUE_HOURS:
+        return "CRITICAL"
+    if overdue_hours > 0:
+        return "HIGH"
+    if overdue_hours > -24:
+        return "MEDIUM"
+    return "LOW"
+
+
+def maintenance_type(entry: MaintenanceDue) -> str:
+    """CORRECTIVE si el equipo está con falla; SCHEDULED por fecha; PREVENTIVE por horas"""
+    if entry.status == "FAILED":
+        return "CORRECTIVE"
+    return "SCHEDULED" if entry.trigger == "CALENDAR" else "PREVENTIVE"
+
+
+def build_work_order(entry: MaintenanceDue, now: float) -> dict:
+    """Fila de maintenance_work_orders para un vencimiento"""
+    if entry.trigger == "CALENDAR":
+        description = f"Mantención programada de {entry.code}"
+    else:
+        description = (
+            f"Overhaul de {entry.code}: {entry.hours_since_last_overhaul:,.0f} h desde el último "
+            f"(intervalo {settings.MAINTENANCE_OVERHAUL_INTERVAL_HOURS:,.0f} h)"
+        )
+    return {
+        "id": uuid.uuid4(),
+        "equipment_id": entry.equipment_id,
+        "maintenance_type": maintenance_type(entry),
+        "priority": work_order_priority(entry, now),
+        "due_date": datetime.fromtimestamp(entry.due_at, tz=timezone.utc),
+        "trigger_reason": entry.trigger,
+        "operating_hours_at_creation": entry.total_operating_hours,
+        "description": description,
+    }
+
+
+# =============================================================================
+# SERVICIO
+# =============================================================================
+
+class MaintenanceScheduler:
+    """
+    Cola de vencimientos sincronizada con la base de datos y generación de órdenes
+
+    Uso:
+        scheduler = get_maintenance_scheduler()
+        due = await scheduler.due_within(pool, hours=48)
+        created = await scheduler.generate_work_orders(pool)
+    """
+
+    def __init__(self):
+        self.queue = MaintenanceQueue()
+        self._version: Optional[tuple] = None
+        self._rebuilt_at: Optional[float] = None
+        self._last_run: Optional[dict] = None
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._leader_conn: Optional[asyncpg.Connection] = None
+        self._is_leader = False
+
+    async def refresh(self, pool: asyncpg.Pool, force: bool = False) -> bool:
+        """Reconstruir la cola si cambiaron los equipos o las órdenes; True si se reconstruyó"""
+        versions = await reference_data.get_table_versions(pool, SCHEDULER_TABLES)
+        version = tuple(versions[table] for table in SCHEDULER_TABLES)
+        if not force and version == self._version:
+            return False
+
+        async with self._lock:
+            if not force and version == self._version:
+                return False
+            reason = "startup" if self._version is None else ("forced" if force else "change")
+            rows = await maintenance.list_maintenance_candidates(pool)
+            now = time.time()
+            self.queue.rebuild(filter(None, (due_entry(row, now) for row in rows)))
+            # Versión leída antes que las filas: un cambio intermedio vuelve a reconstruir
+            self._version = version
+            self._rebuilt_at = now
+            MAINTENANCE_QUEUE_REBUILDS_TOTAL.labels(reason).inc()
+            MAINTENANCE_QUEUE_SIZE.set(len(self.queue))
+            return True
+
+    async def due_within(self, pool: asyncpg.Pool, hours: float, limit: Optional[int] = None) -> list[MaintenanceDue]:
+        """Mantenciones que vencen en las próximas `hours` horas (incluye las ya vencidas)"""
+        await self.refresh(pool)
+        return self.queue.due_within(hours, limit=limit)
+
+    async def generate_work_orders(self, pool: asyncpg.Pool, lead_hours: Optional[float] = None) -> list[asyncpg.Record]:
+        """
+        Crear las órdenes de todo lo que vence dentro de `lead_hours`
+        (MAINTENANCE_WORK_ORDER_LEAD_HOURS por defecto) en una sola sentencia
+
+        Todo en una unidad de trabajo transaccional: un acquire para las
+        versiones, los candidatos, la inserción y el audit log, y la
+        generación queda registrada sólo si las órdenes se confirman.
+        """
+        lead_hours = settings.MAINTENANCE_WORK_ORDER_LEAD_HOURS if lead_hours is None else lead_hours
+        async with unit_of_work(pool):
+            await self.refresh(pool)
+            now = time.time()
+            due = self.queue.due_within(lead_hours, now)
+            created = await maintenance.create_work_orders_bulk(pool, [build_work_order(entry, now) for entry in due])
+            if created:
+                await audit_logs.create_audit_log(
+                    pool,
+                    "CREATE",
+                    f"Scheduler de mantenimiento: {len(created)} órdenes de trabajo",
+                    entity_type="maintenance_work_orders",
+                    extra_data={
+                        "lead_hours": lead_hours,
+                        "work_order_ids": [str(row["id"]) for row in created],
+                    },
+                )
+
+        # Con orden abierta (recién creada o de otro worker) el equipo sale de la cola
+        for entry in due:
+            self.queue.remove(entry.equipment_id)
+        for row in created:
+            MAINTENANCE_WORK_ORDERS_CREATED_TOTAL.labels(row["priority"]).inc()
+        MAINTENANCE_QUEUE_SIZE.set(len(self.queue))
+        self._last_run = {"at": now, "due": len(due), "created": len(created)}
+        return created
+
+    def stats(self) -> dict:
+        """Estado de la cola (endpoint de admin)"""
+        head = self.queue.peek()
+        return {
+            "queued": len(self.queue),
+            "version": dict(zip(SCHEDULER_TABLES, self._version)) if self._version else None,
+            "rebuilt_at": self._rebuilt_at,
+            "next_due_at": head.due_at if head else None,
+            "due_within_24h": self.queue.count_due_within(24),
+            "last_run": self._last_run,
+            "running": self._task is not None and not self._task.done(),
+            "leader": self._is_leader,
+        }
+
+    # -------------------------------------------------------------------------
+    # Ejecución periódica
+    # -------------------------------------------------------------------------
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self._drop_leader_conn()
+
+    async def _drop_leader_conn(self) -> None:
+        """Cerrar la conexión del lock (lo libera si este worker era el líder)"""
+        conn, self._leader_conn, self._is_leader = self._leader_conn, None, False
+        if conn is not None and not conn.is_closed():
+            await conn.close()
+
+    async def _ensure_leader(self) -> bool:
+        """
+        True si este worker es el líder (tiene el advisory lock de sesión)
+        Los demás reintentan el lock en cada ciclo, sobre su propia conexión.
+        """
+        if self._leader_conn is not None and self._leader_conn.is_closed():
+            if self._is_leader:
+                print("⚠️  Maintenance scheduler: conexión del lock perdida, se deja de ser líder")
+            self._leader_conn, self._is_leader = None, False
+        if self._is_leader:
+            return True
+        try:
+            if self._leader_conn is None:
+                self._leader_conn = await asyncpg.connect(
+                    settings.get_db_url_asyncpg(),
+                    server_settings={"application_name": f"{settings.DB_APPLICATION_NAME}-maintenance-scheduler"},
+                )
+            self._is_leader = await self._leader_conn.fetchval(
+                "SELECT pg_try_advisory_lock(hashtext($1))", LEADER_LOCK_NAME
+            )
+        except Exception as e:
+            print(f"⚠️  Maintenance scheduler: advisory lock unavailable ({e})")
+            await self._drop_leader_conn()
+            return False
+        if self._is_leader:
+            print("🛠️  Maintenance scheduler: este worker es el líder")
+        return self._is_leader
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                if await self._ensure_leader():
+                    created = await self.generate_work_orders(await get_db_pool())
+                    if created:
+                        print(f"🛠️  Maintenance scheduler: {len(created)} órdenes de trabajo creadas")
+            except Exception as e:
+                print(f"⚠️  Maintenance scheduler run failed: {e}")
+            await asyncio.sleep(settings.MAINTENANCE_SCHEDULER_INTERVAL_SECONDS)
+
+
+# Instancia global del servicio (una por proceso)
+_service: Optional[MaintenanceScheduler] = None
+
+
+def get_maintenance_scheduler() -> MaintenanceScheduler:
+    """
+    Obtener la instancia del servicio
+    Se usa como dependency de FastAPI
+    """
+    global _service
+
+    if _service is None:
+        _service = MaintenanceScheduler()
+    return _service
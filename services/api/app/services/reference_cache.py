@@ -0,0 +1,258 @@
+"""
+Reference Data Cache
+
+Caché por proceso de las tablas maestras que cambian poco y se leen en casi
+todos los requests operacionales (roles, deposits, mines, equipment_types,
+reagents):
+
+- Al arrancar se carga cada tabla en un snapshot inmutable (tupla de filas e
+  índices id -> fila y código -> fila de sólo lectura)
+- Un trigger incrementa table_versions y publica NOTIFY table_versions con
+  '<tabla>:<versión>'; una conexión dedicada escucha el canal y recarga sólo
+  esa tabla, reemplazando el snapshot completo de una vez (los lectores ven
+  el anterior o el nuevo, nunca uno a medio construir)
+- Cada REFERENCE_CACHE_POLL_SECONDS se comparan las versiones con la base de
+  datos por si se perdió una notificación (conexión de escucha caída)
+
+Las búsquedas (get, get_by_code, rows) son síncronas y no tocan la base de
+datos. La conexión de escucha es una conexión extra por worker, fuera del pool.
+
+Métricas: búsquedas por resultado (hit/miss), recargas por origen, versión en
+caché y segundos desde la última confirmación de que el snapshot está al día.
+"""
+
+import asyncio
+import time
+from types import MappingProxyType
+from typing import Awaitable, Callable, Iterable, Mapping, NamedTuple, Optional
+from uuid import UUID
+
+import asyncpg
+
+from app.config import settings
+from app.database import get_db_pool
+from app.metrics import (
+    REFERENCE_CACHE_LOOKUPS_TOTAL,
+    REFERENCE_CACHE_REFRESHES_TOTAL,
+    REFERENCE_CACHE_STALENESS_SECONDS,
+    REFERENCE_CACHE_VERSION,
+)
+from app.queries import reference_data, roles
+
+
+NOTIFY_CHANNEL = "table_versions"
+
+
+class ReferenceTable(NamedTuple):
+    """Tabla cacheada: loader de filas y columna usada como código"""
+    name: str
+    loader: Callable[[asyncpg.Pool], Awaitable[list]]
+    code_column: str = "code"
+
+
+REFERENCE_TABLES: dict[str, ReferenceTable] = {
+    table.name: table
+    for table in (
+        ReferenceTable("roles", roles.get_all_roles, code_column="name"),
+        ReferenceTable("deposits", reference_data.list_deposits),
+        ReferenceTable("mines", reference_data.list_mines),
+        ReferenceTable("equipment_types", reference_data.list_equipment_types),
+        ReferenceTable("reagents", reference_data.list_reagents),
+    )
+}
+
+
+class TableSnapshot(NamedTuple):
+    """Contenido inmutable de una tabla en una versión"""
+    version: int
+    rows: tuple
+    by_id: Mapping[UUID, asyncpg.Record]
+    by_code: Mapping[str, asyncpg.Record]
+    loaded_at: float
+
+
+def build_snapshot(table: ReferenceTable, version: int, rows: Iterable) -> TableSnapshot:
+    rows = tuple(rows)
+    return TableSnapshot(
+        version=version,
+        rows=rows,
+        by_id=MappingProxyType({row["id"]: row for row in rows}),
+        by_code=MappingProxyType({row[table.code_column]: row for row in rows}),
+        loaded_at=time.time(),
+    )
+
+
+class ReferenceDataCache:
+    """Snapshots versionados de REFERENCE_TABLES (ver docstring del módulo)"""
+
+    def __init__(self, tables: Mapping[str, ReferenceTable] = REFERENCE_TABLES):
+        self._tables = tables
+        self._snapshots: dict[str, TableSnapshot] = {}
+        self._confirmed_at: dict[str, float] = {}
+        self._listener: Optional[asyncpg.Connection] = None
+        self._task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+
+    # -------------------------------------------------------------------------
+    # Búsquedas (sin base de datos)
+    # -------------------------------------------------------------------------
+
+    @property
+    def loaded(self) -> bool:
+        return len(self._snapshots) == len(self._tables)
+
+    def snapshot(self, table: str) -> Optional[TableSnapshot]:
+        """Snapshot actual de la tabla (None si todavía no se cargó)"""
+        return self._snapshots.get(table)
+
+    def versions(self, tables: Iterable[str]) -> Optional[dict[str, int]]:
+        """Versión en caché de cada tabla (None si alguna no está cargada)"""
+        versions = {}
+        for table in tables:
+            snapshot = self._snapshots.get(table)
+            if snapshot is None:
+                return None
+            versions[table] = snapshot.version
+        return versions
+
+    def rows(self, table: str) -> Optional[tuple]:
+        """Todas las filas de la tabla, en el orden del loader"""
+        snapshot = self._snapshots.get(table)
+        REFERENCE_CACHE_LOOKUPS_TOTAL.labels(table, "hit" if snapshot else "miss").inc()
+        return snapshot.rows if snapshot else None
+
+    def get(self, table: str, row_id: UUID) -> Optional[asyncpg.Record]:
+        """Fila por id"""
+        snapshot = self._snapshots.get(table)
+        row = snapshot.by_id.get(row_id) if snapshot else None
+        REFERENCE_CACHE_LOOKUPS_TOTAL.labels(table, "hit" if row is not None else "miss").inc()
+        return row
+
+    def get_by_code(self, table: str, code: str) -> Optional[asyncpg.Record]:
+        """Fila por código (name en roles)"""
+        snapshot = self._snapshots.get(table)
+        row = snapshot.by_code.get(code) if snapshot else None
+        REFERENCE_CACHE_LOOKUPS_TOTAL.labels(table, "hit" if row is not None else "miss").inc()
+        return row
+
+    def stats(self) -> dict:
+        """Estado de la caché por tabla (endpoint de admin)"""
+        now = time.time()
+        return {
+            "listening": self._listener is not None and not self._listener.is_closed(),
+            "tables": {
+                name: {
+                    "version": snapshot.version,
+                    "rows": len(snapshot.rows),
+                    "loaded_at": snapshot.loaded_at,
+                    "confirmed_seconds_ago": round(now - self._confirmed_at.get(name, snapshot.loaded_at), 3),
+                }
+                for name, snapshot in self._snapshots.items()
+            },
+        }
+
+    # -------------------------------------------------------------------------
+    # Carga y refresco
+    # -------------------------------------------------------------------------
+
+    async def refresh(self, pool: asyncpg.Pool, tables: Optional[Iterable[str]] = None, trigger: str = "poll") -> list[str]:
+        """
+        Recargar las tablas cuya versión en la base de datos difiere de la
+        cacheada; retorna las tablas recargadas
+        """
+        names = [name for name in (tables or self._tables) if name in self._tables]
+        async with self._lock:
+            versions = await reference_data.get_table_versions(pool, names)
+            now = time.time()
+            reloaded = []
+            for name in names:
+                current = self._snapshots.get(name)
+                if current is None or current.version != versions[name]:
+                    rows = await self._tables[name].loader(pool)
+                    # Versión leída antes que las filas: si cambió entremedio,
+                    # la próxima notificación/poll vuelve a recargar
+                    self._snapshots = {
+                        **self._snapshots,
+                        name: build_snapshot(self._tables[name], versions[name], rows),
+                    }
+                    REFERENCE_CACHE_REFRESHES_TOTAL.labels(name, trigger).inc()
+                    REFERENCE_CACHE_VERSION.labels(name).set(versions[name])
+                    reloaded.append(name)
+                self._confirmed_at[name] = now
+                REFERENCE_CACHE_STALENESS_SECONDS.labels(name).set(0)
+            return reloaded
+
+    def _update_staleness(self) -> None:
+        now = time.time()
+        for name, confirmed_at in self._confirmed_at.items():
+            REFERENCE_CACHE_STALENESS_SECONDS.labels(name).set(now - confirmed_at)
+
+    async def start(self) -> None:
+        """
+        Carga inicial, escucha de NOTIFY y poll de respaldo
+        Si la base de datos no responde, el poll carga las tablas más tarde.
+        """
+        await self._refresh_quietly(None, "startup")
+        await self._listen()
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._listener is not None:
+            await self._listener.close()
+            self._listener = None
+
+    async def _listen(self) -> None:
+        try:
+            self._listener = await asyncpg.connect(
+                settings.get_db_url_asyncpg(),
+                server_settings={"application_name": f"{settings.DB_APPLICATION_NAME}-listener"},
+            )
+            await self._listener.add_listener(NOTIFY_CHANNEL, self._on_notify)
+        except Exception as e:
+            self._listener = None
+            print(f"⚠️  Reference cache: LISTEN {NOTIFY_CHANNEL} unavailable, polling only ({e})")
+
+    def _on_notify(self, connection, pid, channel, payload: str) -> None:
+        table, _, version = payload.partition(":")
+        snapshot = self._snapshots.get(table)
+        if snapshot is not None and version.isdigit() and int(version) <= snapshot.version:
+            return  # Ya recargada (p. ej. por el poll)
+        asyncio.get_running_loop().create_task(self._refresh_quietly([table], "notify"))
+
+    async def _refresh_quietly(self, tables: Optional[list[str]], trigger: str) -> None:
+        try:
+            await self.refresh(await get_db_pool(), tables, trigger)
+        except Exception as e:
+            print(f"⚠️  Reference cache refresh failed ({trigger}): {e}")
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(settings.REFERENCE_CACHE_POLL_SECONDS)
+            if self._listener is None or self._listener.is_closed():
+                await self._listen()
+            await self._refresh_quietly(None, "poll")
+            self._update_staleness()
+
+
+# Instancia global del servicio (una por proceso)
+_service: Optional[ReferenceDataCache] = None
+
+
+def get_reference_cache() -> ReferenceDataCache:
+    """
+    Obtener la instancia del servicio
+    Se usa como dependency de FastAPI
+    """
+    global _service
+
+    if _service is None:
+        _service = ReferenceDataCache()
+    return _service
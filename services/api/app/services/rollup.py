@@ -0,0 +1,169 @@
+"""
+Roll-up Service
+
+Agregados jerárquicos yacimiento → mina → fase a partir de phase_block_aggregates
+(mantenida por triggers sobre blocks). Las fases se leen en una sola query y
+se suman hacia arriba en Python; el resultado se cachea por versión (ETag).
+"""
+
+from collections import OrderedDict
+from typing import Optional
+from uuid import UUID
+
+import asyncpg
+
+from app.queries import rollups
+
+
+SUM_FIELDS = (
+    "block_count",
+    "mined_block_count",
+    "total_tonnage",
+    "mined_tonnage",
+    "contained_cu_t",
+    "contained_mo_t",
+    "mined_cu_t",
+    "mined_mo_t",
+)
+
+
+def _empty_sums() -> dict:
+    return {field: 0 for field in SUM_FIELDS}
+
+
+def _add(target: dict, source) -> None:
+    for field in SUM_FIELDS:
+        target[field] += source[field]
+
+
+def rollup_metrics(sums: dict) -> dict:
+    """Métricas derivadas (remanente, leyes medias, fracción minada) desde las sumas"""
+    total = sums["total_tonnage"]
+    return {
+        "block_count": sums["block_count"],
+        "mined_block_count": sums["mined_block_count"],
+        "total_tonnage": total,
+        "mined_tonnage": sums["mined_tonnage"],
+        "remaining_tonnage": total - sums["mined_tonnage"],
+        "contained_cu_t": sums["contained_cu_t"],
+        "contained_mo_t": sums["contained_mo_t"],
+        "remaining_cu_t": sums["contained_cu_t"] - sums["mined_cu_t"],
+        "remaining_mo_t": sums["contained_mo_t"] - sums["mined_mo_t"],
+        "avg_cu_grade_pct": sums["contained_cu_t"] / total * 100 if total else None,
+        "avg_mo_grade_pct": sums["contained_mo_t"] / total * 100 if total else None,
+        "mined_fraction": sums["mined_tonnage"] / total if total else None,
+    }
+
+
+def build_rollup(rows: list) -> dict:
+    """
+    Armar el árbol yacimiento → mina → fase sumando los agregados por fase
+
+    Args:
+        rows: Filas de rollups.get_phase_aggregates (ordenadas por yacimiento y mina)
+    """
+    deposits: OrderedDict = OrderedDict()
+    totals = _empty_sums()
+
+    for row in rows:
+        deposit = deposits.get(row["deposit_id"])
+        if deposit is None:
+            deposit = deposits[row["deposit_id"]] = {
+                "id": row["deposit_id"],
+                "code": row["deposit_code"],
+                "name": row["deposit_name"],
+                "sums": _empty_sums(),
+                "mines": OrderedDict(),
+            }
+        if row["mine_id"] is None:
+            continue
+
+        mine = deposit["mines"].get(row["mine_id"])
+        if mine is None:
+            mine = deposit["mines"][row["mine_id"]] = {
+                "id": row["mine_id"],
+                "code": row["mine_code"],
+                "name": row["mine_name"],
+                "sums": _empty_sums(),
+                "phases": [],
+            }
+        if row["phase_id"] is None:
+            continue
+
+        mine["phases"].append({
+            "id": row["phase_id"],
+            "code": row["phase_code"],
+            "name": row["phase_name"],
+            "sequence_number": row["sequence_number"],
+            "metrics": rollup_metrics(row),
+        })
+        _add(mine["sums"], row)
+        _add(deposit["sums"], row)
+        _add(totals, row)
+
+    return {
+        "deposits": [
+            {
+                "id": deposit["id"],
+                "code": deposit["code"],
+                "name": deposit["name"],
+                "metrics": rollup_metrics(deposit["sums"]),
+                "mines": [
+                    {
+                        "id": mine["id"],
+                        "code": mine["code"],
+                        "name": mine["name"],
+                        "metrics": rollup_metrics(mine["sums"]),
+                        "phases": mine["phases"],
+                    }
+                    for mine in deposit["mines"].values()
+                ],
+            }
+            for deposit in deposits.values()
+        ],
+        "totals": rollup_metrics(totals),
+    }
+
+
+class RollupService:
+    """
+    Roll-up cacheado por ETag
+
+    Uso:
+        service = get_rollup_service()
+        payload = await service.get_rollup(pool, etag, deposit_id)
+    """
+
+    def __init__(self, cache_size: int = 32):
+        self._cache: OrderedDict = OrderedDict()
+        self._cache_size = cache_size
+
+    async def get_rollup(self, pool: asyncpg.Pool, etag: str, deposit_id: Optional[UUID] = None) -> dict:
+        """Obtener el roll-up para la versión `etag` (se recalcula sólo si cambió)"""
+        cached = self._cache.get(etag)
+        if cached is not None:
+            self._cache.move_to_end(etag)
+            return cached
+
+        rows = await rollups.get_phase_aggregates(pool, deposit_id)
+        payload = build_rollup(rows)
+        self._cache[etag] = payload
+        while len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+        return payload
+
+
+# Instancia global del servicio (una por proceso)
+_service: Optional[RollupService] = None
+
+
+def get_rollup_service() -> RollupService:
+    """
+    Obtener la instancia del servicio
+    Se usa como dependency de FastAPI
+    """
+    global _service
+
+    if _service is None:
+        _service = RollupService()
+    return _service
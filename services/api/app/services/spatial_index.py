@@ -0,0 +1,518 @@
+"""
+Spatial Index Service
+
+Búsquedas espaciales sobre coordinates sin escanear la tabla:
+
+- Bounding box, radio y k vecinos más cercanos
+- KD-tree (scipy cKDTree) en memoria sobre coordenadas UTM (metros)
+- Refresco incremental: los puntos nuevos/modificados van a un buffer delta
+  (búsqueda por fuerza bruta) y los reemplazados se marcan como eliminados;
+  el árbol se reconstruye sólo cuando el delta supera REBUILD_RATIO del total
+
+Todas las coordenadas se proyectan a una única zona UTM (settings.SPATIAL_UTM_ZONE)
+a partir de latitud/longitud, para que las distancias sean comparables entre puntos
+aunque utm_easting/utm_northing no estén poblados o estén en otra zona.
+"""
+
+import asyncio
+import re
+import time
+from typing import Iterable, NamedTuple, Optional
+from uuid import UUID
+
+import asyncpg
+import numpy as np
+from scipy.spatial import cKDTree
+
+from app.config import settings
+from app.queries import coordinates
+
+
+# =============================================================================
+# PROYECCIÓN WGS84 -> UTM (serie de Krüger, vectorizada)
+# =============================================================================
+
+WGS84_A = 6378137.0
+WGS84_F = 1 / 298.257223563
+UTM_K0 = 0.9996
+UTM_FALSE_EASTING = 500000.0
+UTM_FALSE_NORTHING_SOUTH = 10000000.0
+
+_N = WGS84_F / (2 - WGS84_F)
+_RECTIFYING_RADIUS = WGS84_A / (1 + _N) * (1 + _N**2 / 4 + _N**4 / 64)
+_ALPHA = (
+    _N / 2 - 2 * _N**2 / 3 + 5 * _N**3 / 16,
+    13 * _N**2 / 48 - 3 * _N**3 / 5,
+    61 * _N**3 / 240,
+)
+_E = 2 * np.sqrt(_N) / (1 + _N)
+
+
+def parse_utm_zone(zone: str) -> tuple[int, bool]:
+    """
+    Interpretar una zona UTM ("19S", "19H", "19") como (número, hemisferio sur)
+    "S" se interpreta como hemisferio (convención de los datos semilla) y las
+    letras de banda C-M también corresponden al hemisferio sur.
+    """
+    match = re.fullmatch(r"\s*(\d{1,2})\s*([A-Za-z]?)\s*", zone)
+    if not match or not 1 <= int(match.group(1)) <= 60:
+        raise ValueError(f"Zona UTM inválida: {zone!r}")
+    letter = match.group(2).upper()
+    return int(match.group(1)), letter == "S" or ("C" <= letter <= "M")
+
+
+def latlon_to_utm(
+    latitude: np.ndarray,
+    longitude: np.ndarray,
+    zone: int,
+    southern: bool,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Proyectar latitud/longitud (grados WGS84) a easting/northing (metros)
+    en una zona UTM fija. Error < 1 mm dentro de la zona.
+    """
+    phi = np.radians(np.asarray(latitude, dtype=np.float64))
+    dlam = np.radians(np.asarray(longitude, dtype=np.float64) - ((zone - 1) * 6 - 180 + 3))
+
+    sin_phi = np.sin(phi)
+    t = np.sinh(np.arctanh(sin_phi) - _E * np.arctanh(_E * sin_phi))
+    xi = np.arctan2(t, np.cos(dlam))
+    eta = np.arctanh(np.sin(dlam) / np.sqrt(1 + t * t))
+
+    easting = eta.copy()
+    northing = xi.copy()
+    for j, alpha in enumerate(_ALPHA, start=1):
+        easting += alpha * np.cos(2 * j * xi) * np.sinh(2 * j * eta)
+        northing += alpha * np.sin(2 * j * xi) * np.cosh(2 * j * eta)
+
+    easting = UTM_FALSE_EASTING + UTM_K0 * _RECTIFYING_RADIUS * easting
+    northing = UTM_K0 * _RECTIFYING_RADIUS * northing
+    if southern:
+        northing += UTM_FALSE_NORTHING_SOUTH
+    return easting, northing
+
+
+# =============================================================================
+# ÍNDICE EN MEMORIA
+# =============================================================================
+
+class _Snapshot(NamedTuple):
+    """Árbol + columnas de los puntos indexados (inmutable salvo `alive`)"""
+    tree: Optional[cKDTree]
+    xy: np.ndarray           # (n, 2) easting, northing
+    latitude: np.ndarray
+    longitude: np.ndarray
+    elevation: np.ndarray    # NaN = sin dato
+    point_types: np.ndarray  # object
+    ids: list
+    deposit_ids: list
+    alive: np.ndarray        # bool, False = reemplazado o eliminado
+
+
+def _empty_snapshot() -> _Snapshot:
+    return _Snapshot(
+        tree=None,
+        xy=np.empty((0, 2)),
+        latitude=np.empty(0),
+        longitude=np.empty(0),
+        elevation=np.empty(0),
+        point_types=np.empty(0, dtype=object),
+        ids=[],
+        deposit_ids=[],
+        alive=np.empty(0, dtype=bool),
+    )
+
+
+def _nullable_floats(values: Iterable) -> np.ndarray:
+    return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+
+
+class SpatialIndex:
+    """
+    KD-tree sobre coordenadas UTM con buffer delta para cambios incrementales
+
+    Uso:
+        index = SpatialIndex(zone=19, southern=True)
+        index.build(rows)            # rows: registros de coordinates
+        index.upsert(changed_rows)   # cambios: van al delta
+        index.nearest(-24.27, -69.07, k=5)
+    """
+
+    REBUILD_MIN_CHANGES = 1000
+
+    def __init__(self, zone: int, southern: bool, rebuild_ratio: float = 0.1):
+        self.zone = zone
+        self.southern = southern
+        self.rebuild_ratio = rebuild_ratio
+        self._base = _empty_snapshot()
+        self._positions: dict[UUID, int] = {}
+        self._delta: dict[UUID, dict] = {}
+        self._delta_arrays: Optional[tuple] = None
+        self._dead = 0
+
+    # -------------------------------------------------------------------------
+    # Construcción y cambios
+    # -------------------------------------------------------------------------
+
+    def build(self, rows: list) -> None:
+        """Reconstruir el índice completo a partir de registros de coordinates"""
+        self.build_arrays(
+            ids=[row["id"] for row in rows],
+            deposit_ids=[row["deposit_id"] for row in rows],
+            point_types=[row["point_type"] for row in rows],
+            latitude=np.array([row["latitude"] for row in rows], dtype=np.float64),
+            longitude=np.array([row["longitude"] for row in rows], dtype=np.float64),
+            elevation=_nullable_floats(row["elevation_masl"] for row in rows),
+        )
+
+    def build_arrays(
+        self,
+        ids: list,
+        deposit_ids: list,
+        point_types: list,
+        latitude: np.ndarray,
+        longitude: np.ndarray,
+        elevation: np.ndarray,
+    ) -> None:
+        """Reconstruir el índice a partir de columnas (camino rápido para cargas grandes)"""
+        easting, northing = latlon_to_utm(latitude, longitude, self.zone, self.southern)
+        xy = np.column_stack((easting, northing))
+        point_types_array = np.empty(len(ids), dtype=object)
+        point_types_array[:] = point_types
+
+        self._base = _Snapshot(
+            tree=cKDTree(xy, balanced_tree=False, compact_nodes=False) if len(ids) else None,
+            xy=xy,
+            latitude=np.asarray(latitude, dtype=np.float64),
+            longitude=np.asarray(longitude, dtype=np.float64),
+            elevation=np.asarray(elevation, dtype=np.float64),
+            point_types=point_types_array,
+            ids=list(ids),
+            deposit_ids=list(deposit_ids),
+            alive=np.ones(len(ids), dtype=bool),
+        )
+        self._positions = {point_id: i for i, point_id in enumerate(ids)}
+        self._delta = {}
+        self._delta_arrays = None
+        self._dead = 0
+
+    def upsert(self, rows: list) -> None:
+        """Agregar o reemplazar puntos (el árbol no se toca hasta el próximo rebuild)"""
+        for row in rows:
+            self._kill(row["id"])
+            self._delta[row["id"]] = {
+                "id": row["id"],
+                "deposit_id": row["deposit_id"],
+                "point_type": row["point_type"],
+                "latitude": row["latitude"],
+                "longitude": row["longitude"],
+                "elevation_masl": row["elevation_masl"],
+            }
+        self._delta_arrays = None
+
+    def remove(self, ids: Iterable[UUID]) -> None:
+        """Eliminar puntos del índice"""
+        for point_id in ids:
+            self._kill(point_id)
+            self._delta.pop(point_id, None)
+        self._delta_arrays = None
+
+    def _kill(self, point_id: UUID) -> None:
+        position = self._positions.pop(point_id, None)
+        if position is not None:
+            self._base.alive[position] = False
+            self._dead += 1
+
+    @property
+    def needs_rebuild(self) -> bool:
+        """True si el delta/eliminados superan REBUILD_RATIO del índice"""
+        changes = len(self._delta) + self._dead
+        return changes >= max(self.REBUILD_MIN_CHANGES, self.rebuild_ratio * len(self._base.ids))
+
+    def compacted(self) -> "SpatialIndex":
+        """
+        Nuevo índice con los puntos vigentes + delta en un solo árbol.
+        Se construye aparte (en un thread) y se reemplaza de forma atómica,
+        así las consultas concurrentes nunca ven un índice a medio reconstruir.
+        """
+        base = self._base
+        alive = base.alive
+        delta = list(self._delta.values())
+        index = SpatialIndex(self.zone, self.southern, self.rebuild_ratio)
+        index.build_arrays(
+            ids=[point_id for point_id, ok in zip(base.ids, alive) if ok] + [p["id"] for p in delta],
+            deposit_ids=[d for d, ok in zip(base.deposit_ids, alive) if ok] + [p["deposit_id"] for p in delta],
+            point_types=list(base.point_types[alive]) + [p["point_type"] for p in delta],
+            latitude=np.concatenate((base.latitude[alive], [p["latitude"] for p in delta])),
+            longitude=np.concatenate((base.longitude[alive], [p["longitude"] for p in delta])),
+            elevation=np.concatenate((base.elevation[alive], _nullable_floats(p["elevation_masl"] for p in delta))),
+        )
+        return index
+
+    def __len__(self) -> int:
+        return len(self._positions) + len(self._delta)
+
+    # -------------------------------------------------------------------------
+    # Consultas
+    # -------------------------------------------------------------------------
+
+    def project(self, latitude: float, longitude: float) -> tuple[float, float]:
+        easting, northing = latlon_to_utm(np.array([latitude]), np.array([longitude]), self.zone, self.southern)
+        return float(easting[0]), float(northing[0])
+
+    def nearest(
+        self,
+        latitude: float,
+        longitude: float,
+        k: int = 5,
+        point_type: Optional[str] = None,
+    ) -> list[dict]:
+        """k puntos más cercanos (distancia planar UTM en metros)"""
+        base = self._base
+        center = self.project(latitude, longitude)
+        candidates: list[tuple[float, int]] = []
+
+        if base.tree is not None:
+            # Consultar más de k vecinos si hay eliminados o filtro por tipo,
+            # duplicando hasta completar k válidos o agotar el árbol
+            n = len(base.ids)
+            want = min(2 * k if self._dead or point_type is not None else k, n)
+            while True:
+                distances, positions = base.tree.query(center, k=want)
+                distances = np.atleast_1d(distances)
+                positions = np.atleast_1d(positions)
+                valid = base.alive[positions]
+                if point_type is not None:
+                    valid &= base.point_types[positions] == point_type
+                if valid.sum() >= k or want >= n:
+                    break
+                want = min(want * 2, n)
+            candidates = [(float(d), int(p)) for d, p in zip(distances[valid][:k], positions[valid][:k])]
+
+        results = [self._base_point(base, position, distance) for distance, position in candidates]
+        results.extend(self._delta_matches(center, point_type, k=k))
+        results.sort(key=lambda point: point["distance_m"])
+        return results[:k]
+
+    def within_radius(
+        self,
+        latitude: float,
+        longitude: float,
+        radius_m: float,
+        point_type: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> list[dict]:
+        """Puntos a menos de `radius_m` metros, ordenados por distancia"""
+        base = self._base
+        center = self.project(latitude, longitude)
+        results = []
+
+        if base.tree is not None:
+            positions = np.asarray(base.tree.query_ball_point(center, r=radius_m), dtype=np.intp)
+            positions = positions[self._base_mask(base, positions, point_type)]
+            distances = np.hypot(*(base.xy[positions] - center).T)
+            results = [self._base_point(base, p, d) for p, d in zip(positions, distances)]
+
+        results.extend(self._delta_matches(center, point_type, max_distance=radius_m))
+        results.sort(key=lambda point: point["distance_m"])
+        return results[:limit] if limit else results
+
+    def within_bbox(
+        self,
+        min_latitude: float,
+        min_longitude: float,
+        max_latitude: float,
+        max_longitude: float,
+        point_type: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> list[dict]:
+        """
+        Puntos dentro de un rectángulo lat/lon
+
+        El rectángulo no es paralelo a los ejes UTM: se consultan los candidatos
+        dentro del cuadrado UTM que lo contiene (norma L-infinito) y luego se
+        filtra exacto por latitud/longitud.
+        """
+        base = self._base
+        results = []
+
+        if base.tree is not None:
+            lats = np.array([min_latitude, min_latitude, max_latitude, max_latitude,
+                             min_latitude, max_latitude, (min_latitude + max_latitude) / 2,
+                             (min_latitude + max_latitude) / 2])
+            lons = np.array([min_longitude, max_longitude, min_longitude, max_longitude,
+                             (min_longitude + max_longitude) / 2, (min_longitude + max_longitude) / 2,
+                             min_longitude, max_longitude])
+            easting, northing = latlon_to_utm(lats, lons, self.zone, self.southern)
+            center = ((easting.min() + easting.max()) / 2, (northing.min() + northing.max()) / 2)
+            half_size = max(easting.max() - easting.min(), northing.max() - northing.min()) / 2
+
+            positions = np.asarray(base.tree.query_ball_point(center, r=half_size * 1.01, p=np.inf), dtype=np.intp)
+            mask = self._base_mask(base, positions, point_type)
+            mask &= (base.latitude[positions] >= min_latitude) & (base.latitude[positions] <= max_latitude)
+            mask &= (base.longitude[positions] >= min_longitude) & (base.longitude[positions] <= max_longitude)
+            results = [self._base_point(base, p) for p in np.sort(positions[mask])]
+
+        bbox = (min_latitude, min_longitude, max_latitude, max_longitude)
+        results.extend(self._delta_matches(None, point_type, bbox=bbox))
+        return results[:limit] if limit else results
+
+    # -------------------------------------------------------------------------
+    # Helpers
+    # -------------------------------------------------------------------------
+
+    @staticmethod
+    def _base_mask(base: _Snapshot, positions: np.ndarray, point_type: Optional[str]) -> np.ndarray:
+        mask = base.alive[positions]
+        if point_type is not None:
+            mask &= base.point_types[positions] == point_type
+        return mask
+
+    @staticmethod
+    def _base_point(base: _Snapshot, position: int, distance: Optional[float] = None) -> dict:
+        elevation = base.elevation[position]
+        return {
+            "id": base.ids[position],
+            "deposit_id": base.deposit_ids[position],
+            "point_type": base.point_types[position],
+            "latitude": float(base.latitude[position]),
+            "longitude": float(base.longitude[position]),
+            "elevation_masl": None if np.isnan(elevation) else float(elevation),
+            "distance_m": None if distance is None else float(distance),
+        }
+
+    def _delta_matches(
+        self,
+        center: Optional[tuple[float, float]],
+        point_type: Optional[str],
+        max_distance: Optional[float] = None,
+        k: Optional[int] = None,
+        bbox: Optional[tuple[float, float, float, float]] = None,
+    ) -> list[dict]:
+        """
+        Puntos del delta (fuerza bruta vectorizada), con distancia al centro si se indica.
+        El filtrado se hace sobre arrays; sólo se arman dicts para los seleccionados.
+        """
+        if not self._delta:
+            return []
+        if self._delta_arrays is None:
+            points = list(self._delta.values())
+            latitude = np.array([p["latitude"] for p in points], dtype=np.float64)
+            longitude = np.array([p["longitude"] for p in points], dtype=np.float64)
+            easting, northing = latlon_to_utm(latitude, longitude, self.zone, self.southern)
+            point_types = np.empty(len(points), dtype=object)
+            point_types[:] = [p["point_type"] for p in points]
+            self._delta_arrays = (points, np.column_stack((easting, northing)), latitude, longitude, point_types)
+
+        points, xy, latitude, longitude, point_types = self._delta_arrays
+        mask = np.ones(len(points), dtype=bool) if point_type is None else point_types == point_type
+        if bbox is not None:
+            min_latitude, min_longitude, max_latitude, max_longitude = bbox
+            mask &= (latitude >= min_latitude) & (latitude <= max_latitude)
+            mask &= (longitude >= min_longitude) & (longitude <= max_longitude)
+
+        distances = np.hypot(*(xy - center).T) if center is not None else None
+        if max_distance is not None:
+            mask &= distances <= max_distance
+
+        selected = np.flatnonzero(mask)
+        if k is not None and len(selected) > k:
+            selected = selected[np.argpartition(distances[selected], k)[:k]]
+        return [
+            {**points[i], "distance_m": None if distances is None else float(distances[i])}
+            for i in selected
+        ]
+
+
+# =============================================================================
+# SERVICIO (sincronización con la base de datos)
+# =============================================================================
+
+class SpatialIndexService:
+    """
+    Mantiene un SpatialIndex sincronizado con la tabla coordinates
+
+    - Consulta la versión de la tabla como máximo cada SPATIAL_INDEX_REFRESH_SECONDS
+    - Cambios (updated_at posterior a la última carga) se aplican al delta
+    - Eliminaciones (COUNT distinto) o antigüedad > SPATIAL_INDEX_MAX_AGE_SECONDS
+      provocan una recarga completa
+    """
+
+    def __init__(
+        self,
+        utm_zone: str = settings.SPATIAL_UTM_ZONE,
+        refresh_seconds: float = settings.SPATIAL_INDEX_REFRESH_SECONDS,
+        max_age_seconds: float = settings.SPATIAL_INDEX_MAX_AGE_SECONDS,
+        rebuild_ratio: float = settings.SPATIAL_INDEX_REBUILD_RATIO,
+    ):
+        zone, southern = parse_utm_zone(utm_zone)
+        self._zone = zone
+        self._southern = southern
+        self._rebuild_ratio = rebuild_ratio
+        self._refresh_seconds = refresh_seconds
+        self._max_age_seconds = max_age_seconds
+        self._index: Optional[SpatialIndex] = None
+        self._watermark = None
+        self._loaded_at = 0.0
+        self._checked_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def get_index(self, pool: asyncpg.Pool) -> SpatialIndex:
+        """Obtener el índice, refrescándolo si corresponde"""
+        if self._index is not None and time.monotonic() - self._checked_at < self._refresh_seconds:
+            return self._index
+
+        async with self._lock:
+            now = time.monotonic()
+            if self._index is not None and now - self._checked_at < self._refresh_seconds:
+                return self._index
+
+            version = await coordinates.get_coordinate_version(pool)
+            last_updated_at = version["last_updated_at"]
+
+            if (
+                self._index is None
+                or self._watermark is None
+                or now - self._loaded_at > self._max_age_seconds
+            ):
+                await self._full_load(pool, last_updated_at)
+            elif last_updated_at != self._watermark:
+                changed = await coordinates.get_coordinates_updated_since(pool, self._watermark)
+                self._index.upsert(changed)
+                self._watermark = last_updated_at
+
+            if len(self._index) != version["point_count"]:
+                await self._full_load(pool, last_updated_at)
+            elif self._index.needs_rebuild:
+                self._index = await asyncio.to_thread(self._index.compacted)
+
+            self._checked_at = now
+            return self._index
+
+    async def _full_load(self, pool: asyncpg.Pool, last_updated_at) -> None:
+        rows = await coordinates.get_all_coordinates(pool)
+        index = SpatialIndex(self._zone, self._southern, self._rebuild_ratio)
+        await asyncio.to_thread(index.build, rows)
+        self._index = index
+        self._watermark = last_updated_at
+        self._loaded_at = time.monotonic()
+
+    def invalidate(self) -> None:
+        """Forzar una recarga completa en la próxima consulta"""
+        self._index = None
+
+
+# Instancia global del servicio (una por proceso)
+_service: Optional[SpatialIndexService] = None
+
+
+def get_spatial_index_service() -> SpatialIndexService:
+    """
+    Obtener la instancia del servicio
+    Se usa como dependency de FastAPI
+    """
+    global _service
+
+    if _service is None:
+        _service = SpatialIndexService()
+    return _service
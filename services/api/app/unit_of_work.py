@@ -0,0 +1,236 @@
+"""
+Unit of Work
+
+Una sola conexión del pool (opcionalmente en una transacción) compartida por
+todas las funciones de app/queries llamadas dentro del bloque:
+
+    async with unit_of_work(pool) as uow:
+        if not await users.check_email_exists(pool, email):
+            user = await users.create_user(pool, ...)
+            await roles.assign_role_to_user(pool, user["id"], role_id)
+            uow.defer(AUDIT_INSERT, ...)
+
+Mientras la unidad está activa (ContextVar), la instrumentación de app/queries
+reemplaza el pool por la unidad: un acquire en vez de uno por función y
+atomicidad si transaction=True. La unidad también se puede pasar explícitamente
+como pool (expone acquire/execute/fetch/fetchrow/fetchval).
+
+Sentencias independientes sin resultado se encolan con defer() y se envían
+juntas al cerrar la unidad (o con flush()): las consecutivas con el mismo SQL
+van en un solo executemany, que asyncpg envía en pipeline (un solo ida y vuelta
+por grupo).
+
+Métricas: acquires evitados, queries por unidad, duración y rollbacks.
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Optional
+
+import asyncpg
+
+from app.database import InstrumentedPool, get_db_pool
+from app.metrics import (
+    DB_UOW_ACQUIRES_SAVED_TOTAL,
+    DB_UOW_DURATION,
+    DB_UOW_QUERIES,
+    DB_UOW_ROLLBACKS_TOTAL,
+)
+
+
+class _UnitAcquire:
+    """acquire() de la unidad: la misma conexión, serializada entre tareas"""
+
+    __slots__ = ("_uow",)
+
+    def __init__(self, uow: "UnitOfWork"):
+        self._uow = uow
+
+    async def __aenter__(self) -> asyncpg.Connection:
+        return await self._uow._enter()
+
+    async def __aexit__(self, *exc):
+        self._uow._exit()
+
+    def __await__(self):
+        # Permite `conn = await uow.acquire()` (liberar luego con uow.release(conn))
+        return self._uow._enter().__await__()
+
+
+class UnitOfWork:
+    """Conexión compartida por las queries de un bloque (ver docstring del módulo)"""
+
+    def __init__(self, pool: InstrumentedPool, connection: asyncpg.Connection):
+        self.pool = pool
+        self.connection = connection
+        self.acquires = 0
+        self._deferred: list[tuple[str, tuple]] = []
+        # Una conexión asyncpg no admite operaciones concurrentes: las tareas
+        # hijas (asyncio.gather) esperan su turno; la misma tarea puede re-entrar
+        self._lock = asyncio.Lock()
+        self._owner: Optional[asyncio.Task] = None
+        self._depth = 0
+        self._closed = False
+
+    # -------------------------------------------------------------------------
+    # Interfaz de pool
+    # -------------------------------------------------------------------------
+
+    def acquire(self, *, timeout: Optional[float] = None) -> _UnitAcquire:
+        return _UnitAcquire(self)
+
+    async def release(self, connection: asyncpg.Connection, *, timeout: Optional[float] = None):
+        self._exit()
+
+    async def execute(self, query: str, *args, timeout: Optional[float] = None) -> str:
+        async with self.acquire() as conn:
+            return await conn.execute(query, *args, timeout=timeout)
+
+    async def executemany(self, command: str, args, *, timeout: Optional[float] = None):
+        async with self.acquire() as conn:
+            return await conn.executemany(command, args, timeout=timeout)
+
+    async def fetch(self, query: str, *args, timeout: Optional[float] = None) -> list:
+        async with self.acquire() as conn:
+            return await conn.fetch(query, *args, timeout=timeout)
+
+    async def fetchrow(self, query: str, *args, timeout: Optional[float] = None):
+        async with self.acquire() as conn:
+            return await conn.fetchrow(query, *args, timeout=timeout)
+
+    async def fetchval(self, query: str, *args, column: int = 0, timeout: Optional[float] = None):
+        async with self.acquire() as conn:
+            return await conn.fetchval(query, *args, column=column, timeout=timeout)
+
+    async def _enter(self) -> asyncpg.Connection:
+        if self._closed:
+            raise RuntimeError("Unit of work is already closed")
+        task = asyncio.current_task()
+        if self._owner is task:
+            self._depth += 1
+        else:
+            await self._lock.acquire()
+            self._owner = task
+            self._depth = 1
+        self.acquires += 1
+        return self.connection
+
+    def _exit(self) -> None:
+        self._depth -= 1
+        if self._depth == 0:
+            self._owner = None
+            self._lock.release()
+
+    # -------------------------------------------------------------------------
+    # Pipeline
+    # -------------------------------------------------------------------------
+
+    def defer(self, query: str, *args) -> None:
+        """Encolar una sentencia independiente (sin resultado) para el próximo flush"""
+        self._deferred.append((query, args))
+
+    async def flush(self) -> int:
+        """Enviar las sentencias encoladas; retorna cuántas se ejecutaron"""
+        deferred, self._deferred = self._deferred, []
+        if not deferred:
+            return 0
+
+        async with self.acquire() as conn:
+            start = 0
+            while start < len(deferred):
+                query = deferred[start][0]
+                end = start
+                while end < len(deferred) and deferred[end][0] == query:
+                    end += 1
+                if end - start == 1:
+                    await conn.execute(query, *deferred[start][1])
+                else:
+                    await conn.executemany(query, [args for _, args in deferred[start:end]])
+                start = end
+        return len(deferred)
+
+
+_current_uow: ContextVar[Optional[UnitOfWork]] = ContextVar("current_unit_of_work", default=None)
+
+
+def current_unit_of_work() -> Optional[UnitOfWork]:
+    """Unidad de trabajo activa en este contexto (o None)"""
+    return _current_uow.get()
+
+
+@asynccontextmanager
+async def unit_of_work(
+    pool: Optional[InstrumentedPool] = None,
+    *,
+    transaction: bool = True,
+    isolation: Optional[str] = None,
+    readonly: bool = False,
+) -> AsyncIterator[UnitOfWork]:
+    """
+    Abrir una unidad de trabajo sobre una conexión del pool primario
+
+    Args:
+        pool: Pool primario (por defecto, get_db_pool())
+        transaction: Envolver el bloque en una transacción (rollback si hay excepción)
+        isolation: Nivel de aislamiento de la transacción (read_committed, repeatable_read, serializable)
+        readonly: Transacción de sólo lectura
+    """
+    if pool is None:
+        pool = await get_db_pool()
+
+    outer = _current_uow.get()
+    if outer is not None and outer.pool is pool:
+        # Anidada: se reutiliza la unidad externa (un savepoint si pide transacción)
+        if transaction:
+            async with outer.acquire() as conn:
+                tx = conn.transaction()
+                await tx.start()
+            try:
+                yield outer
+                await outer.flush()
+            except BaseException:
+                async with outer.acquire():
+                    await tx.rollback()
+                raise
+            async with outer.acquire():
+                await tx.commit()
+        else:
+            yield outer
+        return
+
+    start = time.perf_counter()
+    async with pool.acquire() as conn:
+        uow = UnitOfWork(pool, conn)
+        token = _current_uow.set(uow)
+        try:
+            if transaction:
+                tx = conn.transaction(isolation=isolation, readonly=readonly)
+                await tx.start()
+                try:
+                    yield uow
+                    await uow.flush()
+                except BaseException:
+                    DB_UOW_ROLLBACKS_TOTAL.inc()
+                    await tx.rollback()
+                    raise
+                await tx.commit()
+            else:
+                yield uow
+                await uow.flush()
+        finally:
+            uow._closed = True
+            _current_uow.reset(token)
+            DB_UOW_DURATION.observe(time.perf_counter() - start)
+            DB_UOW_QUERIES.observe(uow.acquires)
+            DB_UOW_ACQUIRES_SAVED_TOTAL.inc(max(0, uow.acquires - 1))
+
+
+async def get_unit_of_work() -> AsyncIterator[UnitOfWork]:
+    """
+    Dependency: unidad de trabajo transaccional por request
+    (commit al terminar el endpoint, rollback si lanza una excepción)
+    """
+    async with unit_of_work() as uow:
+        yield uow
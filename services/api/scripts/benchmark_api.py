@@ -0,0 +1,527 @@
+"""
+API Hot Paths Benchmark
+
+Carga sostenida sobre las queries de los caminos calientes de la API, contra un
+Postgres local poblado a escala configurable, con concurrencia fija:
+
+- login:             authenticate_user + create_session + update_last_login
+- login_uow:         lo mismo dentro de una unidad de trabajo (app/unit_of_work.py):
+                     un acquire y una transacción en vez de uno por query
+- session_validation: get_session_by_token
+- list_users:        get_users_page (página + total en una ida y vuelta)
+- search_audit_logs: search_audit_logs por usuario
+- search_audit_extra: search_audit_logs por extra_data (índice GIN)
+- audit_write:       create_audit_log
+- block_grades:      get_phase_block_grades de una fase
+
+Las queries se llaman a través de app/queries con el pool de la aplicación
+(init_db_pool), es decir con la misma instrumentación y routing que en producción.
+Cada escenario corre --duration segundos con --concurrency tareas; se reporta
+p50/p95/p99/max, media, throughput, acquires del pool por operación y errores en un JSON ordenado y redondeado
+(un archivo por commit) para comparar entre commits con --compare o diff.
+
+Escalas (--scale): small (10k usuarios, 500k audit logs, 100k bloques),
+medium (100k, 5M, 1M) y full (1M, 50M, 5M); --users/--audit-logs/--blocks
+las ajustan. La siembra es server-side (generate_series), idempotente y marca
+los datos como de benchmark (emails @bench.local, entity_type 'bench',
+yacimiento BENCH) para borrarlos con --reset.
+
+Ejecutar con:
+    docker compose exec api python -m scripts.benchmark_api --seed --scale small
+    docker compose exec api python -m scripts.benchmark_api --concurrency 32 --duration 30
+    docker compose exec api python -m scripts.benchmark_api --compare benchmark_results/hot_paths-abc1234.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import secrets
+import subprocess
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import asyncpg
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from app.config import settings
+from app.database import close_db_pool, init_db_pool
+from app.metrics import DB_POOL_ACQUIRE_SECONDS
+from app.queries import audit_logs, auth, blocks, sessions, users
+from app.unit_of_work import unit_of_work
+
+
+SCALES = {
+    "small": {"users": 10_000, "audit_logs": 500_000, "blocks": 100_000},
+    "medium": {"users": 100_000, "audit_logs": 5_000_000, "blocks": 1_000_000},
+    "full": {"users": 1_000_000, "audit_logs": 50_000_000, "blocks": 5_000_000},
+}
+
+BENCH_DOMAIN = "bench.local"
+BENCH_DEPOSIT = "BENCH"
+BENCH_PHASES = 50
+SEED_CHUNK = 1_000_000
+# bcrypt de "benchmark" (no se verifica en el benchmark: mide la base de datos)
+BENCH_PASSWORD_HASH = "$2b$12$KIXQJ9b1Zt2hC4uV2mF8.eO0bqk2p7r3m4Yk8w2G1qQ6lD3v9yZ5a"
+
+
+# =============================================================================
+# SIEMBRA (server-side, idempotente)
+# =============================================================================
+
+SEED_USERS = f"""
+    INSERT INTO users (email, username, password_hash, first_name, last_name, is_active, is_verified, created_at)
+    SELECT
+        'bench' || n || '@{BENCH_DOMAIN}',
+        'bench' || n,
+        $3,
+        'Bench',
+        'User ' || n,
+        n % 20 <> 0,
+        n % 3 = 0,
+        now() - (n % 8760) * interval '1 hour'
+    FROM generate_series($1::bigint, $2::bigint) AS n
+    ON CONFLICT DO NOTHING
+"""
+
+SEED_SESSIONS = f"""
+    INSERT INTO sessions (user_id, session_token, expires_at, ip_address, user_agent)
+    SELECT u.id, 'bench-session-' || g.n, now() + interval '30 days', '10.0.0.1', 'benchmark'
+    FROM generate_series($1::bigint, $2::bigint) AS g(n)
+    JOIN users u ON u.email = 'bench' || g.n || '@{BENCH_DOMAIN}'
+    ON CONFLICT DO NOTHING
+"""
+
+SEED_AUDIT_LOGS = """
+    INSERT INTO audit_logs (user_id, action, entity_type, entity_id, description, extra_data, ip_address, user_agent, created_at)
+    SELECT
+        u.id,
+        a.action::audit_action_enum,
+        'bench',
+        md5(n::text)::uuid,
+        'Benchmark ' || a.action || ' ' || n,
+        CASE WHEN a.action = 'CONFIG_CHANGE'
+             THEN jsonb_build_object('request_id', n, 'setting', 'setting_' || (n % 50), 'value', n % 1000)
+             ELSE jsonb_build_object('request_id', n)
+        END,
+        '10.0.' || (n % 256) || '.' || (n / 256 % 256),
+        'benchmark',
+        now() - (n % 31536000) * interval '1 second'
+    FROM generate_series($1::bigint, $2::bigint) AS n
+    CROSS JOIN LATERAL (
+        SELECT (ARRAY['LOGIN','LOGOUT','CREATE','READ','UPDATE','DELETE','CONFIG_CHANGE'])[1 + n % 7] AS action
+    ) a
+    JOIN bench_user_ids u ON u.rn = 1 + (n * 7919) % $3
+"""
+
+SEED_BLOCKS = """
+    INSERT INTO blocks (
+        id, mine_phase_id, code, block_i, block_j, block_k,
+        centroid_x, centroid_y, centroid_z, size_x, size_y, size_z,
+        tonnage, density, cu_grade_pct, mo_grade_pct, mineral_type
+    )
+    SELECT
+        gen_random_uuid(),
+        $1,
+        'BB-' || n,
+        n % 100, (n / 100) % 100, n / 10000,
+        (n % 100) * 10 + 5, ((n / 100) % 100) * 10 + 5, 4000 - (n / 10000) * 15,
+        10, 10, 15,
+        3900, 2.6,
+        round((0.2 + random() * 0.8)::numeric, 3),
+        round((random() * 0.03)::numeric, 4),
+        (ARRAY['SULFIDE','OXIDE','MIXED','TRANSITION'])[1 + n % 4]::mineral_type_enum
+    FROM generate_series($2::bigint, $3::bigint) AS n
+"""
+
+
+async def _insert_chunks(conn: asyncpg.Connection, label: str, query: str, existing: int, target: int, *extra):
+    if existing >= target:
+        print(f"  ✓ {label}: {existing:,} (ya sembrados)")
+        return
+    start = time.perf_counter()
+    for first in range(existing + 1, target + 1, SEED_CHUNK):
+        last = min(first + SEED_CHUNK - 1, target)
+        await conn.execute(query, first, last, *extra)
+        rate = (last - existing) / (time.perf_counter() - start)
+        print(f"  … {label}: {last:,}/{target:,} ({rate:,.0f} filas/s)")
+    print(f"  ✓ {label}: {target:,} en {time.perf_counter() - start:.1f} s")
+
+
+async def seed(conn: asyncpg.Connection, scale: Dict[str, int]) -> None:
+    """Sembrar hasta la escala pedida (sólo agrega lo que falta)"""
+    await conn.execute("SELECT setseed(0.42)")
+    like = f"%@{BENCH_DOMAIN}"
+
+    existing = await conn.fetchval("SELECT COUNT(*) FROM users WHERE email LIKE $1", like)
+    await _insert_chunks(conn, "usuarios", SEED_USERS, existing, scale["users"], BENCH_PASSWORD_HASH)
+
+    session_target = scale["users"] // 2
+    existing = await conn.fetchval("SELECT COUNT(*) FROM sessions WHERE session_token LIKE 'bench-session-%'")
+    await _insert_chunks(conn, "sesiones", SEED_SESSIONS, existing, session_target)
+
+    # Mapa n -> usuario para repartir los audit logs (CREATE TABLE AS no acepta parámetros)
+    await conn.execute(
+        "CREATE TEMP TABLE IF NOT EXISTS bench_user_ids AS "
+        f"SELECT row_number() OVER (ORDER BY email) AS rn, id FROM users WHERE email LIKE '{like}'"
+    )
+    await conn.execute("CREATE INDEX IF NOT EXISTS bench_user_ids_rn ON bench_user_ids (rn)")
+    await conn.execute("ANALYZE bench_user_ids")
+    user_count = await conn.fetchval("SELECT COUNT(*) FROM bench_user_ids")
+    existing = await conn.fetchval("SELECT COUNT(*) FROM audit_logs WHERE entity_type = 'bench'")
+    await _insert_chunks(conn, "audit logs", SEED_AUDIT_LOGS, existing, scale["audit_logs"], user_count)
+
+    deposit_id = await conn.fetchval(
+        """
+        INSERT INTO deposits (id, code, name, primary_commodity, country)
+        VALUES (gen_random_uuid(), $1, 'Benchmark', 'COPPER', 'Chile')
+        ON CONFLICT (code) DO UPDATE SET name = EXCLUDED.name
+        RETURNING id
+        """,
+        BENCH_DEPOSIT,
+    )
+    mine_id = await conn.fetchval(
+        """
+        INSERT INTO mines (id, deposit_id, code, name, mine_type)
+        VALUES (gen_random_uuid(), $1, $2, 'Benchmark', 'OPEN_PIT')
+        ON CONFLICT (code) DO UPDATE SET name = EXCLUDED.name
+        RETURNING id
+        """,
+        deposit_id, f"{BENCH_DEPOSIT}-MINE",
+    )
+    per_phase = max(1, scale["blocks"] // BENCH_PHASES)
+    for number in range(1, BENCH_PHASES + 1):
+        code = f"{BENCH_DEPOSIT}-P{number:02d}"
+        phase_id = await conn.fetchval("SELECT id FROM mine_phases WHERE mine_id = $1 AND code = $2", mine_id, code)
+        if phase_id is None:
+            phase_id = await conn.fetchval(
+                "INSERT INTO mine_phases (id, mine_id, code, name, sequence_number) "
+                "VALUES (gen_random_uuid(), $1, $2, $2, $3) RETURNING id",
+                mine_id, code, number,
+            )
+        existing = await conn.fetchval("SELECT COUNT(*) FROM blocks WHERE mine_phase_id = $1", phase_id)
+        if existing < per_phase:
+            await conn.execute(SEED_BLOCKS, phase_id, existing + 1, per_phase)
+    print(f"  ✓ bloques: {per_phase * BENCH_PHASES:,} en {BENCH_PHASES} fases")
+
+    print("  … ANALYZE")
+    for table in ("users", "sessions", "audit_logs", "blocks"):
+        await conn.execute(f"ANALYZE {table}")
+
+
+async def reset(conn: asyncpg.Connection) -> None:
+    """Borrar los datos de benchmark"""
+    await conn.execute("DELETE FROM audit_logs WHERE entity_type = 'bench'")
+    await conn.execute("DELETE FROM users WHERE email LIKE $1", f"%@{BENCH_DOMAIN}")  # sesiones en cascada
+    await conn.execute(
+        """
+        DELETE FROM blocks WHERE mine_phase_id IN (
+            SELECT p.id FROM mine_phases p JOIN mines m ON m.id = p.mine_id WHERE m.code = $1
+        )
+        """,
+        f"{BENCH_DEPOSIT}-MINE",
+    )
+    await conn.execute(
+        "DELETE FROM mine_phases WHERE mine_id IN (SELECT id FROM mines WHERE code = $1)", f"{BENCH_DEPOSIT}-MINE"
+    )
+    await conn.execute("DELETE FROM mines WHERE code = $1", f"{BENCH_DEPOSIT}-MINE")
+    await conn.execute("DELETE FROM deposits WHERE code = $1", BENCH_DEPOSIT)
+
+
+# =============================================================================
+# ESCENARIOS
+# =============================================================================
+
+class Workload:
+    """Parámetros de entrada de los escenarios (muestreados de los datos sembrados)"""
+
+    def __init__(self, user_count: int, session_count: int, user_ids: List[uuid.UUID], phase_ids: List[uuid.UUID]):
+        self.user_count = user_count
+        self.session_count = session_count
+        self.user_ids = user_ids
+        self.phase_ids = phase_ids
+
+    @classmethod
+    async def load(cls, conn: asyncpg.Connection, sample: int = 10_000) -> "Workload":
+        like = f"%@{BENCH_DOMAIN}"
+        user_count = await conn.fetchval("SELECT COUNT(*) FROM users WHERE email LIKE $1", like)
+        session_count = await conn.fetchval("SELECT COUNT(*) FROM sessions WHERE session_token LIKE 'bench-session-%'")
+        user_ids = [
+            row["id"] for row in await conn.fetch(
+                "SELECT id FROM users WHERE email LIKE $1 ORDER BY random() LIMIT $2", like, sample
+            )
+        ]
+        phase_ids = [
+            row["id"] for row in await conn.fetch(
+                "SELECT p.id FROM mine_phases p JOIN mines m ON m.id = p.mine_id WHERE m.code = $1",
+                f"{BENCH_DEPOSIT}-MINE",
+            )
+        ]
+        if not user_count or not user_ids or not phase_ids:
+            raise RuntimeError("No hay datos de benchmark: ejecutar con --seed")
+        return cls(user_count, session_count, user_ids, phase_ids)
+
+
+async def scenario_login(pool, rng: random.Random, w: Workload):
+    user = await auth.authenticate_user(pool, f"bench{rng.randint(1, w.user_count)}@{BENCH_DOMAIN}")
+    if user is None:
+        return  # Usuario inactivo (1 de cada 20)
+    await sessions.create_session(
+        pool, user["id"], f"bench-login-{secrets.token_urlsafe(24)}", None,
+        datetime.now(timezone.utc) + timedelta(hours=1), "10.0.0.1", "benchmark",
+    )
+    await users.update_last_login(pool, user["id"])
+
+
+async def scenario_login_uow(pool, rng: random.Random, w: Workload):
+    async with unit_of_work(pool):
+        await scenario_login(pool, rng, w)
+
+
+async def scenario_session_validation(pool, rng: random.Random, w: Workload):
+    await sessions.get_session_by_token(pool, f"bench-session-{rng.randint(1, w.session_count)}")
+
+
+async def scenario_list_users(pool, rng: random.Random, w: Workload):
+    await users.get_users_page(pool, limit=50, offset=rng.randrange(0, 1000, 50), is_active=True)
+
+
+async def scenario_search_audit_logs(pool, rng: random.Random, w: Workload):
+    await audit_logs.search_audit_logs(pool, user_id=rng.choice(w.user_ids), limit=50)
+
+
+async def scenario_search_audit_extra(pool, rng: random.Random, w: Workload):
+    await audit_logs.search_audit_logs(
+        pool, extra_data={"setting": [f"setting_{rng.randrange(50)}"]}, action="CONFIG_CHANGE", limit=50,
+    )
+
+
+async def scenario_audit_write(pool, rng: random.Random, w: Workload):
+    await audit_logs.create_audit_log(
+        pool, "CREATE", "Benchmark write",
+        user_id=rng.choice(w.user_ids), entity_type="bench", entity_id=uuid.uuid4(),
+        extra_data={"source": "benchmark"}, ip_address="10.0.0.1", user_agent="benchmark",
+    )
+
+
+async def scenario_block_grades(pool, rng: random.Random, w: Workload):
+    await blocks.get_phase_block_grades(pool, rng.choice(w.phase_ids))
+
+
+SCENARIOS: Dict[str, Callable[..., Awaitable[None]]] = {
+    "login": scenario_login,
+    "login_uow": scenario_login_uow,
+    "session_validation": scenario_session_validation,
+    "list_users": scenario_list_users,
+    "search_audit_logs": scenario_search_audit_logs,
+    "search_audit_extra": scenario_search_audit_extra,
+    "audit_write": scenario_audit_write,
+    "block_grades": scenario_block_grades,
+}
+
+
+# =============================================================================
+# EJECUCIÓN Y REPORTE
+# =============================================================================
+
+async def run_scenario(
+    pool, fn: Callable[..., Awaitable[None]], workload: Workload,
+    concurrency: int, duration: float, warmup: float, seed: int,
+) -> dict:
+    """Correr `fn` con `concurrency` tareas durante warmup + duration segundos"""
+    samples: List[float] = []
+    errors: Dict[str, int] = {}
+    ops = 0
+    acquires_before = pool_acquire_count()
+    start = time.perf_counter()
+    measure_from = start + warmup
+    deadline = measure_from + duration
+
+    async def worker(index: int):
+        nonlocal ops
+        rng = random.Random(seed * 1000 + index)
+        while True:
+            begin = time.perf_counter()
+            if begin >= deadline:
+                return
+            try:
+                await fn(pool, rng, workload)
+            except Exception as e:
+                if begin >= measure_from:
+                    errors[type(e).__name__] = errors.get(type(e).__name__, 0) + 1
+                continue
+            ops += 1
+            if begin >= measure_from:
+                samples.append(time.perf_counter() - begin)
+
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - measure_from
+    # Incluye el calentamiento en ambos términos: acquires por operación completada
+    acquires = pool_acquire_count() - acquires_before
+
+    latencies = np.array(samples) * 1000
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) if len(latencies) else (0.0, 0.0, 0.0)
+    return {
+        "ops": len(samples),
+        "errors": dict(sorted(errors.items())),
+        "throughput_ops_s": round(len(samples) / elapsed, 1),
+        "p50_ms": round(float(p50), 3),
+        "p95_ms": round(float(p95), 3),
+        "p99_ms": round(float(p99), 3),
+        "max_ms": round(float(latencies.max()), 3) if len(latencies) else 0.0,
+        "mean_ms": round(float(latencies.mean()), 3) if len(latencies) else 0.0,
+        "acquires_per_op": round(acquires / ops, 2) if ops else 0.0,
+    }
+
+
+def pool_acquire_count() -> float:
+    """Acquires del pool hechos por este proceso (conteo de db_pool_acquire_seconds)"""
+    for metric in DB_POOL_ACQUIRE_SECONDS.collect():
+        for sample in metric.samples:
+            if sample.name.endswith("_count"):
+                return sample.value
+    return 0.0
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(current: dict, baseline_path: str) -> None:
+    """Imprimir la variación de cada escenario respecto de un resultado anterior"""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    print(f"\n📈 Comparación con {baseline_path} (commit {baseline['meta'].get('commit')})")
+    for name, result in current["scenarios"].items():
+        before = baseline["scenarios"].get(name)
+        if before is None:
+            print(f"  {name:<20} (sin referencia)")
+            continue
+        deltas = []
+        for key in ("p50_ms", "p95_ms", "p99_ms", "throughput_ops_s", "acquires_per_op"):
+            if key not in before:
+                continue  # Resultado anterior sin esta medida
+            change = (result[key] - before[key]) / before[key] * 100 if before[key] else 0.0
+            deltas.append(f"{key.removesuffix('_ms').removesuffix('_ops_s').removesuffix('_per_op')} {change:+6.1f}%")
+        print(f"  {name:<20} " + "  ".join(deltas))
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark de los caminos calientes de la API")
+    parser.add_argument("--scale", choices=SCALES, default="small")
+    parser.add_argument("--users", type=int, help="Sobrescribe la escala")
+    parser.add_argument("--audit-logs", type=int, help="Sobrescribe la escala")
+    parser.add_argument("--blocks", type=int, help="Sobrescribe la escala")
+    parser.add_argument("--seed", action="store_true", help="Sembrar hasta la escala antes de medir")
+    parser.add_argument("--seed-only", action="store_true", help="Sólo sembrar")
+    parser.add_argument("--reset", action="store_true", help="Borrar los datos de benchmark y salir")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="Lista separada por comas")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=20.0, help="Segundos medidos por escenario")
+    parser.add_argument("--warmup", type=float, default=3.0, help="Segundos de calentamiento por escenario")
+    parser.add_argument("--random-seed", type=int, default=42)
+    parser.add_argument("--output", help="JSON de resultados (default: benchmark_results/hot_paths-<commit>.json)")
+    parser.add_argument("--compare", help="JSON de un resultado anterior para comparar")
+    return parser.parse_args(argv)
+
+
+async def main(argv: Optional[List[str]] = None):
+    """Main function"""
+    args = parse_args(argv)
+    scale = dict(SCALES[args.scale])
+    for key in ("users", "audit_logs", "blocks"):
+        if getattr(args, key) is not None:
+            scale[key] = getattr(args, key)
+    names = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = set(names) - set(SCENARIOS)
+    if unknown:
+        raise SystemExit(f"Escenarios desconocidos: {', '.join(sorted(unknown))}")
+
+    print("=" * 70)
+    print("  🏋️  API HOT PATHS BENCHMARK")
+    print("=" * 70)
+
+    conn = await asyncpg.connect(settings.get_db_url_asyncpg())
+    try:
+        if args.reset:
+            await reset(conn)
+            print("🧹 Datos de benchmark eliminados")
+            return
+        if args.seed or args.seed_only:
+            print(f"\n🌱 Sembrando escala {scale}")
+            await seed(conn, scale)
+            if args.seed_only:
+                return
+        workload = await Workload.load(conn)
+        server_version = await conn.fetchval("SHOW server_version")
+    finally:
+        await conn.close()
+
+    print(
+        f"  Usuarios: {workload.user_count:,}  |  Concurrencia: {args.concurrency}  |  "
+        f"{args.duration:.0f} s por escenario (+{args.warmup:.0f} s calentamiento)"
+    )
+    if args.concurrency > settings.DB_MAX_POOL_SIZE:
+        print(f"  ⚠️  Concurrencia mayor que POSTGRES_MAX_POOL_SIZE={settings.DB_MAX_POOL_SIZE}: incluye espera del pool")
+
+    pool = await init_db_pool()
+    results = {}
+    try:
+        for name in names:
+            result = await run_scenario(
+                pool, SCENARIOS[name], workload,
+                args.concurrency, args.duration, args.warmup, args.random_seed,
+            )
+            results[name] = result
+            errors = sum(result["errors"].values())
+            print(
+                f"  {name:<20} p50={result['p50_ms']:8.3f} ms  p95={result['p95_ms']:8.3f} ms  "
+                f"p99={result['p99_ms']:8.3f} ms  {result['throughput_ops_s']:9,.1f} ops/s  "
+                f"{result['acquires_per_op']:5.2f} acquires/op"
+                + (f"  ❌ {errors} errores" if errors else "")
+            )
+    finally:
+        await close_db_pool()
+
+    commit = git_commit()
+    report = {
+        "meta": {
+            "commit": commit,
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "postgres": server_version,
+            "scale": scale,
+            "seeded_users": workload.user_count,
+            "concurrency": args.concurrency,
+            "duration_s": args.duration,
+            "warmup_s": args.warmup,
+            "pool_max_size": settings.DB_MAX_POOL_SIZE,
+            "random_seed": args.random_seed,
+        },
+        "scenarios": results,
+    }
+    output = args.output or os.path.join("benchmark_results", f"hot_paths-{commit}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+        f.write("\n")
+    print(f"\n💾 Resultados en {output}")
+
+    if args.compare:
+        compare(report, args.compare)
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
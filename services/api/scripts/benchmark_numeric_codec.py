@@ -0,0 +1,135 @@
+"""
+Numeric Profile Benchmark
+
+Fetch completos de queries reales de app/queries con los dos perfiles
+numéricos de app/numeric_profiles.py, contra el Postgres de la aplicación:
+
+- block_grades: blocks.get_phase_block_grades de la fase con más bloques
+  (tonelaje y leyes, 5 columnas NUMERIC)
+- fleet_hours:  equipment_fleet.list_operating_hours_leaderboard de toda la
+  flota (horas de operación, 2 columnas NUMERIC)
+- equipment_detail: equipment_fleet.get_equipment_by_code (acquisition_cost
+  es financiera: queda Decimal también en analytics)
+
+Por perfil se reporta p50 del fetch (conn.fetch con el pool de la aplicación,
+init_db_pool), valores NUMERIC decodificados por segundo y bytes por valor en
+memoria. exact decodifica NUMERIC -> Decimal con el codec binario de asyncpg;
+analytics castea a ::float8 en el SQL (codec binario de float8).
+
+Ejecutar con:
+    docker compose exec api python -m scripts.benchmark_numeric_codec
+    docker compose exec api python -m scripts.benchmark_numeric_codec --repeat 20
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from typing import Awaitable, Callable, List, Optional
+from uuid import UUID
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from app.database import close_db_pool, init_db_pool
+from app.numeric_profiles import PROFILES
+from app.queries import blocks, equipment_fleet
+
+
+def numeric_values(rows, columns) -> list:
+    return [row[column] for row in rows for column in columns if row[column] is not None]
+
+
+async def time_fetch(fetch: Callable[[str], Awaitable[list]], profile: str, repeat: int) -> tuple[List[float], list]:
+    """Segundos por fetch en cada repetición y el último resultado"""
+    rows = await fetch(profile)  # calentamiento (prepara la sentencia)
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = await fetch(profile)
+        samples.append(time.perf_counter() - start)
+    return samples, rows
+
+
+async def run_case(name: str, fetch, columns, repeat: int) -> None:
+    print(f"\n📦 {name}")
+    baseline = None
+    for profile in PROFILES:
+        samples, rows = await time_fetch(fetch, profile, repeat)
+        values = numeric_values(rows if isinstance(rows, list) else [rows], columns)
+        p50 = float(np.percentile(samples, 50))
+        baseline = baseline or p50
+        types = sorted({type(value).__name__ for value in values})
+        per_value = sum(sys.getsizeof(value) for value in values) / len(values) if values else 0
+        rate = len(values) / p50 / 1e6 if values else 0
+        print(
+            f"  {profile:<10} {p50 * 1000:9.2f} ms  (x{baseline / p50:4.1f})  "
+            f"{rate:6.2f} M valores/s  {per_value:5.0f} bytes/valor  {','.join(types)}"
+        )
+
+
+async def run(args: argparse.Namespace) -> None:
+    pool = await init_db_pool()
+    try:
+        phase_id = UUID(args.phase_id) if args.phase_id else await pool.fetchval(
+            "SELECT mine_phase_id FROM blocks GROUP BY mine_phase_id ORDER BY COUNT(*) DESC LIMIT 1"
+        )
+        if phase_id is not None:
+            await run_case(
+                f"block_grades (fase {phase_id})",
+                lambda profile: blocks.get_phase_block_grades(pool, phase_id, True, numeric=profile),
+                blocks.GRADE_COLUMNS,
+                args.repeat,
+            )
+        else:
+            print("\n⚠️  Sin bloques: omitiendo block_grades (ver scripts/load_block_model.py)")
+
+        fleet_size = await pool.fetchval("SELECT COUNT(*) FROM equipment WHERE deleted_at IS NULL")
+        if fleet_size:
+            await run_case(
+                f"fleet_hours ({fleet_size:,} equipos)",
+                lambda profile: equipment_fleet.list_operating_hours_leaderboard(
+                    pool, limit=fleet_size, numeric=profile
+                ),
+                equipment_fleet.HOURS_COLUMNS,
+                args.repeat,
+            )
+            code = await pool.fetchval("SELECT code FROM equipment WHERE deleted_at IS NULL LIMIT 1")
+            await run_case(
+                f"equipment_detail ({code})",
+                lambda profile: equipment_fleet.get_equipment_by_code(pool, code, numeric=profile),
+                (*equipment_fleet.HOURS_COLUMNS, "acquisition_cost"),
+                args.repeat,
+            )
+        else:
+            print("\n⚠️  Sin equipos: omitiendo fleet_hours y equipment_detail (ver scripts/seed_mining_data.py)")
+    finally:
+        await close_db_pool()
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark de perfiles numéricos (exact vs analytics)")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--phase-id", default=None, help="Fase para block_grades (por defecto la de más bloques)")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
+    """Main function"""
+    args = parse_args(argv)
+
+    print("=" * 70)
+    print("  🔢 NUMERIC PROFILE BENCHMARK")
+    print("=" * 70)
+    print(f"  Repeticiones: {args.repeat}  |  p50 del fetch")
+
+    asyncio.run(run(args))
+
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
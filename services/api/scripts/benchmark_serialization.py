@@ -0,0 +1,211 @@
+"""
+JSON Serialization Benchmark
+
+Costo de serializar filas de la base de datos a bytes de respuesta, por cada
+1.000 filas, con filas sintéticas de audit_logs (UUID, datetime, INET, JSONB)
+y de un catálogo con NUMERIC (Decimal):
+
+- fastapi:        Pydantic valida + dump_python(mode="json") + json.dumps
+                  (camino por defecto de FastAPI con response_model y JSONResponse)
+- pydantic+orjson: Pydantic valida + dump_python(mode="json") + orjson
+                  (response_model con ORJSONResponse como clase por defecto)
+- fast_json:      orjson directo sobre las filas, sin re-validar (app/responses.py)
+- fast_json+val:  fast_json con FAST_JSON_VALIDATE=true
+
+Antes de medir verifica que fast_json produzca exactamente los mismos bytes
+que fastapi y pydantic+orjson sobre una muestra de filas (campos faltantes,
+orden de campos, datetime UTC con Z, NUMERIC -> float); si no coinciden
+termina con código de salida 1.
+
+No requiere base de datos. Las filas son dicts (asyncpg.Record no se puede
+construir fuera del protocolo; fast_json lo convierte con el mismo costo que un dict).
+
+Ejecutar con:
+    docker compose exec api python -m scripts.benchmark_serialization
+    docker compose exec api python -m scripts.benchmark_serialization --rows 10000 --repeat 20
+"""
+
+import argparse
+import ipaddress
+import json
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Callable, List, Optional
+
+import numpy as np
+from pydantic import BaseModel, TypeAdapter
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from app.models.audit_log import AuditLogPublic
+from app.responses import dumps as orjson_dumps, fast_json, _adapter
+from app.config import settings
+
+
+ACTIONS = ["LOGIN", "LOGOUT", "CREATE", "READ", "UPDATE", "DELETE", "CONFIG_CHANGE"]
+ENTITY_TYPES = ["user", "deposit", "mine", "equipment", "reagent"]
+
+
+class ReagentRow(BaseModel):
+    """Fila de catálogo con NUMERIC (Decimal en asyncpg, float en la API como ReagentSummary)"""
+    id: uuid.UUID
+    code: str
+    name: str
+    unit_cost: float
+    consumption_kg_t: Optional[float] = None
+    updated_at: datetime
+
+
+def generate_audit_logs(n: int, seed: int) -> List[dict]:
+    rng = np.random.default_rng(seed)
+    base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    return [
+        {
+            "id": uuid.UUID(int=int(rng.integers(1, 2**63))),
+            "user_id": uuid.UUID(int=int(rng.integers(1, 2**63))),
+            "action": ACTIONS[i % len(ACTIONS)],
+            "entity_type": ENTITY_TYPES[i % len(ENTITY_TYPES)],
+            "entity_id": uuid.UUID(int=int(rng.integers(1, 2**63))),
+            "description": f"Operación {i} sobre {ENTITY_TYPES[i % len(ENTITY_TYPES)]}",
+            "extra_data": {"request_id": i, "fields": ["status", "name"], "ok": bool(i % 2)},
+            "ip_address": ipaddress.IPv4Address(int(rng.integers(0x0A000000, 0x0AFFFFFF))),
+            "user_agent": "Mozilla/5.0 (X11; Linux x86_64)",
+            "created_at": base + timedelta(seconds=int(rng.integers(0, 31_536_000))),
+        }
+        for i in range(n)
+    ]
+
+
+def generate_reagents(n: int, seed: int) -> List[dict]:
+    rng = np.random.default_rng(seed)
+    return [
+        {
+            "id": uuid.UUID(int=i + 1),
+            "code": f"REA-{i:05d}",
+            "name": f"Reactivo {i}",
+            "unit_cost": Decimal(f"{rng.uniform(0.5, 50):.4f}"),
+            "consumption_kg_t": Decimal(f"{rng.uniform(0.001, 2):.6f}"),
+            "updated_at": datetime(2025, 6, 1, tzinfo=timezone.utc),
+        }
+        for i in range(n)
+    ]
+
+
+def fastapi_default(adapter: TypeAdapter, rows: List[dict]) -> bytes:
+    value = adapter.validate_python(rows)
+    return json.dumps(
+        adapter.dump_python(value, mode="json"),
+        ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def pydantic_orjson(adapter: TypeAdapter, rows: List[dict]) -> bytes:
+    value = adapter.validate_python(rows)
+    return orjson_dumps(adapter.dump_python(value, mode="json"))
+
+
+def fast_json_body(model, rows: List[dict], validate: bool) -> bytes:
+    settings.FAST_JSON_VALIDATE = validate
+    return fast_json(rows, model=model).body
+
+
+def check_wire_format(model, adapter: TypeAdapter, pydantic_rows: List[dict], db_rows: List[dict]) -> bool:
+    """fast_json debe producir los mismos bytes que el camino con response_model"""
+    expected = fastapi_default(adapter, pydantic_rows)
+    bodies = {
+        "pydantic+orjson": pydantic_orjson(adapter, pydantic_rows),
+        "fast_json": fast_json_body(model, db_rows, validate=False),
+    }
+    equal = True
+    for name, body in bodies.items():
+        if body == expected:
+            continue
+        equal = False
+        offset = next(
+            (i for i, (a, b) in enumerate(zip(body, expected)) if a != b),
+            min(len(body), len(expected)),
+        )
+        print(f"  ❌ {name} difiere de fastapi en el byte {offset}:")
+        print(f"     fastapi: {expected[max(0, offset - 40):offset + 40]!r}")
+        print(f"     {name}: {body[max(0, offset - 40):offset + 40]!r}")
+    if equal:
+        print(f"  ✅ mismo body en los tres caminos ({len(pydantic_rows)} filas, {len(expected):,} bytes)")
+    return equal
+
+
+def time_per_1000(fn: Callable[[], bytes], rows: int, repeat: int) -> tuple[List[float], int]:
+    size = len(fn())  # calentamiento
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        samples.append(elapsed_ms / rows * 1000)
+    return samples, size
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark de serialización JSON de filas")
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--check-rows", type=int, default=500, help="Filas de la verificación de bytes")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
+    """Main function"""
+    args = parse_args(argv)
+
+    print("=" * 70)
+    print("  ⚡ JSON SERIALIZATION BENCHMARK")
+    print("=" * 70)
+    print(f"  Filas: {args.rows:,}  |  Repeticiones: {args.repeat}  |  Tiempo por 1.000 filas")
+
+    audit_logs = generate_audit_logs(args.rows, args.seed)
+    # AuditLogPublic declara ip_address como str: Pydantic no acepta el IPv4Address de asyncpg
+    audit_logs_str_ip = [{**row, "ip_address": str(row["ip_address"])} for row in audit_logs]
+    reagents = generate_reagents(args.rows, args.seed)
+
+    datasets = [
+        ("audit_logs (UUID, datetime, INET, JSONB)", list[AuditLogPublic], audit_logs_str_ip, audit_logs),
+        ("reagents (NUMERIC -> Decimal)", list[ReagentRow], reagents, reagents),
+    ]
+    wire_format_ok = True
+    for title, model, pydantic_rows, db_rows in datasets:
+        adapter = _adapter(model)
+        print(f"\n📦 {title}")
+        wire_format_ok &= check_wire_format(
+            model, adapter, pydantic_rows[:args.check_rows], db_rows[:args.check_rows]
+        )
+
+        paths = [
+            ("fastapi", lambda: fastapi_default(adapter, pydantic_rows)),
+            ("pydantic+orjson", lambda: pydantic_orjson(adapter, pydantic_rows)),
+            ("fast_json", lambda: fast_json_body(model, db_rows, validate=False)),
+            ("fast_json+val", lambda: fast_json_body(model, db_rows, validate=True)),
+        ]
+
+        baseline = None
+        for name, fn in paths:
+            samples, size = time_per_1000(fn, args.rows, args.repeat)
+            p50, p95 = np.percentile(samples, [50, 95])
+            baseline = baseline or p50
+            print(
+                f"  {name:<16} p50={p50:7.3f} ms  p95={p95:7.3f} ms  "
+                f"(x{baseline / p50:5.1f})  {size / args.rows:6.0f} bytes/fila"
+            )
+
+    settings.FAST_JSON_VALIDATE = False
+    print("=" * 70)
+    if not wire_format_ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""
+Spatial Index Benchmark
+
+Mide el índice espacial en memoria (app/services/spatial_index.py) contra
+una búsqueda por fuerza bruta con numpy, sobre puntos sintéticos en el norte de Chile:
+
+- Tiempo de construcción del KD-tree
+- Latencia p50/p95 de k vecinos, radio y bounding box
+- Costo del refresco incremental (upsert al delta) y de la compactación
+
+No requiere base de datos.
+
+Ejecutar con:
+    docker compose exec api python -m scripts.benchmark_spatial
+    docker compose exec api python -m scripts.benchmark_spatial --points 1000000 --queries 500
+"""
+
+import argparse
+import os
+import sys
+import time
+import uuid
+from typing import Callable, List, Optional
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from app.services.spatial_index import SpatialIndex, latlon_to_utm, parse_utm_zone
+
+
+# Región de los pórfidos cupríferos del norte (aprox.)
+LAT_RANGE = (-28.0, -18.0)
+LON_RANGE = (-71.0, -67.0)
+POINT_TYPES = ["CENTROID", "VERTEX", "ACCESS", "DRILLHOLE"]
+
+
+def generate_points(n: int, seed: int) -> dict:
+    """Generar n puntos uniformes dentro de la región"""
+    rng = np.random.default_rng(seed)
+    return {
+        "ids": [uuid.UUID(int=i + 1) for i in range(n)],
+        "deposit_ids": [uuid.UUID(int=i % 50 + 1) for i in range(n)],
+        "point_types": [POINT_TYPES[i] for i in rng.integers(0, len(POINT_TYPES), n)],
+        "latitude": rng.uniform(*LAT_RANGE, n),
+        "longitude": rng.uniform(*LON_RANGE, n),
+        "elevation": rng.uniform(0, 5000, n),
+    }
+
+
+def percentiles(samples: List[float]) -> str:
+    p50, p95 = np.percentile(np.array(samples) * 1000, [50, 95])
+    return f"p50={p50:8.3f} ms  p95={p95:8.3f} ms"
+
+
+def time_queries(fn: Callable[[float, float], object], centers: np.ndarray) -> List[float]:
+    samples = []
+    for latitude, longitude in centers:
+        start = time.perf_counter()
+        fn(latitude, longitude)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark del índice espacial")
+    parser.add_argument("--points", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--radius-m", type=float, default=2000.0)
+    parser.add_argument("--bbox-deg", type=float, default=0.05, help="Lado del bounding box en grados")
+    parser.add_argument("--changes", type=int, default=10_000, help="Puntos a modificar en el refresco incremental")
+    parser.add_argument("--utm-zone", default="19S")
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
+    """Main function"""
+    args = parse_args(argv)
+    zone, southern = parse_utm_zone(args.utm_zone)
+
+    print("=" * 70)
+    print("  🗺️  SPATIAL INDEX BENCHMARK")
+    print("=" * 70)
+    print(f"  Puntos: {args.points:,}  |  Consultas: {args.queries}  |  Zona UTM: {args.utm_zone}")
+
+    points = generate_points(args.points, args.seed)
+    rng = np.random.default_rng(args.seed + 1)
+    centers = np.column_stack((rng.uniform(*LAT_RANGE, args.queries), rng.uniform(*LON_RANGE, args.queries)))
+
+    # Construcción
+    index = SpatialIndex(zone, southern)
+    start = time.perf_counter()
+    index.build_arrays(**points)
+    build_s = time.perf_counter() - start
+    print(f"\n🏗️  Construcción KD-tree: {build_s:.3f} s ({args.points / build_s:,.0f} puntos/s)")
+
+    # Fuerza bruta (referencia)
+    easting, northing = latlon_to_utm(points["latitude"], points["longitude"], zone, southern)
+    latitude, longitude = points["latitude"], points["longitude"]
+
+    def brute_nearest(lat: float, lon: float):
+        x, y = index.project(lat, lon)
+        distances = np.hypot(easting - x, northing - y)
+        return np.argpartition(distances, args.k)[:args.k]
+
+    def brute_radius(lat: float, lon: float):
+        x, y = index.project(lat, lon)
+        return np.flatnonzero(np.hypot(easting - x, northing - y) <= args.radius_m)
+
+    def brute_bbox(lat: float, lon: float):
+        return np.flatnonzero(
+            (latitude >= lat) & (latitude <= lat + args.bbox_deg)
+            & (longitude >= lon) & (longitude <= lon + args.bbox_deg)
+        )
+
+    # Verificación rápida de resultados
+    for lat, lon in centers[:10]:
+        expected = {points["ids"][i] for i in brute_radius(lat, lon)}
+        found = {p["id"] for p in index.within_radius(lat, lon, args.radius_m)}
+        assert expected == found, "within_radius no coincide con fuerza bruta"
+
+    print(f"\n⏱️  Latencia por consulta ({args.queries} consultas)")
+    benchmarks = [
+        (f"k vecinos (k={args.k})",
+         lambda lat, lon: index.nearest(lat, lon, k=args.k), brute_nearest),
+        (f"radio ({args.radius_m:.0f} m)",
+         lambda lat, lon: index.within_radius(lat, lon, args.radius_m), brute_radius),
+        (f"bbox ({args.bbox_deg}°)",
+         lambda lat, lon: index.within_bbox(lat, lon, lat + args.bbox_deg, lon + args.bbox_deg), brute_bbox),
+    ]
+    for name, indexed, brute in benchmarks:
+        indexed_samples = time_queries(indexed, centers)
+        brute_samples = time_queries(brute, centers)
+        speedup = np.median(brute_samples) / np.median(indexed_samples)
+        print(f"  {name:<22} índice:      {percentiles(indexed_samples)}")
+        print(f"  {'':<22} fuerza bruta:{percentiles(brute_samples)}  (x{speedup:,.0f})")
+
+    # Refresco incremental
+    changes = min(args.changes, args.points)
+    moved = rng.choice(args.points, changes, replace=False)
+    rows = [
+        {
+            "id": points["ids"][i],
+            "deposit_id": points["deposit_ids"][i],
+            "point_type": points["point_types"][i],
+            "latitude": float(rng.uniform(*LAT_RANGE)),
+            "longitude": float(rng.uniform(*LON_RANGE)),
+            "elevation_masl": None,
+        }
+        for i in moved
+    ]
+    start = time.perf_counter()
+    index.upsert(rows)
+    upsert_s = time.perf_counter() - start
+
+    delta_samples = time_queries(lambda lat, lon: index.nearest(lat, lon, k=args.k), centers)
+
+    start = time.perf_counter()
+    index = index.compacted()
+    compact_s = time.perf_counter() - start
+
+    print(f"\n🔄 Refresco incremental ({changes:,} puntos modificados)")
+    print(f"  upsert al delta:       {upsert_s * 1000:.1f} ms")
+    print(f"  k vecinos con delta:   {percentiles(delta_samples)}")
+    print(f"  compactación:          {compact_s:.3f} s")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
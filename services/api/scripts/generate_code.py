@@ -4,35 +4,41 @@ Code Generation Scripts
 
 Herramientas para automatizar la generación de código:
 - Pydantic schemas desde SQLAlchemy models
-- Queries SQL básicas desde SQLAlchemy models
+- Queries SQL desde SQLAlchemy models: parámetros tipados, proyecciones por
+  caso de uso, paginación keyset sobre índices, soft delete, lotes con unnest
+  y sentencias registradas como prepared statements
+
+Ejecutar con:
+    python scripts/generate_code.py <modelo|tabla>
 """
 
+import enum
 import os
+import re
 import sys
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
 from pathlib import Path
-from typing import Dict, List, Optional, Type
+from typing import Dict, List, Optional, Tuple, Type
 import inspect
 
-# Add the app directory to the Python path
-sys.path.insert(0, str(Path(__file__).parent / "app"))
+# Directorio services/api (contiene el paquete app)
+API_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(API_DIR))
 
+from sqlalchemy import ARRAY, JSON, Enum as SQLEnum, LargeBinary, Numeric, Text
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.ext.declarative import DeclarativeMeta
 from pydantic import BaseModel, Field
-from pydantic_sqlalchemy import sqlalchemy_to_pydantic
-import importlib.util
 
 
 def load_sqlalchemy_models() -> Dict[str, Type[DeclarativeMeta]]:
     """Cargar todos los modelos SQLAlchemy desde db_models"""
     models = {}
 
-    # Importar el módulo db_models
-    spec = importlib.util.spec_from_file_location(
-        "db_models",
-        Path(__file__).parent / "app" / "db_models" / "__init__.py"
-    )
-    db_models_module = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(db_models_module)
+    # Importar el paquete db_models (sus módulos usan imports relativos)
+    import app.db_models as db_models_module
 
     # Encontrar todas las clases que heredan de Base
     for name, obj in inspect.getmembers(db_models_module):
@@ -40,6 +46,7 @@ def load_sqlalchemy_models() -> Dict[str, Type[DeclarativeMeta]]:
             hasattr(obj, '__tablename__') and
             name != 'Base'):
             models[name.lower()] = obj
+            models[obj.__tablename__] = obj
 
     return models
 
@@ -47,6 +54,8 @@ def load_sqlalchemy_models() -> Dict[str, Type[DeclarativeMeta]]:
 def generate_pydantic_schemas(model_name: str, sqlalchemy_model: Type[DeclarativeMeta]) -> str:
     """Generar schemas Pydantic desde un modelo SQLAlchemy"""
 
+    from pydantic_sqlalchemy import sqlalchemy_to_pydantic
+
     # Convertir a Pydantic usando pydantic-sqlalchemy
     PydanticModel = sqlalchemy_to_pydantic(sqlalchemy_model)
 
@@ -158,208 +167,742 @@ def generate_pydantic_schemas(model_name: str, sqlalchemy_model: Type[Declarativ
     return '\n'.join(code_lines)
 
 
-def generate_sql_queries(model_name: str, sqlalchemy_model: Type[DeclarativeMeta]) -> str:
-    """Generar queries SQL básicas desde un modelo SQLAlchemy"""
+# ============================================================================
+# QUERIES SQL (v2)
+# ============================================================================
+
+# Columnas de auditoría: las maneja la DB, no son parámetros de create/update
+AUDIT_COLUMNS = ("created_at", "updated_at", "deleted_at")
+
+# Columnas que identifican una fila para selectores y referencias (proyección "ref")
+LABEL_COLUMNS = ("code", "employee_code", "name", "email", "username", "title")
+
+# Tipo Python (anotación) por tipo de la columna
+PYTHON_TYPES = {
+    uuid.UUID: "UUID",
+    str: "str",
+    int: "int",
+    float: "float",
+    Decimal: "Decimal",
+    bool: "bool",
+    datetime: "datetime",
+    date: "date",
+    dict: "dict",
+    list: "list",
+}
+
+
+class ColumnInfo:
+    """Metadatos de una columna para generar SQL y firmas tipadas"""
+
+    def __init__(self, column):
+        self.name = column.name
+        self.nullable = column.nullable
+        self.primary_key = column.primary_key
+        self.computed = column.computed is not None
+        # Tipo PostgreSQL para casts de arrays (sin COLLATE): 'numeric(12, 2)', 'equipment_status_enum'
+        compiled = column.type.compile(dialect=postgresql.dialect())
+        self.sql_type = re.sub(r"\s+COLLATE\s+.*$", "", compiled).lower()
+        self.python_type = self._python_type(column.type)
+        self.is_blob = isinstance(column.type, (Text, JSON, LargeBinary, ARRAY))
+        self.default = self._default_literal(column)
+        self.server_default = self._server_default_sql(column)
+
+    @staticmethod
+    def _python_type(column_type) -> str:
+        # Los enums viajan como texto (asyncpg recibe/retorna la etiqueta)
+        if isinstance(column_type, SQLEnum):
+            return "str"
+        try:
+            return PYTHON_TYPES.get(column_type.python_type, "Any")
+        except NotImplementedError:
+            return "Any"
+
+    @staticmethod
+    def _default_literal(column) -> Optional[str]:
+        """Default escalar del modelo como literal Python (None si no hay)"""
+        default = column.default
+        if default is None or not default.is_scalar:
+            return None
+        value = default.arg
+        if isinstance(value, enum.Enum):
+            value = value.name
+        if isinstance(value, (int, float)) and not isinstance(value, bool) and isinstance(column.type, Numeric):
+            return f'Decimal("{value}")' if column.type.asdecimal else repr(float(value))
+        return _literal(value)
+
+    @staticmethod
+    def _server_default_sql(column) -> Optional[str]:
+        """Expresión SQL del server_default (None si no hay)"""
+        server_default = column.server_default
+        if server_default is None or not hasattr(server_default, "arg"):
+            return None
+        arg = server_default.arg
+        if isinstance(arg, str):
+            return "'" + arg.replace("'", "''") + "'"
+        return str(arg.compile(dialect=postgresql.dialect()))
+
+    @property
+    def annotation(self) -> str:
+        return f"Optional[{self.python_type}]" if self.nullable else self.python_type
+
+
+class TableInfo:
+    """Columnas, índices y claves de una tabla relevantes para el generador"""
+
+    def __init__(self, sqlalchemy_model: Type[DeclarativeMeta]):
+        table = sqlalchemy_model.__table__
+        self.table = table.name
+        self.entity = re.sub(r"(?<!^)(?=[A-Z])", "_", sqlalchemy_model.__name__).lower()
+        self.columns = [ColumnInfo(column) for column in table.columns]
+        self.by_name = {column.name: column for column in self.columns}
+        self.soft_delete = "deleted_at" in self.by_name
+        self.has_updated_at = "updated_at" in self.by_name
+
+        # id sin default en el servidor: se genera en Python (uuid4)
+        id_column = self.by_name.get("id")
+        self.client_ids = id_column is not None and id_column.server_default is None
+
+        self.indexes = self._usable_indexes(table)
+
+    def _usable_indexes(self, table) -> List[Tuple[str, Tuple[str, ...], bool, Optional[str]]]:
+        """
+        (nombre, columnas, único, predicado) de los índices que las queries
+        generadas pueden usar: sin predicado, o con el filtro de soft delete
+        (las lecturas generadas ya incluyen deleted_at IS NULL)
+        """
+        indexes = []
+        for index in sorted(table.indexes, key=lambda index: index.name or ""):
+            where = index.dialect_options["postgresql"].get("where")
+            predicate = str(where) if where is not None else None
+            columns = tuple(column.name for column in index.columns)
+            if not columns:
+                continue  # índices sobre expresiones
+            indexes.append((index.name, columns, bool(index.unique), predicate))
+        return indexes
+
+    def _implied(self, predicate: Optional[str]) -> bool:
+        return predicate is None or (self.soft_delete and predicate == "deleted_at IS NULL")
+
+    @property
+    def writable(self) -> List[ColumnInfo]:
+        """Columnas de INSERT (id sólo si se genera en Python)"""
+        return [
+            column for column in self.columns
+            if column.name not in AUDIT_COLUMNS
+            and not column.computed
+            and (column.name != "id" or self.client_ids)
+        ]
+
+    @property
+    def updatable(self) -> List[ColumnInfo]:
+        return [column for column in self.writable if column.name != "id"]
+
+    def projection(self, use_case: str) -> List[str]:
+        """
+        Columnas por caso de uso:
+        - detail: todas (por id, RETURNING de create/update)
+        - list: sin textos largos/JSON ni columnas de auditoría salvo created_at
+        - ref: id + columnas identificatorias (selectores, referencias)
+        """
+        names = [column.name for column in self.columns if column.name != "deleted_at"]
+        if use_case == "detail":
+            return names
+        if use_case == "list":
+            return [
+                name for name in names
+                if not self.by_name[name].is_blob and name != "updated_at"
+            ]
+        labels = [name for name in LABEL_COLUMNS if name in self.by_name]
+        return ["id", *labels] if labels else []
+
+    def keyset(self) -> Tuple[Tuple[str, ...], str, str]:
+        """
+        Clave de paginación keyset sobre un índice: (columnas, ASC/DESC, índice)
+
+        1. created_at indexado: (created_at, id) DESC (más recientes primero)
+        2. Índice único de columnas NOT NULL (clave natural, p. ej. code) ASC
+        3. Clave primaria (id) ASC
+        """
+        for name, columns, _, predicate in self.indexes:
+            if columns[0] == "created_at" and self._implied(predicate) and "id" in self.by_name:
+                return ("created_at", "id"), "DESC", name
+        for name, columns, unique, predicate in self.indexes:
+            if (
+                unique
+                and self._implied(predicate)
+                and "id" not in columns
+                and not any(self.by_name[column].nullable for column in columns)
+            ):
+                return columns, "ASC", name
+        return ("id",), "ASC", f"{self.table}_pkey"
+
+    def natural_key(self) -> Optional[Tuple[Tuple[str, ...], Optional[str]]]:
+        """(columnas, predicado) del primer índice único que no es la clave primaria"""
+        for _, columns, unique, predicate in self.indexes:
+            if unique and "id" not in columns:
+                return columns, predicate
+        return None
+
+
+def _literal(value) -> str:
+    """Literal Python con comillas dobles (estilo del repo)"""
+    if isinstance(value, str):
+        return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+    return repr(value)
+
+
+def _tuple_literal(names: List[str], indent: int = 4) -> List[str]:
+    """Tupla de strings en varias líneas de hasta ~88 columnas"""
+    items = [f"{_literal(name)}," for name in names]
+    lines, current = [], ""
+    for item in items:
+        if current and len(" " * (indent + 4) + current + " " + item) > 88:
+            lines.append(current)
+            current = item
+        else:
+            current = f"{current} {item}" if current else item
+    lines.append(current)
+    return ["(", *[" " * 4 + line for line in lines], ")"]
 
-    table_name = sqlalchemy_model.__tablename__
-    columns = [col.name for col in sqlalchemy_model.__table__.columns]
-    pk_column = next((col.name for col in columns if col == 'id'), 'id')
 
-    code_lines = [
-        '"""',
-        f'{model_name.title()} SQL Queries',
-        '',
-        f'Queries SQL puras para operaciones CRUD de {model_name}.',
-        'GENERADO AUTOMÁTICAMENTE - NO EDITAR MANUALMENTE',
-        '"""',
-        '',
-        'from typing import Optional',
-        'from uuid import UUID',
-        'from decimal import Decimal',
-        'import asyncpg',
-        '',
+def _indented_entry(prefix: str, literal: List[str], indent: int = 4) -> List[str]:
+    """Entrada de dict/asignación cuyo valor es un literal multilínea"""
+    return [
+        " " * indent + prefix + literal[0],
+        *[" " * indent + line for line in literal[1:-1]],
+        " " * indent + literal[-1] + ",",
+    ]
+
+
+def _sql_block(lines: List[str], indent: int) -> List[str]:
+    return [" " * indent + line for line in lines]
+
+
+def _column_list(names: List[str], indent: int = 12) -> List[str]:
+    """Columnas una por línea, separadas por coma"""
+    return _sql_block([f"{name}," for name in names[:-1]] + [names[-1]], indent)
+
+
+def _statement(info: TableInfo, constant: str, name: str, sql: List[str]) -> List[str]:
+    """Constante de módulo con el SQL, registrada como prepared statement"""
+    return [
+        f'{constant} = register_statement("{info.table}.{name}", """',
+        *sql,
+        '""")',
         '',
+    ]
+
+
+def _signature(name: str, params: List[str], returns: str) -> List[str]:
+    """Firma en una línea, o un parámetro por línea si supera ~88 columnas"""
+    line = f"async def {name}(pool: asyncpg.Pool, {', '.join(params)}) -> {returns}:"
+    if len(line) <= 88:
+        return [line]
+    return [f"async def {name}(", "    pool: asyncpg.Pool,", *[f"    {p}," for p in params], f") -> {returns}:"]
+
+
+def _function(signature: List[str], docstring: List[str], body: List[str]) -> List[str]:
+    doc = [f'    """{docstring[0]}"""'] if len(docstring) == 1 else [
+        '    """',
+        *[f"    {line}" if line else "" for line in docstring],
+        '    """',
+    ]
+    return [*signature, *doc, *body, '', '']
+
+
+def _header(title: str) -> List[str]:
+    return [
         '# ============================================================================',
-        '# READ QUERIES',
+        f'# {title}',
         '# ============================================================================',
         '',
-        f'async def get_{model_name}_by_id(pool: asyncpg.Pool, {model_name}_id: UUID) -> Optional[asyncpg.Record]:',
-        f'    """Obtener {model_name} por ID"""',
-        f'    query = """',
-        f'        SELECT',
     ]
 
-    # Agregar columnas al SELECT
-    for col in columns:
-        code_lines.append(f'            {col},')
 
-    code_lines.extend([
-        f'        FROM {table_name}',
-        f'        WHERE id = $1',
-        f'    """',
-        f'    async with pool.acquire() as conn:',
-        f'        return await conn.fetchrow(query, {model_name}_id)',
+def _alive(info: TableInfo, indent: int = 10) -> List[str]:
+    return [" " * indent + "AND deleted_at IS NULL"] if info.soft_delete else []
+
+
+def generate_sql_queries(model_name: str, sqlalchemy_model: Type[DeclarativeMeta]) -> str:
+    """
+    Generar el módulo de queries SQL de un modelo SQLAlchemy
+
+    Respecto de la v1 (todo str, SELECT *, OFFSET, hard delete):
+    - Parámetros tipados desde el tipo de cada columna (defaults del modelo)
+    - Proyecciones por caso de uso (detail / list / ref)
+    - Paginación keyset sobre un índice existente (ver TableInfo.keyset)
+    - Soft delete si la tabla tiene deleted_at
+    - Inserción y upsert por lotes con unnest (una sentencia por lote)
+    - Todas las sentencias son constantes registradas en app/prepared_statements.py
+    """
+    info = TableInfo(sqlalchemy_model)
+    entity, table = info.entity, info.table
+    if "id" not in info.by_name or not info.by_name["id"].primary_key:
+        raise ValueError(f"{table}: el generador requiere una clave primaria 'id'")
+    id_param = f"{entity}_id"
+
+    key_columns, direction, key_index = info.keyset()
+
+    # Las páginas incluyen siempre la clave keyset (cursor de la página siguiente)
+    detail = info.projection("detail")
+    projections = {}
+    for use_case in ("list", "ref"):
+        names = info.projection(use_case)
+        if names:
+            projections[use_case] = names + [column for column in key_columns if column not in names]
+    comparison = "<" if direction == "DESC" else ">"
+    order_by = ", ".join(f"{column} {direction}" for column in key_columns)
+
+    writable = info.writable
+    updatable = info.updatable
+    natural_key = info.natural_key()
+
+    # Imports según los tipos usados
+    python_types = {info.by_name[column].python_type for column in key_columns}
+    python_types |= {column.python_type for column in writable}
+    typing_names = ["Any", "Mapping", "Optional", "Sequence"]
+    imports = []
+    if {"datetime", "date"} & python_types:
+        imports.append(f"from datetime import {', '.join(sorted({'datetime', 'date'} & python_types))}")
+    if "Decimal" in python_types or any(c.default and c.default.startswith("Decimal(") for c in writable):
+        imports.append("from decimal import Decimal")
+    imports.append(f"from typing import {', '.join(typing_names)}")
+    imports.append("from uuid import UUID, uuid4" if info.client_ids else "from uuid import UUID")
+    imports.append("import asyncpg")
+
+    module_doc = [
+        '"""',
+        f'{entity.replace("_", " ").title()} SQL Queries',
         '',
+        f'Queries SQL puras para operaciones CRUD de {table}.',
+        'GENERADO AUTOMÁTICAMENTE (scripts/generate_code.py) - NO EDITAR MANUALMENTE',
         '',
-        f'async def get_all_{model_name}s(',
-        f'    pool: asyncpg.Pool,',
-        f'    limit: int = 100,',
-        f'    offset: int = 0',
-        f') -> list[asyncpg.Record]:',
-        f'    """Obtener lista de {model_name}s con paginación"""',
-        f'    query = """',
-        f'        SELECT',
-    ])
-
-    # Columnas para lista (excluir campos largos)
-    list_columns = [col for col in columns if col not in ['description', 'updated_at']]
-    for col in list_columns:
-        code_lines.append(f'            {col},')
+        f'- Paginación keyset sobre {key_index}: ORDER BY {order_by}',
+    ]
+    if info.soft_delete:
+        module_doc.append('- Soft delete: las lecturas y updates ignoran filas con deleted_at')
+    module_doc += [
+        '- Lotes: create_*_bulk / upsert_*_bulk envían todas las filas en una',
+        '  sentencia (INSERT ... SELECT FROM unnest) en vez de una por fila',
+        '- Las sentencias se registran en app/prepared_statements.py: el caché de',
+        '  sentencias de cada conexión alcanza para todas',
+        '"""',
+    ]
 
-    code_lines.extend([
-        f'        FROM {table_name}',
-        f'        ORDER BY created_at DESC',
-        f'        LIMIT $1 OFFSET $2',
-        f'    """',
-        f'    async with pool.acquire() as conn:',
-        f'        return await conn.fetch(query, limit, offset)',
+    code_lines = [
+        *module_doc,
         '',
+        *imports,
+        '',
+        'from app.prepared_statements import register_statement',
         '',
-        '# ============================================================================',
-        '# CREATE QUERIES',
-        '# ============================================================================',
         '',
-        f'async def create_{model_name}(',
-        f'    pool: asyncpg.Pool,',
+        *_header('PROYECCIONES'),
+        '# Columnas retornadas por caso de uso (detail: por id y RETURNING)',
+        'PROJECTIONS = {',
+        *[
+            line
+            for use_case, names in {"detail": detail, **projections}.items()
+            for line in _indented_entry(f'"{use_case}": ', _tuple_literal(names))
+        ],
+        '}',
+        '',
+        '',
+        *_header('SENTENCIAS'),
+    ]
+
+    # --- READ ---------------------------------------------------------------
+    code_lines += _statement(info, "_GET_BY_ID", "get_by_id", [
+        '    SELECT',
+        *_column_list(detail, 8),
+        f'    FROM {table}',
+        '    WHERE id = $1',
+        *_alive(info, 6),
     ])
 
-    # Parámetros para create (excluir id, created_at, updated_at)
-    create_params = [col for col in columns if col not in ['id', 'created_at', 'updated_at']]
-    for param in create_params:
-        if param.endswith('_id'):
-            code_lines.append(f'    {param}: Optional[UUID] = None,')
-        else:
-            code_lines.append(f'    {param}: str,')  # Simplificar tipos
+    # Lookups por lote (DataLoader, app/dataloader.py): una query por lista de ids
+    for use_case, names in {"detail": detail, **projections}.items():
+        code_lines += _statement(info, f"_GET_BY_IDS_{use_case.upper()}", f"get_by_ids_{use_case}", [
+            '    SELECT',
+            *_column_list(names if "id" in names else ["id", *names], 8),
+            f'    FROM {table}',
+            '    WHERE id = ANY($1::uuid[])',
+            *_alive(info, 6),
+        ])
+    code_lines += [
+        '_GET_BY_IDS = {',
+        *[f'    "{use_case}": _GET_BY_IDS_{use_case.upper()},' for use_case in ("detail", *projections)],
+        '}',
+        '',
+    ]
 
-    code_lines.extend([
-        f') -> asyncpg.Record:',
-        f'    """Crear nuevo {model_name}"""',
-        f'    query = """',
-        f'        INSERT INTO {table_name} (',
-    ])
+    for use_case, names in projections.items():
+        first_where = ["    WHERE deleted_at IS NULL"] if info.soft_delete else []
+        cursor = ", ".join(f"${n}" for n in range(2, len(key_columns) + 2))
+        tuple_columns = f"({', '.join(key_columns)})" if len(key_columns) > 1 else key_columns[0]
+        tuple_cursor = f"({cursor})" if len(key_columns) > 1 else cursor
+        code_lines += _statement(info, f"_PAGE_{use_case.upper()}", f"page_{use_case}", [
+            '    SELECT',
+            *_column_list(names, 8),
+            f'    FROM {table}',
+            *first_where,
+            f'    ORDER BY {order_by}',
+            '    LIMIT $1',
+        ])
+        code_lines += _statement(info, f"_PAGE_{use_case.upper()}_AFTER", f"page_{use_case}_after", [
+            '    SELECT',
+            *_column_list(names, 8),
+            f'    FROM {table}',
+            f'    WHERE {tuple_columns} {comparison} {tuple_cursor}',
+            *_alive(info, 6),
+            f'    ORDER BY {order_by}',
+            '    LIMIT $1',
+        ])
+    code_lines += [
+        '# Proyección -> (primera página, páginas siguientes)',
+        '_PAGE = {',
+        *[
+            f'    "{use_case}": (_PAGE_{use_case.upper()}, _PAGE_{use_case.upper()}_AFTER),'
+            for use_case in projections
+        ],
+        '}',
+        '',
+    ]
 
-    # Columnas para INSERT
-    insert_columns = create_params
-    for col in insert_columns[:-1]:
-        code_lines.append(f'            {col},')
-    code_lines.append(f'            {insert_columns[-1]}')
-    code_lines.append(f'        )')
-    code_lines.append(f'        VALUES (')
-
-    # Placeholders
-    placeholders = [f'${i+1}' for i in range(len(insert_columns))]
-    for ph in placeholders[:-1]:
-        code_lines.append(f'            {ph},')
-    code_lines.append(f'            {placeholders[-1]}')
-    code_lines.append(f'        )')
-    code_lines.append(f'        RETURNING')
-
-    # RETURNING columns
-    for col in columns:
-        code_lines.append(f'            {col},')
+    # --- CREATE -------------------------------------------------------------
+    insert_values = []
+    for n, column in enumerate(writable, start=1):
+        if column.server_default and not column.nullable and column.default is None:
+            insert_values.append(f"COALESCE(${n}::{column.sql_type}, {column.server_default})")
+        else:
+            insert_values.append(f"${n}")
+    code_lines += _statement(info, "_CREATE", "create", [
+        f'    INSERT INTO {table} (',
+        *_column_list([c.name for c in writable], 8),
+        '    )',
+        f'    VALUES ({", ".join(insert_values)})',
+        '    RETURNING',
+        *_column_list(detail, 8),
+    ])
 
-    code_lines.extend([
-        f'    """',
-        f'    async with pool.acquire() as conn:',
-        f'        return await conn.fetchrow(',
-        f'            query,',
+    unnest_arrays = ", ".join(f"${n}::{c.sql_type}[]" for n, c in enumerate(writable, start=1))
+    unnest_alias = ", ".join(c.name for c in writable)
+    unnest_select = [
+        f"COALESCE(v.{c.name}, {c.server_default})"
+        if c.server_default and not c.nullable and c.default is None else f"v.{c.name}"
+        for c in writable
+    ]
+    bulk_insert = [
+        f'    INSERT INTO {table} (',
+        *_column_list([c.name for c in writable], 8),
+        '    )',
+        '    SELECT',
+        *_column_list(unnest_select, 8),
+        f'    FROM unnest({unnest_arrays})',
+        f'        AS v({unnest_alias})',
+    ]
+    code_lines += _statement(info, "_CREATE_BULK", "create_bulk", [*bulk_insert, '    RETURNING id'])
+
+    if natural_key:
+        conflict_columns, conflict_predicate = natural_key
+        updates = [f"{c.name} = EXCLUDED.{c.name}" for c in updatable if c.name not in conflict_columns]
+        if info.has_updated_at:
+            updates.append("updated_at = NOW()")
+        if info.soft_delete:
+            updates.append("deleted_at = NULL")  # upsert de una clave eliminada la restaura
+        if not updates:
+            updates.append(f"{conflict_columns[0]} = EXCLUDED.{conflict_columns[0]}")
+        where = f" WHERE {conflict_predicate}" if conflict_predicate else ""
+        code_lines += _statement(info, "_UPSERT_BULK", "upsert_bulk", [
+            *bulk_insert,
+            f'    ON CONFLICT ({", ".join(conflict_columns)}){where} DO UPDATE',
+            '    SET',
+            *_column_list(updates, 8),
+            f'    RETURNING {", ".join(conflict_columns)}, id',
+        ])
+
+    # --- UPDATE / DELETE ----------------------------------------------------
+    set_parts = [f"{c.name} = COALESCE(${n}, {c.name})" for n, c in enumerate(updatable, start=2)]
+    if info.has_updated_at:
+        set_parts.append("updated_at = NOW()")
+    code_lines += _statement(info, "_UPDATE", "update", [
+        f'    UPDATE {table}',
+        '    SET',
+        *_column_list(set_parts, 8),
+        '    WHERE id = $1',
+        *_alive(info, 6),
+        '    RETURNING',
+        *_column_list(detail, 8),
     ])
 
-    # Parámetros para execute
-    for param in create_params:
-        code_lines.append(f'            {param},')
+    if info.soft_delete:
+        code_lines += _statement(info, "_SOFT_DELETE", "soft_delete", [
+            f'    UPDATE {table}',
+            '    SET',
+            '        deleted_at = NOW()' + (',' if info.has_updated_at else ''),
+            *(['        updated_at = NOW()'] if info.has_updated_at else []),
+            '    WHERE id = $1',
+            '      AND deleted_at IS NULL',
+            '    RETURNING id',
+        ])
+    code_lines += _statement(
+        info,
+        "_HARD_DELETE" if info.soft_delete else "_DELETE",
+        "hard_delete" if info.soft_delete else "delete",
+        [
+        f'    DELETE FROM {table}',
+        '    WHERE id = $1',
+        '    RETURNING id',
+        ],
+    )
 
-    code_lines.extend([
-        f'        )',
+    # Defaults del modelo para filas de los lotes (claves ausentes en el dict)
+    bulk_defaults = {c.name: c.default for c in writable if c.default is not None}
+    code_lines += [
+        '# Defaults del modelo para las claves ausentes en las filas de un lote',
+        '_BULK_DEFAULTS = {',
+        *[f'    "{name}": {literal},' for name, literal in bulk_defaults.items()],
+        '}',
+        '_BULK_COLUMNS = ' + _tuple_literal([c.name for c in writable], 0)[0],
+        *_tuple_literal([c.name for c in writable], 0)[1:],
         '',
         '',
-        '# ============================================================================',
-        '# UPDATE QUERIES',
-        '# ============================================================================',
+        'def _bulk_arrays(rows: Sequence[Mapping[str, Any]]) -> list[list]:',
+        '    """Filas (dicts) -> un array por columna para unnest"""',
+        '    arrays: list[list] = [[] for _ in _BULK_COLUMNS]',
+        '    for row in rows:',
+        *([
+            '        if row.get("id") is None:',
+            '            row = {**row, "id": uuid4()}',
+        ] if info.client_ids else []),
+        '        for values, column in zip(arrays, _BULK_COLUMNS):',
+        '            values.append(row[column] if column in row else _BULK_DEFAULTS.get(column))',
+        '    return arrays',
         '',
-        f'async def update_{model_name}(',
-        f'    pool: asyncpg.Pool,',
-        f'    {model_name}_id: UUID,',
-    ])
-
-    # Parámetros de update (todos opcionales)
-    for param in create_params:
-        code_lines.append(f'    {param}: Optional[str] = None,')
+        '',
+    ]
 
-    code_lines.extend([
-        f') -> Optional[asyncpg.Record]:',
-        f'    """Actualizar {model_name}"""',
-        f'    query = """',
-        f'        UPDATE {table_name}',
-        f'        SET',
-    ])
+    # --- FUNCIONES ----------------------------------------------------------
+    code_lines += _header('READ QUERIES')
+    code_lines += _function(
+        _signature(f'get_{entity}_by_id', [f'{id_param}: UUID'], 'Optional[asyncpg.Record]'),
+        [f'Obtener {entity} por ID'],
+        [
+            '    async with pool.acquire() as conn:',
+            f'        return await conn.fetchrow(_GET_BY_ID, {id_param})',
+        ],
+    )
 
-    # SET clause con COALESCE
-    set_parts = []
-    for i, param in enumerate(create_params):
-        set_parts.append(f'            {param} = COALESCE(${i+2}, {param})')
+    all_use_cases = " | ".join(f'"{use_case}"' for use_case in ("detail", *projections))
+    code_lines += _function(
+        [
+            f'async def get_{table}_by_ids(',
+            '    pool: asyncpg.Pool,',
+            f'    {entity}_ids: Sequence[UUID],',
+            '    projection: str = "detail",',
+            ') -> dict[UUID, asyncpg.Record]:',
+        ],
+        [
+            f'Obtener varios {table} por ID en una query (id = ANY($1::uuid[]))',
+            '',
+            'Para resolver referencias fila a fila sin N+1 usar el DataLoader del',
+            f'request: get_loader(get_{table}_by_ids, pool).load({entity}_id)',
+            '(app/dataloader.py).',
+            '',
+            'Args:',
+            f'    projection: Columnas retornadas ({all_use_cases}, ver PROJECTIONS)',
+            '',
+            'Returns:',
+            '    Mapa id -> fila (los ids inexistentes no aparecen)',
+        ],
+        [
+            '    try:',
+            '        query = _GET_BY_IDS[projection]',
+            '    except KeyError:',
+            '        raise ValueError(f"Proyección desconocida: {projection}") from None',
+            f'    if not {entity}_ids:',
+            '        return {}',
+            '',
+            '    async with pool.acquire() as conn:',
+            f'        records = await conn.fetch(query, list(dict.fromkeys({entity}_ids)))',
+            '    return {record["id"]: record for record in records}',
+        ],
+    )
 
-    for part in set_parts[:-1]:
-        code_lines.append(f'{part},')
-    code_lines.append(f'{set_parts[-1]},')
-    code_lines.append(f'            updated_at = NOW()')
-    code_lines.append(f'        WHERE id = $1')
-    code_lines.append(f'        RETURNING')
+    cursor_params = [f"after_{column}" for column in key_columns]
+    use_cases = " | ".join(f'"{use_case}"' for use_case in projections)
+    code_lines += _function(
+        [
+            f'async def get_{table}_page(',
+            '    pool: asyncpg.Pool,',
+            '    limit: int = 100,',
+            *[
+                f'    {param}: Optional[{info.by_name[column].python_type}] = None,'
+                for param, column in zip(cursor_params, key_columns)
+            ],
+            '    projection: str = "list",',
+            ') -> list[asyncpg.Record]:',
+        ],
+        [
+            f'Página de {table} con paginación keyset ({key_index})',
+            '',
+            f'Orden: {order_by}. Para la página siguiente pasar los valores de la',
+            f'última fila: {", ".join(f"{p}=ultima[{c!r}]" for p, c in zip(cursor_params, key_columns))}.',
+            'El costo no crece con la página (sin OFFSET).',
+            '',
+            'Args:',
+            f'    projection: Columnas retornadas ({use_cases}, ver PROJECTIONS)',
+        ],
+        [
+            '    try:',
+            '        first, after = _PAGE[projection]',
+            '    except KeyError:',
+            '        raise ValueError(f"Proyección desconocida: {projection}") from None',
+            '',
+            '    async with pool.acquire() as conn:',
+            f'        if {cursor_params[0]} is None:',
+            '            return await conn.fetch(first, limit)',
+            f'        return await conn.fetch(after, limit, {", ".join(cursor_params)})',
+        ],
+    )
 
-    # RETURNING
-    for col in columns:
-        code_lines.append(f'            {col},')
+    code_lines += _header('CREATE QUERIES')
+    required = [c for c in writable if not c.nullable and c.default is None and c.server_default is None and c.name != "id"]
+    optional = [c for c in writable if c not in required and c.name != "id"]
+    create_params = [f'    {c.name}: {c.python_type},' for c in required]
+    for c in optional:
+        if c.default is not None:
+            create_params.append(f'    {c.name}: {c.python_type} = {c.default},')
+        else:
+            create_params.append(f'    {c.name}: Optional[{c.python_type}] = None,')
+    if info.client_ids:
+        create_params.append('    id: Optional[UUID] = None,')
+    create_args = ["id or uuid4()" if c.name == "id" else c.name for c in writable]
+    code_lines += _function(
+        [f'async def create_{entity}(', '    pool: asyncpg.Pool,', *create_params, ') -> asyncpg.Record:'],
+        [f'Crear nuevo {entity}'],
+        [
+            '    async with pool.acquire() as conn:',
+            '        return await conn.fetchrow(',
+            '            _CREATE,',
+            *[f'            {arg},' for arg in create_args],
+            '        )',
+        ],
+    )
 
-    code_lines.extend([
-        f'    """',
-        f'    async with pool.acquire() as conn:',
-        f'        return await conn.fetchrow(',
-        f'            query,',
-        f'            {model_name}_id,',
-    ])
+    code_lines += _function(
+        [
+            f'async def create_{table}_bulk(',
+            '    pool: asyncpg.Pool,',
+            '    rows: Sequence[Mapping[str, Any]],',
+            ') -> list[UUID]:',
+        ],
+        [
+            f'Insertar muchas filas de {table} en una sola sentencia (unnest)',
+            '',
+            'Cada fila es un dict columna -> valor (mismas columnas que create_*);',
+            'las claves ausentes toman el default del modelo.',
+            '',
+            'Returns:',
+            '    ids de las filas insertadas, en el orden de `rows`',
+        ],
+        [
+            '    if not rows:',
+            '        return []',
+            '    async with pool.acquire() as conn:',
+            '        records = await conn.fetch(_CREATE_BULK, *_bulk_arrays(rows))',
+            '    return [record["id"] for record in records]',
+        ],
+    )
 
-    for param in create_params:
-        code_lines.append(f'            {param},')
+    if natural_key:
+        conflict_columns, _ = natural_key
+        if len(conflict_columns) == 1:
+            key_expr, key_type = f'record["{conflict_columns[0]}"]', info.by_name[conflict_columns[0]].python_type
+        else:
+            key_expr = f'({", ".join(f"record[{c!r}]" for c in conflict_columns)})'
+            key_type = f'tuple[{", ".join(info.by_name[c].python_type for c in conflict_columns)}]'
+        code_lines += _function(
+            [
+                f'async def upsert_{table}_bulk(',
+                '    pool: asyncpg.Pool,',
+                '    rows: Sequence[Mapping[str, Any]],',
+                f') -> dict[{key_type}, UUID]:',
+            ],
+            [
+                f'Insertar o actualizar filas de {table} por su clave natural ({", ".join(conflict_columns)})',
+                '',
+                'Una sentencia para todo el lote (ON CONFLICT ... DO UPDATE); las filas',
+                'existentes conservan su id.',
+                '',
+                'Returns:',
+                '    Mapa clave natural -> id (filas nuevas y existentes)',
+            ],
+            [
+                '    if not rows:',
+                '        return {}',
+                '    async with pool.acquire() as conn:',
+                '        records = await conn.fetch(_UPSERT_BULK, *_bulk_arrays(rows))',
+                f'    return {{{key_expr}: record["id"] for record in records}}',
+            ],
+        )
+
+    code_lines += _header('UPDATE QUERIES')
+    code_lines += _function(
+        [
+            f'async def update_{entity}(',
+            '    pool: asyncpg.Pool,',
+            f'    {id_param}: UUID,',
+            *[f'    {c.name}: Optional[{c.python_type}] = None,' for c in updatable],
+            ') -> Optional[asyncpg.Record]:',
+        ],
+        [f'Actualizar {entity} (los parámetros None no se modifican)'],
+        [
+            '    async with pool.acquire() as conn:',
+            '        return await conn.fetchrow(',
+            '            _UPDATE,',
+            f'            {id_param},',
+            *[f'            {c.name},' for c in updatable],
+            '        )',
+        ],
+    )
 
-    code_lines.extend([
-        f'        )',
-        '',
-        '',
-        '# ============================================================================',
-        '# DELETE QUERIES',
-        '# ============================================================================',
-        '',
-        f'async def delete_{model_name}(pool: asyncpg.Pool, {model_name}_id: UUID) -> bool:',
-        f'    """Eliminar {model_name} (hard delete)"""',
-        f'    query = """',
-        f'        DELETE FROM {table_name}',
-        f'        WHERE id = $1',
-        f'        RETURNING id',
-        f'    """',
-        f'    async with pool.acquire() as conn:',
-        f'        result = await conn.fetchrow(query, {model_name}_id)',
-        f'        return result is not None',
-    ])
+    code_lines += _header('DELETE QUERIES')
+    if info.soft_delete:
+        code_lines += _function(
+            _signature(f'soft_delete_{entity}', [f'{id_param}: UUID'], 'bool'),
+            [f'Soft delete de {entity} (no elimina físicamente)'],
+            [
+                '    async with pool.acquire() as conn:',
+                f'        result = await conn.fetchrow(_SOFT_DELETE, {id_param})',
+                '        return result is not None',
+            ],
+        )
+        delete_name, delete_doc, delete_constant = (
+            f'hard_delete_{entity}', f'Hard delete de {entity} (PELIGRO: elimina permanentemente)', "_HARD_DELETE"
+        )
+    else:
+        delete_name, delete_doc, delete_constant = f'delete_{entity}', f'Eliminar {entity}', "_DELETE"
+    code_lines += _function(
+        _signature(delete_name, [f'{id_param}: UUID'], 'bool'),
+        [delete_doc],
+        [
+            '    async with pool.acquire() as conn:',
+            f'        result = await conn.fetchrow({delete_constant}, {id_param})',
+            '        return result is not None',
+        ],
+    )
 
-    return '\n'.join(code_lines)
+    return '\n'.join(code_lines).rstrip() + '\n'
 
 
 def main():
     """Generar código automáticamente desde modelos SQLAlchemy"""
 
     if len(sys.argv) < 2:
-        print("Uso: python generate_code.py <model_name>")
-        print("Ejemplo: python generate_code.py product")
+        print("Uso: python generate_code.py <model_name|table_name>")
+        print("Ejemplo: python generate_code.py equipment")
         sys.exit(1)
 
     model_name = sys.argv[1].lower()
@@ -380,8 +923,8 @@ def main():
     sqlalchemy_model = models[model_name]
 
     # Directorios de salida
-    models_dir = Path(__file__).parent / "app" / "models"
-    queries_dir = Path(__file__).parent / "app" / "queries"
+    models_dir = API_DIR / "app" / "models"
+    queries_dir = API_DIR / "app" / "queries"
 
     models_dir.mkdir(exist_ok=True)
     queries_dir.mkdir(exist_ok=True)
@@ -397,7 +940,7 @@ def main():
 
     # Generar queries SQL
     queries_code = generate_sql_queries(model_name, sqlalchemy_model)
-    queries_file = queries_dir / f"{model_name}.py"
+    queries_file = queries_dir / f"{sqlalchemy_model.__tablename__}.py"
 
     with open(queries_file, 'w', encoding='utf-8') as f:
         f.write(queries_code)
@@ -405,7 +948,8 @@ def main():
     print(f"✅ Generado: {queries_file}")
 
     print("\n🎉 ¡Código generado exitosamente!")
-    print(f"Recuerda actualizar los __init__.py para importar las nuevas clases.")
+    print("Recuerda actualizar los __init__.py para importar las nuevas clases")
+    print("(app/queries/__init__.py: import + instrument_module para métricas y réplicas).")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,664 @@
+"""
+Synthetic Data Generator
+
+Generador parametrizado de datos sintéticos a escala (decenas de millones de
+filas) con distribuciones realistas, para pruebas de carga y de planes de
+ejecución sobre volúmenes de producción:
+
+- Usuarios: N usuarios con el mismo hash de password (bcrypt de "Synthetic123!")
+- Audit logs: actividad por usuario con ley de potencias (Zipf: pocos usuarios
+  concentran la mayoría de los eventos), ciclo diario de actividad y mezcla de
+  acciones/entidades similar a la de producción; referencian a los --users
+  usuarios generados en la misma ejecución (con --users 0, sólo sistema)
+- Block model: por fase, un campo de leyes espacialmente correlacionado
+  (campo gaussiano suavizado + tendencia de pórfido: ley mayor al centro) con
+  zonación de mineral por profundidad (óxidos arriba, sulfuros abajo)
+- Flotas de equipos por mina: palas, camiones por pala, cargadores,
+  perforadoras y equipos de planta, con estados, horas de operación y fechas
+  de mantención (algunas vencidas)
+
+La generación es determinista (--seed) y ocurre en procesos separados
+(ProcessPoolExecutor, --workers): cada chunk se genera como CSV en un proceso
+y se carga con COPY por una conexión propia, de modo que generación y carga
+corren en paralelo. Los bloques reutilizan el pipeline de load_block_model
+(validación + COPY binario a staging + swap por fase).
+
+Todos los datos quedan marcados para poder borrarlos con --reset: emails
+@synthetic.local, extra_data {"source": "synthetic"} en audit logs (índice GIN)
+y códigos SYN-* en yacimientos, minas, fases y equipos.
+
+Ejecutar con:
+    docker compose exec api python -m scripts.generate_synthetic_data --users 100000 --audit-logs 5000000
+    docker compose exec api python -m scripts.generate_synthetic_data --mines 10 --blocks-per-phase 500000 --workers 8
+    docker compose exec api python -m scripts.generate_synthetic_data --reset
+"""
+
+import argparse
+import asyncio
+import csv
+import io
+import os
+import sys
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Callable, Dict, Iterator, List, Optional
+
+import asyncpg
+import numpy as np
+import orjson
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from app.config import settings
+from scripts.load_block_model import load_block_model
+from scripts.seed_data import pwd_context
+from scripts.seed_mining_data import EQUIPMENT_TYPES_DATA, seed_equipment_types
+from scripts.seed_upsert import upsert
+
+
+SYNTHETIC_DOMAIN = "synthetic.local"
+SYNTHETIC_PREFIX = "SYN"
+SYNTHETIC_PASSWORD = "Synthetic123!"
+SYNTHETIC_MARKER = {"source": "synthetic"}
+
+# Flujos de números aleatorios independientes (chunk_rng)
+STREAMS = {"users": 1, "audit_logs": 2, "blocks": 3, "fleet": 4, "ids": 5}
+
+
+# =============================================================================
+# UTILIDADES
+# =============================================================================
+
+def chunk_rng(seed: int, stream: str, index: int) -> np.random.Generator:
+    """Generador determinista por (seed, flujo, chunk): mismo resultado con 1 o N workers"""
+    return np.random.default_rng([seed, STREAMS[stream], index])
+
+
+@lru_cache(maxsize=None)
+def _id_prefix(seed: int, stream: str) -> int:
+    return int(chunk_rng(seed, "ids", STREAMS[stream]).integers(0, 2**63))
+
+
+def synthetic_uuid(seed: int, stream: str, index: int) -> uuid.UUID:
+    """
+    UUID v4 determinista a partir del índice de la fila
+
+    Permite referenciar usuarios desde los audit logs en otros procesos sin
+    compartir la lista de ids.
+    """
+    return uuid.UUID(int=(_id_prefix(seed, stream) << 64) | index, version=4)
+
+
+def to_csv(rows) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue().encode()
+
+
+def _timestamps(rng: np.random.Generator, count: int, days: int, now: float) -> List[str]:
+    """Timestamps de los últimos `days` días con ciclo diario (peak 9-18 h)"""
+    hour_weights = np.array([1, 1, 1, 1, 1, 2, 4, 8, 12, 14, 14, 13, 10, 12, 14, 14, 12, 9, 6, 4, 3, 2, 2, 1], dtype=float)
+    hours = rng.choice(24, size=count, p=hour_weights / hour_weights.sum())
+    seconds = rng.integers(0, days, count) * 86400 + hours * 3600 + rng.integers(0, 3600, count)
+    start = (int(now) // 86400 - days + 1) * 86400
+    instants = np.minimum(start + seconds, int(now)).astype("datetime64[s]")
+    return np.datetime_as_string(instants, timezone="UTC").tolist()
+
+
+# =============================================================================
+# USUARIOS
+# =============================================================================
+
+USER_COLUMNS = ["id", "email", "username", "password_hash", "first_name", "last_name", "is_active", "is_verified", "created_at"]
+
+FIRST_NAMES = ["Carlos", "María", "Juan", "Ana", "Pedro", "Carmen", "Luis", "Francisca", "Jorge", "Valentina", "Diego", "Camila"]
+LAST_NAMES = ["González", "Muñoz", "Rojas", "Díaz", "Pérez", "Soto", "Contreras", "Silva", "Martínez", "Sepúlveda", "Morales", "Fuentes"]
+
+
+def generate_users_csv(seed: int, chunk_index: int, start: int, count: int, password_hash: str, now: float) -> bytes:
+    """Chunk de usuarios [start, start + count) como CSV"""
+    rng = chunk_rng(seed, "users", chunk_index)
+    first = rng.integers(0, len(FIRST_NAMES), count).tolist()
+    last = rng.integers(0, len(LAST_NAMES), count).tolist()
+    active = (rng.random(count) > 0.05).tolist()
+    verified = (rng.random(count) > 0.3).tolist()
+    created = _timestamps(rng, count, 3 * 365, now)
+    return to_csv(
+        (
+            synthetic_uuid(seed, "users", n),
+            f"user{n}@{SYNTHETIC_DOMAIN}",
+            f"user{n}",
+            password_hash,
+            FIRST_NAMES[first[i]],
+            LAST_NAMES[last[i]],
+            active[i],
+            verified[i],
+            created[i],
+        )
+        for i, n in enumerate(range(start, start + count))
+    )
+
+
+# =============================================================================
+# AUDIT LOGS (actividad con ley de potencias)
+# =============================================================================
+
+AUDIT_LOG_COLUMNS = ["user_id", "action", "entity_type", "entity_id", "description", "extra_data", "ip_address", "user_agent", "created_at"]
+
+# Mezcla de acciones (proporción aproximada observada en producción)
+ACTION_WEIGHTS = {
+    "READ": 0.52, "UPDATE": 0.14, "CREATE": 0.10, "LOGIN": 0.09, "LOGOUT": 0.07,
+    "DELETE": 0.02, "LOGIN_FAILED": 0.015, "INFO": 0.02, "WARNING": 0.006, "ERROR": 0.004,
+    "CONFIG_CHANGE": 0.003, "PERMISSION_CHANGE": 0.002,
+}
+ACTIONS = np.array(list(ACTION_WEIGHTS), dtype=object)
+ACTION_P = np.array(list(ACTION_WEIGHTS.values())) / sum(ACTION_WEIGHTS.values())
+
+ENTITY_TYPES = ["users", "mines", "mine_phases", "blocks", "equipment", "reagents", "process_areas", "operators"]
+ENTITY_P = np.array([0.1, 0.15, 0.1, 0.3, 0.2, 0.05, 0.05, 0.05])
+
+SETTINGS = ["maintenance_window", "alert_threshold", "export_limit", "session_timeout", "grade_cutoff", "shift_schedule"]
+
+USER_AGENTS = [
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/120.0",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 14_2) Safari/605.1.15",
+    "Mozilla/5.0 (X11; Linux x86_64) Firefox/121.0",
+    "python-httpx/0.26.0",
+]
+
+
+@lru_cache(maxsize=4)
+def activity_cdf(seed: int, users: int, alpha: float) -> np.ndarray:
+    """
+    Distribución acumulada de actividad por usuario (Zipf con exponente alpha)
+
+    El rango de cada usuario es una permutación aleatoria, para que los más
+    activos no sean los primeros ids. Se calcula una vez por proceso.
+    """
+    ranks = chunk_rng(seed, "ids", 0).permutation(users) + 1
+    weights = ranks.astype(np.float64) ** -alpha
+    cdf = np.cumsum(weights)
+    return cdf / cdf[-1]
+
+
+def generate_audit_logs_csv(
+    seed: int, chunk_index: int, start: int, count: int,
+    users: int, alpha: float, days: int, now: float,
+) -> bytes:
+    """Chunk de audit logs [start, start + count) como CSV"""
+    rng = chunk_rng(seed, "audit_logs", chunk_index)
+    user_index = np.searchsorted(activity_cdf(seed, users, alpha), rng.random(count)).tolist() if users else []
+    system = (rng.random(count) < 0.02).tolist()  # Acciones del sistema, sin usuario
+    actions = rng.choice(ACTIONS, size=count, p=ACTION_P).tolist()
+    entities = rng.choice(len(ENTITY_TYPES), size=count, p=ENTITY_P).tolist()
+    entity_numbers = rng.integers(0, 1_000_000, count).tolist()
+    settings_index = rng.integers(0, len(SETTINGS), count).tolist()
+    agents = rng.integers(0, len(USER_AGENTS), count).tolist()
+    created = _timestamps(rng, count, days, now)
+
+    rows = []
+    for i, n in enumerate(range(start, start + count)):
+        action = actions[i]
+        user = None if system[i] or users == 0 else user_index[i]
+        extra = {**SYNTHETIC_MARKER, "request_id": n}
+        if action in ("LOGIN", "LOGOUT", "LOGIN_FAILED"):
+            entity_type, entity_id = "sessions", None
+            description = f"{action} user{user}" if user is not None else action
+        elif action in ("CONFIG_CHANGE", "PERMISSION_CHANGE"):
+            entity_type, entity_id = "settings", None
+            extra["setting"] = SETTINGS[settings_index[i]]
+            description = f"{action} {extra['setting']}"
+        else:
+            entity_type = ENTITY_TYPES[entities[i]]
+            entity_id = synthetic_uuid(seed, "audit_logs", entity_numbers[i])
+            description = f"{action} {entity_type}"
+        rows.append((
+            synthetic_uuid(seed, "users", user) if user is not None else None,
+            action,
+            entity_type,
+            entity_id,
+            description,
+            orjson.dumps(extra).decode(),
+            f"10.{user // 65536 % 256}.{user // 256 % 256}.{user % 256}" if user is not None else "127.0.0.1",
+            USER_AGENTS[agents[i]],
+            created[i],
+        ))
+    return to_csv(rows)
+
+
+# =============================================================================
+# BLOCK MODEL (leyes espacialmente correlacionadas)
+# =============================================================================
+
+BLOCK_SIZE = (10.0, 10.0, 15.0)
+DENSITY_BY_MINERAL = {"OXIDE": 2.45, "MIXED": 2.55, "TRANSITION": 2.6, "SULFIDE": 2.7}
+
+
+def grid_shape(blocks: int) -> tuple:
+    """Dimensiones (ni, nj, nk) de una fase de ~`blocks` bloques (planta 2:1 respecto de la altura)"""
+    nk = max(1, round((blocks / 4) ** (1 / 3)))
+    ni = max(1, round((blocks / nk) ** 0.5))
+    nj = max(1, blocks // (ni * nk))
+    return ni, nj, nk
+
+
+def gaussian_field(rng: np.random.Generator, shape: tuple, correlation: float) -> np.ndarray:
+    """
+    Campo gaussiano estandarizado con correlación espacial
+
+    Ruido blanco suavizado con un kernel gaussiano en el dominio de
+    frecuencias; `correlation` es el alcance aproximado en bloques.
+    """
+    noise = rng.standard_normal(shape)
+    frequencies = np.meshgrid(*(np.fft.fftfreq(n) for n in shape), indexing="ij")
+    kernel = np.exp(-2 * (np.pi * correlation) ** 2 * sum(f ** 2 for f in frequencies))
+    field = np.fft.ifftn(np.fft.fftn(noise) * kernel).real
+    return (field - field.mean()) / (field.std() or 1.0)
+
+
+def generate_phase_blocks(seed: int, phase_index: int, blocks: int, mean_cu: float, correlation: float) -> Dict[str, np.ndarray]:
+    """
+    Block model sintético de una fase, en el formato de chunk de load_block_model
+
+    - cu: lognormal sobre un campo correlacionado, con tendencia radial de pórfido
+    - mo: correlacionado con cu (rho ~0.6)
+    - mineral_type: por profundidad relativa, con borde irregular
+    """
+    rng = chunk_rng(seed, "blocks", phase_index)
+    shape = grid_shape(blocks)
+    i, j, k = (axis.ravel() for axis in np.meshgrid(*(np.arange(n) for n in shape), indexing="ij"))
+
+    cu_field = gaussian_field(rng, shape, correlation).ravel()
+    mo_field = 0.6 * cu_field + 0.8 * gaussian_field(rng, shape, correlation).ravel()
+
+    # Distancia normalizada al eje del pórfido (centro en planta, mitad inferior)
+    ni, nj, nk = shape
+    radius = np.sqrt(((i - ni / 2) / ni) ** 2 + ((j - nj / 2) / nj) ** 2 + ((k - 0.7 * nk) / (2 * nk)) ** 2)
+    trend = np.clip(1.6 - 1.8 * radius, 0.15, None)
+    trend /= trend.mean()
+    sigma = 0.45
+    cu = np.clip(mean_cu * trend * np.exp(sigma * cu_field - sigma ** 2 / 2), 0.0, 9.999)
+    mo = np.clip(mean_cu * 0.03 * trend * np.exp(0.6 * mo_field - 0.18), 0.0, 0.9999)
+
+    depth = (k + rng.normal(0, 0.6, k.size)) / nk  # k = 0 es el banco superior
+    mineral = np.select(
+        [depth < 0.12, depth < 0.22, depth < 0.3],
+        ["OXIDE", "MIXED", "TRANSITION"],
+        "SULFIDE",
+    ).astype(object)
+    density = np.vectorize(DENSITY_BY_MINERAL.get, otypes=[float])(mineral) + rng.normal(0, 0.03, k.size)
+
+    size_x, size_y, size_z = BLOCK_SIZE
+    origin_x, origin_y = 10_000.0 * (phase_index + 1), 50_000.0
+    return {
+        "block_i": i,
+        "block_j": j,
+        "block_k": k,
+        "centroid_x": origin_x + (i + 0.5) * size_x,
+        "centroid_y": origin_y + (j + 0.5) * size_y,
+        "centroid_z": 4000.0 - (k + 0.5) * size_z,
+        "size_x": np.full(k.size, size_x),
+        "size_y": np.full(k.size, size_y),
+        "size_z": np.full(k.size, size_z),
+        "density": np.round(density, 3),
+        "tonnage": np.round(density * size_x * size_y * size_z, 2),
+        "cu_grade_pct": np.round(cu, 3),
+        "mo_grade_pct": np.round(mo, 4),
+        "mineral_type": mineral,
+        "is_mined": (k < rng.integers(0, max(1, nk // 4) + 1)),
+    }
+
+
+def split_chunk(chunk: Dict[str, np.ndarray], size: int) -> Iterator[Dict[str, np.ndarray]]:
+    total = len(chunk["block_i"])
+    for first in range(0, total, size):
+        yield {column: values[first:first + size] for column, values in chunk.items()}
+
+
+# =============================================================================
+# FLOTAS DE EQUIPOS
+# =============================================================================
+
+EQUIPMENT_COLUMNS = [
+    "id", "equipment_type_id", "mine_id", "code", "name", "serial_number", "status",
+    "location_area", "installation_date", "last_maintenance_date", "next_maintenance_date",
+    "total_operating_hours", "hours_since_last_overhaul", "acquisition_cost", "is_active",
+]
+
+# Composición de flota por mina: (tipo, cantidad base, área); los camiones
+# se dimensionan por pala
+FLEET_COMPOSITION = [
+    ("PAL-7495", 3, "Mina"), ("CAR-994K", 2, "Mina"), ("PER-D75K", 4, "Mina"),
+    ("CHA-PRIM", 1, "Chancado"), ("CHA-SECO", 2, "Chancado"),
+    ("MOL-SAG", 1, "Molienda"), ("MOL-BOL", 2, "Molienda"), ("CIC-GMA", 4, "Molienda"),
+    ("FLO-RGH", 12, "Flotación"), ("FLO-CLN", 6, "Flotación"),
+    ("BOM-WAR", 16, "Transporte"), ("CON-OVL", 3, "Transporte"),
+    ("ESP-HRT", 2, "Espesamiento"), ("FIL-PRES", 3, "Filtración"),
+]
+TRUCKS_PER_SHOVEL = (6, 10)
+
+STATUS_WEIGHTS = {"OPERATIONAL": 0.8, "STANDBY": 0.07, "MAINTENANCE": 0.08, "FAILED": 0.03, "DECOMMISSIONED": 0.02}
+COST_BY_CATEGORY = {
+    "HAUL_TRUCK": 5e6, "EXCAVATOR": 25e6, "LOADER": 4e6, "DRILL": 3e6, "CRUSHER": 12e6, "MILL": 40e6,
+    "FLOTATION_CELL": 2e6, "PUMP": 4e5, "CONVEYOR": 15e6, "CYCLONE": 3e5, "THICKENER": 8e6, "FILTER": 5e6,
+}
+
+
+def generate_fleet(
+    seed: int, mine_index: int, mine_id: uuid.UUID, mine_code: str,
+    type_ids: Dict[str, uuid.UUID], fleet_scale: float, now: datetime,
+) -> List[tuple]:
+    """Registros de equipos de una mina (en el orden de EQUIPMENT_COLUMNS)"""
+    rng = chunk_rng(seed, "fleet", mine_index)
+    types = {t["code"]: t for t in EQUIPMENT_TYPES_DATA}
+    plan = [(code, max(1, round(base * fleet_scale * rng.uniform(0.7, 1.3))), area) for code, base, area in FLEET_COMPOSITION]
+    shovels = plan[0][1]
+    plan.append(("CAM-797F", int(shovels * rng.integers(*TRUCKS_PER_SHOVEL, endpoint=True)), "Mina"))
+
+    statuses = list(STATUS_WEIGHTS)
+    status_p = np.array(list(STATUS_WEIGHTS.values()))
+    records = []
+    for type_code, count, area in plan:
+        eq_type = types[type_code]
+        life = eq_type["expected_life_hours"]
+        age_days = rng.integers(180, 15 * 365, count)
+        hours = np.minimum(age_days * 24 * rng.uniform(0.55, 0.85, count), life * 1.2)
+        overhaul = hours % (life / 4)
+        last_service = rng.integers(1, 120, count)
+        interval = rng.choice([30, 60, 90], count)  # Algunas quedan vencidas (last + interval < hoy)
+        cost = COST_BY_CATEGORY[eq_type["category"]] * rng.lognormal(0, 0.15, count)
+        status = rng.choice(statuses, size=count, p=status_p)
+        for n in range(count):
+            last = now - timedelta(days=int(last_service[n]))
+            records.append((
+                uuid.UUID(bytes=rng.bytes(16), version=4),
+                type_ids[type_code],
+                mine_id,
+                f"{mine_code}-{type_code}-{n + 1:03d}",
+                f"{eq_type['name']} #{n + 1:03d}",
+                f"SN-{rng.integers(10**7, 10**8)}",
+                str(status[n]),
+                area,
+                now - timedelta(days=int(age_days[n])),
+                last,
+                last + timedelta(days=int(interval[n])),
+                round(float(hours[n]), 2),
+                round(float(overhaul[n]), 2),
+                round(float(cost[n]), 2),
+                bool(status[n] != "DECOMMISSIONED"),
+            ))
+    return records
+
+
+# =============================================================================
+# CARGA
+# =============================================================================
+
+class GenerationStats:
+    """Filas y tiempos por tabla"""
+
+    def __init__(self):
+        self.rows: Dict[str, int] = {}
+        self.seconds: Dict[str, float] = {}
+
+    def add(self, table: str, rows: int, seconds: float):
+        self.rows[table] = self.rows.get(table, 0) + rows
+        self.seconds[table] = self.seconds.get(table, 0.0) + seconds
+
+
+async def copy_parallel(
+    pool: asyncpg.Pool,
+    executor: ProcessPoolExecutor,
+    table: str,
+    columns: List[str],
+    total: int,
+    chunk_size: int,
+    generate: Callable[..., bytes],
+    seed: int,
+    *args,
+) -> float:
+    """
+    Generar (en procesos) y cargar (COPY CSV, una conexión por worker) `total` filas
+
+    generate(seed, chunk_index, start, count, *args) -> bytes CSV
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    for chunk_index, start in enumerate(range(0, total, chunk_size)):
+        queue.put_nowait((chunk_index, start, min(chunk_size, total - start)))
+
+    started = time.perf_counter()
+    loaded = 0
+
+    async def worker():
+        nonlocal loaded
+        async with pool.acquire() as conn:
+            while not queue.empty():
+                chunk_index, start, count = queue.get_nowait()
+                data = await loop.run_in_executor(executor, generate, seed, chunk_index, start, count, *args)
+                await conn.copy_to_table(table, source=io.BytesIO(data), columns=columns, format="csv")
+                loaded += count
+                rate = loaded / (time.perf_counter() - started)
+                print(f"  📦 {table}: {loaded:>12,}/{total:,} ({rate:,.0f} filas/s)")
+
+    await asyncio.gather(*(worker() for _ in range(pool.get_max_size())))
+    return time.perf_counter() - started
+
+
+async def ensure_mines(conn: asyncpg.Connection, mines: int, phases_per_mine: int) -> tuple:
+    """Yacimientos, minas y fases SYN-* (un upsert por tabla); retorna (mines, phases)"""
+    deposit_ids = await upsert(
+        conn,
+        "deposits",
+        [
+            {
+                "code": f"{SYNTHETIC_PREFIX}-DEP-{n:03d}",
+                "name": f"Yacimiento Sintético {n:03d}",
+                "primary_commodity": "COPPER",
+                "country": "Chile",
+            }
+            for n in range(1, max(1, mines // 3) + 1)
+        ],
+        conflict=("code",),
+    )
+    deposit_list = list(deposit_ids.values())
+
+    mine_ids = await upsert(
+        conn,
+        "mines",
+        [
+            {
+                "deposit_id": deposit_list[(n - 1) % len(deposit_list)],
+                "code": f"{SYNTHETIC_PREFIX}-MIN-{n:03d}",
+                "name": f"Mina Sintética {n:03d}",
+                "mine_type": "UNDERGROUND" if n % 4 == 0 else "OPEN_PIT",
+                "is_active": True,
+            }
+            for n in range(1, mines + 1)
+        ],
+        conflict=("code",),
+    )
+
+    phase_ids = await upsert(
+        conn,
+        "mine_phases",
+        [
+            {
+                "mine_id": mine_id,
+                "code": f"{mine_code}-F{p}",
+                "name": f"Fase {p}",
+                "sequence_number": p,
+                "is_active": p == 1,
+                "is_completed": False,
+            }
+            for mine_code, mine_id in mine_ids.items()
+            for p in range(1, phases_per_mine + 1)
+        ],
+        conflict=("mine_id", "code"),
+    )
+    return (
+        [{"id": mine_id, "code": code} for code, mine_id in mine_ids.items()],
+        [{"id": phase_id, "code": code} for (_, code), phase_id in phase_ids.items()],
+    )
+
+
+async def load_blocks(
+    pool: asyncpg.Pool, executor: ProcessPoolExecutor, phases: list,
+    blocks_per_phase: int, seed: int, mean_cu: float, correlation: float, chunk_size: int,
+) -> int:
+    """Generar cada fase en un proceso y cargarla con load_block_model (replace)"""
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    for phase_index, phase in enumerate(phases):
+        queue.put_nowait((phase_index, phase))
+    loaded = 0
+
+    async def worker():
+        nonlocal loaded
+        async with pool.acquire() as conn:
+            while not queue.empty():
+                phase_index, phase = queue.get_nowait()
+                chunk = await loop.run_in_executor(
+                    executor, generate_phase_blocks, seed, phase_index, blocks_per_phase, mean_cu, correlation
+                )
+                stats = await load_block_model(conn, split_chunk(chunk, chunk_size), phase["id"], mode="replace")
+                loaded += stats.rows_loaded
+                print(f"  🧱 {phase['code']}: {stats.rows_loaded:,} bloques ({stats.rows_per_second:,.0f} filas/s)")
+
+    await asyncio.gather(*(worker() for _ in range(pool.get_max_size())))
+    return loaded
+
+
+async def load_fleets(conn: asyncpg.Connection, mines: list, seed: int, fleet_scale: float) -> int:
+    """Flotas por mina (reemplaza los equipos SYN-* de cada mina)"""
+    type_ids = await seed_equipment_types(conn)
+    now = datetime.now(timezone.utc)
+    records = []
+    for mine_index, mine in enumerate(mines):
+        records.extend(generate_fleet(seed, mine_index, mine["id"], mine["code"], type_ids, fleet_scale, now))
+    async with conn.transaction():
+        await conn.execute(
+            "DELETE FROM equipment WHERE mine_id = ANY($1::uuid[]) AND code LIKE $2",
+            [mine["id"] for mine in mines], f"{SYNTHETIC_PREFIX}-%",
+        )
+        await conn.copy_records_to_table(
+            "equipment",
+            records=records,
+            columns=EQUIPMENT_COLUMNS,
+        )
+    return len(records)
+
+
+async def reset(conn: asyncpg.Connection):
+    """Borrar todos los datos sintéticos"""
+    await conn.execute("DELETE FROM audit_logs WHERE extra_data @> $1::jsonb", SYNTHETIC_MARKER)
+    await conn.execute("DELETE FROM users WHERE email LIKE $1", f"%@{SYNTHETIC_DOMAIN}")
+    # Fases, bloques y equipos se borran en cascada con la mina
+    await conn.execute("DELETE FROM mines WHERE code LIKE $1", f"{SYNTHETIC_PREFIX}-MIN-%")
+    await conn.execute("DELETE FROM deposits WHERE code LIKE $1", f"{SYNTHETIC_PREFIX}-DEP-%")
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Generador de datos sintéticos a escala")
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--audit-logs", type=int, default=500_000)
+    parser.add_argument("--activity-alpha", type=float, default=1.1, help="Exponente Zipf de actividad por usuario")
+    parser.add_argument("--days", type=int, default=365, help="Días de historia de audit logs")
+    parser.add_argument("--mines", type=int, default=4)
+    parser.add_argument("--phases-per-mine", type=int, default=3)
+    parser.add_argument("--blocks-per-phase", type=int, default=50_000)
+    parser.add_argument("--mean-cu", type=float, default=0.55, help="Ley media de cobre (%%)")
+    parser.add_argument("--correlation", type=float, default=6.0, help="Alcance de correlación de leyes (bloques)")
+    parser.add_argument("--fleet-scale", type=float, default=1.0, help="Multiplicador del tamaño de flota por mina")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4)
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--reset", action="store_true", help="Borrar los datos sintéticos y salir")
+    return parser.parse_args(argv)
+
+
+async def main(argv: Optional[List[str]] = None):
+    """Main function"""
+    args = parse_args(argv)
+
+    print("=" * 70)
+    print("  🧬 SYNTHETIC DATA GENERATOR")
+    print("=" * 70)
+
+    dsn = settings.get_db_url_asyncpg()
+    conn = await asyncpg.connect(dsn)
+    try:
+        if args.reset:
+            await reset(conn)
+            print("🧹 Datos sintéticos eliminados")
+            return
+        existing_users = await conn.fetchval("SELECT COUNT(*) FROM users WHERE email LIKE $1", f"%@{SYNTHETIC_DOMAIN}")
+        if existing_users and args.users:
+            raise SystemExit("Ya existen usuarios sintéticos: ejecutar primero con --reset")
+        mines, phases = await ensure_mines(conn, args.mines, args.phases_per_mine) if args.mines else ([], [])
+    finally:
+        await conn.close()
+
+    stats = GenerationStats()
+    now = time.time()
+    pool = await asyncpg.create_pool(dsn, min_size=args.workers, max_size=args.workers)
+    try:
+        with ProcessPoolExecutor(max_workers=args.workers) as executor:
+            if args.users:
+                print(f"\n👥 Usuarios ({args.users:,})...")
+                password_hash = pwd_context.hash(SYNTHETIC_PASSWORD)
+                seconds = await copy_parallel(
+                    pool, executor, "users", USER_COLUMNS, args.users, args.chunk_size,
+                    generate_users_csv, args.seed, password_hash, now,
+                )
+                stats.add("users", args.users, seconds)
+
+            if args.audit_logs:
+                print(f"\n📝 Audit logs ({args.audit_logs:,}, Zipf alpha={args.activity_alpha})...")
+                seconds = await copy_parallel(
+                    pool, executor, "audit_logs", AUDIT_LOG_COLUMNS, args.audit_logs, args.chunk_size,
+                    generate_audit_logs_csv, args.seed, args.users, args.activity_alpha, args.days, now,
+                )
+                stats.add("audit_logs", args.audit_logs, seconds)
+
+            if phases and args.blocks_per_phase:
+                print(f"\n🧱 Bloques ({len(phases)} fases × ~{args.blocks_per_phase:,})...")
+                started = time.perf_counter()
+                rows = await load_blocks(
+                    pool, executor, phases, args.blocks_per_phase,
+                    args.seed, args.mean_cu, args.correlation, args.chunk_size,
+                )
+                stats.add("blocks", rows, time.perf_counter() - started)
+
+        if mines:
+            print(f"\n🚜 Flotas de equipos ({len(mines)} minas)...")
+            started = time.perf_counter()
+            async with pool.acquire() as conn:
+                rows = await load_fleets(conn, mines, args.seed, args.fleet_scale)
+            stats.add("equipment", rows, time.perf_counter() - started)
+
+        async with pool.acquire() as conn:
+            for table in stats.rows:
+                await conn.execute(f"ANALYZE {table}")
+    finally:
+        await pool.close()
+
+    print()
+    print("=" * 70)
+    print("  ✅ Generación completada")
+    print("=" * 70)
+    for table, rows in stats.rows.items():
+        seconds = stats.seconds[table]
+        print(f"   - {table:<12} {rows:>14,} filas  {seconds:8.1f}s  ({rows / seconds if seconds else 0:,.0f} filas/s)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,777 @@
+"""
+Block Model Loader
+
+Carga masiva de modelos de bloques en la tabla blocks:
+- Lectura en streaming por chunks (CSV, Parquet o GSLIB/texto de block model)
+- Validación vectorizada (numpy) de los CHECK constraints de la tabla
+- COPY binario a una tabla staging temporal
+- Filas con tokens no numéricos rechazadas; posiciones (i, j, k) repetidas:
+  gana la última fila
+- Swap (replace) o merge de la staging contra blocks en una sola transacción
+- Reporte de progreso y métricas de filas/segundo
+
+Ejecutar con:
+    docker compose exec api python -m scripts.load_block_model modelo.csv --phase-code MIN-CHUQ-01-F1
+
+Opciones útiles:
+    --format {csv,parquet,gslib}   Formato de entrada (default: por extensión)
+    --mode {replace,merge}         replace = reemplaza los bloques de la fase
+                                   merge   = actualiza por posición (i, j, k) e inserta nuevos
+    --chunk-size N                 Filas por chunk (default: 100000)
+    --strict                       Abortar ante la primera fila inválida
+    --rejects rechazos.csv         Guardar filas rechazadas con su motivo
+"""
+
+import argparse
+import asyncio
+import asyncpg
+import csv
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+from uuid import UUID
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from app.config import settings
+
+
+# =============================================================================
+# ESQUEMA DE LA TABLA BLOCKS
+# =============================================================================
+
+# Columnas cargadas (en orden de la tabla staging)
+STAGING_COLUMNS = [
+    "code",
+    "block_i",
+    "block_j",
+    "block_k",
+    "centroid_x",
+    "centroid_y",
+    "centroid_z",
+    "size_x",
+    "size_y",
+    "size_z",
+    "tonnage",
+    "density",
+    "cu_grade_pct",
+    "mo_grade_pct",
+    "au_grade_gpt",
+    "ag_grade_gpt",
+    "mineral_type",
+    "is_mined",
+]
+
+INDEX_COLUMNS = ["block_i", "block_j", "block_k"]
+
+FLOAT_COLUMNS = [
+    "centroid_x",
+    "centroid_y",
+    "centroid_z",
+    "size_x",
+    "size_y",
+    "size_z",
+    "tonnage",
+    "density",
+    "cu_grade_pct",
+    "mo_grade_pct",
+    "au_grade_gpt",
+    "ag_grade_gpt",
+]
+
+# Precisión NUMERIC(p, s) de cada columna: el valor redondeado a s decimales
+# debe ser < 10^(p - s) para no provocar "numeric field overflow" en el merge
+NUMERIC_PRECISION = {
+    "centroid_x": (12, 3),
+    "centroid_y": (12, 3),
+    "centroid_z": (10, 3),
+    "size_x": (8, 2),
+    "size_y": (8, 2),
+    "size_z": (8, 2),
+    "tonnage": (12, 2),
+    "density": (5, 3),
+    "cu_grade_pct": (5, 3),
+    "mo_grade_pct": (5, 4),
+    "au_grade_gpt": (6, 3),
+    "ag_grade_gpt": (6, 2),
+}
+
+# Dimensiones por defecto del bloque (mismos defaults que el modelo SQLAlchemy)
+DEFAULT_SIZES = {"size_x": 10.0, "size_y": 10.0, "size_z": 15.0}
+
+MINERAL_TYPES = np.array(["SULFIDE", "OXIDE", "MIXED", "TRANSITION"], dtype=object)
+
+# Alias habituales en software de planificación (Datamine, Vulcan, GSLIB)
+COLUMN_ALIASES = {
+    "code": "code", "block_code": "code", "blockid": "code", "block_id": "code",
+    "block_i": "block_i", "i": "block_i", "ix": "block_i", "ijk_i": "block_i",
+    "block_j": "block_j", "j": "block_j", "iy": "block_j", "ijk_j": "block_j",
+    "block_k": "block_k", "k": "block_k", "iz": "block_k", "ijk_k": "block_k",
+    "centroid_x": "centroid_x", "x": "centroid_x", "xc": "centroid_x", "xcentre": "centroid_x",
+    "centroid_y": "centroid_y", "y": "centroid_y", "yc": "centroid_y", "ycentre": "centroid_y",
+    "centroid_z": "centroid_z", "z": "centroid_z", "zc": "centroid_z", "zcentre": "centroid_z",
+    "size_x": "size_x", "xinc": "size_x", "dx": "size_x", "xsize": "size_x",
+    "size_y": "size_y", "yinc": "size_y", "dy": "size_y", "ysize": "size_y",
+    "size_z": "size_z", "zinc": "size_z", "dz": "size_z", "zsize": "size_z",
+    "tonnage": "tonnage", "tonnes": "tonnage", "tons": "tonnage", "ton": "tonnage",
+    "density": "density", "dens": "density", "sg": "density",
+    "cu_grade_pct": "cu_grade_pct", "cu": "cu_grade_pct", "cut": "cu_grade_pct", "cu_pct": "cu_grade_pct",
+    "mo_grade_pct": "mo_grade_pct", "mo": "mo_grade_pct", "mo_pct": "mo_grade_pct",
+    "au_grade_gpt": "au_grade_gpt", "au": "au_grade_gpt", "au_gpt": "au_grade_gpt",
+    "ag_grade_gpt": "ag_grade_gpt", "ag": "ag_grade_gpt", "ag_gpt": "ag_grade_gpt",
+    "mineral_type": "mineral_type", "mintype": "mineral_type", "rocktype": "mineral_type",
+    "is_mined": "is_mined", "mined": "is_mined",
+}
+
+NULL_TOKENS = ["", "NA", "N/A", "NULL", "null", "None", "nan", "NaN"]
+
+TRUE_TOKENS = np.array(["1", "true", "t", "yes", "y", "si", "s"], dtype=object)
+
+Chunk = Dict[str, np.ndarray]
+
+
+# =============================================================================
+# LECTORES (STREAMING POR CHUNKS)
+# =============================================================================
+
+def _map_header(names: List[str]) -> Dict[int, str]:
+    """Mapear índices de columnas del archivo a columnas canónicas de blocks"""
+    mapping = {}
+    for idx, name in enumerate(names):
+        canonical = COLUMN_ALIASES.get(name.strip().lower())
+        if canonical and canonical not in mapping.values():
+            mapping[idx] = canonical
+
+    missing = [col for col in INDEX_COLUMNS if col not in mapping.values()]
+    if missing:
+        raise ValueError(f"Columnas obligatorias ausentes en el archivo: {', '.join(missing)}")
+    return mapping
+
+
+def _rows_to_chunk(rows: List[List[str]], mapping: Dict[int, str]) -> Chunk:
+    """Transponer filas de texto a arrays por columna"""
+    return {
+        canonical: np.array([row[idx] if idx < len(row) else "" for row in rows], dtype=object)
+        for idx, canonical in mapping.items()
+    }
+
+
+def read_csv_chunks(path: Path, chunk_size: int, delimiter: str = ",") -> Iterator[Chunk]:
+    """Leer un CSV por chunks de chunk_size filas"""
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f, delimiter=delimiter)
+        mapping = _map_header(next(reader))
+
+        rows = []
+        for row in reader:
+            if not row:
+                continue
+            rows.append(row)
+            if len(rows) >= chunk_size:
+                yield _rows_to_chunk(rows, mapping)
+                rows = []
+        if rows:
+            yield _rows_to_chunk(rows, mapping)
+
+
+def read_gslib_chunks(path: Path, chunk_size: int) -> Iterator[Chunk]:
+    """
+    Leer un block model en formato GSLIB (Geo-EAS) por chunks
+
+    Formato:
+        línea 1: título
+        línea 2: número de variables (nvar)
+        nvar líneas: nombre de cada variable
+        resto: datos separados por espacios
+    """
+    with open(path, encoding="utf-8") as f:
+        f.readline()  # título
+        nvar = int(f.readline().split()[0])
+        names = [f.readline().strip() for _ in range(nvar)]
+        mapping = _map_header(names)
+
+        rows = []
+        for line in f:
+            values = line.split()
+            if not values:
+                continue
+            rows.append(values)
+            if len(rows) >= chunk_size:
+                yield _rows_to_chunk(rows, mapping)
+                rows = []
+        if rows:
+            yield _rows_to_chunk(rows, mapping)
+
+
+def read_parquet_chunks(path: Path, chunk_size: int) -> Iterator[Chunk]:
+    """Leer un archivo Parquet por record batches (requiere pyarrow)"""
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise RuntimeError(
+            "Para leer Parquet instala pyarrow: pip install pyarrow"
+        ) from e
+
+    parquet_file = pq.ParquetFile(path)
+    mapping = _map_header(parquet_file.schema_arrow.names)
+
+    for batch in parquet_file.iter_batches(batch_size=chunk_size):
+        yield {
+            canonical: batch.column(idx).to_numpy(zero_copy_only=False)
+            for idx, canonical in mapping.items()
+        }
+
+
+READERS = {
+    "csv": read_csv_chunks,
+    "gslib": read_gslib_chunks,
+    "parquet": read_parquet_chunks,
+}
+
+
+def detect_format(path: Path) -> str:
+    """Detectar formato de entrada según la extensión"""
+    suffix = path.suffix.lower()
+    if suffix in (".parquet", ".pq"):
+        return "parquet"
+    if suffix in (".dat", ".gslib", ".txt", ".out"):
+        return "gslib"
+    return "csv"
+
+
+# =============================================================================
+# CONVERSIÓN Y VALIDACIÓN VECTORIZADA
+# =============================================================================
+
+# Prefijo de la regla de rechazo para tokens no numéricos ("-", "n/a", ...)
+NON_NUMERIC_PREFIX = "non_numeric_"
+
+
+def _parse_floats(text: np.ndarray) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    Parsear texto a float64; los tokens no numéricos quedan NaN
+
+    Returns:
+        (valores, máscara de tokens no numéricos o None si no hubo ninguno)
+    """
+    try:
+        return text.astype(np.float64), None
+    except ValueError:
+        pass
+
+    # Camino lento sólo para los chunks con algún token inválido
+    result = np.empty(len(text), dtype=np.float64)
+    invalid = np.zeros(len(text), dtype=bool)
+    for row, token in enumerate(text.tolist()):
+        try:
+            result[row] = float(token)
+        except ValueError:
+            result[row] = np.nan
+            invalid[row] = True
+    return result, invalid
+
+
+def _as_float(values: np.ndarray, missing_value: Optional[float]) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    Convertir un array (texto o numérico) a float64 con NaN para nulos
+
+    Returns:
+        (valores, máscara de tokens no numéricos o None si no hubo ninguno)
+    """
+    invalid = None
+    if values.dtype.kind in "fiu":
+        result = values.astype(np.float64)
+    else:
+        text = np.char.strip(values.astype(str))
+        result, invalid = _parse_floats(np.where(np.isin(text, NULL_TOKENS), "nan", text))
+
+    if missing_value is not None:
+        result[result == missing_value] = np.nan
+    return result, invalid
+
+
+def coerce_chunk(raw: Chunk, missing_value: Optional[float] = None) -> Chunk:
+    """
+    Normalizar un chunk crudo a arrays tipados
+
+    - Índices i, j, k -> float64 (se validan como enteros)
+    - Numéricos -> float64 con NaN para nulos
+    - Tokens no numéricos -> NaN + máscara non_numeric_<col> (se rechazan)
+    - code / mineral_type -> object
+    - is_mined -> bool
+    """
+    size = len(next(iter(raw.values())))
+    chunk: Chunk = {}
+
+    for col in INDEX_COLUMNS + FLOAT_COLUMNS:
+        if col in raw:
+            chunk[col], invalid = _as_float(raw[col], missing_value)
+            if invalid is not None:
+                chunk[f"{NON_NUMERIC_PREFIX}{col}"] = invalid
+        elif col in DEFAULT_SIZES:
+            chunk[col] = np.full(size, DEFAULT_SIZES[col])
+        else:
+            chunk[col] = np.full(size, np.nan)
+
+    # Tonelaje derivado del volumen y la densidad si el archivo no lo trae
+    if "tonnage" not in raw:
+        chunk["tonnage"] = chunk["density"] * chunk["size_x"] * chunk["size_y"] * chunk["size_z"]
+
+    if "mineral_type" in raw:
+        chunk["mineral_type"] = np.array(
+            [
+                m.strip().upper() if isinstance(m, str) and m.strip() not in NULL_TOKENS else None
+                for m in raw["mineral_type"]
+            ],
+            dtype=object,
+        )
+    else:
+        chunk["mineral_type"] = np.full(size, None, dtype=object)
+
+    if "is_mined" in raw:
+        mined = raw["is_mined"]
+        if mined.dtype == bool:
+            chunk["is_mined"] = mined
+        else:
+            chunk["is_mined"] = np.isin(np.char.lower(mined.astype(str)), TRUE_TOKENS.astype(str))
+    else:
+        chunk["is_mined"] = np.zeros(size, dtype=bool)
+
+    if "code" in raw:
+        chunk["code"] = raw["code"].astype(object)
+
+    return chunk
+
+
+def validate_chunk(chunk: Chunk) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """
+    Validar un chunk contra las restricciones de la tabla blocks
+
+    Los CHECK con NULL se consideran válidos (igual que en PostgreSQL).
+
+    Returns:
+        (máscara de filas válidas, {nombre_regla: máscara de filas que la violan})
+    """
+    with np.errstate(invalid="ignore"):
+        violations = {
+            rule: mask for rule, mask in chunk.items() if rule.startswith(NON_NUMERIC_PREFIX)
+        }
+
+        for col in INDEX_COLUMNS:
+            values = chunk[col]
+            violations[f"{col}_not_null_integer"] = np.isnan(values) | (values != np.round(values))
+
+        cu = chunk["cu_grade_pct"]
+        violations["blocks_cu_grade_range"] = (cu < 0) | (cu > 100)
+
+        mo = chunk["mo_grade_pct"]
+        violations["blocks_mo_grade_range"] = (mo < 0) | (mo > 100)
+
+        violations["blocks_tonnage_non_negative"] = chunk["tonnage"] < 0
+        violations["blocks_density_positive"] = chunk["density"] <= 0
+
+        for col in DEFAULT_SIZES:
+            violations[f"{col}_not_null"] = np.isnan(chunk[col])
+
+        for col, (precision, scale) in NUMERIC_PRECISION.items():
+            limit = 10.0 ** (precision - scale)
+            violations[f"{col}_numeric_overflow"] = np.abs(np.round(chunk[col], scale)) >= limit
+
+        mineral = chunk["mineral_type"]
+        known = np.equal(mineral, None)
+        for mineral_type in MINERAL_TYPES:
+            known |= mineral == mineral_type
+        violations["mineral_type_enum"] = ~known
+
+        if "code" in chunk:
+            code_length = np.array([len(c) if isinstance(c, str) else 0 for c in chunk["code"]])
+            violations["code_not_null"] = code_length == 0
+            violations["code_max_length"] = code_length > 50
+
+    invalid = np.zeros(len(chunk["block_i"]), dtype=bool)
+    for mask in violations.values():
+        invalid |= mask
+
+    return ~invalid, violations
+
+
+def _nullable(values: np.ndarray) -> list:
+    """Convertir un array float a lista Python con None en lugar de NaN"""
+    as_object = values.astype(object)
+    as_object[np.isnan(values)] = None
+    return as_object.tolist()
+
+
+def chunk_to_records(chunk: Chunk, mask: np.ndarray) -> List[tuple]:
+    """Convertir las filas válidas de un chunk a tuplas para COPY"""
+    i = chunk["block_i"][mask].astype(np.int64)
+    j = chunk["block_j"][mask].astype(np.int64)
+    k = chunk["block_k"][mask].astype(np.int64)
+
+    if "code" in chunk:
+        codes = chunk["code"][mask].tolist()
+    else:
+        codes = [f"BLK-{a:03d}{b:03d}{c:03d}" for a, b, c in zip(i.tolist(), j.tolist(), k.tolist())]
+
+    columns = [codes, i.tolist(), j.tolist(), k.tolist()]
+    columns.extend(_nullable(chunk[col][mask]) for col in FLOAT_COLUMNS)
+    columns.append(chunk["mineral_type"][mask].tolist())
+    columns.append(chunk["is_mined"][mask].tolist())
+
+    return list(zip(*columns))
+
+
+# =============================================================================
+# CARGA (COPY A STAGING + SWAP / MERGE)
+# =============================================================================
+
+CREATE_STAGING_QUERY = """
+    CREATE TEMP TABLE IF NOT EXISTS blocks_staging (
+        code varchar(50) NOT NULL,
+        block_i integer NOT NULL,
+        block_j integer NOT NULL,
+        block_k integer NOT NULL,
+        centroid_x double precision,
+        centroid_y double precision,
+        centroid_z double precision,
+        size_x double precision NOT NULL,
+        size_y double precision NOT NULL,
+        size_z double precision NOT NULL,
+        tonnage double precision,
+        density double precision,
+        cu_grade_pct double precision,
+        mo_grade_pct double precision,
+        au_grade_gpt double precision,
+        ag_grade_gpt double precision,
+        mineral_type text,
+        is_mined boolean NOT NULL,
+        seq bigserial
+    )
+"""
+
+# Posiciones (i, j, k) repetidas en el archivo: gana la última fila leída
+# (mayor seq), igual en replace y en merge
+DEDUPE_STAGING_QUERY = """
+    DELETE FROM blocks_staging
+    WHERE seq IN (
+        SELECT seq
+        FROM (
+            SELECT
+                seq,
+                ROW_NUMBER() OVER (
+                    PARTITION BY block_i, block_j, block_k
+                    ORDER BY seq DESC
+                ) AS position_rank
+            FROM blocks_staging
+        ) ranked
+        WHERE position_rank > 1
+    )
+"""
+
+# Columnas de staging que se copian a blocks (el cast double -> numeric es implícito)
+_VALUE_COLUMNS = ", ".join(STAGING_COLUMNS)
+_SELECT_VALUES = ", ".join(
+    f"s.{col}::mineral_type_enum" if col == "mineral_type" else f"s.{col}"
+    for col in STAGING_COLUMNS
+)
+
+REPLACE_QUERIES = [
+    "DELETE FROM blocks WHERE mine_phase_id = $1",
+    f"""
+        INSERT INTO blocks (id, mine_phase_id, {_VALUE_COLUMNS}, mined_at)
+        SELECT gen_random_uuid(), $1, {_SELECT_VALUES},
+               CASE WHEN s.is_mined THEN NOW() END
+        FROM blocks_staging s
+    """,
+]
+
+_UPDATE_SET = ",\n            ".join(
+    f"{col} = s.{col}::mineral_type_enum" if col == "mineral_type" else f"{col} = s.{col}"
+    for col in STAGING_COLUMNS
+    if col not in INDEX_COLUMNS
+)
+
+MERGE_QUERIES = [
+    f"""
+        UPDATE blocks b
+        SET
+            {_UPDATE_SET},
+            mined_at = CASE WHEN s.is_mined AND NOT b.is_mined THEN NOW() ELSE b.mined_at END,
+            updated_at = NOW()
+        FROM blocks_staging s
+        WHERE b.mine_phase_id = $1
+          AND b.block_i = s.block_i
+          AND b.block_j = s.block_j
+          AND b.block_k = s.block_k
+    """,
+    f"""
+        INSERT INTO blocks (id, mine_phase_id, {_VALUE_COLUMNS}, mined_at)
+        SELECT gen_random_uuid(), $1, {_SELECT_VALUES},
+               CASE WHEN s.is_mined THEN NOW() END
+        FROM blocks_staging s
+        WHERE NOT EXISTS (
+            SELECT 1
+            FROM blocks b
+            WHERE b.mine_phase_id = $1
+              AND b.block_i = s.block_i
+              AND b.block_j = s.block_j
+              AND b.block_k = s.block_k
+        )
+    """,
+]
+
+
+class LoadStats:
+    """Contadores y tiempos de una carga"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.rows_read = 0
+        self.rows_loaded = 0
+        self.rows_rejected = 0
+        self.rows_duplicated = 0
+        self.rejections: Dict[str, int] = {}
+        self.copy_seconds = 0.0
+        self.merge_seconds = 0.0
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows_read / self.elapsed if self.elapsed > 0 else 0.0
+
+    def report_progress(self):
+        print(
+            f"  📦 {self.rows_read:>12,} filas leídas | "
+            f"{self.rows_loaded:,} en staging | "
+            f"{self.rows_rejected:,} rechazadas | "
+            f"{self.rows_per_second:,.0f} filas/s"
+        )
+
+
+def _write_rejects(writer, chunk: Chunk, violations: Dict[str, np.ndarray]):
+    """Escribir filas rechazadas con la lista de reglas violadas"""
+    invalid_rows = np.flatnonzero(np.logical_or.reduce(list(violations.values())))
+    for row in invalid_rows:
+        reasons = [rule for rule, mask in violations.items() if mask[row]]
+        writer.writerow(
+            [chunk[col][row] if col in chunk else "" for col in STAGING_COLUMNS]
+            + ["|".join(reasons)]
+        )
+
+
+async def copy_chunks(
+    conn: asyncpg.Connection,
+    chunks: Iterator[Chunk],
+    stats: LoadStats,
+    missing_value: Optional[float] = None,
+    strict: bool = False,
+    rejects_writer=None,
+):
+    """Validar y copiar chunks (COPY binario) a la tabla staging"""
+    await conn.execute(CREATE_STAGING_QUERY)
+    await conn.execute("TRUNCATE blocks_staging")
+
+    for raw in chunks:
+        chunk = coerce_chunk(raw, missing_value)
+        valid, violations = validate_chunk(chunk)
+
+        rejected = int((~valid).sum())
+        stats.rows_read += len(valid)
+        stats.rows_rejected += rejected
+        for rule, mask in violations.items():
+            count = int(mask.sum())
+            if count:
+                stats.rejections[rule] = stats.rejections.get(rule, 0) + count
+
+        if rejected:
+            if strict:
+                raise ValueError(
+                    f"{rejected} filas inválidas en el chunk: "
+                    + ", ".join(f"{r}={n}" for r, n in stats.rejections.items())
+                )
+            if rejects_writer is not None:
+                _write_rejects(rejects_writer, chunk, violations)
+
+        records = chunk_to_records(chunk, valid)
+        if records:
+            copy_start = time.perf_counter()
+            await conn.copy_records_to_table(
+                "blocks_staging",
+                records=records,
+                columns=STAGING_COLUMNS,
+            )
+            stats.copy_seconds += time.perf_counter() - copy_start
+            stats.rows_loaded += len(records)
+
+        stats.report_progress()
+
+
+async def merge_staging(conn: asyncpg.Connection, phase_id: UUID, mode: str, stats: LoadStats):
+    """Deduplicar la staging por posición y aplicarla sobre blocks en una única transacción"""
+    merge_start = time.perf_counter()
+
+    status = await conn.execute(DEDUPE_STAGING_QUERY)
+    duplicated = int(status.split()[-1])
+    if duplicated:
+        stats.rows_duplicated += duplicated
+        stats.rows_loaded -= duplicated
+        print(f"  ⚠️  {duplicated:,} filas con posición (i, j, k) repetida descartadas (gana la última)")
+
+    if mode == "merge":
+        # Índice sobre la posición para el join del UPDATE / NOT EXISTS
+        await conn.execute(
+            "CREATE INDEX IF NOT EXISTS blocks_staging_position "
+            "ON blocks_staging (block_i, block_j, block_k)"
+        )
+    await conn.execute("ANALYZE blocks_staging")
+
+    queries = MERGE_QUERIES if mode == "merge" else REPLACE_QUERIES
+    async with conn.transaction():
+        for query in queries:
+            await conn.execute(query, phase_id)
+
+    stats.merge_seconds = time.perf_counter() - merge_start
+
+
+async def load_block_model(
+    conn: asyncpg.Connection,
+    chunks: Iterator[Chunk],
+    phase_id: UUID,
+    mode: str = "replace",
+    missing_value: Optional[float] = None,
+    strict: bool = False,
+    rejects_writer=None,
+) -> LoadStats:
+    """
+    Cargar un block model completo en una fase
+
+    Args:
+        conn: Conexión asyncpg (dedicada, la staging es temporal de sesión)
+        chunks: Iterador de chunks crudos (ver read_*_chunks)
+        phase_id: ID de la fase (mine_phases.id)
+        mode: 'replace' (swap de los bloques de la fase) o 'merge' (upsert por i, j, k)
+        missing_value: Valor que representa nulo en el archivo (ej: -99 en GSLIB)
+        strict: Abortar ante filas inválidas en lugar de descartarlas
+        rejects_writer: csv.writer opcional para filas rechazadas
+
+    Returns:
+        Estadísticas de la carga
+    """
+    if mode not in ("replace", "merge"):
+        raise ValueError(f"Modo inválido: {mode}")
+
+    stats = LoadStats()
+    try:
+        await copy_chunks(conn, chunks, stats, missing_value, strict, rejects_writer)
+        await merge_staging(conn, phase_id, mode, stats)
+    finally:
+        await conn.execute("DROP TABLE IF EXISTS blocks_staging")
+
+    return stats
+
+
+async def resolve_phase_id(conn: asyncpg.Connection, phase_code: str) -> UUID:
+    """Obtener el ID de una fase por su código"""
+    phase_id = await conn.fetchval(
+        "SELECT id FROM mine_phases WHERE code = $1 AND deleted_at IS NULL",
+        phase_code,
+    )
+    if phase_id is None:
+        raise ValueError(f"Fase no encontrada: {phase_code}")
+    return phase_id
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Carga masiva de block models")
+    parser.add_argument("path", type=Path, help="Archivo CSV, Parquet o GSLIB")
+    phase = parser.add_mutually_exclusive_group(required=True)
+    phase.add_argument("--phase-code", help="Código de la fase (mine_phases.code)")
+    phase.add_argument("--phase-id", type=UUID, help="ID de la fase (mine_phases.id)")
+    parser.add_argument("--format", choices=sorted(READERS), help="Formato de entrada")
+    parser.add_argument("--mode", choices=["replace", "merge"], default="replace")
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    parser.add_argument("--delimiter", default=",", help="Separador CSV")
+    parser.add_argument("--missing-value", type=float, help="Valor nulo (ej: -99)")
+    parser.add_argument("--strict", action="store_true")
+    parser.add_argument("--rejects", type=Path, help="CSV de filas rechazadas")
+    return parser.parse_args(argv)
+
+
+async def main(argv: Optional[List[str]] = None):
+    """Main function"""
+    args = parse_args(argv)
+    file_format = args.format or detect_format(args.path)
+
+    print("=" * 70)
+    print("  🧱 BLOCK MODEL LOADER")
+    print("=" * 70)
+    print(f"📄 Archivo: {args.path} ({file_format})")
+    print(f"🔁 Modo:    {args.mode}")
+
+    if file_format == "csv":
+        chunks = read_csv_chunks(args.path, args.chunk_size, args.delimiter)
+    else:
+        chunks = READERS[file_format](args.path, args.chunk_size)
+
+    rejects_file = None
+    rejects_writer = None
+    if args.rejects:
+        rejects_file = open(args.rejects, "w", newline="", encoding="utf-8")
+        rejects_writer = csv.writer(rejects_file)
+        rejects_writer.writerow(STAGING_COLUMNS + ["rejection_reasons"])
+
+    conn = None
+    try:
+        print("📡 Conectando a base de datos...")
+        conn = await asyncpg.connect(settings.get_db_url_asyncpg())
+        phase_id = args.phase_id or await resolve_phase_id(conn, args.phase_code)
+
+        stats = await load_block_model(
+            conn,
+            chunks,
+            phase_id,
+            mode=args.mode,
+            missing_value=args.missing_value,
+            strict=args.strict,
+            rejects_writer=rejects_writer,
+        )
+
+        print()
+        print("=" * 70)
+        print("  ✅ Carga completada")
+        print("=" * 70)
+        print(f"   - Filas leídas:     {stats.rows_read:,}")
+        print(f"   - Filas cargadas:   {stats.rows_loaded:,}")
+        print(f"   - Filas rechazadas: {stats.rows_rejected:,}")
+        print(f"   - Filas duplicadas: {stats.rows_duplicated:,}")
+        for rule, count in sorted(stats.rejections.items()):
+            print(f"       · {rule}: {count:,}")
+        print(f"   - COPY a staging:   {stats.copy_seconds:.2f}s")
+        print(f"   - Merge ({args.mode}):  {stats.merge_seconds:.2f}s")
+        print(f"   - Total:            {stats.elapsed:.2f}s ({stats.rows_per_second:,.0f} filas/s)")
+
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        raise
+    finally:
+        if rejects_file:
+            rejects_file.close()
+        if conn:
+            await conn.close()
+            print("📡 Conexión cerrada")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
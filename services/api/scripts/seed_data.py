@@ -5,6 +5,9 @@ Script para poblar la base de datos con datos iniciales:
 - Roles del sistema (ADMIN, USER, MODERATOR, GUEST)
 - Usuario administrador por defecto
 
+Idempotente: cada tabla se siembra con un upsert por lotes sobre su clave
+natural (roles.name, users.email), sin consultas de existencia por fila.
+
 Ejecutar con:
     docker compose exec api python -m scripts.seed_data
 
@@ -15,18 +18,37 @@ O desde Makefile:
 import asyncio
 import asyncpg
 from passlib.context import CryptContext
+import json
 import os
 import sys
+from datetime import datetime, timezone
+from typing import List, Tuple
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
 from app.config import settings
+from scripts.seed_upsert import upsert
 
 # Password hashing
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
+ADMIN_EMAIL = "admin@example.com"
+ADMIN_PASSWORD = "Admin123!"  # Password temporal (¡CAMBIAR EN PRODUCCIÓN!)
+
+# Asignación de roles por email en una sentencia (los pares ya asignados se omiten)
+ASSIGN_ROLES_QUERY = """
+    INSERT INTO user_roles (user_id, role_id)
+    SELECT u.id, r.id
+    FROM unnest($1::text[], $2::text[]) AS v(email, role)
+    JOIN users u ON u.email = v.email AND u.deleted_at IS NULL
+    JOIN roles r ON r.name = v.role
+    ON CONFLICT (user_id, role_id) DO NOTHING
+    RETURNING id
+"""
+
+
 async def seed_roles(conn: asyncpg.Connection):
     """Crear roles del sistema"""
     print("📝 Creando roles del sistema...")
@@ -38,194 +60,94 @@ async def seed_roles(conn: asyncpg.Connection):
         ("GUEST", "Usuario invitado con acceso de solo lectura", 10, True),
     ]
 
-    query = """
-        INSERT INTO roles (name, description, priority, is_system)
-        VALUES ($1, $2, $3, $4)
-        ON CONFLICT (name) DO NOTHING
-        RETURNING name
+    role_ids = await upsert(
+        conn,
+        "roles",
+        [
+            {"name": name, "description": description, "priority": priority, "is_system": is_system}
+            for name, description, priority, is_system in roles
+        ],
+        conflict=("name",),
+    )
+    print(f"✅ Roles: {role_ids.summary()}")
+
+
+async def seed_users(conn: asyncpg.Connection, users: List[Tuple[str, str, str, str, str, str]]):
     """
+    Upsert de usuarios por email y asignación de su rol
 
-    created_count = 0
-    for name, description, priority, is_system in roles:
-        result = await conn.fetchrow(query, name, description, priority, is_system)
-        if result:
-            print(f"  ✅ Rol creado: {name} (prioridad: {priority})")
-            created_count += 1
-        else:
-            print(f"  ℹ️  Rol ya existe: {name}")
-
-    if created_count > 0:
-        print(f"✅ {created_count} roles creados")
-    else:
-        print("ℹ️  Todos los roles ya existían")
+    El hash del password y la fecha de verificación sólo se escriben al crear
+    el usuario: re-ejecutar el seed no resetea passwords cambiados.
+    """
+    verified_at = datetime.now(timezone.utc)
+    user_ids = await upsert(
+        conn,
+        "users",
+        [
+            {
+                "email": email,
+                "username": username,
+                "password_hash": pwd_context.hash(password),
+                "first_name": first_name,
+                "last_name": last_name,
+                "is_active": True,
+                "is_verified": True,
+                "email_verified_at": verified_at,
+            }
+            for email, username, password, first_name, last_name, _ in users
+        ],
+        conflict=("email",),
+        keep=("password_hash", "email_verified_at"),
+    )
+    print(f"  ✅ Usuarios: {user_ids.summary()}")
+
+    assigned = await conn.fetch(
+        ASSIGN_ROLES_QUERY,
+        [user[0] for user in users],
+        [user[5] for user in users],
+    )
+    print(f"  ✅ Roles asignados: {len(assigned)} nuevos de {len(users)}")
+    return user_ids
 
 
 async def seed_admin_user(conn: asyncpg.Connection):
     """Crear usuario administrador por defecto"""
     print("\n👤 Creando usuario administrador por defecto...")
 
-    # Default admin credentials (CAMBIAR EN PRODUCCIÓN!)
-    admin_email = "admin@example.com"
-    admin_username = "admin"
-    admin_password = "Admin123!"  # Password temporal
-
-    # Hash password
-    password_hash = pwd_context.hash(admin_password)
-
-    # Check if admin already exists
-    check_query = """
-        SELECT id FROM users
-        WHERE email = $1 AND deleted_at IS NULL
-    """
-    existing_admin = await conn.fetchrow(check_query, admin_email)
-
-    if existing_admin:
-        print(f"  ℹ️  Usuario admin ya existe: {admin_email}")
-        admin_id = existing_admin["id"]
-    else:
-        # Create admin user
-        create_query = """
-            INSERT INTO users (
-                email,
-                username,
-                password_hash,
-                first_name,
-                last_name,
-                is_active,
-                is_verified,
-                email_verified_at
-            )
-            VALUES ($1, $2, $3, $4, $5, $6, $7, NOW())
-            RETURNING id, email, username
-        """
-
-        admin = await conn.fetchrow(
-            create_query,
-            admin_email,
-            admin_username,
-            password_hash,
-            "System",
-            "Administrator",
-            True,
-            True,
-        )
-        admin_id = admin["id"]
-        print(f"  ✅ Usuario admin creado: {admin['email']}")
-        print(f"     Username: {admin['username']}")
-        print(f"     Password: {admin_password} (¡CAMBIAR EN PRODUCCIÓN!)")
-
-    # Assign ADMIN role
-    print("\n🔑 Asignando rol ADMIN...")
-
-    # Get ADMIN role ID
-    role_query = "SELECT id FROM roles WHERE name = 'ADMIN'"
-    admin_role = await conn.fetchrow(role_query)
-
-    if not admin_role:
-        print("  ❌ Rol ADMIN no encontrado. Ejecuta seed_roles primero.")
-        return
-
-    # Assign role
-    assign_query = """
-        INSERT INTO user_roles (user_id, role_id)
-        VALUES ($1, $2)
-        ON CONFLICT (user_id, role_id) DO NOTHING
-        RETURNING id
-    """
-
-    result = await conn.fetchrow(assign_query, admin_id, admin_role["id"])
-    if result:
-        print("  ✅ Rol ADMIN asignado al usuario administrador")
-    else:
-        print("  ℹ️  Usuario ya tenía el rol ADMIN")
+    user_ids = await seed_users(
+        conn,
+        [(ADMIN_EMAIL, "admin", ADMIN_PASSWORD, "System", "Administrator", "ADMIN")],
+    )
+    if user_ids.inserted:
+        print("     Username: admin")
+        print(f"     Password: {ADMIN_PASSWORD} (¡CAMBIAR EN PRODUCCIÓN!)")
 
 
 async def seed_sample_users(conn: asyncpg.Connection):
     """Crear usuarios de ejemplo (opcional)"""
     print("\n👥 Creando usuarios de ejemplo...")
 
-    sample_users = [
-        ("user1@example.com", "user1", "User123!", "John", "Doe", "USER"),
-        ("user2@example.com", "user2", "User123!", "Jane", "Smith", "USER"),
-        ("moderator@example.com", "moderator", "Mod123!", "Mike", "Johnson", "MODERATOR"),
-    ]
-
-    created_count = 0
-    for email, username, password, first_name, last_name, role_name in sample_users:
-        # Check if user exists
-        check_query = "SELECT id FROM users WHERE email = $1 AND deleted_at IS NULL"
-        existing = await conn.fetchrow(check_query, email)
-
-        if existing:
-            print(f"  ℹ️  Usuario ya existe: {email}")
-            user_id = existing["id"]
-        else:
-            # Create user
-            password_hash = pwd_context.hash(password)
-            create_query = """
-                INSERT INTO users (
-                    email,
-                    username,
-                    password_hash,
-                    first_name,
-                    last_name,
-                    is_active,
-                    is_verified,
-                    email_verified_at
-                )
-                VALUES ($1, $2, $3, $4, $5, TRUE, TRUE, NOW())
-                RETURNING id
-            """
-            user = await conn.fetchrow(
-                create_query,
-                email,
-                username,
-                password_hash,
-                first_name,
-                last_name,
-            )
-            user_id = user["id"]
-            print(f"  ✅ Usuario creado: {email}")
-            created_count += 1
-
-        # Assign role
-        role_query = "SELECT id FROM roles WHERE name = $1"
-        role = await conn.fetchrow(role_query, role_name)
-
-        if role:
-            assign_query = """
-                INSERT INTO user_roles (user_id, role_id)
-                VALUES ($1, $2)
-                ON CONFLICT DO NOTHING
-            """
-            await conn.execute(assign_query, user_id, role["id"])
-
-    if created_count > 0:
-        print(f"✅ {created_count} usuarios de ejemplo creados")
+    await seed_users(
+        conn,
+        [
+            ("user1@example.com", "user1", "User123!", "John", "Doe", "USER"),
+            ("user2@example.com", "user2", "User123!", "Jane", "Smith", "USER"),
+            ("moderator@example.com", "moderator", "Mod123!", "Mike", "Johnson", "MODERATOR"),
+        ],
+    )
 
 
 async def seed_audit_logs(conn: asyncpg.Connection):
     """Crear audit logs de ejemplo para testing"""
     print("\n📝 Creando audit logs de ejemplo...")
 
-    # Obtener admin user ID
-    admin_query = "SELECT id FROM users WHERE email = 'admin@example.com' LIMIT 1"
-    admin = await conn.fetchrow(admin_query)
-
-    if not admin:
-        print("  ⚠️  Usuario admin no encontrado. Ejecuta seed_admin_user primero.")
-        return
-
-    admin_id = admin["id"]
-
-    # Audit logs de ejemplo
+    # None = sin usuario; "admin" = usuario administrador (se resuelve en SQL)
     audit_logs = [
         # Login exitoso
         (
-            admin_id,
+            "admin",
             "LOGIN",
             None,
-            None,
             "Admin user logged in successfully",
             {"browser": "Chrome", "os": "Linux"},
             "127.0.0.1",
@@ -233,10 +155,9 @@ async def seed_audit_logs(conn: asyncpg.Connection):
         ),
         # Creación de usuario
         (
-            admin_id,
+            "admin",
             "CREATE",
             "users",
-            None,  # Would be actual user_id in real scenario
             "Created new user account",
             {"username": "test_user", "email": "test@example.com"},
             "127.0.0.1",
@@ -244,10 +165,9 @@ async def seed_audit_logs(conn: asyncpg.Connection):
         ),
         # Cambio de configuración
         (
-            admin_id,
+            "admin",
             "CONFIG_CHANGE",
             "system",
-            None,
             "Updated system settings",
             {"setting": "max_upload_size", "old_value": "10MB", "new_value": "20MB"},
             "127.0.0.1",
@@ -258,7 +178,6 @@ async def seed_audit_logs(conn: asyncpg.Connection):
             None,
             "ERROR",
             "system",
-            None,
             "Database connection timeout",
             {"error_code": "DB_TIMEOUT", "duration_ms": 5000},
             None,
@@ -269,7 +188,6 @@ async def seed_audit_logs(conn: asyncpg.Connection):
             None,
             "WARNING",
             "system",
-            None,
             "High memory usage detected",
             {"memory_usage_percent": 85, "threshold": 80},
             None,
@@ -280,7 +198,6 @@ async def seed_audit_logs(conn: asyncpg.Connection):
             None,
             "LOGIN_FAILED",
             None,
-            None,
             "Failed login attempt for user: admin@example.com",
             {"reason": "invalid_password", "attempts": 3},
             "192.168.1.100",
@@ -288,10 +205,9 @@ async def seed_audit_logs(conn: asyncpg.Connection):
         ),
         # Update de usuario
         (
-            admin_id,
+            "admin",
             "UPDATE",
             "users",
-            None,
             "Updated user profile information",
             {"fields_updated": ["first_name", "last_name"], "username": "admin"},
             "127.0.0.1",
@@ -302,7 +218,6 @@ async def seed_audit_logs(conn: asyncpg.Connection):
             None,
             "INFO",
             "system",
-            None,
             "Database backup completed successfully",
             {"backup_size_mb": 250, "duration_seconds": 45},
             None,
@@ -310,56 +225,54 @@ async def seed_audit_logs(conn: asyncpg.Connection):
         ),
     ]
 
-    import json
-    created_count = 0
-
-    for user_id, action, entity_type, entity_id, description, extra_data, ip, user_agent in audit_logs:
-        # Check if similar audit log exists (para no duplicar en re-runs)
-        check_query = """
-            SELECT id FROM audit_logs
-            WHERE action = $1 AND description = $2
-            LIMIT 1
-        """
-        existing = await conn.fetchrow(check_query, action, description)
-
-        if existing:
-            continue
-
-        # Create audit log
-        import uuid as uuid_lib
-        create_query = """
-            INSERT INTO audit_logs (
-                id,
-                user_id,
-                action,
-                entity_type,
-                entity_id,
-                description,
-                extra_data,
-                ip_address,
-                user_agent
-            )
-            VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9)
-            RETURNING id, action, description
-        """
-
-        log = await conn.fetchrow(
-            create_query,
-            uuid_lib.uuid4(),
+    # Un solo INSERT ... SELECT: omite los (action, description) ya sembrados
+    # (para no duplicar en re-runs) sin una consulta de existencia por log
+    create_query = """
+        INSERT INTO audit_logs (
             user_id,
             action,
             entity_type,
-            entity_id,
             description,
-            json.dumps(extra_data) if extra_data else None,
-            ip,
+            extra_data,
+            ip_address,
             user_agent
         )
+        SELECT
+            CASE WHEN v.as_admin THEN u.id END,
+            v.action::audit_action_enum,
+            v.entity_type,
+            v.description,
+            v.extra_data::jsonb,
+            v.ip_address,
+            v.user_agent
+        FROM unnest($1::boolean[], $2::text[], $3::text[], $4::text[], $5::text[], $6::text[], $7::text[])
+            AS v(as_admin, action, entity_type, description, extra_data, ip_address, user_agent)
+        LEFT JOIN users u ON u.email = $8
+        WHERE (NOT v.as_admin OR u.id IS NOT NULL)
+          AND NOT EXISTS (
+              SELECT 1 FROM audit_logs a
+              WHERE a.action = v.action::audit_action_enum AND a.description = v.description
+          )
+        RETURNING action, description
+    """
+
+    created = await conn.fetch(
+        create_query,
+        [user == "admin" for user, *_ in audit_logs],
+        [log[1] for log in audit_logs],
+        [log[2] for log in audit_logs],
+        [log[3] for log in audit_logs],
+        [json.dumps(log[4]) if log[4] else None for log in audit_logs],
+        [log[5] for log in audit_logs],
+        [log[6] for log in audit_logs],
+        ADMIN_EMAIL,
+    )
+
+    for log in created:
         print(f"  ✅ Audit log creado: {log['action']} - {log['description'][:50]}...")
-        created_count += 1
 
-    if created_count > 0:
-        print(f"✅ {created_count} audit logs creados")
+    if created:
+        print(f"✅ {len(created)} audit logs creados")
     else:
         print("ℹ️  Todos los audit logs ya existían")
 
@@ -394,8 +307,8 @@ async def main():
         print("=" * 70)
         print()
         print("Credenciales de administrador:")
-        print("  Email:    admin@example.com")
-        print("  Password: Admin123!")
+        print(f"  Email:    {ADMIN_EMAIL}")
+        print(f"  Password: {ADMIN_PASSWORD}")
         print()
         print("⚠️  IMPORTANTE: Cambiar password en producción!")
         print()
@@ -14,26 +14,39 @@ Script para poblar la base de datos con datos de ejemplo del dominio minero:
 - Reactivos (Reagents)
 - Áreas de proceso (Process Areas)
 
+Las etapas corren en paralelo según sus claves foráneas (SEED_STAGES), cada
+una en su propia conexión del pool, con un upsert set-based por tabla
+(scripts/seed_upsert.py) y un reporte de tiempos por etapa al final. El seed
+es idempotente: re-ejecutarlo actualiza los datos declarados aquí.
+
 Ejecutar con:
     docker compose exec api python -m scripts.seed_mining_data
+    docker compose exec api python -m scripts.seed_mining_data --concurrency 1   # secuencial
 
 O desde Makefile:
     make db-seed-mining
 """
 
+import argparse
 import asyncio
 import asyncpg
 import os
 import sys
-import uuid
+import time
 from datetime import datetime, timedelta
 from decimal import Decimal
+from graphlib import TopologicalSorter
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional, Tuple
 import random
 
+import numpy as np
+
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
 from app.config import settings
+from scripts.load_block_model import load_block_model
+from scripts.seed_upsert import upsert
 
 
 # =============================================================================
@@ -349,100 +362,61 @@ OPERATORS_DATA = [
 # =============================================================================
 # FUNCIONES DE SEED
 # =============================================================================
+#
+# Cada función siembra su tabla con un único upsert set-based (ver
+# scripts/seed_upsert.py) y retorna el mapa código -> id. Re-ejecutar el seed
+# actualiza los valores declarados arriba y conserva ids y valores aleatorios.
+
+def _pick(data: dict, columns: List[str]) -> dict:
+    return {column: data.get(column) for column in columns}
+
+
+def _first(ids: dict):
+    return next(iter(ids.values()), None)
+
+
+DEPOSIT_COLUMNS = [
+    "code", "name", "genetic_model", "primary_commodity", "secondary_commodity",
+    "measured_resources_mt", "indicated_resources_mt", "inferred_resources_mt",
+    "proven_reserves_mt", "probable_reserves_mt", "avg_cu_grade_pct", "avg_mo_grade_pct",
+    "country", "region", "province", "commune", "description",
+]
+
 
 async def seed_deposits(conn: asyncpg.Connection) -> dict:
     """Crear yacimientos mineros"""
     print("\n🏔️  Creando yacimientos (deposits)...")
 
-    deposit_ids = {}
-
-    for deposit in CHILEAN_DEPOSITS:
-        # Check if exists
-        check_query = "SELECT id FROM deposits WHERE code = $1"
-        existing = await conn.fetchrow(check_query, deposit["code"])
-
-        if existing:
-            print(f"  ℹ️  Yacimiento ya existe: {deposit['name']}")
-            deposit_ids[deposit["code"]] = existing["id"]
-            continue
-
-        deposit_id = uuid.uuid4()
-        deposit_ids[deposit["code"]] = deposit_id
-
-        create_query = """
-            INSERT INTO deposits (
-                id, code, name, genetic_model, primary_commodity, secondary_commodity,
-                measured_resources_mt, indicated_resources_mt, inferred_resources_mt,
-                proven_reserves_mt, probable_reserves_mt, avg_cu_grade_pct, avg_mo_grade_pct,
-                country, region, province, commune, description
-            ) VALUES (
-                $1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14, $15, $16, $17, $18
-            )
-        """
-
-        await conn.execute(
-            create_query,
-            deposit_id,
-            deposit["code"],
-            deposit["name"],
-            deposit["genetic_model"],
-            deposit["primary_commodity"],
-            deposit["secondary_commodity"],
-            deposit["measured_resources_mt"],
-            deposit["indicated_resources_mt"],
-            deposit["inferred_resources_mt"],
-            deposit["proven_reserves_mt"],
-            deposit["probable_reserves_mt"],
-            deposit["avg_cu_grade_pct"],
-            deposit["avg_mo_grade_pct"],
-            deposit["country"],
-            deposit["region"],
-            deposit["province"],
-            deposit["commune"],
-            deposit["description"],
-        )
-        print(f"  ✅ Yacimiento creado: {deposit['name']}")
+    deposit_ids = await upsert(
+        conn, "deposits", [_pick(deposit, DEPOSIT_COLUMNS) for deposit in CHILEAN_DEPOSITS], conflict=("code",),
+    )
+    print(f"  ✅ Yacimientos: {deposit_ids.summary()}")
 
     return deposit_ids
 
 
 async def seed_coordinates(conn: asyncpg.Connection, deposit_ids: dict):
-    """Crear coordenadas geoespaciales"""
+    """Crear coordenadas geoespaciales (centroide de cada yacimiento)"""
     print("\n📍 Creando coordenadas...")
 
-    for deposit in CHILEAN_DEPOSITS:
-        deposit_id = deposit_ids.get(deposit["code"])
-        if not deposit_id:
-            continue
-
-        # Check if exists
-        check_query = "SELECT id FROM coordinates WHERE deposit_id = $1 AND point_type = 'CENTROID'"
-        existing = await conn.fetchrow(check_query, deposit_id)
-
-        if existing:
-            print(f"  ℹ️  Coordenadas ya existen para: {deposit['name']}")
-            continue
-
-        create_query = """
-            INSERT INTO coordinates (
-                id, deposit_id, point_type, latitude, longitude, elevation_masl,
-                utm_zone, coordinate_system, datum
-            ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9)
-        """
-
-        await conn.execute(
-            create_query,
-            uuid.uuid4(),
-            deposit_id,
-            "CENTROID",
-            deposit["latitude"],
-            deposit["longitude"],
-            deposit["elevation_masl"],
-            "19S",  # UTM Zone for Chile
-            "WGS84",
-            "WGS84",
-        )
-        print(f"  ✅ Coordenadas creadas para: {deposit['name']}")
+    rows = [
+        {
+            "deposit_id": deposit_ids[deposit["code"]],
+            "point_type": "CENTROID",
+            "latitude": deposit["latitude"],
+            "longitude": deposit["longitude"],
+            "elevation_masl": deposit["elevation_masl"],
+            "utm_zone": "19S",  # UTM Zone for Chile
+            "coordinate_system": "WGS84",
+            "datum": "WGS84",
+        }
+        for deposit in CHILEAN_DEPOSITS
+        if deposit["code"] in deposit_ids
+    ]
+    coordinate_ids = await upsert(
+        conn, "coordinates", rows, conflict=("deposit_id",), conflict_where="point_type = 'CENTROID'",
+    )
+    print(f"  ✅ Coordenadas: {coordinate_ids.summary()}")
 
 
 async def seed_mineralogy(conn: asyncpg.Connection, deposit_ids: dict):
@@ -450,156 +424,89 @@ async def seed_mineralogy(conn: asyncpg.Connection, deposit_ids: dict):
     print("\n💎 Creando mineralogía...")
 
     # Use first deposit for mineralogy
-    first_deposit_id = list(deposit_ids.values())[0] if deposit_ids else None
+    first_deposit_id = _first(deposit_ids)
     if not first_deposit_id:
         print("  ⚠️  No hay yacimientos. Saltando mineralogía.")
         return
 
-    for mineral in MINERALOGY_DATA:
-        # Check if exists
-        check_query = """
-            SELECT id FROM mineralogy
-            WHERE deposit_id = $1 AND mineral_name = $2
-        """
-        existing = await conn.fetchrow(check_query, first_deposit_id, mineral["mineral_name"])
-
-        if existing:
-            print(f"  ℹ️  Mineral ya existe: {mineral['mineral_name']}")
-            continue
-
-        create_query = """
-            INSERT INTO mineralogy (
-                id, deposit_id, mineral_name, mineral_formula, mineral_class,
-                abundance_pct, is_primary_ore, floatability, natural_hydrophobicity,
-                associated_minerals, arsenic_content_ppm
-            ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11)
-        """
-
-        await conn.execute(
-            create_query,
-            uuid.uuid4(),
-            first_deposit_id,
-            mineral["mineral_name"],
-            mineral["mineral_formula"],
-            mineral["mineral_class"],
-            mineral.get("abundance_pct"),
-            mineral["is_primary_ore"],
-            mineral.get("floatability"),
-            mineral.get("natural_hydrophobicity"),
-            mineral.get("associated_minerals"),
-            mineral.get("arsenic_content_ppm"),
-        )
-        print(f"  ✅ Mineral creado: {mineral['mineral_name']}")
+    columns = [
+        "mineral_name", "mineral_formula", "mineral_class", "abundance_pct", "is_primary_ore",
+        "floatability", "natural_hydrophobicity", "associated_minerals", "arsenic_content_ppm",
+    ]
+    rows = [{"deposit_id": first_deposit_id, **_pick(mineral, columns)} for mineral in MINERALOGY_DATA]
+    mineral_ids = await upsert(conn, "mineralogy", rows, conflict=("deposit_id", "mineral_name"))
+    print(f"  ✅ Minerales: {mineral_ids.summary()}")
+
+
+MINES_DATA = [
+    {"deposit_code": "DEP-TEND", "code": "MIN-TEND-01", "name": "El Teniente - Mina Principal",
+     "mine_type": "UNDERGROUND", "design_capacity_tpd": Decimal("140000.00")},
+    {"deposit_code": "DEP-CHUQ", "code": "MIN-CHUQ-01", "name": "Chuquicamata - Rajo Abierto",
+     "mine_type": "OPEN_PIT", "design_capacity_tpd": Decimal("180000.00")},
+    {"deposit_code": "DEP-CHUQ", "code": "MIN-CHUQ-02", "name": "Chuquicamata Subterránea",
+     "mine_type": "UNDERGROUND", "design_capacity_tpd": Decimal("140000.00")},
+    {"deposit_code": "DEP-ESCO", "code": "MIN-ESCO-01", "name": "Escondida - Norte",
+     "mine_type": "OPEN_PIT", "design_capacity_tpd": Decimal("200000.00")},
+]
 
 
 async def seed_mines(conn: asyncpg.Connection, deposit_ids: dict) -> dict:
     """Crear minas"""
     print("\n⛏️  Creando minas...")
 
-    mine_ids = {}
-
-    mine_data = [
-        {"deposit_code": "DEP-TEND", "code": "MIN-TEND-01", "name": "El Teniente - Mina Principal",
-         "mine_type": "UNDERGROUND", "design_capacity_tpd": Decimal("140000.00")},
-        {"deposit_code": "DEP-CHUQ", "code": "MIN-CHUQ-01", "name": "Chuquicamata - Rajo Abierto",
-         "mine_type": "OPEN_PIT", "design_capacity_tpd": Decimal("180000.00")},
-        {"deposit_code": "DEP-CHUQ", "code": "MIN-CHUQ-02", "name": "Chuquicamata Subterránea",
-         "mine_type": "UNDERGROUND", "design_capacity_tpd": Decimal("140000.00")},
-        {"deposit_code": "DEP-ESCO", "code": "MIN-ESCO-01", "name": "Escondida - Norte",
-         "mine_type": "OPEN_PIT", "design_capacity_tpd": Decimal("200000.00")},
+    rows = [
+        {
+            "deposit_id": deposit_ids[mine["deposit_code"]],
+            "code": mine["code"],
+            "name": mine["name"],
+            "mine_type": mine["mine_type"],
+            "design_capacity_tpd": mine["design_capacity_tpd"],
+            "current_capacity_tpd": mine["design_capacity_tpd"] * Decimal("0.85"),  # 85% utilization
+            "start_date": datetime.now() - timedelta(days=random.randint(3650, 7300)),  # 10-20 years ago
+            "is_active": True,
+        }
+        for mine in MINES_DATA
+        if mine["deposit_code"] in deposit_ids
     ]
-
-    for mine in mine_data:
-        deposit_id = deposit_ids.get(mine["deposit_code"])
-        if not deposit_id:
-            continue
-
-        # Check if exists
-        check_query = "SELECT id FROM mines WHERE code = $1"
-        existing = await conn.fetchrow(check_query, mine["code"])
-
-        if existing:
-            print(f"  ℹ️  Mina ya existe: {mine['name']}")
-            mine_ids[mine["code"]] = existing["id"]
-            continue
-
-        mine_id = uuid.uuid4()
-        mine_ids[mine["code"]] = mine_id
-
-        create_query = """
-            INSERT INTO mines (
-                id, deposit_id, code, name, mine_type, design_capacity_tpd,
-                current_capacity_tpd, start_date, is_active
-            ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9)
-        """
-
-        await conn.execute(
-            create_query,
-            mine_id,
-            deposit_id,
-            mine["code"],
-            mine["name"],
-            mine["mine_type"],
-            mine["design_capacity_tpd"],
-            mine["design_capacity_tpd"] * Decimal("0.85"),  # 85% utilization
-            datetime.now() - timedelta(days=random.randint(3650, 7300)),  # 10-20 years ago
-            True,
-        )
-        print(f"  ✅ Mina creada: {mine['name']}")
+    mine_ids = await upsert(conn, "mines", rows, conflict=("code",), keep=("start_date",))
+    print(f"  ✅ Minas: {mine_ids.summary()}")
 
     return mine_ids
 
 
 async def seed_mine_phases(conn: asyncpg.Connection, mine_ids: dict) -> dict:
-    """Crear fases de explotación"""
+    """Crear fases de explotación (3 por mina)"""
     print("\n📊 Creando fases de mina...")
 
-    phase_ids = {}
-
-    for mine_code, mine_id in mine_ids.items():
-        for phase_num in range(1, 4):  # 3 phases per mine
-            phase_code = f"{mine_code}-F{phase_num}"
-
-            # Check if exists
-            check_query = "SELECT id FROM mine_phases WHERE code = $1"
-            existing = await conn.fetchrow(check_query, phase_code)
-
-            if existing:
-                phase_ids[phase_code] = existing["id"]
-                continue
-
-            phase_id = uuid.uuid4()
-            phase_ids[phase_code] = phase_id
-
-            create_query = """
-                INSERT INTO mine_phases (
-                    id, mine_id, code, name, sequence_number,
-                    design_tonnage_mt, design_cu_grade_pct, design_mo_grade_pct,
-                    design_strip_ratio, elevation_top_masl, elevation_bottom_masl,
-                    planned_start_date, is_active, is_completed
-                ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14)
-            """
-
-            await conn.execute(
-                create_query,
-                phase_id,
-                mine_id,
-                phase_code,
-                f"Fase {phase_num}",
-                phase_num,
-                Decimal(str(random.randint(50, 200))),  # 50-200 Mt
-                Decimal(str(random.uniform(0.4, 0.8))),  # 0.4-0.8% Cu
-                Decimal(str(random.uniform(0.01, 0.03))),  # 0.01-0.03% Mo
-                Decimal(str(random.uniform(1.5, 4.0))),  # Strip ratio
-                Decimal(str(random.randint(3000, 3500))),
-                Decimal(str(random.randint(2500, 3000))),
-                datetime.now() + timedelta(days=365 * phase_num),
-                phase_num == 1,  # Only first phase is active
-                False,
-            )
-        print(f"  ✅ Fases creadas para: {mine_code}")
-
-    return phase_ids
+    rows = [
+        {
+            "mine_id": mine_id,
+            "code": f"{mine_code}-F{phase_num}",
+            "name": f"Fase {phase_num}",
+            "sequence_number": phase_num,
+            "design_tonnage_mt": Decimal(str(random.randint(50, 200))),  # 50-200 Mt
+            "design_cu_grade_pct": Decimal(str(random.uniform(0.4, 0.8))),  # 0.4-0.8% Cu
+            "design_mo_grade_pct": Decimal(str(random.uniform(0.01, 0.03))),  # 0.01-0.03% Mo
+            "design_strip_ratio": Decimal(str(random.uniform(1.5, 4.0))),  # Strip ratio
+            "elevation_top_masl": Decimal(str(random.randint(3000, 3500))),
+            "elevation_bottom_masl": Decimal(str(random.randint(2500, 3000))),
+            "planned_start_date": datetime.now() + timedelta(days=365 * phase_num),
+            "is_active": phase_num == 1,  # Only first phase is active
+            "is_completed": False,
+        }
+        for mine_code, mine_id in mine_ids.items()
+        for phase_num in range(1, 4)
+    ]
+    phase_keys = await upsert(
+        conn, "mine_phases", rows, conflict=("mine_id", "code"),
+        keep=(
+            "design_tonnage_mt", "design_cu_grade_pct", "design_mo_grade_pct", "design_strip_ratio",
+            "elevation_top_masl", "elevation_bottom_masl", "planned_start_date",
+        ),
+    )
+    print(f"  ✅ Fases: {phase_keys.summary()}")
+
+    return {code: phase_id for (_, code), phase_id in phase_keys.items()}
 
 
 async def seed_blocks(conn: asyncpg.Connection, phase_ids: dict):
@@ -607,109 +514,77 @@ async def seed_blocks(conn: asyncpg.Connection, phase_ids: dict):
     print("\n🧱 Creando bloques de modelo...")
 
     # Create a small sample of blocks for first phase only
-    first_phase_id = list(phase_ids.values())[0] if phase_ids else None
+    first_phase_id = _first(phase_ids)
     if not first_phase_id:
         print("  ⚠️  No hay fases. Saltando bloques.")
         return
 
-    # Check existing blocks
-    check_query = "SELECT COUNT(*) as count FROM blocks WHERE mine_phase_id = $1"
-    result = await conn.fetchrow(check_query, first_phase_id)
-
-    if result["count"] > 0:
-        print(f"  ℹ️  Ya existen {result['count']} bloques")
-        return
-
-    # Create 5x5x3 = 75 sample blocks
-    block_count = 0
-    for i in range(5):
-        for j in range(5):
-            for k in range(3):
-                block_code = f"BLK-{i:02d}{j:02d}{k:02d}"
-
-                # Random mineral type
-                mineral_types = ["SULFIDE", "OXIDE", "MIXED", "TRANSITION"]
-                mineral_type = random.choice(mineral_types)
-
-                create_query = """
-                    INSERT INTO blocks (
-                        id, mine_phase_id, code, block_i, block_j, block_k,
-                        centroid_x, centroid_y, centroid_z,
-                        size_x, size_y, size_z, tonnage, density,
-                        cu_grade_pct, mo_grade_pct, mineral_type, is_mined
-                    ) VALUES (
-                        $1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14, $15, $16, $17, $18
-                    )
-                """
-
-                await conn.execute(
-                    create_query,
-                    uuid.uuid4(),
-                    first_phase_id,
-                    block_code,
-                    i, j, k,
-                    Decimal(str(1000 + i * 10)),  # centroid_x
-                    Decimal(str(2000 + j * 10)),  # centroid_y
-                    Decimal(str(3000 - k * 15)),  # centroid_z
-                    Decimal("10.00"),  # size_x
-                    Decimal("10.00"),  # size_y
-                    Decimal("15.00"),  # size_z
-                    Decimal(str(random.randint(3000, 5000))),  # tonnage
-                    Decimal(str(random.uniform(2.5, 2.8))),  # density
-                    Decimal(str(random.uniform(0.3, 1.0))),  # cu_grade
-                    Decimal(str(random.uniform(0.005, 0.03))),  # mo_grade
-                    mineral_type,
-                    False,
-                )
-                block_count += 1
-
-    print(f"  ✅ {block_count} bloques creados")
+    # Create 5x5x3 = 75 sample blocks, generados como arrays y cargados
+    # con el mismo pipeline (COPY binario + staging) que los block models reales.
+    # Semilla fija + modo merge (upsert por i, j, k): re-ejecutar no cambia nada
+    rng = np.random.default_rng(75)
+    i, j, k = np.meshgrid(np.arange(5), np.arange(5), np.arange(3), indexing="ij")
+    i, j, k = i.ravel(), j.ravel(), k.ravel()
+    block_count = len(i)
+
+    mineral_types = np.array(["SULFIDE", "OXIDE", "MIXED", "TRANSITION"], dtype=object)
+    sample_chunk = {
+        "code": np.array(
+            [f"BLK-{a:02d}{b:02d}{c:02d}" for a, b, c in zip(i, j, k)], dtype=object
+        ),
+        "block_i": i,
+        "block_j": j,
+        "block_k": k,
+        "centroid_x": 1000.0 + i * 10,
+        "centroid_y": 2000.0 + j * 10,
+        "centroid_z": 3000.0 - k * 15,
+        "size_x": np.full(block_count, 10.0),
+        "size_y": np.full(block_count, 10.0),
+        "size_z": np.full(block_count, 15.0),
+        "tonnage": rng.integers(3000, 5001, block_count).astype(np.float64),
+        "density": np.round(rng.uniform(2.5, 2.8, block_count), 3),
+        "cu_grade_pct": np.round(rng.uniform(0.3, 1.0, block_count), 3),
+        "mo_grade_pct": np.round(rng.uniform(0.005, 0.03, block_count), 4),
+        "mineral_type": rng.choice(mineral_types, block_count),
+        "is_mined": np.zeros(block_count, dtype=bool),
+    }
+
+    stats = await load_block_model(conn, iter([sample_chunk]), first_phase_id, mode="merge")
+
+    print(f"  ✅ {stats.rows_loaded} bloques ({stats.rows_per_second:,.0f} filas/s)")
 
 
 async def seed_equipment_types(conn: asyncpg.Connection) -> dict:
     """Crear tipos de equipos"""
     print("\n🔧 Creando tipos de equipos...")
 
-    type_ids = {}
-
-    for eq_type in EQUIPMENT_TYPES_DATA:
-        # Check if exists
-        check_query = "SELECT id FROM equipment_types WHERE code = $1"
-        existing = await conn.fetchrow(check_query, eq_type["code"])
-
-        if existing:
-            type_ids[eq_type["code"]] = existing["id"]
-            continue
-
-        type_id = uuid.uuid4()
-        type_ids[eq_type["code"]] = type_id
-
-        create_query = """
-            INSERT INTO equipment_types (
-                id, code, name, category, manufacturer, model,
-                capacity, capacity_unit, power_kw, expected_life_hours, is_active
-            ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11)
-        """
-
-        await conn.execute(
-            create_query,
-            type_id,
-            eq_type["code"],
-            eq_type["name"],
-            eq_type["category"],
-            eq_type["manufacturer"],
-            eq_type["model"],
-            eq_type["capacity"],
-            eq_type["capacity_unit"],
-            eq_type.get("power_kw"),
-            eq_type["expected_life_hours"],
-            True,
-        )
-        print(f"  ✅ Tipo de equipo: {eq_type['name']}")
+    columns = [
+        "code", "name", "category", "manufacturer", "model",
+        "capacity", "capacity_unit", "power_kw", "expected_life_hours",
+    ]
+    rows = [{**_pick(eq_type, columns), "is_active": True} for eq_type in EQUIPMENT_TYPES_DATA]
+    type_ids = await upsert(conn, "equipment_types", rows, conflict=("code",))
+    print(f"  ✅ Tipos de equipo: {type_ids.summary()}")
 
     return type_ids
 
 
+EQUIPMENT_DATA = [
+    ("CAM-797F", "EQ-CAM-001", "Camión #001", "Mina"),
+    ("CAM-797F", "EQ-CAM-002", "Camión #002", "Mina"),
+    ("CAM-797F", "EQ-CAM-003", "Camión #003", "Mina"),
+    ("PAL-7495", "EQ-PAL-001", "Pala Eléctrica #001", "Mina"),
+    ("CAR-994K", "EQ-CAR-001", "Cargador #001", "Mina"),
+    ("PER-D75K", "EQ-PER-001", "Perforadora #001", "Mina"),
+    ("CHA-PRIM", "EQ-CHP-001", "Chancador Primario #001", "Chancado"),
+    ("MOL-SAG", "EQ-SAG-001", "Molino SAG #001", "Molienda"),
+    ("MOL-BOL", "EQ-BOL-001", "Molino de Bolas #001", "Molienda"),
+    ("FLO-RGH", "EQ-FLR-001", "Celda Rougher #001", "Flotación"),
+    ("FLO-CLN", "EQ-FLC-001", "Celda Cleaner #001", "Flotación"),
+    ("BOM-WAR", "EQ-BOM-001", "Bomba de Pulpa #001", "Transporte"),
+]
+
+
 async def seed_equipment(conn: asyncpg.Connection, mine_ids: dict, type_ids: dict):
     """Crear equipos"""
     print("\n🚜 Creando equipos...")
@@ -718,57 +593,30 @@ async def seed_equipment(conn: asyncpg.Connection, mine_ids: dict, type_ids: dic
         print("  ⚠️  No hay minas o tipos de equipo. Saltando.")
         return
 
-    first_mine_id = list(mine_ids.values())[0]
-
-    equipment_list = [
-        ("CAM-797F", "EQ-CAM-001", "Camión #001", "Mina"),
-        ("CAM-797F", "EQ-CAM-002", "Camión #002", "Mina"),
-        ("CAM-797F", "EQ-CAM-003", "Camión #003", "Mina"),
-        ("PAL-7495", "EQ-PAL-001", "Pala Eléctrica #001", "Mina"),
-        ("CAR-994K", "EQ-CAR-001", "Cargador #001", "Mina"),
-        ("PER-D75K", "EQ-PER-001", "Perforadora #001", "Mina"),
-        ("CHA-PRIM", "EQ-CHP-001", "Chancador Primario #001", "Chancado"),
-        ("MOL-SAG", "EQ-SAG-001", "Molino SAG #001", "Molienda"),
-        ("MOL-BOL", "EQ-BOL-001", "Molino de Bolas #001", "Molienda"),
-        ("FLO-RGH", "EQ-FLR-001", "Celda Rougher #001", "Flotación"),
-        ("FLO-CLN", "EQ-FLC-001", "Celda Cleaner #001", "Flotación"),
-        ("BOM-WAR", "EQ-BOM-001", "Bomba de Pulpa #001", "Transporte"),
+    first_mine_id = _first(mine_ids)
+
+    rows = [
+        {
+            "equipment_type_id": type_ids[type_code],
+            "mine_id": first_mine_id,
+            "code": eq_code,
+            "name": eq_name,
+            "serial_number": f"SN-{random.randint(100000, 999999)}",
+            "status": "OPERATIONAL",
+            "location_area": location,
+            "installation_date": datetime.now() - timedelta(days=random.randint(365, 1825)),
+            "total_operating_hours": Decimal(str(random.randint(10000, 50000))),
+            "is_active": True,
+        }
+        for type_code, eq_code, eq_name, location in EQUIPMENT_DATA
+        if type_code in type_ids
     ]
-
-    for type_code, eq_code, eq_name, location in equipment_list:
-        type_id = type_ids.get(type_code)
-        if not type_id:
-            continue
-
-        # Check if exists
-        check_query = "SELECT id FROM equipment WHERE code = $1"
-        existing = await conn.fetchrow(check_query, eq_code)
-
-        if existing:
-            continue
-
-        create_query = """
-            INSERT INTO equipment (
-                id, equipment_type_id, mine_id, code, name, serial_number,
-                status, location_area, installation_date, total_operating_hours, is_active
-            ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11)
-        """
-
-        await conn.execute(
-            create_query,
-            uuid.uuid4(),
-            type_id,
-            first_mine_id,
-            eq_code,
-            eq_name,
-            f"SN-{random.randint(100000, 999999)}",
-            "OPERATIONAL",
-            location,
-            datetime.now() - timedelta(days=random.randint(365, 1825)),
-            Decimal(str(random.randint(10000, 50000))),
-            True,
-        )
-        print(f"  ✅ Equipo: {eq_name}")
+    # Estado y horas evolucionan con la operación: el seed sólo los inicializa
+    equipment_ids = await upsert(
+        conn, "equipment", rows, conflict=("code",),
+        keep=("serial_number", "status", "installation_date", "total_operating_hours"),
+    )
+    print(f"  ✅ Equipos: {equipment_ids.summary()}")
 
 
 async def seed_operators(conn: asyncpg.Connection, mine_ids: dict):
@@ -779,88 +627,38 @@ async def seed_operators(conn: asyncpg.Connection, mine_ids: dict):
         print("  ⚠️  No hay minas. Saltando operadores.")
         return
 
-    first_mine_id = list(mine_ids.values())[0]
-
-    for operator in OPERATORS_DATA:
-        # Check if exists
-        check_query = "SELECT id FROM operators WHERE employee_code = $1"
-        existing = await conn.fetchrow(check_query, operator["employee_code"])
-
-        if existing:
-            continue
-
-        create_query = """
-            INSERT INTO operators (
-                id, mine_id, employee_code, first_name, last_name,
-                email, phone, job_title, department, default_shift,
-                license_number, hire_date, is_active
-            ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13)
-        """
-
-        await conn.execute(
-            create_query,
-            uuid.uuid4(),
-            first_mine_id,
-            operator["employee_code"],
-            operator["first_name"],
-            operator["last_name"],
-            operator.get("email"),
-            operator.get("phone"),
-            operator["job_title"],
-            operator.get("department"),
-            operator.get("default_shift"),
-            operator.get("license_number"),
-            datetime.now() - timedelta(days=random.randint(365, 3650)),
-            True,
-        )
-        print(f"  ✅ Operador: {operator['first_name']} {operator['last_name']}")
+    first_mine_id = _first(mine_ids)
+
+    columns = [
+        "employee_code", "first_name", "last_name", "email", "phone",
+        "job_title", "department", "default_shift", "license_number",
+    ]
+    rows = [
+        {
+            "mine_id": first_mine_id,
+            **_pick(operator, columns),
+            "hire_date": datetime.now() - timedelta(days=random.randint(365, 3650)),
+            "is_active": True,
+        }
+        for operator in OPERATORS_DATA
+    ]
+    operator_ids = await upsert(conn, "operators", rows, conflict=("employee_code",), keep=("hire_date",))
+    print(f"  ✅ Operadores: {operator_ids.summary()}")
 
 
 async def seed_reagents(conn: asyncpg.Connection):
     """Crear reactivos químicos"""
     print("\n🧪 Creando reactivos...")
 
-    for reagent in REAGENTS_DATA:
-        # Check if exists
-        check_query = "SELECT id FROM reagents WHERE code = $1"
-        existing = await conn.fetchrow(check_query, reagent["code"])
-
-        if existing:
-            continue
-
-        create_query = """
-            INSERT INTO reagents (
-                id, code, name, commercial_name, reagent_type, chemical_family,
-                chemical_formula, molecular_weight, density,
-                recommended_dosage_min, recommended_dosage_max, dosage_unit,
-                unit_cost, cost_currency, cost_unit, supplier, hazard_class, is_active
-            ) VALUES (
-                $1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14, $15, $16, $17, $18
-            )
-        """
-
-        await conn.execute(
-            create_query,
-            uuid.uuid4(),
-            reagent["code"],
-            reagent["name"],
-            reagent.get("commercial_name"),
-            reagent["reagent_type"],
-            reagent.get("chemical_family"),
-            reagent.get("chemical_formula"),
-            reagent.get("molecular_weight"),
-            reagent.get("density"),
-            reagent.get("recommended_dosage_min"),
-            reagent.get("recommended_dosage_max"),
-            reagent.get("dosage_unit"),
-            reagent.get("unit_cost"),
-            reagent.get("cost_currency"),
-            reagent.get("cost_unit"),
-            reagent.get("supplier"),
-            reagent.get("hazard_class"),
-            True,
-        )
-        print(f"  ✅ Reactivo: {reagent['name']}")
+    columns = [
+        "code", "name", "commercial_name", "reagent_type", "chemical_family",
+        "chemical_formula", "molecular_weight", "density",
+        "recommended_dosage_min", "recommended_dosage_max", "dosage_unit",
+        "unit_cost", "cost_currency", "cost_unit", "supplier", "hazard_class",
+    ]
+    rows = [{**_pick(reagent, columns), "is_active": True} for reagent in REAGENTS_DATA]
+    reagent_ids = await upsert(conn, "reagents", rows, conflict=("code",))
+    print(f"  ✅ Reactivos: {reagent_ids.summary()}")
 
 
 async def seed_process_areas(conn: asyncpg.Connection, mine_ids: dict):
@@ -871,67 +669,148 @@ async def seed_process_areas(conn: asyncpg.Connection, mine_ids: dict):
         print("  ⚠️  No hay minas. Saltando áreas de proceso.")
         return
 
-    first_mine_id = list(mine_ids.values())[0]
-
-    for area in PROCESS_AREAS_DATA:
-        # Check if exists
-        check_query = "SELECT id FROM process_areas WHERE code = $1 AND mine_id = $2"
-        existing = await conn.fetchrow(check_query, area["code"], first_mine_id)
-
-        if existing:
-            continue
-
-        create_query = """
-            INSERT INTO process_areas (
-                id, mine_id, code, name, area_type, sequence_order,
-                design_capacity, capacity_unit, target_recovery_pct,
-                target_grade_pct, circuit_type, is_active
-            ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12)
-        """
-
-        await conn.execute(
-            create_query,
-            uuid.uuid4(),
-            first_mine_id,
-            area["code"],
-            area["name"],
-            area["area_type"],
-            area["sequence_order"],
-            area.get("design_capacity"),
-            area.get("capacity_unit"),
-            area.get("target_recovery_pct"),
-            area.get("target_grade_pct"),
-            area.get("circuit_type"),
-            True,
+    first_mine_id = _first(mine_ids)
+
+    columns = [
+        "code", "name", "area_type", "sequence_order", "design_capacity", "capacity_unit",
+        "target_recovery_pct", "target_grade_pct", "circuit_type",
+    ]
+    rows = [
+        {"mine_id": first_mine_id, **_pick(area, columns), "is_active": True}
+        for area in PROCESS_AREAS_DATA
+    ]
+    area_ids = await upsert(conn, "process_areas", rows, conflict=("mine_id", "code"))
+    print(f"  ✅ Áreas de proceso: {area_ids.summary()}")
+
+
+# =============================================================================
+# EJECUCIÓN POR DEPENDENCIAS (DAG)
+# =============================================================================
+
+class SeedStage(NamedTuple):
+    """Etapa del seed: función y etapas cuyos resultados recibe (en orden)"""
+    name: str
+    func: Callable[..., Awaitable[Any]]
+    requires: Tuple[str, ...] = ()
+
+
+# Dependencias = claves foráneas entre las tablas de cada etapa
+SEED_STAGES = [
+    SeedStage("deposits", seed_deposits),
+    SeedStage("coordinates", seed_coordinates, ("deposits",)),
+    SeedStage("mineralogy", seed_mineralogy, ("deposits",)),
+    SeedStage("mines", seed_mines, ("deposits",)),
+    SeedStage("mine_phases", seed_mine_phases, ("mines",)),
+    SeedStage("blocks", seed_blocks, ("mine_phases",)),
+    SeedStage("equipment_types", seed_equipment_types),
+    SeedStage("equipment", seed_equipment, ("mines", "equipment_types")),
+    SeedStage("operators", seed_operators, ("mines",)),
+    SeedStage("reagents", seed_reagents),
+    SeedStage("process_areas", seed_process_areas, ("mines",)),
+]
+
+
+class StageTiming(NamedTuple):
+    name: str
+    ready_at: float   # Dependencias completas (s desde el inicio)
+    started_at: float  # Conexión obtenida
+    finished_at: float
+
+    @property
+    def seconds(self) -> float:
+        return self.finished_at - self.started_at
+
+
+async def run_stages(pool: asyncpg.Pool, stages: List[SeedStage]) -> Tuple[Dict[str, Any], List[StageTiming]]:
+    """
+    Ejecutar las etapas respetando sus dependencias
+
+    Cada etapa corre apenas terminan las etapas que requiere, en una conexión
+    propia del pool (el pool limita la concurrencia). Si una etapa falla se
+    cancelan las demás y se propaga el error.
+
+    Returns:
+        (resultado de cada etapa, tiempos de cada etapa en orden de término)
+    """
+    by_name = {stage.name: stage for stage in stages}
+    graph = {}
+    for stage in stages:
+        unknown = set(stage.requires) - set(by_name)
+        if unknown:
+            raise ValueError(f"Etapa {stage.name}: dependencias desconocidas {sorted(unknown)}")
+        graph[stage.name] = set(stage.requires)
+    order = list(TopologicalSorter(graph).static_order())  # CycleError si hay ciclos
+
+    origin = time.perf_counter()
+    tasks: Dict[str, asyncio.Task] = {}
+    timings: List[StageTiming] = []
+
+    async def run(stage: SeedStage):
+        inputs = [await tasks[name] for name in stage.requires]
+        ready_at = time.perf_counter() - origin
+        async with pool.acquire() as conn:
+            started_at = time.perf_counter() - origin
+            result = await stage.func(conn, *inputs)
+        timings.append(StageTiming(stage.name, ready_at, started_at, time.perf_counter() - origin))
+        return result
+
+    for name in order:
+        tasks[name] = asyncio.ensure_future(run(by_name[name]))
+    try:
+        await asyncio.gather(*tasks.values())
+    except BaseException:
+        for task in tasks.values():
+            task.cancel()
+        await asyncio.gather(*tasks.values(), return_exceptions=True)
+        raise
+
+    return {name: task.result() for name, task in tasks.items()}, timings
+
+
+def print_timings(timings: List[StageTiming]):
+    """Tabla de tiempos por etapa (inicio relativo, espera por conexión, duración)"""
+    total = max(timing.finished_at for timing in timings)
+    serial = sum(timing.seconds for timing in timings)
+    print("⏱️  Tiempos por etapa:")
+    print(f"   {'etapa':<16} {'inicio':>8} {'espera':>8} {'duración':>9}")
+    for timing in sorted(timings, key=lambda t: t.started_at):
+        print(
+            f"   {timing.name:<16} {timing.started_at:>7.3f}s "
+            f"{timing.started_at - timing.ready_at:>7.3f}s {timing.seconds:>8.3f}s"
         )
-        print(f"  ✅ Área de proceso: {area['name']}")
+    print(f"   Total: {total:.3f}s (secuencial: {serial:.3f}s, {serial / total if total else 1:.1f}x)")
+
 
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Seed de entidades maestras de minería")
+    parser.add_argument(
+        "--concurrency", type=int, default=4,
+        help="Conexiones (etapas independientes en paralelo); 1 = secuencial",
+    )
+    return parser.parse_args(argv)
 
-async def main():
+
+async def main(argv: Optional[List[str]] = None):
     """Main function"""
+    args = parse_args(argv)
+
     print("=" * 70)
     print("  🏔️  SEED MINING DATA - Entidades Maestras Capa 1")
     print("=" * 70)
     print()
 
-    # Connect to database
+    pool = None
     try:
         print("📡 Conectando a base de datos...")
-        conn = await asyncpg.connect(settings.get_db_url_asyncpg())
-        print("✅ Conexión establecida")
-
-        # Seed data in order (respecting foreign keys)
-        deposit_ids = await seed_deposits(conn)
-        await seed_coordinates(conn, deposit_ids)
-        await seed_mineralogy(conn, deposit_ids)
-        mine_ids = await seed_mines(conn, deposit_ids)
-        phase_ids = await seed_mine_phases(conn, mine_ids)
-        await seed_blocks(conn, phase_ids)
-        type_ids = await seed_equipment_types(conn)
-        await seed_equipment(conn, mine_ids, type_ids)
-        await seed_operators(conn, mine_ids)
-        await seed_reagents(conn)
-        await seed_process_areas(conn, mine_ids)
+        pool = await asyncpg.create_pool(
+            settings.get_db_url_asyncpg(),
+            min_size=1,
+            max_size=max(1, args.concurrency),
+        )
+        print(f"✅ Conexión establecida ({args.concurrency} conexiones)")
+
+        # Etapas en paralelo según sus claves foráneas
+        results, timings = await run_stages(pool, SEED_STAGES)
 
         print()
         print("=" * 70)
@@ -940,13 +819,15 @@ async def main():
         print()
         print("📊 Resumen de datos creados:")
         print(f"   - Yacimientos:      {len(CHILEAN_DEPOSITS)}")
-        print(f"   - Minas:            {len(mine_ids)}")
-        print(f"   - Fases:            {len(phase_ids)}")
+        print(f"   - Minas:            {len(results['mines'])}")
+        print(f"   - Fases:            {len(results['mine_phases'])}")
         print(f"   - Tipos de equipo:  {len(EQUIPMENT_TYPES_DATA)}")
         print(f"   - Operadores:       {len(OPERATORS_DATA)}")
         print(f"   - Reactivos:        {len(REAGENTS_DATA)}")
         print(f"   - Áreas de proceso: {len(PROCESS_AREAS_DATA)}")
         print()
+        print_timings(timings)
+        print()
 
     except Exception as e:
         print(f"\n❌ Error: {e}")
@@ -954,8 +835,8 @@ async def main():
         traceback.print_exc()
         raise
     finally:
-        if conn:
-            await conn.close()
+        if pool:
+            await pool.close()
             print("📡 Conexión cerrada")
 
 
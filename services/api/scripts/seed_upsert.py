@@ -0,0 +1,136 @@
+"""
+Set-Based Seed Upserts
+
+Upsert por lotes para los scripts de seed: todas las filas de una tabla van en
+un solo INSERT ... SELECT FROM unnest($1::tipo[], $2::tipo[], ...) con
+ON CONFLICT (clave natural) DO UPDATE, que retorna el mapa clave -> id de las
+filas insertadas y de las existentes en la misma ida y vuelta.
+
+- Re-ejecutar el seed es idempotente: actualiza los valores declarados en el
+  script y conserva los ids (y las columnas de `keep`, p. ej. hashes de
+  password o fechas aleatorias)
+- Los tipos de los arrays se leen del catálogo (una vez por tabla y proceso),
+  así los NUMERIC(p, s), enums y varchar(n) se castean igual que la columna
+- Las tablas mineras no tienen default de id en el servidor: si las filas no
+  traen id se genera uno (sólo se usa si la fila es nueva)
+
+Uso:
+    deposit_ids = await upsert(conn, "deposits", rows, conflict=("code",))
+"""
+
+import uuid
+from typing import Any, Dict, Optional, Sequence
+
+import asyncpg
+
+
+class UpsertResult(dict):
+    """Mapa clave -> id, con la cantidad de filas nuevas (el resto ya existía)"""
+
+    def __init__(self, ids: Dict[Any, uuid.UUID], inserted: int):
+        super().__init__(ids)
+        self.inserted = inserted
+
+    def summary(self) -> str:
+        existing = len(self) - self.inserted
+        return f"{self.inserted} creados" + (f", {existing} ya existían" if existing else "")
+
+
+# Tipos de columna por tabla (format_type: 'numeric(12,2)', 'mine_type_enum', ...)
+_column_types: Dict[str, Dict[str, str]] = {}
+
+COLUMN_TYPES_QUERY = """
+    SELECT a.attname AS name, format_type(a.atttypid, a.atttypmod) AS type
+    FROM pg_attribute a
+    WHERE a.attrelid = $1::regclass
+      AND a.attnum > 0
+      AND NOT a.attisdropped
+"""
+
+
+async def column_types(conn: asyncpg.Connection, table: str) -> Dict[str, str]:
+    """Tipo SQL de cada columna de la tabla (cacheado por proceso)"""
+    if table not in _column_types:
+        rows = await conn.fetch(COLUMN_TYPES_QUERY, table)
+        if not rows:
+            raise ValueError(f"Tabla desconocida: {table}")
+        _column_types[table] = {row["name"]: row["type"] for row in rows}
+    return _column_types[table]
+
+
+def build_upsert_query(
+    table: str,
+    columns: Sequence[str],
+    types: Dict[str, str],
+    conflict: Sequence[str],
+    keep: Sequence[str] = (),
+    conflict_where: Optional[str] = None,
+) -> str:
+    """
+    INSERT ... SELECT FROM unnest(...) ON CONFLICT ... DO UPDATE ... RETURNING clave, id
+
+    xmax = 0 distingue las filas insertadas de las actualizadas.
+    """
+    unknown = [column for column in columns if column not in types]
+    if unknown:
+        raise ValueError(f"Columnas desconocidas en {table}: {', '.join(unknown)}")
+
+    arrays = ", ".join(f"${n}::{types[column]}[]" for n, column in enumerate(columns, start=1))
+    updates = [f"{column} = EXCLUDED.{column}" for column in columns if column not in (*conflict, "id", *keep)]
+    if "updated_at" in types and "updated_at" not in columns:
+        updates.append("updated_at = NOW()")
+    if not updates:
+        # DO NOTHING no retorna las filas existentes: update sin cambios de valor
+        updates.append(f"{conflict[0]} = EXCLUDED.{conflict[0]}")
+
+    where = f" WHERE {conflict_where}" if conflict_where else ""
+    return f"""
+        INSERT INTO {table} ({", ".join(columns)})
+        SELECT * FROM unnest({arrays})
+        ON CONFLICT ({", ".join(conflict)}){where} DO UPDATE
+        SET {", ".join(updates)}
+        RETURNING {", ".join(conflict)}, id, (xmax = 0) AS inserted
+    """
+
+
+async def upsert(
+    conn: asyncpg.Connection,
+    table: str,
+    rows: Sequence[Dict[str, Any]],
+    conflict: Sequence[str],
+    keep: Sequence[str] = (),
+    conflict_where: Optional[str] = None,
+) -> UpsertResult:
+    """
+    Insertar o actualizar `rows` (dicts con las mismas claves) en una sentencia
+
+    Args:
+        conn: Conexión asyncpg
+        table: Tabla destino
+        rows: Filas a sembrar
+        conflict: Columnas de la clave natural (índice único)
+        keep: Columnas que no se sobrescriben si la fila ya existe
+        conflict_where: Predicado del índice único parcial (si lo es)
+
+    Returns:
+        Mapa clave -> id (clave = valor de la columna, o tupla si son varias),
+        en el orden de `rows`; .inserted = filas nuevas
+    """
+    if not rows:
+        return UpsertResult({}, 0)
+    types = await column_types(conn, table)
+
+    columns = list(rows[0])
+    if "id" in types and "id" not in columns:
+        columns.insert(0, "id")
+        rows = [{"id": uuid.uuid4(), **row} for row in rows]
+
+    query = build_upsert_query(table, columns, types, conflict, keep, conflict_where)
+    result = await conn.fetch(query, *([row[column] for row in rows] for column in columns))
+
+    def key(record) -> Any:
+        return record[conflict[0]] if len(conflict) == 1 else tuple(record[column] for column in conflict)
+
+    ids = {key(record): record["id"] for record in result}
+    inserted = sum(1 for record in result if record["inserted"])
+    return UpsertResult({key(row): ids[key(row)] for row in rows}, inserted)